@@ -0,0 +1,109 @@
+"""Construction time and peak memory of actions DataFrames from raw damage events.
+
+Compares `pd.DataFrame(events)` followed by `.apply` over the nested `ability`
+dict and the dotted `buffs` string against `decode_damage_events`, on synthetic
+events shaped like a long fight with DoTs and pets.
+
+Usage:
+    python benchmarks/damage_events.py [n_events ...]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from fflogs_rotation.damage_events import decode_damage_events
+
+ABILITIES = [(f"Action {i}", 30000 + i) for i in range(40)]
+BUFFS = ["1000049", "1001221", "1002964", "1001185", "1003889", "1001822"]
+
+
+def synthetic_events(n: int, seed: int = 0) -> list[dict]:
+    """Events alternating "prepares action" and damage, with some DoT ticks."""
+    rng = random.Random(seed)
+    events = []
+    for i in range(n):
+        name, guid = rng.choice(ABILITIES)
+        buffs = rng.sample(BUFFS, rng.randint(0, 4))
+        event = {
+            "timestamp": 1000 * i,
+            "type": "calculateddamage" if i % 2 == 0 else "damage",
+            "sourceID": rng.choice([1, 1, 1, 12]),
+            "targetID": 20,
+            "packetID": i // 2,
+            "ability": {"name": name, "guid": guid},
+            "hitType": rng.choice([1, 2]),
+            "amount": rng.randint(10000, 100000),
+            "multiplier": 1.0 + rng.random() / 10,
+        }
+        if buffs:
+            event["buffs"] = ".".join(buffs) + "."
+        if rng.random() < 0.2:
+            event["directHit"] = True
+        if i % 10 == 1:
+            event["tick"] = True
+            del event["packetID"]
+        events.append(event)
+    return events
+
+
+def build_via_dataframe(events: list[dict]) -> pd.DataFrame:
+    """Previous construction path of `create_action_df`."""
+    actions_df = pd.DataFrame(events)
+    actions_df["ability_name"] = actions_df["ability"].apply(
+        lambda x: x.get("name") if isinstance(x, dict) else None
+    )
+    actions_df["abilityGameID"] = actions_df["ability"].apply(
+        lambda x: x.get("guid") if isinstance(x, dict) else None
+    )
+    actions_df.drop(columns="ability", inplace=True)
+    actions_df = actions_df[
+        (actions_df["type"] == "calculateddamage")
+        | ((actions_df["type"] == "damage") & (actions_df["tick"] == True))
+    ]
+    actions_df["buffs"] = actions_df["buffs"].apply(
+        lambda x: x[:-1].split(".") if not pd.isna(x) else []
+    )
+    return actions_df
+
+
+def build_via_columns(events: list[dict]) -> pd.DataFrame:
+    """Columnar construction path of `create_action_df`."""
+    decoded = decode_damage_events(events)
+    actions_df = pd.DataFrame(decoded.columns)
+    actions_df["buff_set_id"] = decoded.buff_set_ids
+    return actions_df
+
+
+def measure(build, events: list[dict]) -> tuple[float, float]:
+    """Best wall time of three runs (s) and peak traced memory (MiB)."""
+    times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        build(events)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    build(events)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak / 2**20
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'events':>8} {'path':>10} {'time (ms)':>10} {'peak (MiB)':>11}")
+    for n in sizes:
+        events = synthetic_events(n)
+        for label, build in (
+            ("dataframe", build_via_dataframe),
+            ("columnar", build_via_columns),
+        ):
+            seconds, peak = measure(build, events)
+            print(f"{n:>8} {label:>10} {1000 * seconds:>10.1f} {peak:>11.1f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [10_000, 50_000, 200_000])
@@ -0,0 +1,62 @@
+"""Import time and memory of the app and analysis modules.
+
+Each module is imported in a fresh interpreter with `-X importtime`, reporting
+wall time, the slowest imports by cumulative time, and peak RSS. Exits non-zero
+if any import exceeds its budget. Run from the repo root.
+
+Usage:
+    python benchmarks/import_time.py [module ...]
+"""
+
+import subprocess
+import sys
+import time
+
+# Module -> import time budget, in ms
+BUDGETS_MS = {
+    "fflogs_rotation.actions": 1500,
+    "crit_app.app": 4000,
+}
+# Imports a module and prints the interpreter's peak RSS, in KB.
+PROGRAM = (
+    "import {module}, resource; "
+    "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+)
+
+
+def measure(module: str, top: int = 10) -> float:
+    """Import a module in a subprocess, print its slowest imports, return wall ms."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROGRAM.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_ms = 1000 * (time.perf_counter() - start)
+    max_rss_mb = int(result.stdout) / 1024
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        imports.append((int(cumulative), name.strip()))
+
+    print(f"{module}: {wall_ms:.0f} ms, peak RSS {max_rss_mb:.0f} MB")
+    for cumulative, name in sorted(imports, reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    return wall_ms
+
+
+if __name__ == "__main__":
+    modules = sys.argv[1:] or list(BUDGETS_MS)
+    over_budget = []
+    for module in modules:
+        wall_ms = measure(module)
+        budget = BUDGETS_MS.get(module)
+        if budget is not None and wall_ms > budget:
+            over_budget.append(f"{module} ({wall_ms:.0f} > {budget} ms)")
+    if over_budget:
+        sys.exit("Over budget: " + ", ".join(over_budget))
@@ -5,11 +5,73 @@ from dash import Input, Output, State, dcc, html
 from dash.exceptions import PreventUpdate
 from dash.long_callback import DiskcacheLongCallbackManager
 
-from crit_app.config import DEBUG
+from crit_app.config import (
+    ACTION_DISTRIBUTION_CACHE_URI,
+    DEBUG,
+    FFLOGS_CACHE_URI,
+    FFLOGS_RECORDING_MODE,
+    FFLOGS_RECORDING_URI,
+    FFLOGS_STAND_IN_URL,
+    JOB_ANALYSIS_CACHE_URI,
+    PHASE_ROTATION_CACHE_URI,
+    STAGE_TIMING_URI,
+)
+from crit_app.util.action_distribution_cache import (
+    TieredActionDistributionCache,
+    set_action_distribution_cache,
+)
+from crit_app.util.analysis_cache import DiskJobAnalysisStore, set_job_analysis_store
+from fflogs_rotation.cache import DiskResponseCache, set_response_cache
+from fflogs_rotation.http_session import configure_session
+from fflogs_rotation.phases import DiskPhaseRotationCache, set_phase_rotation_cache
+from fflogs_rotation.profiling import SQLiteStageTimingSink, set_stage_timing_sink
+from fflogs_rotation.rate_limit import RateLimitScheduler, set_rate_limiter
+from fflogs_rotation.recording import RecordReplaySession
+from fflogs_rotation.single_flight import DiskSingleFlight, set_single_flight
+from fflogs_rotation.stand_in_server import StandInSession
 
 cache = diskcache.Cache("./cache")
 long_callback_manager = DiskcacheLongCallbackManager(cache)
 
+# Queue FFLogs queries by priority instead of running into the hourly point limit.
+# Every worker spends points from the same bucket.
+set_rate_limiter(RateLimitScheduler(directory=FFLOGS_CACHE_URI / "rate_limit"))
+# Workers analyzing the same fight at once share one FFLogs query.
+set_single_flight(DiskSingleFlight(FFLOGS_CACHE_URI / "in_flight"))
+
+# Offline load testing/profiling, every FFLogs query goes to the recordings or
+# stand-in server instead of being answered by the response cache.
+if FFLOGS_STAND_IN_URL is not None:
+    configure_session(StandInSession, stand_in_url=FFLOGS_STAND_IN_URL)
+elif FFLOGS_RECORDING_URI is not None:
+    configure_session(
+        RecordReplaySession,
+        directory=FFLOGS_RECORDING_URI,
+        mode=FFLOGS_RECORDING_MODE,
+    )
+else:
+    # Finished reports never change, so FFLogs responses are cached across analyses.
+    set_response_cache(DiskResponseCache(FFLOGS_CACHE_URI))
+
+# Every phase of a pull is built at once and cached, so other phases are instant.
+if PHASE_ROTATION_CACHE_URI is not None:
+    set_phase_rotation_cache(DiskPhaseRotationCache(PHASE_ROTATION_CACHE_URI))
+
+# Identical rotations with identical stats reuse a prior job analysis.
+if JOB_ANALYSIS_CACHE_URI is not None:
+    set_job_analysis_store(DiskJobAnalysisStore(JOB_ANALYSIS_CACHE_URI))
+
+# Actions seen in any prior analysis reuse their damage distributions. This binds
+# `ffxiv_stats.moments.ActionMoments` to a caching factory for the whole process,
+# `set_action_distribution_cache(None)` restores it.
+set_action_distribution_cache(
+    TieredActionDistributionCache(ACTION_DISTRIBUTION_CACHE_URI)
+)
+
+# Record how long each stage of an analysis takes, queryable with SQL.
+if STAGE_TIMING_URI is not None:
+    set_stage_timing_sink(SQLiteStageTimingSink(STAGE_TIMING_URI))
+
 app = dash.Dash(
     __name__,
     use_pages=True,
@@ -656,6 +656,21 @@ def initialize_rotation_card(
                         ]
                     )
                 ),
+                # Compare the rotation's DPS distribution under saved gearsets
+                html.H3("Compare saved gearsets", className="mt-3"),
+                html.P(
+                    "Evaluate this rotation with each saved gearset of the same "
+                    "role, without analyzing the log again. Each gearset's DPS "
+                    "distribution is convolved like the one above, so the "
+                    "percentiles of this analysis match it."
+                ),
+                dbc.Button(
+                    "Compare gearsets",
+                    id="stat-sweep-button",
+                    color="primary",
+                    className="mb-3",
+                ),
+                html.Div(id="stat-sweep-div"),
             ],
             className="mb-3",
         ),
@@ -4,5 +4,14 @@ FFLOGS_TOKEN = ""
 ETRO_TOKEN = ""
 DB_URI = Path("db_uri.db").resolve()
 BLOB_URI = Path("blob_uri").resolve()
+FFLOGS_CACHE_URI = Path("fflogs_cache").resolve()  # FFLogs API response cache
+PHASE_ROTATION_CACHE_URI = Path("phase_cache").resolve()  # None to disable
+JOB_ANALYSIS_CACHE_URI = Path("job_analysis_cache").resolve()  # None to disable
+ACTION_DISTRIBUTION_CACHE_URI = Path("action_cache").resolve()  # None for memory only
+FFLOGS_RECORDING_URI = None  # Record/replay FFLogs responses here, None to disable
+FFLOGS_RECORDING_MODE = "replay"  # "record" or "replay" FFLOGS_RECORDING_URI
+FFLOGS_STAND_IN_URL = None  # Send FFLogs queries to a local stand-in server instead
+STAGE_TIMING_URI = None  # SQLite DB of per-stage analysis timings, None to disable
+PROFILE_URI = None  # cProfiles of analyses with a profile_analysis=1 cookie go here
 DEBUG = True  # run server in debug mode
 DRY_RUN = False  # whether to write items to DB_URI
@@ -19,6 +19,9 @@ if not (BLOB_URI / "party-analyses").exists():
 if not (BLOB_URI / "error-logs").exists():
     (BLOB_URI / "error-logs").resolve().mkdir(parents=True)
 
+if not (BLOB_URI / "fight-metadata").exists():
+    (BLOB_URI / "fight-metadata").resolve().mkdir(parents=True)
+
 create_encounter_table = """
 CREATE TABLE if not exists
     encounter (
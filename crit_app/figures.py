@@ -268,6 +268,90 @@ def make_rotation_percentile_table(
     return rotation_percentile_table
 
 
+def make_stat_sweep_table(
+    sweep_summary: pd.DataFrame, fast_estimate: bool = False
+) -> dash_table.DataTable:
+    """Make a table comparing the DPS distributions of several gearsets.
+
+    Percentiles of a fast estimate are of the moment-based approximation, so the
+    headers are then marked as approximate.
+
+    Parameters:
+        sweep_summary (pd.DataFrame): Summary of a stat sweep, one row per gearset
+            with its moments and DPS percentiles.
+        fast_estimate (bool): Whether the stat sweep was a fast estimate.
+
+    Returns:
+        dash_table.DataTable: Table with one row per gearset.
+    """
+    dps_format = Format(precision=2, scheme=Scheme.decimal_integer)
+    columns = [dict(id="name", name="Gearset")] + [
+        dict(id=c, name=c.capitalize(), type="numeric", format=dps_format)
+        for c in ("mean", "std")
+    ]
+    approximate = "~" if fast_estimate else ""
+    columns += [
+        dict(id=c, name=f"{approximate}{c[1:]}th %", type="numeric", format=dps_format)
+        for c in sweep_summary.columns
+        if c.startswith("p")
+    ]
+
+    return dash_table.DataTable(
+        data=sweep_summary.to_dict("records"),
+        columns=columns,
+        cell_selectable=False,
+        style_header={
+            "backgroundColor": "#222",
+            "color": "white",
+            "fontWeight": "bold",
+            "textAlign": "left",
+            "border": "none",
+            "borderBottom": "1px solid #333",
+            "padding": "10px 15px",
+            "fontFamily": "sans-serif",
+        },
+        style_data={
+            "backgroundColor": "#333",
+            "color": "white",
+            "textAlign": "left",
+            "padding": "10px 15px",
+            "fontFamily": "sans-serif",
+            "border": "none",
+            "borderBottom": "1px solid #292929",
+        },
+        style_table={
+            "overflowX": "auto",
+            "borderRadius": "5px",
+            "boxShadow": "0 3px 6px rgba(0,0,0,0.16)",
+        },
+    )
+
+
+def make_stat_sweep_figure(sweep: Any) -> Figure:
+    """Make a plotly figure overlaying the DPS distributions of several gearsets.
+
+    Parameters:
+        sweep (Any): Stat sweep, with DPS distributions on a shared support.
+
+    Returns:
+        Figure: Plotly figure with one line per gearset.
+    """
+    fig = go.Figure()
+    for name, distribution in zip(sweep.summary["name"], sweep.dps_distributions):
+        fig.add_trace(
+            go.Scatter(x=sweep.dps_support, y=distribution, mode="lines", name=name)
+        )
+
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis_title="Damage per Second (DPS)",
+        yaxis_title="Frequency",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
+        margin=dict(l=20, r=20, t=40, b=20),
+    )
+    return fig
+
+
 def how_tall_should_the_action_box_plot_be(n_actions: int) -> int:
     """Alter height of the box figure so it can fit and look good.
 
@@ -1,8 +1,6 @@
 import dash
 from dash import html
 
-from crit_app.pages.math import math_layout
-
 dash.register_page(
     __name__,
     path="/about",
@@ -66,10 +64,13 @@ about_layout = html.Div(
         html.H3("How are damage distributions calculated (short)?"),
         html.P("Lots of convolutions."),
         html.H3("How are damage distributions calculated (longer)?"),
-        math_layout,
     ]
 )
 
 
 def layout():
-    return about_layout
+    # The math explainer builds its figures at import, so it's only imported
+    # once the page is first visited.
+    from crit_app.pages.math import math_layout
+
+    return html.Div(about_layout.children + [math_layout])
@@ -1,6 +1,7 @@
 import datetime
 import pickle
 import traceback
+from functools import partial
 from typing import Any
 from uuid import uuid4
 
@@ -40,12 +41,6 @@ from crit_app.config import BLOB_URI, DEBUG, DRY_RUN
 from crit_app.dmg_distribution import (
     get_dps_dmg_percentile,
 )
-from crit_app.figures import (
-    make_action_box_and_whisker_figure,
-    make_action_pdfs_figure,
-    make_rotation_pdf_figure,
-    make_rotation_percentile_table,
-)
 from crit_app.job_data.encounter_data import (
     encounter_level,
     encounter_phases,
@@ -102,6 +97,8 @@ from crit_app.util.history import (
     upsert_local_store_record,
 )
 from crit_app.util.player_dps_distribution import job_analysis_to_data_class
+from crit_app.util.profiling import record_analysis_stages
+from fflogs_rotation.fight_metadata import load_fight_metadata
 from fflogs_rotation.job_data.data import (
     critical_hit_rate_table,
     damage_buff_table,
@@ -110,6 +107,14 @@ from fflogs_rotation.job_data.data import (
     guaranteed_hits_by_buff_table,
     potency_table,
 )
+from fflogs_rotation.phases import (
+    build_phase_table,
+    get_phase_rotation_cache,
+    phase_rotation_key,
+    phase_rotation_table,
+)
+from fflogs_rotation.profiling import set_analysis_id, stage
+from fflogs_rotation.rate_limit import Priority, request_priority
 from fflogs_rotation.rotation import RotationTable
 
 valid_stat_return = (True, False)
@@ -180,6 +185,9 @@ dash.register_page(
     meta_tags=metas,
 )
 
+# Higher level = bigger damage = bigger discretization step size
+ACTION_DELTA_MAP = {90: 4, 100: 9}
+
 
 def layout(analysis_id=None):
     """Display a previously-analyzed rotation by its analysis ID."""
@@ -289,30 +297,48 @@ def layout(analysis_id=None):
         # Get actions and create a rotation again, used if the RotationTable class updates.
         if redo_rotation:
             try:
-                rotation_object = RotationTable(
-                    headers,
-                    analysis_details["report_id"],
-                    int(analysis_details["fight_id"]),
-                    player_job_no_space,
-                    player_id,
-                    crit,
-                    direct_hit,
-                    determination,
-                    main_stat_pre_bonus,
-                    weapon_damage,
-                    level,
-                    fight_phase,
-                    damage_buff_table,
-                    critical_hit_rate_table,
-                    direct_hit_rate_table,
-                    guaranteed_hits_by_action_table,
-                    guaranteed_hits_by_buff_table,
-                    potency_table,
-                    encounter_phases,
-                    pet_ids,
-                    analysis_details["excluded_enemy_ids"],
-                    tenacity=tenacity,
-                )
+                # Lazy recomputes yield FFLogs API points to interactive analyses.
+                with request_priority(Priority.BACKGROUND):
+                    build_rotation = partial(
+                        RotationTable,
+                        headers=headers,
+                        report_id=analysis_details["report_id"],
+                        fight_id=int(analysis_details["fight_id"]),
+                        job=player_job_no_space,
+                        player_id=player_id,
+                        crit_stat=crit,
+                        dh_stat=direct_hit,
+                        determination=determination,
+                        main_stat=main_stat_pre_bonus,
+                        weapon_damage=weapon_damage,
+                        level=level,
+                        damage_buff_table=damage_buff_table,
+                        critical_hit_rate_buff_table=critical_hit_rate_table,
+                        direct_hit_rate_buff_table=direct_hit_rate_table,
+                        guaranteed_hits_by_action_table=guaranteed_hits_by_action_table,
+                        guaranteed_hits_by_buff_table=guaranteed_hits_by_buff_table,
+                        potency_table=potency_table,
+                        encounter_phases=encounter_phases,
+                        pet_ids=pet_ids,
+                        excluded_enemy_ids=analysis_details["excluded_enemy_ids"],
+                        tenacity=tenacity,
+                        fight_metadata=load_fight_metadata(
+                            BLOB_URI / "fight-metadata",
+                            analysis_details["report_id"],
+                            int(analysis_details["fight_id"]),
+                        ),
+                    )
+                    # Phases are sliced out of the whole fight only if new analyses
+                    # are, so both build the same table.
+                    if encounter_id in encounter_phases:
+                        rotation_object = build_phase_table(
+                            fight_phase,
+                            build_rotation,
+                            last_phase=furthest_phase,
+                            all_phases=get_phase_rotation_cache().enabled,
+                        )
+                    else:
+                        rotation_object = build_rotation(phase=fight_phase)
 
                 action_df = rotation_object.filtered_actions_df
                 rotation_df = rotation_object.rotation_df
@@ -469,6 +495,14 @@ def layout(analysis_id=None):
             / 100
         )
 
+        # Figure code pulls in plotly.express, so it's imported when first needed.
+        from crit_app.figures import (
+            make_action_box_and_whisker_figure,
+            make_action_pdfs_figure,
+            make_rotation_pdf_figure,
+            make_rotation_percentile_table,
+        )
+
         ### make rotation card results
         rotation_fig = make_rotation_pdf_figure(
             job_analysis_data,
@@ -1294,6 +1328,7 @@ def copy_analysis_link(n: int, selected: str) -> str:
     Input("magical-ranged-jobs", "value"),
     prevent_initial_call=True,
 )
+@record_analysis_stages
 def analyze_and_register_rotation(
     n_clicks: int,
     main_stat_pre_bonus: int,
@@ -1420,9 +1455,6 @@ def analyze_and_register_rotation(
 
     level = encounter_level[encounter_id]
 
-    # Higher level = bigger damage = bigger discretization step size
-    delta_map = {90: 4, 100: 9}
-
     main_stat_multiplier = compute_party_bonus(report_id, fight_id)
     main_stat_type = role_stat_dict[role]["main_stat"]["placeholder"].lower()
     main_stat = int(main_stat_pre_bonus * main_stat_multiplier)
@@ -1491,30 +1523,57 @@ def analyze_and_register_rotation(
             )
 
         # if n_prior_reports == 0:
-        rotation = RotationTable(
-            headers,
-            report_id,
-            fight_id,
-            job_no_space,
-            player_id,
-            ch,
-            dh,
-            determination,
-            main_stat_pre_bonus,
-            wd,
-            level,
-            fight_phase,
-            damage_buff_table,
-            critical_hit_rate_table,
-            direct_hit_rate_table,
-            guaranteed_hits_by_action_table,
-            guaranteed_hits_by_buff_table,
-            potency_table,
-            encounter_phases,
-            pet_ids,
-            excluded_enemy_ids,
-            tenacity,
+        build_rotation = partial(
+            RotationTable,
+            headers=headers,
+            report_id=report_id,
+            fight_id=fight_id,
+            job=job_no_space,
+            player_id=player_id,
+            crit_stat=ch,
+            dh_stat=dh,
+            determination=determination,
+            main_stat=main_stat_pre_bonus,
+            weapon_damage=wd,
+            level=level,
+            damage_buff_table=damage_buff_table,
+            critical_hit_rate_buff_table=critical_hit_rate_table,
+            direct_hit_rate_buff_table=direct_hit_rate_table,
+            guaranteed_hits_by_action_table=guaranteed_hits_by_action_table,
+            guaranteed_hits_by_buff_table=guaranteed_hits_by_buff_table,
+            potency_table=potency_table,
+            encounter_phases=encounter_phases,
+            pet_ids=pet_ids,
+            excluded_enemy_ids=excluded_enemy_ids,
+            tenacity=tenacity,
+            fight_metadata=load_fight_metadata(
+                BLOB_URI / "fight-metadata", report_id, fight_id
+            ),
         )
+        # Every phase of the pull is built at once, so other phases are instant.
+        if encounter_id in encounter_phases:
+            rotation = phase_rotation_table(
+                phase_rotation_key(
+                    report_id,
+                    fight_id,
+                    player_id,
+                    job_no_space,
+                    ch,
+                    dh,
+                    determination,
+                    main_stat_pre_bonus,
+                    wd,
+                    level,
+                    tenacity,
+                    pet_ids,
+                    excluded_enemy_ids,
+                ),
+                fight_phase,
+                build_rotation,
+                last_phase=last_phase_index,
+            )
+        else:
+            rotation = build_rotation(phase=fight_phase)
 
         rotation_df = rotation.rotation_df
         t = rotation.fight_dps_time
@@ -1534,7 +1593,7 @@ def analyze_and_register_rotation(
             wd,
             delay,
             main_stat_pre_bonus,
-            action_delta=delta_map[level],
+            action_delta=ACTION_DELTA_MAP[level],
             level=level,
         )
 
@@ -1542,6 +1601,7 @@ def analyze_and_register_rotation(
         job_analysis_data.interpolate_distributions()
 
         analysis_id = str(uuid4())
+        set_analysis_id(analysis_id)
         redo_rotation_flag = 0
         redo_dps_pdf_flag = 0
 
@@ -1562,10 +1622,11 @@ def analyze_and_register_rotation(
         )
 
         if not DRY_RUN:
-            with open(BLOB_URI / f"rotation-object-{analysis_id}.pkl", "wb") as f:
-                pickle.dump(rotation, f)
-            with open(BLOB_URI / f"job-analysis-data-{analysis_id}.pkl", "wb") as f:
-                pickle.dump(job_analysis_data, f)
+            with stage("blob_writes"):
+                with open(BLOB_URI / f"rotation-object-{analysis_id}.pkl", "wb") as f:
+                    pickle.dump(rotation, f)
+                with open(BLOB_URI / f"job-analysis-data-{analysis_id}.pkl", "wb") as f:
+                    pickle.dump(job_analysis_data, f)
 
             analysis_datetime = datetime.datetime.now()
             # FIXME: remove medication amt
@@ -1812,4 +1873,107 @@ def valid_weapon_damage(weapon_damage: int) -> tuple:
         return invalid_stat_return
 
 
+@callback(
+    Output("stat-sweep-div", "children"),
+    Input("stat-sweep-button", "n_clicks"),
+    State("saved-gearsets", "data"),
+    State("url", "pathname"),
+    prevent_initial_call=True,
+)
+def compare_saved_gearsets(
+    n_clicks: int, saved_gearsets: list[dict], pathname: str
+) -> list[Any]:
+    """
+    Compare the analyzed rotation's DPS distribution under each saved gearset.
+
+    The rotation is loaded from the analysis instead of fetched again, and all
+    gearsets are evaluated together by `stat_sweep`.
+
+    Parameters:
+    n_clicks (int): Number of times the compare button was clicked.
+    saved_gearsets (list[dict]): Gearsets saved in local storage.
+    pathname (str): Path of the analysis page.
+
+    Returns:
+    list[Any]: Comparison table and figure, or an alert.
+    """
+    if (not n_clicks) or (not pathname.startswith("/analysis/")):
+        raise PreventUpdate
+
+    analysis_id = pathname.rstrip("/").split("/")[-1]
+    if not check_valid_player_analysis_id(analysis_id):
+        raise PreventUpdate
+
+    analysis_details = retrieve_player_analysis_information(analysis_id)
+    role = analysis_details["role"]
+    job_no_space = analysis_details["job"]
+    party_bonus = analysis_details["party_bonus"]
+    level = encounter_level[analysis_details["encounter_id"]]
+
+    gearsets = [
+        {
+            "name": "This analysis",
+            "main_stat": int(analysis_details["main_stat"]),
+            "secondary_stat": analysis_details["secondary_stat"],
+            "determination": analysis_details["determination"],
+            "speed_stat": analysis_details["speed"],
+            "ch": analysis_details["critical_hit"],
+            "dh": analysis_details["direct_hit"],
+            "wd": analysis_details["weapon_damage"],
+            "delay": analysis_details["delay"],
+            "main_stat_pre_bonus": analysis_details["main_stat_pre_bonus"],
+        }
+    ]
+    for gearset in saved_gearsets or []:
+        if gearset.get("role") != role:
+            continue
+        secondary_stat = set_secondary_stats(
+            role,
+            abbreviated_job_map[job_no_space].upper(),
+            party_bonus,
+            gearset.get("tenacity"),
+        )[2]
+        gearsets.append(
+            {
+                "name": gearset.get("name", "Unnamed"),
+                "main_stat": int(gearset["main_stat"] * party_bonus),
+                "secondary_stat": secondary_stat,
+                "determination": gearset["determination"],
+                "speed_stat": gearset["speed"],
+                "ch": gearset["crit"],
+                "dh": gearset["direct_hit"],
+                "wd": gearset["weapon_damage"],
+                "delay": analysis_details["delay"],
+                "main_stat_pre_bonus": gearset["main_stat"],
+            }
+        )
+
+    if len(gearsets) == 1:
+        return [error_alert(f"No saved {role} gearsets to compare.")]
+
+    try:
+        with open(BLOB_URI / f"rotation-object-{analysis_id}.pkl", "rb") as outp:
+            rotation_object = pickle.load(outp)
+
+        from crit_app.figures import make_stat_sweep_figure, make_stat_sweep_table
+        from crit_app.util.stat_sweep import stat_sweep
+
+        sweep = stat_sweep(
+            role,
+            job_no_space,
+            rotation_object,
+            rotation_object.fight_dps_time,
+            gearsets,
+            level=level,
+            action_delta=ACTION_DELTA_MAP[level],
+        )
+    except Exception as e:
+        return [error_alert(str(e))]
+
+    return [
+        make_stat_sweep_table(sweep.summary, sweep.fast_estimate),
+        dcc.Graph(figure=make_stat_sweep_figure(sweep), id="stat-sweep-fig"),
+    ]
+
+
 # The gearset callbacks have been moved to crit_app/callbacks/gearset_callbacks.py
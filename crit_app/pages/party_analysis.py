@@ -2,7 +2,9 @@ import json
 import pickle
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import uuid4
 
@@ -13,12 +15,6 @@ from dash.exceptions import PreventUpdate
 from plotly.graph_objs._figure import Figure
 
 from crit_app.config import BLOB_URI, DRY_RUN
-from crit_app.figures import (
-    make_action_box_and_whisker_figure,
-    make_kill_time_graph,
-    make_party_rotation_pdf_figure,
-    make_rotation_pdf_figure,
-)
 from crit_app.job_data.encounter_data import (
     custom_t_clip_encounter_phases,
     encounter_level,
@@ -92,6 +88,8 @@ from crit_app.util.party_dps_distribution import (
     rotation_dps_pdf,
 )
 from crit_app.util.player_dps_distribution import job_analysis_to_data_class
+from crit_app.util.profiling import record_analysis_stages
+from fflogs_rotation.fight_metadata import load_fight_metadata
 from fflogs_rotation.job_data.data import (
     critical_hit_rate_table,
     damage_buff_table,
@@ -100,6 +98,10 @@ from fflogs_rotation.job_data.data import (
     guaranteed_hits_by_buff_table,
     potency_table,
 )
+from fflogs_rotation.party_events import PartyDamageEvents
+from fflogs_rotation.phases import phase_rotation_key, phase_rotation_table
+from fflogs_rotation.profiling import set_analysis_id, stage
+from fflogs_rotation.rate_limit import Priority, request_priority, submit_in_context
 from fflogs_rotation.rotation import RotationTable
 
 reverse_abbreviated_role_map = dict(
@@ -235,6 +237,12 @@ def layout(party_analysis_id=None):
         )
         perform_kill_time_analysis = party_analysis_obj.perform_kill_time_analysis
 
+        # Figure code pulls in plotly.express, so it's imported when first needed.
+        from crit_app.figures import (
+            make_kill_time_graph,
+            make_party_rotation_pdf_figure,
+        )
+
         party_dps_figure = make_party_rotation_pdf_figure(party_analysis_obj)
         kill_time_figure = (
             make_kill_time_graph(party_analysis_obj, kill_time)
@@ -323,6 +331,11 @@ def load_job_rotation_figure(job_analysis_id: Optional[str], graph_type: str) ->
     ).reset_index()
     rotation_dps = action_dps["amount"].sum()
 
+    from crit_app.figures import (
+        make_action_box_and_whisker_figure,
+        make_rotation_pdf_figure,
+    )
+
     if graph_type == "rotation":
         return make_rotation_pdf_figure(
             job_object, rotation_dps, job_object.active_dps_t, job_object.analysis_t
@@ -967,6 +980,7 @@ def job_progress(job_list, active_job):
     ],
     prevent_initial_call=True,
 )
+@record_analysis_stages
 def analyze_party_rotation(
     set_progress,
     n_clicks,
@@ -1043,18 +1057,19 @@ def analyze_party_rotation(
 
     level = encounter_level[encounter_id]
 
-    # Get Limit Break instances
-    # Check if LB was used, get its ID if it was
-    if lb_player_id is not None:
-        lb_damage_events_df, error_message = limit_break_damage_events(
-            report_id, fight_id, lb_player_id, fight_phase
+    # Get Limit Break instances while prior analyses are looked up, joined before
+    # the player-level analyses. Not waited on if a prior party analysis is found.
+    lb_executor = ThreadPoolExecutor(max_workers=1)
+    with request_priority(Priority.PARTY):
+        lb_query = submit_in_context(
+            lb_executor,
+            _limit_break_damage,
+            report_id,
+            fight_id,
+            lb_player_id,
+            fight_phase,
         )
-        if error_message != "":
-            return updated_url, [error_alert(error_message)], analysis_history
-        lb_damage = lb_damage_events_df["amount"].sum()
-    else:
-        lb_damage_events_df = pd.DataFrame(columns=["timestamp"])
-        lb_damage = 0
+    lb_executor.shutdown(wait=False)
 
     # Party bonus to main stat
     main_stat_multiplier = 1 + len(set(main_stat_label)) / 100
@@ -1116,31 +1131,37 @@ def analyze_party_rotation(
     ):
         return f"/party_analysis/{party_analysis_id}", [], analysis_history
 
+    # Fail before any player-level analysis runs if the Limit Break query failed.
+    lb_damage_events_df, lb_damage, error_message = lb_query.result()
+    if error_message != "":
+        return updated_url, [error_alert(error_message)], analysis_history
+
     # Compute player-level analyses
-    success, results = player_analysis_loop(
-        report_id,
-        fight_id,
-        encounter_name,
-        encounter_id,
-        player_name,
-        player_id,
-        fight_phase,
-        pet_id_map,
-        job,
-        set_progress,
-        main_stat_no_buff,
-        main_stat_multiplier,
-        secondary_stat_no_buff,
-        speed,
-        determination,
-        crit,
-        dh,
-        weapon_damage,
-        level,
-        job_build_url,
-        player_analysis_ids,
-        # t_clips,
-    )
+    with request_priority(Priority.PARTY):
+        success, results = player_analysis_loop(
+            report_id,
+            fight_id,
+            encounter_name,
+            encounter_id,
+            player_name,
+            player_id,
+            fight_phase,
+            pet_id_map,
+            job,
+            set_progress,
+            main_stat_no_buff,
+            main_stat_multiplier,
+            secondary_stat_no_buff,
+            speed,
+            determination,
+            crit,
+            dh,
+            weapon_damage,
+            level,
+            job_build_url,
+            player_analysis_ids,
+            # t_clips,
+        )
 
     if success:
         (
@@ -1260,14 +1281,16 @@ def analyze_party_rotation(
     # Create an ID if it's not a recompute
     if party_analysis_id is None:
         party_analysis_id = str(uuid4())
+    set_analysis_id(party_analysis_id)
 
     # Job analyses
     creation_ts = datetime.now()
     for a in range(len(job_rotation_pdf_list)):
         # Write RotationTable
-        with open(
-            BLOB_URI / f"rotation-object-{player_analysis_ids[a]}.pkl", "wb"
-        ) as f:
+        with (
+            stage("blob_writes"),
+            open(BLOB_URI / f"rotation-object-{player_analysis_ids[a]}.pkl", "wb") as f,
+        ):
             pickle.dump(job_rotation_analyses_list[a], f)
 
         # Convert job analysis to data class
@@ -1280,9 +1303,12 @@ def analyze_party_rotation(
         )
 
         # Write data class
-        with open(
-            BLOB_URI / f"job-analysis-data-{player_analysis_ids[a]}.pkl", "wb"
-        ) as f:
+        with (
+            stage("blob_writes"),
+            open(
+                BLOB_URI / f"job-analysis-data-{player_analysis_ids[a]}.pkl", "wb"
+            ) as f,
+        ):
             pickle.dump(job_analysis_data, f)
 
         # Update report table
@@ -1293,9 +1319,13 @@ def analyze_party_rotation(
         pass
 
     # Write party analysis to disk
-    with open(
-        BLOB_URI / "party-analyses" / f"party-analysis-{party_analysis_id}.pkl", "wb"
-    ) as f:
+    with (
+        stage("blob_writes"),
+        open(
+            BLOB_URI / "party-analyses" / f"party-analysis-{party_analysis_id}.pkl",
+            "wb",
+        ) as f,
+    ):
         pickle.dump(party_rotation, f)
 
     # Update party report table
@@ -1340,6 +1370,32 @@ def analyze_party_rotation(
     return updated_url, [], analysis_history
 
 
+def _limit_break_damage(
+    report_id: str, fight_id: int, lb_player_id: Optional[int], fight_phase: int
+) -> Tuple[pd.DataFrame, float, str]:
+    """Get limit break damage events and total damage for a fight.
+
+    Args:
+        report_id: FFLogs report ID
+        fight_id: Fight ID within the report
+        lb_player_id: Actor ID of the limit break "player", None if LB wasn't used
+        fight_phase: Phase of the fight, 0 for the whole fight
+
+    Returns:
+        Tuple of LB damage events, total LB damage, and an error message
+    """
+    # Check if LB was used, get its ID if it was
+    if lb_player_id is None:
+        return pd.DataFrame(columns=["timestamp"]), 0, ""
+
+    lb_damage_events_df, error_message = limit_break_damage_events(
+        report_id, fight_id, lb_player_id, fight_phase
+    )
+    if error_message != "":
+        return lb_damage_events_df, 0, error_message
+    return lb_damage_events_df, lb_damage_events_df["amount"].sum(), error_message
+
+
 def player_analysis_loop(
     report_id: str,
     fight_id: int,
@@ -1381,6 +1437,7 @@ def player_analysis_loop(
     This function:
       1. Retrieves or creates a unique analysis ID for each player.
       2. Builds a rotation analysis DataFrame and PDF for each job in the fight.
+         Damage events for the whole party are fetched once and shared.
       3. Saves the rotation data and associated PDFs into lists and dictionaries
          for future reference.
       4. Catches exceptions to gather and return error information if the analysis fails.
@@ -1434,6 +1491,13 @@ def player_analysis_loop(
     job_rotation_pdf_list = []
     job_db_rows = []
 
+    # Fetch the whole party's damage events once instead of once per player
+    party_events = PartyDamageEvents(report_id, fight_id)
+    # Fight-level fields saved by the encounter lookup, shared by every player
+    fight_metadata = load_fight_metadata(
+        BLOB_URI / "fight-metadata", report_id, fight_id
+    )
+
     try:
         a = 0
         for a in range(len(job)):
@@ -1463,31 +1527,55 @@ def player_analysis_loop(
             )
             job_build_id, build_provider = parse_build_uuid(job_build_url[a], 0)
 
-            job_rotation_analyses_list.append(
-                RotationTable(
-                    headers,
-                    report_id,
-                    fight_id,
-                    full_job,
-                    player_id[a],
-                    crit[a],
-                    dh[a],
-                    determination[a],
-                    main_stat_no_buff[a],
-                    weapon_damage[a],
-                    level,
+            build_rotation = partial(
+                RotationTable,
+                headers=headers,
+                report_id=report_id,
+                fight_id=fight_id,
+                job=full_job,
+                player_id=player_id[a],
+                crit_stat=crit[a],
+                dh_stat=dh[a],
+                determination=determination[a],
+                main_stat=main_stat_no_buff[a],
+                weapon_damage=weapon_damage[a],
+                level=level,
+                damage_buff_table=damage_buff_table,
+                critical_hit_rate_buff_table=critical_hit_rate_table,
+                direct_hit_rate_buff_table=direct_hit_rate_table,
+                guaranteed_hits_by_action_table=guaranteed_hits_by_action_table,
+                guaranteed_hits_by_buff_table=guaranteed_hits_by_buff_table,
+                potency_table=potency_table,
+                encounter_phases=encounter_phases,
+                pet_ids=pet_id_map[player_id[a]],
+                tenacity=secondary_stat_buff,
+                party_events=party_events,
+                fight_metadata=fight_metadata,
+            )
+            # Every phase of the pull is built at once, so other phases are instant.
+            if encounter_id in encounter_phases:
+                rotation = phase_rotation_table(
+                    phase_rotation_key(
+                        report_id,
+                        fight_id,
+                        player_id[a],
+                        full_job,
+                        crit[a],
+                        dh[a],
+                        determination[a],
+                        main_stat_no_buff[a],
+                        weapon_damage[a],
+                        level,
+                        secondary_stat_buff,
+                        pet_id_map[player_id[a]],
+                        None,
+                    ),
                     fight_phase,
-                    damage_buff_table,
-                    critical_hit_rate_table,
-                    direct_hit_rate_table,
-                    guaranteed_hits_by_action_table,
-                    guaranteed_hits_by_buff_table,
-                    potency_table,
-                    encounter_phases=encounter_phases,
-                    pet_ids=pet_id_map[player_id[a]],
-                    tenacity=secondary_stat_buff,
+                    build_rotation,
                 )
-            )
+            else:
+                rotation = build_rotation(phase=fight_phase)
+            job_rotation_analyses_list.append(rotation)
 
             job_rotation_pdf_list.append(
                 rotation_analysis(
@@ -1625,8 +1713,6 @@ def create_rotation_clippings(
         job_rotation_clipping_pdf_list = {t: [] for t in t_clips}
         job_rotation_clipping_analyses = {t: [] for t in t_clips}
         for a in range(len(job)):
-            clipped_rotations = []
-
             full_job = reverse_abbreviated_role_map[job[a]]
             role = role_mapping[full_job]
             delay = weapon_delays[job[a].upper()]
@@ -1647,21 +1733,15 @@ def create_rotation_clippings(
                 None if secondary_stat_buff == "None" else secondary_stat_buff
             )
 
+            actions_df = job_rotation_analyses_list[a].actions_df
+            if role in ("Healer", "Magical Ranged"):
+                actions_df = actions_df[actions_df["ability_name"] != "attack"]
+
+            # All clippings are built together from one pass over the actions.
+            clipped_rotations = job_rotation_analyses_list[a].make_clipped_rotation_dfs(
+                actions_df, [t + t_clip_offset for t in t_clips]
+            )
             for idx, t in enumerate(t_clips):
-                # t += t_clip_offset
-                # print(t)
-                # FIXME: can remove
-                actions_df = job_rotation_analyses_list[a].actions_df
-                if role in ("Healer", "Magical Ranged"):
-                    actions_df = actions_df[actions_df["ability_name"] != "attack"]
-
-                clipped_rotations.append(
-                    job_rotation_analyses_list[a].make_rotation_df(
-                        actions_df,
-                        t_end_clip=t + t_clip_offset,
-                        return_clipped=True,
-                    )
-                )
                 if clipped_rotations[idx] is not None:
                     # Compute mean via MGFs because it is cheap to compute
                     # and will be exact. We need the mean later when we unconvolve
@@ -1770,20 +1850,25 @@ def party_analysis_portion(
     """
     rotation_dmg_step = LEVEL_STEP_MAP[level]["rotation_dmg_step"]
 
-    rotation_pdf, rotation_supp = rotation_dps_pdf(job_rotation_pdf_list, lb_damage)
+    with stage("party_rotation_dps_pdf"):
+        rotation_pdf, rotation_supp = rotation_dps_pdf(job_rotation_pdf_list, lb_damage)
 
     if perform_kill_time_analysis:
-        truncated_party_distribution, party_distribution_clipping = kill_time_analysis(
-            job_rotation_analyses_list,
-            job_rotation_pdf_list,
-            lb_damage_events_df,
-            job_rotation_clipping_analyses,
-            job_rotation_clipping_pdf_list,
-            rotation_pdf,
-            rotation_supp,
-            t_clips,
-            rotation_dmg_step,
-        )
+        with stage("kill_time_analysis") as kill_time_stage:
+            truncated_party_distribution, party_distribution_clipping = (
+                kill_time_analysis(
+                    job_rotation_analyses_list,
+                    job_rotation_pdf_list,
+                    lb_damage_events_df,
+                    job_rotation_clipping_analyses,
+                    job_rotation_clipping_pdf_list,
+                    rotation_pdf,
+                    rotation_supp,
+                    t_clips,
+                    rotation_dmg_step,
+                )
+            )
+            kill_time_stage.rows = len(t_clips)
     else:
         truncated_party_distribution = {
             t: {"pdf": [1, 0], "support": [1, 0]} for t in t_clips
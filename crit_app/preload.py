@@ -0,0 +1,33 @@
+"""Warm the modules and caches analyses use, before gunicorn forks its workers.
+
+Heavy dependencies (ffxiv_stats, scipy, the job modules, figure code) are imported
+lazily so that importing the app stays fast. Under gunicorn with `preload_app`,
+`deploy/gunicorn.conf.py` calls `preload` once in the master process instead, so
+every worker starts with them already imported and shares their memory with the
+master copy-on-write.
+"""
+
+import importlib
+
+# Modules analyses import lazily.
+PRELOAD_MODULES = (
+    "ffxiv_stats",
+    "ffxiv_stats.jobs",
+    "ffxiv_stats.moments",
+    "scipy.signal",
+    "scipy.stats",
+    "coreapi",
+    "crit_app.figures",
+    "crit_app.pages.math",
+    "fflogs_rotation.job_data.data",
+)
+
+
+def preload() -> None:
+    """Import lazily imported modules and job classes."""
+    from fflogs_rotation.actions import JOB_CLASSES
+
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+    # Resolving each class imports its job module.
+    list(JOB_CLASSES.values())
@@ -1,12 +1,16 @@
-from typing import Any, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from ffxiv_stats.jobs import Healer, MagicalRanged, Melee, PhysicalRanged, Tank
 
 from crit_app.job_data.encounter_data import encounter_phases
 from crit_app.job_data.job_data import caster_healer_strength
 from crit_app.job_data.roles import role_stat_dict
+from crit_app.util.analysis_cache import get_job_analysis_store, rotation_fingerprint
+from fflogs_rotation.profiling import stage
+
+if TYPE_CHECKING:
+    from ffxiv_stats.jobs import Healer, MagicalRanged, Melee, PhysicalRanged, Tank
 
 
 def validate_main_stat(
@@ -364,7 +368,7 @@ def check_prior_party_analysis(
 
     all_job_analyses_match = (
         (~party_analysis_ids[party_analysis_ids.isin(job_analysis_id_list)].isna())[
-            [f"analysis_id_{x+1}" for x in range(len(job_analysis_id_list))]
+            [f"analysis_id_{x + 1}" for x in range(len(job_analysis_id_list))]
         ]
         .all(axis=1)
         .iloc[0]
@@ -379,11 +383,9 @@ def check_prior_party_analysis(
         return None, 1
 
 
-def rotation_analysis(
+def job_object(
     role: str,
     job_no_space: str,
-    rotation_df: pd.DataFrame,
-    t: float,
     main_stat: int,
     secondary_stat: int,
     determination: int,
@@ -393,21 +395,14 @@ def rotation_analysis(
     wd: int,
     delay: float,
     main_stat_pre_bonus: int,
-    rotation_delta: int = 100,
-    rotation_step: float = 0.5,
-    action_delta: int = 10,
-    compute_mgf: bool = False,
     level: int = 100,
-    test_error_log=False,
-) -> Union[Healer, Tank, MagicalRanged, Melee, PhysicalRanged]:
+) -> Union["Healer", "Tank", "MagicalRanged", "Melee", "PhysicalRanged"]:
     """
-    Analyze job rotation and compute DPS distributions.
+    Create the `ffxiv_stats` job object of a role, without a rotation attached.
 
     Args:
         role: Job role (Healer/Tank/etc)
         job_no_space: Pascal case job name
-        rotation_df: Rotation data frame
-        t: Fight duration in seconds
         main_stat: Main stat value
         secondary_stat: Secondary stat value
         determination: Determination stat
@@ -417,28 +412,18 @@ def rotation_analysis(
         wd: Weapon damage
         delay: Weapon delay
         main_stat_pre_bonus: Pre-bonus main stat for pets
-        rotation_delta: Rotation delta value
-        rotation_step: Rotation step size
-        action_delta: Action delta value
-        compute_mgf: Whether to compute MGF
         level: Character level
 
     Returns:
-        Job object containing analyzed rotation and DPS distributions
+        Job object of the role
 
     Raises:
-        ValueError: If role invalid or NaN in DPS distribution
-
-    Example:
-        >>> df = pd.DataFrame(...)  # Rotation data
-        >>> job = rotation_analysis(
-        ...     "Healer", "WhiteMage", df,
-        ...     t=360, main_stat=3000, ...
-        ... )
+        ValueError: If role invalid
     """
+    from ffxiv_stats.jobs import Healer, MagicalRanged, Melee, PhysicalRanged, Tank
 
     if role == "Healer":
-        job_obj = Healer(
+        return Healer(
             mind=main_stat,
             strength=secondary_stat,
             det=determination,
@@ -452,7 +437,7 @@ def rotation_analysis(
         )
 
     elif role == "Tank":
-        job_obj = Tank(
+        return Tank(
             strength=main_stat,
             det=determination,
             skill_speed=speed_stat,
@@ -467,7 +452,7 @@ def rotation_analysis(
         )
 
     elif role == "Magical Ranged":
-        job_obj = MagicalRanged(
+        return MagicalRanged(
             intelligence=main_stat,
             strength=secondary_stat,
             det=determination,
@@ -481,7 +466,7 @@ def rotation_analysis(
         )
 
     elif role == "Melee":
-        job_obj = Melee(
+        return Melee(
             main_stat=main_stat,
             det=determination,
             skill_speed=speed_stat,
@@ -495,7 +480,7 @@ def rotation_analysis(
         )
 
     elif role == "Physical Ranged":
-        job_obj = PhysicalRanged(
+        return PhysicalRanged(
             dexterity=main_stat,
             det=determination,
             skill_speed=speed_stat,
@@ -509,20 +494,128 @@ def rotation_analysis(
     else:
         raise ValueError("Incorrect role specified.")
 
-    job_obj.attach_rotation(
-        rotation_df,
-        t,
-        rotation_delta=rotation_delta,
-        rotation_pdf_step=rotation_step,
-        action_delta=action_delta,
-        purge_action_moments=True,
-        compute_mgf=compute_mgf,
+
+def rotation_analysis(
+    role: str,
+    job_no_space: str,
+    rotation_df: pd.DataFrame,
+    t: float,
+    main_stat: int,
+    secondary_stat: int,
+    determination: int,
+    speed_stat: int,
+    ch: int,
+    dh: int,
+    wd: int,
+    delay: float,
+    main_stat_pre_bonus: int,
+    rotation_delta: int = 100,
+    rotation_step: float = 0.5,
+    action_delta: int = 10,
+    compute_mgf: bool = False,
+    level: int = 100,
+    test_error_log=False,
+) -> Union["Healer", "Tank", "MagicalRanged", "Melee", "PhysicalRanged"]:
+    """
+    Analyze job rotation and compute DPS distributions.
+
+    If a job analysis store is set, an identical rotation analyzed with the same
+    inputs is reused instead of computed, see `crit_app.util.analysis_cache`.
+    Otherwise, if an action distribution cache is set, only actions which weren't
+    seen before are convolved, see `crit_app.util.action_distribution_cache`.
+
+    Args:
+        role: Job role (Healer/Tank/etc)
+        job_no_space: Pascal case job name
+        rotation_df: Rotation data frame
+        t: Fight duration in seconds
+        main_stat: Main stat value
+        secondary_stat: Secondary stat value
+        determination: Determination stat
+        speed_stat: Skill/spell speed stat
+        ch: Critical hit stat
+        dh: Direct hit stat
+        wd: Weapon damage
+        delay: Weapon delay
+        main_stat_pre_bonus: Pre-bonus main stat for pets
+        rotation_delta: Rotation delta value
+        rotation_step: Rotation step size
+        action_delta: Action delta value
+        compute_mgf: Whether to compute MGF
+        level: Character level
+
+    Returns:
+        Job object containing analyzed rotation and DPS distributions
+
+    Raises:
+        ValueError: If role invalid or NaN in DPS distribution
+
+    Example:
+        >>> df = pd.DataFrame(...)  # Rotation data
+        >>> job = rotation_analysis(
+        ...     "Healer", "WhiteMage", df,
+        ...     t=360, main_stat=3000, ...
+        ... )
+    """
+    store = get_job_analysis_store()
+    if store.enabled:
+        fingerprint = rotation_fingerprint(
+            rotation_df,
+            role=role,
+            job=job_no_space,
+            t=t,
+            main_stat=main_stat,
+            secondary_stat=secondary_stat,
+            determination=determination,
+            speed_stat=speed_stat,
+            ch=ch,
+            dh=dh,
+            wd=wd,
+            delay=delay,
+            main_stat_pre_bonus=main_stat_pre_bonus,
+            rotation_delta=rotation_delta,
+            rotation_step=rotation_step,
+            action_delta=action_delta,
+            compute_mgf=compute_mgf,
+            level=level,
+        )
+        job_obj = store.get(fingerprint)
+        if (job_obj is not None) and (not test_error_log):
+            return job_obj
+
+    job_obj = job_object(
+        role,
+        job_no_space,
+        main_stat,
+        secondary_stat,
+        determination,
+        speed_stat,
+        ch,
+        dh,
+        wd,
+        delay,
+        main_stat_pre_bonus,
+        level,
     )
 
+    with stage("rotation_analysis", job_no_space) as analysis_stage:
+        job_obj.attach_rotation(
+            rotation_df,
+            t,
+            rotation_delta=rotation_delta,
+            rotation_pdf_step=rotation_step,
+            action_delta=action_delta,
+            purge_action_moments=True,
+            compute_mgf=compute_mgf,
+        )
+        analysis_stage.rows = len(rotation_df)
+
     # Check if any NaN values are in the DPS distribution
     for k, v in job_obj.unique_actions_distribution.items():
         if np.isnan(v["dps_distribution"].sum()):
             raise ValueError(f"NaN values encountered in DPS distribution for {k}")
+    if store.enabled:
+        store.set(fingerprint, job_obj)
     if test_error_log:
         raise ValueError("Raise test error.")
     return job_obj
@@ -0,0 +1,251 @@
+"""Reuse the damage distributions of actions across analyses.
+
+`ffxiv_stats` convolves the one-hit damage distribution of every action row
+`n` times and computes its moments, from scratch on every analysis. The same
+actions recur constantly across players of the same tier, so the damage
+distribution of an action row is cached by its content: base damage `d2` (which
+already folds in potency, stats and medication), crit multiplier, buffs, hit type
+probabilities, number of hits, discretization and the `ffxiv_stats` version.
+
+Damage distributions don't depend on the elapsed time `t`, so one cached action is
+reused by analyses of any duration; only the cheap conversion to DPS is redone.
+
+Only the damage support and distribution of an action are cached. `ActionMoments`
+computes everything else itself, with the convolution replaced by the cached
+arrays, so nothing from another row or elapsed time carries over.
+
+The cache has two tiers, an in-memory least-recently-used tier per worker in front
+of an optional disk tier shared by all workers. It is process-wide and set with
+`set_action_distribution_cache`, which also makes `ffxiv_stats.moments.Rotation`
+build its actions with `cached_action_moments`, until caching is disabled again.
+The default cache is a no-op, so nothing is reused unless the app opts in.
+`ffxiv_stats` is only imported once caching is enabled.
+"""
+
+import functools
+import hashlib
+import json
+import pickle
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from importlib.metadata import version
+from pathlib import Path
+
+import diskcache
+import numpy as np
+import pandas as pd
+
+# Looked up once, reading package metadata doesn't import ffxiv_stats.
+_FFXIV_STATS_VERSION = version("ffxiv_stats")
+
+# Fields of an action row which its damage distribution depends on.
+ACTION_KEY_FIELDS = ["n", "p_n", "p_c", "p_d", "p_cd", "d2", "l_c", "buffs", "is_dot"]
+
+# `ActionMoments` arrays which don't depend on the elapsed time, the only ones cached.
+CACHED_ARRAYS = ("damage_support", "damage_distribution")
+
+
+def _json_default(value):
+    """Serialize numpy scalars and arrays like their Python counterparts."""
+    return np.asarray(value).tolist()
+
+
+def action_distribution_key(
+    action_row: pd.Series, action_delta: int, compute_mgf: bool
+) -> str:
+    """Create a stable content hash of an action row's damage distribution.
+
+    Args:
+        action_row (pd.Series): Row of a rotation DataFrame, with `d2` and `is_dot`
+            attached by `ffxiv_stats`.
+        action_delta (int): Damage discretization step.
+        compute_mgf (bool): Whether moments are computed from the MGF.
+
+    Returns:
+        str: Hex digest identifying the damage distribution.
+    """
+    payload = json.dumps(
+        {
+            "ffxiv_stats": _FFXIV_STATS_VERSION,
+            "action_delta": action_delta,
+            "compute_mgf": compute_mgf,
+            **{f: action_row.get(f) for f in ACTION_KEY_FIELDS},
+        },
+        sort_keys=True,
+        default=_json_default,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ActionDistributionCache:
+    """No-op action distribution cache, every lookup is a miss."""
+
+    enabled = False
+
+    def get(self, key: str) -> dict | None:
+        return None
+
+    def set(self, key: str, state: dict) -> None:
+        pass
+
+
+class TieredActionDistributionCache(ActionDistributionCache):
+    """Least-recently-used memory tier in front of an optional disk tier.
+
+    Entries are stored pickled, so every lookup returns fresh arrays which
+    `ffxiv_stats` is free to modify in place. Disk hits are promoted to memory.
+    """
+
+    enabled = True
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        memory_limit: int = 2**28,
+        size_limit: int = 2**30,
+        ttl: float = 30 * 24 * 3600,
+    ) -> None:
+        """Create the memory tier and open (or create) the disk tier.
+
+        Args:
+            directory (str | Path | None, optional): Disk tier directory, `None` for
+                memory only. Defaults to None.
+            memory_limit (int, optional): Maximum memory tier size in bytes.
+                Defaults to 256 MiB.
+            size_limit (int, optional): Maximum disk tier size in bytes. Defaults to
+                1 GiB.
+            ttl (float, optional): Seconds to keep an action on disk. Defaults to
+                30 days.
+        """
+        self.memory: OrderedDict[str, bytes] = OrderedDict()
+        self.memory_limit = memory_limit
+        self.memory_size = 0
+        self._lock = threading.Lock()
+
+        self.cache = (
+            None
+            if directory is None
+            else diskcache.Cache(
+                str(directory),
+                size_limit=size_limit,
+                eviction_policy="least-recently-used",
+            )
+        )
+        self.ttl = ttl
+
+    def _remember(self, key: str, payload: bytes) -> None:
+        """Add an entry to the memory tier, evicting the least recently used."""
+        if len(payload) > self.memory_limit:
+            return
+        with self._lock:
+            if key in self.memory:
+                self.memory_size -= len(self.memory.pop(key))
+            self.memory[key] = payload
+            self.memory_size += len(payload)
+            while self.memory_size > self.memory_limit:
+                _, evicted = self.memory.popitem(last=False)
+                self.memory_size -= len(evicted)
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            payload = self.memory.get(key)
+            if payload is not None:
+                self.memory.move_to_end(key)
+
+        if (payload is None) and (self.cache is not None):
+            payload = self.cache.get(key)
+            if payload is not None:
+                self._remember(key, payload)
+
+        return None if payload is None else pickle.loads(payload)
+
+    def set(self, key: str, state: dict) -> None:
+        payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, payload)
+        if self.cache is not None:
+            self.cache.set(key, payload, expire=self.ttl)
+
+
+@functools.cache
+def cached_action_moments(action_moments: type) -> Callable[..., object]:
+    """Factory of `ffxiv_stats`' `ActionMoments` which reuses cached distributions.
+
+    `Rotation` builds one `ActionMoments` per action row by calling
+    `ffxiv_stats.moments.ActionMoments`, which is this factory while caching is
+    enabled. It is built when caching is first enabled, so `ffxiv_stats` isn't
+    imported before.
+
+    Args:
+        action_moments (type): The original `ActionMoments` class.
+
+    Returns:
+        Callable[..., object]: Builds `action_moments` instances, with the same
+            arguments as the class.
+    """
+
+    def build(
+        action_df, t, action_delta=10, compute_mgf=True, moments_only=False
+    ) -> object:
+        """Build an action, convolving its damage distribution only on a miss."""
+        cache = get_action_distribution_cache()
+        if (not cache.enabled) or moments_only:
+            return action_moments(action_df, t, action_delta, compute_mgf, moments_only)
+
+        key = action_distribution_key(action_df, action_delta, compute_mgf)
+        state = cache.get(key)
+        if state is None:
+            action = action_moments(
+                action_df, t, action_delta, compute_mgf, moments_only
+            )
+            cache.set(key, {name: getattr(action, name) for name in CACHED_ARRAYS})
+            return action
+
+        # `ActionMoments.__init__` computes everything but the convolution, which
+        # is shadowed by the cached arrays while it runs.
+        action = action_moments.__new__(action_moments)
+        action.compute_dps_distribution = lambda: tuple(
+            state[name] for name in CACHED_ARRAYS
+        )
+        try:
+            action_moments.__init__(
+                action, action_df, t, action_delta, compute_mgf, moments_only
+            )
+        finally:
+            del action.compute_dps_distribution
+        return action
+
+    return build
+
+
+_action_distribution_cache: ActionDistributionCache = ActionDistributionCache()
+# `ffxiv_stats.moments.ActionMoments` replaced while caching is enabled.
+_original_action_moments: type | None = None
+
+
+def set_action_distribution_cache(cache: ActionDistributionCache | None) -> None:
+    """Set the process-wide action distribution cache, `None` disables caching.
+
+    `ffxiv_stats` has no hook for building actions, `Rotation` looks up
+    `ffxiv_stats.moments.ActionMoments` for each action row. While caching is
+    enabled, that name is bound to `cached_action_moments`, which still builds
+    `ActionMoments` instances. Disabling caching restores the original class.
+    """
+    global _action_distribution_cache, _original_action_moments
+    _action_distribution_cache = ActionDistributionCache() if cache is None else cache
+
+    if (cache is not None) and (_original_action_moments is None):
+        from ffxiv_stats import moments
+
+        _original_action_moments = moments.ActionMoments
+        moments.ActionMoments = cached_action_moments(_original_action_moments)
+    elif (cache is None) and (_original_action_moments is not None):
+        from ffxiv_stats import moments
+
+        moments.ActionMoments = _original_action_moments
+        _original_action_moments = None
+
+
+def get_action_distribution_cache() -> ActionDistributionCache:
+    """Get the process-wide action distribution cache."""
+    return _action_distribution_cache
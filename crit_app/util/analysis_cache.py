@@ -0,0 +1,133 @@
+"""Reuse the job analyses of identical rotations.
+
+Many analyses have the same rotation and stats as an earlier one, like the same
+player resubmitted with a different build URL, or the same phase reached across
+pulls. `rotation_fingerprint` hashes the rotation DataFrame columns the damage
+distributions depend on, along with the stats and settings of the analysis.
+`rotation_analysis` stores its job analyses by fingerprint, so identical rotations
+reuse an existing job analysis instead of convolving the damage distributions again.
+
+The store is process-wide and set with `set_job_analysis_store`. The default store
+is a no-op, so nothing is reused unless the app opts in.
+"""
+
+import hashlib
+import json
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+import diskcache
+import pandas as pd
+
+# Looked up once, reading package metadata doesn't import ffxiv_stats.
+_FFXIV_STATS_VERSION = version("ffxiv_stats")
+
+# Columns of `rotation_df` which the damage distributions depend on.
+DISTRIBUTION_COLUMNS = [
+    "action_name",
+    "base_action",
+    "n",
+    "p_n",
+    "p_c",
+    "p_d",
+    "p_cd",
+    "buffs",
+    "l_c",
+    "main_stat_add",
+    "potency",
+    "damage_type",
+]
+
+
+def rotation_fingerprint(rotation_df: pd.DataFrame, **inputs) -> str:
+    """Create a stable content hash of a rotation and the inputs of its analysis.
+
+    Rows are hashed in a canonical order, since reordering them doesn't change the
+    damage distributions. The `ffxiv_stats` version is included, so analyses
+    are recomputed when the damage model changes.
+
+    Args:
+        rotation_df (pd.DataFrame): Rotation DataFrame, from `RotationTable`.
+        **inputs: Stats and settings of the analysis, like `main_stat`, `t` and
+            `action_delta`.
+
+    Returns:
+        str: Hex digest identifying the analysis.
+    """
+    rotation = rotation_df[DISTRIBUTION_COLUMNS].sort_values(
+        DISTRIBUTION_COLUMNS, ignore_index=True
+    )
+    row_hashes = pd.util.hash_pandas_object(rotation, index=False).to_numpy()
+
+    digest = hashlib.sha256(row_hashes.tobytes())
+    digest.update(
+        json.dumps(
+            {"ffxiv_stats": _FFXIV_STATS_VERSION, **inputs},
+            sort_keys=True,
+            default=str,
+        ).encode()
+    )
+    return digest.hexdigest()
+
+
+class JobAnalysisStore:
+    """No-op job analysis store, every lookup is a miss."""
+
+    enabled = False
+
+    def get(self, fingerprint: str) -> Any | None:
+        return None
+
+    def set(self, fingerprint: str, job_analysis: Any) -> None:
+        pass
+
+
+class DiskJobAnalysisStore(JobAnalysisStore):
+    """Size-bounded, least-recently-used disk store of job analyses.
+
+    The store is shared by all workers. Job analyses only depend on their
+    fingerprint, so they're kept until evicted or `ttl` seconds have passed.
+    """
+
+    enabled = True
+
+    def __init__(
+        self,
+        directory: str | Path,
+        size_limit: int = 2**30,
+        ttl: float = 30 * 24 * 3600,
+    ) -> None:
+        """Open (or create) the disk store.
+
+        Args:
+            directory (str | Path): Store directory.
+            size_limit (int, optional): Maximum store size in bytes. Defaults to 1 GiB.
+            ttl (float, optional): Seconds to keep a job analysis. Defaults to 30 days.
+        """
+        self.cache = diskcache.Cache(
+            str(directory),
+            size_limit=size_limit,
+            eviction_policy="least-recently-used",
+        )
+        self.ttl = ttl
+
+    def get(self, fingerprint: str) -> Any | None:
+        return self.cache.get(fingerprint)
+
+    def set(self, fingerprint: str, job_analysis: Any) -> None:
+        self.cache.set(fingerprint, job_analysis, expire=self.ttl)
+
+
+_job_analysis_store: JobAnalysisStore = JobAnalysisStore()
+
+
+def set_job_analysis_store(store: JobAnalysisStore | None) -> None:
+    """Set the process-wide job analysis store, `None` disables reuse."""
+    global _job_analysis_store
+    _job_analysis_store = JobAnalysisStore() if store is None else store
+
+
+def get_job_analysis_store() -> JobAnalysisStore:
+    """Get the process-wide job analysis store."""
+    return _job_analysis_store
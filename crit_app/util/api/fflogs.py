@@ -1,13 +1,19 @@
 import json
+import logging
 from typing import Any
 from urllib.parse import parse_qs, urlparse
 
 import pandas as pd
-import requests
 
-from crit_app.config import FFLOGS_TOKEN
+from crit_app.config import BLOB_URI, FFLOGS_TOKEN
 from crit_app.job_data.encounter_data import excluded_enemy_game_ids
 from crit_app.job_data.roles import role_mapping
+from fflogs_rotation.fight_metadata import FightMetadata, save_fight_metadata
+from fflogs_rotation.http_session import get_session
+from fflogs_rotation.rate_limit import estimate_query_cost, get_rate_limiter
+from fflogs_rotation.single_flight import get_single_flight
+
+logger = logging.getLogger(__name__)
 
 # API config
 url = "https://www.fflogs.com/api/v2/client"
@@ -144,6 +150,34 @@ def _encounter_query_fight_id_exists(response_dict: dict) -> bool:
         return False
 
 
+def _post_graphql_query(
+    json_payload: dict[str, Any], headers: dict[str, str] = headers
+) -> dict:
+    """Send a GraphQL query to FFLogs, returning the response JSON.
+
+    Waits for the FFLogs rate limiter, and identical queries already in flight in
+    any worker are coalesced instead of being sent again.
+
+    Raises:
+        requests.HTTPError: If FFLogs responds with an error status.
+    """
+
+    def fetch() -> dict:
+        get_rate_limiter().acquire(
+            headers, cost=estimate_query_cost(json_payload["query"])
+        )
+        r = get_session().post(url=url, json=json_payload, headers=headers)
+        r.raise_for_status()
+        return r.json()
+
+    return get_single_flight().run(
+        json_payload["operationName"],
+        json_payload["query"],
+        json_payload["variables"],
+        fetch,
+    )
+
+
 def _query_last_fight_id(report_id: str) -> tuple[int, str]:
     """
     Find the numerical Fight ID when fight=last is passed in.
@@ -173,13 +207,11 @@ def _query_last_fight_id(report_id: str) -> tuple[int, str]:
         "variables": variables,
         "operationName": "LastFightID",
     }
-    r = requests.post(url=url, json=json_payload, headers=headers)
     try:
-        r.raise_for_status()
+        response = _post_graphql_query(json_payload, headers)
     except Exception as e:
         return 0, str(e)
 
-    response = r.json()
     query_errors = _encounter_query_error_messages(response)
 
     if query_errors != "":
@@ -205,6 +237,9 @@ def _query_encounter_info(
             reportData {
                 report(code: $code) {
                     startTime
+                    region {
+                        compactName
+                    }
                     rankings(fightIDs: $id)
                     fights(fightIDs: $id, translate: true) {
                         encounterID
@@ -213,6 +248,9 @@ def _query_encounter_info(
                         endTime,
                         name,
                         lastPhase
+                        hasEcho
+                        difficulty
+                        phaseTransitions { id startTime }
                         enemyNPCs{
                             gameID,
                             id
@@ -227,9 +265,7 @@ def _query_encounter_info(
         "variables": variables,
         "operationName": "EncounterInfo",
     }
-    r = requests.post(url=url, json=json_payload, headers=headers)
-    r.raise_for_status()
-    response_dict = r.json()
+    response_dict = _post_graphql_query(json_payload, headers)
 
     # Check report isn't private or gives some error message
     # While still status 200
@@ -465,6 +501,20 @@ def encounter_information(
     )
     fight_time = _encounter_duration(r)
 
+    # Player analyses of this fight reuse the fight-level fields instead of
+    # querying them again. Failing to save only costs those analyses a query.
+    try:
+        save_fight_metadata(
+            BLOB_URI / "fight-metadata",
+            FightMetadata.from_report(
+                report_id, fight_id, r["data"]["reportData"]["report"]
+            ),
+        )
+    except OSError:
+        logger.exception(
+            "Couldn't save the fight metadata of %s fight %s", report_id, fight_id
+        )
+
     return (
         error_message,
         fight_id,
@@ -522,14 +572,11 @@ def _query_lb_events(
         "variables": variables,
         "operationName": "LimitBreakDamage",
     }
-    r = requests.post(url=url, json=json_payload, headers=headers)
-
     try:
-        r.raise_for_status()
+        r = _post_graphql_query(json_payload, headers)
 
     except Exception as e:
         return [], None, str(e)
-    r = r.json()
 
     start_time = r["data"]["reportData"]["report"]["startTime"]
     lb_data = r["data"]["reportData"]["report"]["events"]["data"]
@@ -2,10 +2,10 @@ from typing import Any, Optional, Union
 from urllib.parse import parse_qs, urlparse
 from uuid import UUID
 
-import coreapi
-import requests
 from dash import html
 
+from fflogs_rotation.http_session import get_session
+
 ETRO_JOB_STATS = {
     "WHM": ("Healer", "MND", "SPS"),
     "AST": ("Healer", "MND", "SPS"),
@@ -148,8 +148,10 @@ def _query_etro_stats(gearset_id: str) -> tuple[Union[dict[str, Any], str], bool
     gearset_params = {
         "id": gearset_id,
     }
+    import coreapi
+
     try:
-        client = coreapi.Client()
+        client = coreapi.Client(session=get_session())
         schema = client.get("https://etro.gg/api/docs/")
         build_result = client.action(schema, gearset_action, params=gearset_params)
         return build_result, True
@@ -288,7 +290,7 @@ def _query_xiv_gear_sets(xiv_gearset_id: str) -> tuple[str, Optional[list[dict]]
             - List of gear sets if valid, None if invalid
     """
     request_url = f"https://api.xivgear.app/fulldata/{xiv_gearset_id}?partyBonus=0"
-    xiv_gear_request = requests.get(request_url)
+    xiv_gear_request = get_session().get(request_url)
     try:
         xiv_gear_request.raise_for_status()
     except Exception as e:
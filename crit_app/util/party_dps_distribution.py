@@ -3,9 +3,7 @@ from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
-from ffxiv_stats.moments import _coarsened_boundaries
 from numpy.typing import ArrayLike
-from scipy.signal import fftconvolve
 
 from crit_app.util.player_dps_distribution import JobAnalysis
 
@@ -147,6 +145,9 @@ def rotation_dps_pdf(rotation_pdf_list, lb_dps=0, dmg_step=20):
     Returns:
         tuple: tuple of the party's damage distribution and damage support.
     """
+    from ffxiv_stats.moments import _coarsened_boundaries
+    from scipy.signal import fftconvolve
+
     party_dps_distribution = fftconvolve(
         rotation_pdf_list[0].rotation_dps_distribution,
         rotation_pdf_list[1].rotation_dps_distribution,
@@ -194,6 +195,9 @@ def unconvovle_clipped_pdf(
     Returns:
         [array]: Tuple of numpy arrays, the truncated damage PDF and truncated damage support.
     """
+    from ffxiv_stats.moments import _coarsened_boundaries
+    from scipy.signal import fftconvolve
+
     # Subtracting pdfs, smallest support value is sum of
     # smallest positive support and largest negative support values
     lower = rotation_support[0] - clipped_support[-1]
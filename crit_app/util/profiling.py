@@ -0,0 +1,41 @@
+"""Opt-in stage timings and profiles of analysis callbacks.
+
+Stage timings are recorded for every analysis when `STAGE_TIMING_URI` is set. A
+cProfile of an analysis is saved to `PROFILE_URI` when the request carries a
+`profile_analysis=1` cookie, e.g. set from the browser console with
+
+    document.cookie = "profile_analysis=1"
+"""
+
+from functools import wraps
+from pathlib import Path
+
+import dash
+from dash.exceptions import MissingCallbackContextException
+
+from crit_app.config import PROFILE_URI
+from fflogs_rotation.profiling import record_stages
+
+PROFILE_COOKIE = "profile_analysis"
+
+
+def requested_profile_directory() -> Path | None:
+    """Directory to save the current callback's profile to, if it asked for one."""
+    if PROFILE_URI is None:
+        return None
+    try:
+        cookies = dash.callback_context.cookies
+    except MissingCallbackContextException:
+        return None
+    return Path(PROFILE_URI) if cookies.get(PROFILE_COOKIE) == "1" else None
+
+
+def record_analysis_stages(callback_fn):
+    """Record the stages of an analysis callback, see `fflogs_rotation.profiling`."""
+
+    @wraps(callback_fn)
+    def wrapper(*args, **kwargs):
+        with record_stages(requested_profile_directory()):
+            return callback_fn(*args, **kwargs)
+
+    return wrapper
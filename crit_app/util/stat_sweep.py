@@ -0,0 +1,485 @@
+"""Compare the DPS distributions of one rotation under several gearsets.
+
+Comparing builds with `rotation_analysis` re-fetches the log and convolves every
+action once per gearset, although only the stats change. `stat_sweep` evaluates
+all gearsets of one `RotationTable` together instead. The rotation counts and buff
+grouping come from the table once, `RotationTable.rotation_df_for_stats` only
+re-derives the hit type probabilities and crit multiplier of each gearset.
+
+Each DPS distribution is convolved like `ffxiv_stats.moments.Rotation`: every action
+row landing `n` hits on a grid of `action_delta` damage, then the rows of each base
+action, coarsened to a grid of `rotation_delta` damage, then all base actions. The
+grids are shared by every gearset, each spanning the damage of all of them, so every
+convolution is a single FFT batched over gearsets. Landing `n` hits raises the
+Fourier transform of one hit to the `n`th power. The mean, standard deviation and
+skewness are those of the convolved distributions.
+
+`fast_estimate` skips the convolutions. Hits of an action are independent, so the
+exact moments of a rotation follow from the moments of a single hit. Each DPS
+distribution is then the skew normal distribution with these moments, which only
+approximates the convolved distribution, so percentiles can differ slightly from
+those of `rotation_analysis`.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from numpy.typing import ArrayLike
+
+from crit_app.shared_elements import job_object
+from fflogs_rotation.rotation import RotationTable
+
+# DPS percentiles reported for every gearset.
+SWEEP_PERCENTILES = (1, 10, 25, 50, 75, 90, 99)
+
+# Skewness a skew normal distribution can reach is just under 1.
+_MAX_SKEWNESS = 0.99
+
+
+@dataclass
+class StatSweep:
+    summary: pd.DataFrame
+    dps_support: ArrayLike
+    dps_distributions: ArrayLike
+    # Whether the distributions are skew normal approximations.
+    fast_estimate: bool = False
+
+
+def _action_d2(job_obj, rotation_df: pd.DataFrame) -> np.ndarray:
+    """Base damage of each action row, like `attach_rotation` of `ffxiv_stats`.
+
+    Args:
+        job_obj: `ffxiv_stats` job object with the gearset's stats.
+        rotation_df (pd.DataFrame): Rotation DataFrame.
+
+    Returns:
+        np.ndarray: Base damage `d2` of each row.
+    """
+    from ffxiv_stats.jobs import Healer
+
+    d2 = []
+    for potency, damage_type, main_stat_add in rotation_df[
+        ["potency", "damage_type", "main_stat_add"]
+    ].itertuples(index=False):
+        if damage_type == "direct":
+            d2.append(job_obj.direct_d2(potency, ap_adjust=main_stat_add))
+        elif damage_type in ("magic-dot", "physical-dot"):
+            d2.append(
+                job_obj.dot_d2(
+                    potency,
+                    magic=damage_type == "magic-dot",
+                    ap_adjust=main_stat_add,
+                )
+            )
+        elif damage_type == "auto":
+            # Medication doesn't affect healer autos.
+            ap_adjust = 0 if isinstance(job_obj, Healer) else main_stat_add
+            d2.append(job_obj.auto_attack_d2(potency, ap_adjust=ap_adjust))
+        elif damage_type == "pet":
+            d2.append(job_obj.pet_direct_d2(potency, ap_adjust=main_stat_add))
+        else:
+            raise ValueError(f"Invalid damage type value of '{damage_type}'.")
+    return np.array(d2, dtype=float)
+
+
+def _hit_supports(job_obj, rotation_df: pd.DataFrame) -> list[tuple[np.ndarray, ...]]:
+    """Damage rolls of a single hit of each action row, for each hit type.
+
+    Hit types are in the order normal, critical, direct and critical-direct, like
+    the hit type probabilities.
+
+    Args:
+        job_obj: `ffxiv_stats` job object with the gearset's stats.
+        rotation_df (pd.DataFrame): Rotation DataFrame.
+
+    Returns:
+        list[tuple[np.ndarray, ...]]: Damage rolls of each hit type, per row.
+    """
+    from ffxiv_stats.moments import Support
+
+    d2 = _action_d2(job_obj, rotation_df)
+    is_dot = rotation_df["damage_type"].str.endswith("-dot").to_numpy()
+
+    hit_supports = []
+    for a, (l_c, buffs) in enumerate(
+        rotation_df[["l_c", "buffs"]].itertuples(index=False)
+    ):
+        support = Support(d2[a], l_c, bool(is_dot[a]), buffs)
+        hit_supports.append(
+            (
+                support.normal_supp,
+                support.crit_supp,
+                support.dir_supp,
+                support.crit_dir_supp,
+            )
+        )
+    return hit_supports
+
+
+def _one_hit_moments(
+    hit_supports: tuple[np.ndarray, ...], p: ArrayLike
+) -> tuple[float, float, float]:
+    """Mean, variance and third central moment of the damage of a single hit.
+
+    Damage is uniform over the support of each hit type, and hit types are mixed
+    by their probabilities `p`.
+    """
+    raw = np.zeros(3)
+    for p_hit, s in zip(p, hit_supports):
+        raw += p_hit * np.array([s.mean(), (s**2).mean(), (s**3).mean()])
+
+    mean = raw[0]
+    variance = raw[1] - mean**2
+    third = raw[2] - 3 * mean * raw[1] + 2 * mean**3
+    return mean, variance, third
+
+
+def _rotation_moments(
+    hit_supports: list[tuple[np.ndarray, ...]], rotation_df: pd.DataFrame, t: float
+) -> np.ndarray:
+    """DPS mean, variance and skewness of a rotation from its hits' damage rolls."""
+    p = rotation_df[["p_n", "p_c", "p_d", "p_cd"]].to_numpy()
+    action_moments = np.array(
+        [_one_hit_moments(s, p[a]) for a, s in enumerate(hit_supports)]
+    )
+    # Cumulants of independent hits add up.
+    mean, variance, third = (
+        rotation_df["n"].to_numpy() @ action_moments / np.array([t, t**2, t**3])
+    )
+    return np.array([mean, variance, third / variance**1.5])
+
+
+def rotation_moments(job_obj, rotation_df: pd.DataFrame, t: float) -> np.ndarray:
+    """Exact DPS mean, variance and skewness of a rotation, without convolving.
+
+    Args:
+        job_obj: `ffxiv_stats` job object with the gearset's stats.
+        rotation_df (pd.DataFrame): Rotation DataFrame.
+        t (float): Elapsed time in seconds.
+
+    Returns:
+        np.ndarray: DPS mean, variance and skewness.
+    """
+    return _rotation_moments(_hit_supports(job_obj, rotation_df), rotation_df, t)
+
+
+def _interp_rows(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """`np.interp` of each row of `fp`, which all share the points `xp`."""
+    if xp.size == 1:
+        return np.repeat(fp, x.size, axis=1)
+    i = np.clip(np.searchsorted(xp, x, side="right") - 1, 0, xp.size - 2)
+    w = np.clip((x - xp[i]) / (xp[i + 1] - xp[i]), 0, 1)
+    return fp[:, i] * (1 - w) + fp[:, i + 1] * w
+
+
+def _normalized(pmfs: np.ndarray) -> np.ndarray:
+    """Clip FFT round-off below 0 and scale each row to sum to 1."""
+    pmfs = np.clip(pmfs, 0, None)
+    return pmfs / pmfs.sum(axis=1, keepdims=True)
+
+
+def _n_hit_pmfs(
+    hit_supports: list[tuple[np.ndarray, ...]],
+    p: np.ndarray,
+    n: int,
+    action_delta: int,
+) -> tuple[float, np.ndarray]:
+    """Damage PMFs of an action row landing `n` hits, for every gearset.
+
+    Like `ActionMoments.compute_dps_distribution` of `ffxiv_stats`, the density of
+    each hit type of one hit is its probability over its number of rolls, from its
+    lowest to its highest roll, discretized in steps of `action_delta`. The one-hit
+    grid spans every gearset's possible hit types.
+
+    Args:
+        hit_supports (list[tuple[np.ndarray, ...]]): Damage rolls of each hit type
+            of one hit, per gearset.
+        p (np.ndarray): Hit type probabilities, shape (gearsets, 4).
+        n (int): Number of hits.
+        action_delta (int): Damage discretization step.
+
+    Returns:
+        tuple[float, np.ndarray]: Damage of the first grid point and the PMFs,
+            shape (gearsets, grid points).
+    """
+    from ffxiv_stats.moments import _coarsened_boundaries
+    from scipy.fft import irfft, next_fast_len, rfft
+
+    lowest = min(
+        s[0]
+        for g, supports in enumerate(hit_supports)
+        for h, s in enumerate(supports)
+        if p[g, h] > 0
+    )
+    highest = max(
+        s[-1]
+        for g, supports in enumerate(hit_supports)
+        for h, s in enumerate(supports)
+        if p[g, h] > 0
+    )
+    start, end = _coarsened_boundaries(
+        np.floor(lowest), np.floor(highest), action_delta
+    )
+    grid = np.arange(start, end + action_delta, action_delta)
+
+    one_hit = np.zeros((len(hit_supports), grid.size))
+    for g, supports in enumerate(hit_supports):
+        for p_hit, s in zip(p[g], supports):
+            in_support = (grid >= s[0]) & (grid <= s[-1])
+            if not in_support.any():
+                # Rolls spanning less than a step land on the nearest point.
+                in_support = np.abs(grid - s.mean()) == np.abs(grid - s.mean()).min()
+            one_hit[g, in_support] += p_hit / s.size
+
+    size = n * (grid.size - 1) + 1
+    fft_size = next_fast_len(size, real=True)
+    n_hits = irfft(rfft(one_hit, fft_size, axis=1) ** n, fft_size, axis=1)
+    return start * n, _normalized(n_hits[:, :size])
+
+
+def _convolve_rotations(
+    hit_supports: list[list[tuple[np.ndarray, ...]]],
+    rotation_dfs: list[pd.DataFrame],
+    t: float,
+    action_delta: int,
+    rotation_delta: int,
+    dps_step: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """DPS distributions of every gearset, convolved like `Rotation` of `ffxiv_stats`.
+
+    Args:
+        hit_supports (list[list[tuple[np.ndarray, ...]]]): Damage rolls of each hit
+            type of one hit, per gearset and action row.
+        rotation_dfs (list[pd.DataFrame]): Rotation DataFrame of each gearset, with
+            the same rows in the same order.
+        t (float): Elapsed time in seconds.
+        action_delta (int): Damage discretization step of action rows.
+        rotation_delta (int): Damage discretization step of base actions and the
+            rotation.
+        dps_step (float): Spacing of the DPS support.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: DPS support and the DPS distribution of each
+            gearset, shape (gearsets, support).
+    """
+    from ffxiv_stats.moments import _coarsened_boundaries
+    from scipy.signal import fftconvolve
+
+    # Counts and base actions don't depend on the stats.
+    rotation_df = rotation_dfs[0]
+    p = np.stack([r[["p_n", "p_c", "p_d", "p_cd"]].to_numpy() for r in rotation_dfs])
+    n = rotation_df["n"].to_numpy()
+    base_action_idx, base_actions = pd.factorize(rotation_df["base_action"])
+
+    rotation_start = 0.0
+    rotation_pmfs = None
+    for b in range(len(base_actions)):
+        # Rows of a base action, on a grid of `action_delta`.
+        action_start = 0.0
+        action_pmfs = None
+        for a in np.flatnonzero(base_action_idx == b):
+            start, pmfs = _n_hit_pmfs(
+                [supports[a] for supports in hit_supports],
+                p[:, a],
+                int(n[a]),
+                action_delta,
+            )
+            action_start += start
+            action_pmfs = (
+                pmfs
+                if action_pmfs is None
+                else _normalized(fftconvolve(action_pmfs, pmfs, axes=1))
+            )
+
+        # Coarsened to a grid of `rotation_delta`.
+        support = action_start + action_delta * np.arange(action_pmfs.shape[1])
+        start, end = _coarsened_boundaries(support[0], support[-1], rotation_delta)
+        coarsened_support = np.arange(start, end + rotation_delta, rotation_delta)
+        action_pmfs = _normalized(_interp_rows(coarsened_support, support, action_pmfs))
+
+        rotation_start += start
+        rotation_pmfs = (
+            action_pmfs
+            if rotation_pmfs is None
+            else _normalized(fftconvolve(rotation_pmfs, action_pmfs, axes=1))
+        )
+
+    damage_support = rotation_start + rotation_delta * np.arange(rotation_pmfs.shape[1])
+    dps_support = np.arange(
+        int(damage_support[1] / t),
+        int(damage_support[-1] / t) + dps_step,
+        dps_step,
+    )
+    dps_distributions = np.clip(
+        _interp_rows(dps_support, damage_support / t, rotation_pmfs), 0, None
+    )
+    dps_distributions /= dps_distributions.sum(axis=1, keepdims=True) * dps_step
+    return dps_support, dps_distributions
+
+
+def _skew_normal_parameters(
+    mean: ArrayLike, variance: ArrayLike, skewness: ArrayLike
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Shape, scale and location of the skew normal distribution with these moments.
+
+    Like `Rotation.moments_to_skew_norm` of `ffxiv_stats`, which needs a rotation.
+    """
+    skewness = np.clip(skewness, -_MAX_SKEWNESS, _MAX_SKEWNESS)
+    abs_skewness = np.abs(skewness) ** (2 / 3)
+    delta = np.sqrt(
+        np.pi / 2 * abs_skewness / (abs_skewness + ((4 - np.pi) / 2) ** (2 / 3))
+    )
+    alpha = np.sign(skewness) * delta / np.sqrt(1 - delta**2)
+    omega = np.sqrt(variance / (1 - 2 * delta**2 / np.pi))
+    xi = mean - omega * delta * np.sqrt(2 / np.pi)
+    return alpha, omega, xi
+
+
+def _skew_normal_distributions(
+    moments: np.ndarray, dps_step: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Skew normal DPS distributions with these moments, and their percentiles.
+
+    Args:
+        moments (np.ndarray): DPS mean, variance and skewness, shape (gearsets, 3).
+        dps_step (float): Spacing of the shared DPS support.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: DPS support, distributions of
+            shape (gearsets, support) and percentiles of shape (gearsets,
+            percentiles).
+    """
+    from scipy.stats import skewnorm
+
+    alpha, omega, xi = (x[:, None] for x in _skew_normal_parameters(*moments.T))
+    q = np.array(SWEEP_PERCENTILES) / 100
+    percentiles = skewnorm.ppf(q, alpha, xi, omega)
+
+    # One support covering the bulk of every gearset's distribution.
+    tails = skewnorm.ppf([1e-4, 1 - 1e-4], alpha, xi, omega)
+    lower, upper = np.floor(tails[:, 0].min()), np.ceil(tails[:, 1].max())
+    dps_support = np.arange(lower, upper + dps_step, dps_step)
+    return dps_support, skewnorm.pdf(dps_support, alpha, xi, omega), percentiles
+
+
+def _percentiles(dps_support: np.ndarray, dps_distributions: np.ndarray) -> np.ndarray:
+    """DPS percentiles of each distribution, like the analysis' percentile table.
+
+    Returns:
+        np.ndarray: Percentiles, shape (gearsets, percentiles).
+    """
+    dx = dps_support[1] - dps_support[0]
+    F = np.cumsum(dps_distributions, axis=1) * dx
+    q = np.array(SWEEP_PERCENTILES) / 100
+    return dps_support[np.abs(F[:, None, :] - q[None, :, None]).argmin(axis=2)]
+
+
+def _distribution_moments(
+    dps_support: np.ndarray, dps_distributions: np.ndarray
+) -> np.ndarray:
+    """DPS mean, variance and skewness of each distribution, shape (gearsets, 3)."""
+    weights = dps_distributions / dps_distributions.sum(axis=1, keepdims=True)
+    mean = weights @ dps_support
+    centered = dps_support - mean[:, None]
+    variance = (weights * centered**2).sum(axis=1)
+    third = (weights * centered**3).sum(axis=1)
+    return np.stack([mean, variance, third / variance**1.5], axis=1)
+
+
+def stat_sweep(
+    role: str,
+    job_no_space: str,
+    rotation: RotationTable,
+    t: float,
+    gearsets: Sequence[dict],
+    level: int = 100,
+    dps_step: float = 0.5,
+    action_delta: int = 10,
+    rotation_delta: int = 100,
+    fast_estimate: bool = False,
+) -> StatSweep:
+    """Compute the DPS distributions of one rotation under several gearsets.
+
+    Args:
+        role (str): Job role (Healer/Tank/etc).
+        job_no_space (str): Pascal case job name.
+        rotation (RotationTable): Rotation of the analysis, shared by every gearset.
+        t (float): Elapsed time in seconds.
+        gearsets (Sequence[dict]): Stats of each gearset, keyed like the arguments
+            of `rotation_analysis`: `main_stat`, `secondary_stat`, `determination`,
+            `speed_stat`, `ch`, `dh`, `wd`, `delay` and `main_stat_pre_bonus`. An
+            optional `name` labels the gearset.
+        level (int, optional): Character level. Defaults to 100.
+        dps_step (float, optional): Spacing of the shared DPS support. Defaults
+            to 0.5.
+        action_delta (int, optional): Damage discretization step of action rows,
+            like `rotation_analysis`. Defaults to 10.
+        rotation_delta (int, optional): Damage discretization step of base actions
+            and the rotation, like `rotation_analysis`. Defaults to 100.
+        fast_estimate (bool, optional): Approximate each DPS distribution by the
+            skew normal distribution with its moments instead of convolving.
+            Defaults to False.
+
+    Returns:
+        StatSweep: One summary row of moments and DPS percentiles per gearset,
+            with their DPS distributions on a shared support.
+
+    Example:
+        >>> sweep = stat_sweep(
+        ...     "Tank", "DarkKnight", rotation, t=360,
+        ...     gearsets=[{"name": "BiS", "main_stat": 4900, ...}, ...],
+        ... )
+        >>> sweep.summary[["name", "mean", "p50"]]
+    """
+    rotation_dfs = [rotation.rotation_df_for_stats(g["ch"], g["dh"]) for g in gearsets]
+    hit_supports = [
+        _hit_supports(
+            job_object(
+                role,
+                job_no_space,
+                g["main_stat"],
+                g["secondary_stat"],
+                g["determination"],
+                g["speed_stat"],
+                g["ch"],
+                g["dh"],
+                g["wd"],
+                g["delay"],
+                g["main_stat_pre_bonus"],
+                level,
+            ),
+            rotation_df,
+        )
+        for g, rotation_df in zip(gearsets, rotation_dfs)
+    ]
+    moments = np.array(
+        [
+            _rotation_moments(supports, rotation_df, t)
+            for supports, rotation_df in zip(hit_supports, rotation_dfs)
+        ]
+    )
+
+    if fast_estimate:
+        dps_support, dps_distributions, percentiles = _skew_normal_distributions(
+            moments, dps_step
+        )
+    else:
+        dps_support, dps_distributions = _convolve_rotations(
+            hit_supports, rotation_dfs, t, action_delta, rotation_delta, dps_step
+        )
+        percentiles = _percentiles(dps_support, dps_distributions)
+        moments = _distribution_moments(dps_support, dps_distributions)
+
+    mean, variance, skewness = moments.T
+    summary = pd.DataFrame(
+        {
+            "name": [g.get("name", f"Gearset {i + 1}") for i, g in enumerate(gearsets)],
+            "mean": mean,
+            "std": np.sqrt(variance),
+            "skewness": skewness,
+        }
+        | {f"p{p}": percentiles[:, i] for i, p in enumerate(SWEEP_PERCENTILES)}
+    )
+    return StatSweep(summary, dps_support, dps_distributions, fast_estimate)
@@ -0,0 +1,25 @@
+"""gunicorn settings for the public site.
+
+The app is loaded, and lazily imported modules are preloaded, in the master
+process before workers are forked. `gc.freeze()` then moves everything allocated
+so far out of the garbage collector's reach, so collections in a worker don't
+touch (and copy) the pages shared with the master.
+
+Usage:
+    gunicorn -c deploy/gunicorn.conf.py crit_app.app:server
+"""
+
+import gc
+import os
+
+bind = os.environ.get("CRIT_APP_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("CRIT_APP_WORKERS", "5"))
+preload_app = True
+
+
+def when_ready(server):
+    from crit_app.preload import preload
+
+    preload()
+    gc.freeze()
+    server.log.info("Preloaded modules, %d objects frozen", gc.get_freeze_count())
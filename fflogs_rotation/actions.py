@@ -1,24 +1,97 @@
+import importlib
 import warnings
+from collections.abc import Iterator, Mapping
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import cached_property
+from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
-from ffxiv_stats import Rate
-from ffxiv_stats.jobs import Healer, MagicalRanged, Melee, PhysicalRanged, Tank
 
 from crit_app.job_data.encounter_data import patch_times, patch_times_cn, patch_times_ko
-from fflogs_rotation.bard import BardActions
-from fflogs_rotation.base import BuffQuery
-from fflogs_rotation.black_mage import BlackMageActions
-from fflogs_rotation.dark_knight import DarkKnightActions
-from fflogs_rotation.dragoon import DragoonActions
+from fflogs_rotation.base import BuffQuery, PageStats, aura_fields
+from fflogs_rotation.buff_sets import (
+    buff_vocabulary,
+    map_buff_sets,
+    update_buff_set_ids,
+)
+from fflogs_rotation.damage_events import (
+    DamageEventColumns,
+    DamageEventDecoder,
+    decode_damage_events,
+)
 from fflogs_rotation.encounter_specifics import EncounterSpecifics
-from fflogs_rotation.machinist import MachinistActions
-from fflogs_rotation.monk import MonkActions
-from fflogs_rotation.ninja import NinjaActions
-from fflogs_rotation.paladin import PaladinActions
-from fflogs_rotation.reaper import ReaperActions
-from fflogs_rotation.samurai import SamuraiActions
-from fflogs_rotation.viper import ViperActions
+from fflogs_rotation.fight_metadata import FightMetadata
+from fflogs_rotation.job_data.snapshot import patch_index
+from fflogs_rotation.party_events import PartyDamageEvents
+from fflogs_rotation.profiling import stage
+from fflogs_rotation.rate_limit import submit_in_context
+
+if TYPE_CHECKING:
+    from ffxiv_stats import Rate
+
+
+class LazyClasses(Mapping):
+    """Classes by name, imported from "module:attribute" paths on first access.
+
+    Importing `ffxiv_stats` and every job module up front slows down worker
+    startup, while an analysis only needs one job. `crit_app.preload` imports them
+    all before gunicorn forks its workers.
+    """
+
+    def __init__(self, paths: dict[str, str]) -> None:
+        self._paths = paths
+        self._classes: dict[str, type] = {}
+
+    def __getitem__(self, name: str) -> type:
+        if name not in self._classes:
+            module, attribute = self._paths[name].split(":")
+            self._classes[name] = getattr(importlib.import_module(module), attribute)
+        return self._classes[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+# Job-specific helper classes, as "module:attribute" paths
+JOB_CLASS_PATHS = {
+    "Bard": "fflogs_rotation.bard:BardActions",
+    "BlackMage": "fflogs_rotation.black_mage:BlackMageActions",
+    "DarkKnight": "fflogs_rotation.dark_knight:DarkKnightActions",
+    "Dragoon": "fflogs_rotation.dragoon:DragoonActions",
+    "Machinist": "fflogs_rotation.machinist:MachinistActions",
+    "Monk": "fflogs_rotation.monk:MonkActions",
+    "Ninja": "fflogs_rotation.ninja:NinjaActions",
+    "Paladin": "fflogs_rotation.paladin:PaladinActions",
+    "Reaper": "fflogs_rotation.reaper:ReaperActions",
+    "Samurai": "fflogs_rotation.samurai:SamuraiActions",
+    "Viper": "fflogs_rotation.viper:ViperActions",
+}
+JOB_CLASSES = LazyClasses(JOB_CLASS_PATHS)
+
+# Job modules which declare `aura_requirements`. Their aura tables are merged into
+# the `FightInformation` query instead of costing an extra round trip.
+JOB_AURA_CLASSES = LazyClasses(
+    {
+        job: JOB_CLASS_PATHS[job]
+        for job in (
+            "Paladin",
+            "Monk",
+            "Ninja",
+            "Dragoon",
+            "Reaper",
+            "Viper",
+            "Samurai",
+            "Machinist",
+        )
+    }
+)
+
+# Phase downtime, damage events, job-specific and encounter-specific queries.
+CONCURRENT_QUERIES = 4
 
 
 class ActionTable(BuffQuery):
@@ -56,7 +129,15 @@ class ActionTable(BuffQuery):
         excluded_enemy_ids: list[int] | None = None,
         tenacity: int | None = None,
         debug: bool = False,
+        party_events: PartyDamageEvents | None = None,
+        fight_metadata: FightMetadata | None = None,
+        all_phases: bool = False,
     ) -> None:
+        if all_phases and phase != 0:
+            raise ValueError(
+                "All phases are built from the whole fight, phase must be 0."
+            )
+
         self.report_id = report_id
         self.fight_id = fight_id
         self.job = job
@@ -72,37 +153,74 @@ class ActionTable(BuffQuery):
         self.debug = debug
         self.encounter_phases = encounter_phases
         self.tenacity = tenacity
+        self.all_phases = all_phases
 
         super().__init__(api_url="https://www.fflogs.com/api/v2/client")
 
         self.excluded_enemy_ids = excluded_enemy_ids
 
         # Fetch fight information and set timings
-        fight_info_response = self._query_fight_information(headers)
-        self._set_fight_information(headers, fight_info_response)
+        with stage("action_table.fight_information", job):
+            fight_info_response = self._query_fight_information(headers, fight_metadata)
+
+        # The remaining queries only depend on fight information, so they run
+        # concurrently and are joined before building the actions DataFrame.
+        # Neither the executor nor the party event store is kept as an
+        # attribute, so they're never pickled.
+        with (
+            stage("action_table.queries", job) as queries_stage,
+            ThreadPoolExecutor(max_workers=CONCURRENT_QUERIES) as executor,
+        ):
+            phase_downtime = self._set_fight_information(
+                headers, fight_info_response, executor
+            )
+            # Every phase's downtime, so phases can be sliced out of the fight.
+            phase_downtimes = (
+                submit_in_context(executor, self._query_phase_downtimes, headers)
+                if self.phase_windows
+                else None
+            )
 
-        self.d2_100 = self._get_100_potency_d2_value(
-            main_stat,
-            determination,
-            weapon_damage,
-            level,
-            job,
-            self.medication_amt,
-            tenacity,
-        )
+            self.d2_100 = self._get_100_potency_d2_value(
+                main_stat,
+                determination,
+                weapon_damage,
+                level,
+                job,
+                self.medication_amt,
+                tenacity,
+            )
 
-        self.medication_multiplier = self._estimate_medication_multiplier(
-            self.medication_amt,
-            self.main_stat,
-            self.determination,
-            self.weapon_damage,
-            self.level,
-            self.job,
-            tenacity,
-        )
+            # Fetch damage events from FFLogs, or the party-wide store if provided.
+            actions = submit_in_context(
+                executor, self._query_damage_events, headers, party_events
+            )
+            job_specifics = submit_in_context(
+                executor, self._create_job_specifics, headers, fight_info_response
+            )
+            encounter_responses = submit_in_context(
+                executor, self._query_encounter_specifics, headers
+            )
 
-        # Fetch damage events from FFLogs
-        self.actions = self._query_damage_events(headers)
+            self.medication_multiplier = self._estimate_medication_multiplier(
+                self.medication_amt,
+                self.main_stat,
+                self.determination,
+                self.weapon_damage,
+                self.level,
+                self.job,
+                tenacity,
+            )
+
+            if phase_downtime is not None:
+                self._set_downtime(phase_downtime.result())
+            self.phase_downtimes = (
+                phase_downtimes.result() if phase_downtimes is not None else {}
+            )
+            self.actions = actions.result()
+            self.job_specifics = job_specifics.result()
+            encounter_responses = encounter_responses.result()
+            queries_stage.rows = len(self.actions)
 
         # Buff tables filtered based on fight start time
         self._filter_buff_tables(
@@ -124,16 +242,21 @@ class ActionTable(BuffQuery):
         ]["buff_id"].tolist()
 
         # Build initial actions DataFrame
-        self.actions_df = self.create_action_df()
+        with stage("action_table.create_action_df", job) as create_stage:
+            self.actions_df = self.create_action_df()
 
-        self.actions_df = self.normalize_damage(
-            self.actions_df, self.medication_multiplier
-        )
-        self.actions_df = self.potency_estimate(self.actions_df, self.d2_100)
+            self.actions_df = self.normalize_damage(
+                self.actions_df, self.medication_multiplier
+            )
+            self.actions_df = self.potency_estimate(self.actions_df, self.d2_100)
+            create_stage.rows = len(self.actions_df)
 
         # Apply job-specific mechanics
-        self._apply_job_specifics(headers)
-        self._apply_encounter_specifics(headers)
+        with stage("action_table.job_specifics", job):
+            self._apply_job_specifics(headers)
+        with stage("action_table.encounter_specifics", job) as encounter_stage:
+            self._apply_encounter_specifics(headers, encounter_responses)
+            encounter_stage.rows = len(self.actions_df)
 
         # Final cleanup of actions DataFrame
         # Remove unpaired actions, which still count towards gauge generation
@@ -145,16 +268,26 @@ class ActionTable(BuffQuery):
         if self.has_echo:
             self.apply_the_echo()
 
-    def _query_fight_information(self, headers: dict[str, str]) -> None:
+    def _query_fight_information(
+        self, headers: dict[str, str], fight_metadata: FightMetadata | None = None
+    ) -> dict:
         """
         Retrieves fight information from the FFLogs GraphQL API for the specified.
 
-        fight and calls `_process_fight_data()` to set core attributes (e.g., encounter
-        name, start/end times, echo). Modifies class state in-place.
+        fight, used by `_set_fight_information()` to set core attributes (e.g.,
+        encounter name, start/end times, echo).
+
+        If the fight's metadata is already known, only the player's potion and job
+        aura tables are queried and the metadata fills in the rest.
 
         Args:
             headers (dict[str, str]): HTTP headers for GraphQL querying, including
             authentication tokens.
+            fight_metadata (FightMetadata | None, optional): Persisted metadata of
+                the fight, from the encounter lookup.
+
+        Returns:
+            dict: `reportData.report` portion of the `FightInformation` response.
         """
         fight_info_variables = {
             "code": self.report_id,
@@ -162,6 +295,18 @@ class ActionTable(BuffQuery):
             "sourceID": self.player_id,
         }
 
+        if fight_metadata is not None:
+            response = self.gql_query(
+                headers,
+                self._player_fight_information_query(),
+                fight_info_variables,
+                "PlayerFightInformation",
+            )
+            return {
+                **response["data"]["reportData"]["report"],
+                **fight_metadata.as_report(),
+            }
+
         response = self.gql_query(
             headers,
             self._fight_information_query(),
@@ -172,24 +317,37 @@ class ActionTable(BuffQuery):
         # TODO: check for valid response
         return response["data"]["reportData"]["report"]
 
+    def _player_fields(self) -> str:
+        """Report fields specific to the player: potion and job aura tables."""
+        job_class = JOB_AURA_CLASSES.get(self.job)
+        job_auras = ""
+        if job_class is not None:
+            job_auras = aura_fields(job_class.aura_requirements, "$sourceID")
+
+        potion_type = """
+                    potionType: table(
+                        fightIDs: $id
+                        dataType: Buffs
+                        abilityID: 1000049
+                        sourceID: $sourceID
+                    )
+                    """
+        return potion_type + job_auras
+
     def _fight_information_query(self) -> str:
-        """Fight information GQL query string."""
-        return """
+        """Fight information GQL query string.
+
+        Includes the aura tables the job module needs, if any.
+        """
+        query = """
         query FightInformation($code: String!, $id: [Int]!, $sourceID: Int!) {
             reportData {
                 report(code: $code) {
                     startTime
                     region{
-                        name,
                         compactName
                     }
-                    # masterData { abilities { name gameID } }
-                    potionType: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        abilityID: 1000049
-                        sourceID: $sourceID
-                    )
+                    %s
                     table(fightIDs: $id, dataType: DamageDone)
                     fights(fightIDs: $id, translate: true) {
                         encounterID
@@ -206,6 +364,25 @@ class ActionTable(BuffQuery):
             }
         }
         """
+        return query % self._player_fields()
+
+    def _player_fight_information_query(self) -> str:
+        """Fight information GQL query string when the fight metadata is known.
+
+        Only queries the report start time and the player's aura tables, skipping
+        the fight's damage table and rankings.
+        """
+        query = """
+        query PlayerFightInformation($code: String!, $id: [Int]!, $sourceID: Int!) {
+            reportData {
+                report(code: $code) {
+                    startTime
+                    %s
+                }
+            }
+        }
+        """
+        return query % self._player_fields()
 
     def _fight_phase_downtime_query(self) -> str:
         """Query to get the downtime of a specific phase."""
@@ -224,6 +401,29 @@ class ActionTable(BuffQuery):
         }
         """
 
+    @staticmethod
+    def _all_phase_downtime_query(phases: list[int]) -> str:
+        """Query to get the downtime of each phase, aliased `phase<id>`."""
+        variables = "".join(f", $start{p}: Float!, $end{p}: Float!" for p in phases)
+        tables = "".join(
+            f"""
+                    phase{p}: table(
+                        fightIDs: $id
+                        dataType: DamageDone
+                        startTime: $start{p}
+                        endTime: $end{p}
+                    )"""
+            for p in phases
+        )
+        return """
+        query PhaseTimes($code: String!, $id: [Int]!%s) {
+            reportData {
+                report(code: $code) {%s
+                }
+            }
+        }
+        """ % (variables, tables)
+
     def _damage_events_query(self) -> str:
         """Query to retrieve damage events."""
         return """
@@ -254,8 +454,31 @@ class ActionTable(BuffQuery):
         """
 
     def _set_fight_information(
-        self, headers: dict[str, str], fight_info_response: dict
-    ) -> None:
+        self,
+        headers: dict[str, str],
+        fight_info_response: dict,
+        executor: Executor | None = None,
+    ) -> Future | None:
+        """Set fight attributes from the `FightInformation` response.
+
+        Phase analyses need an extra query for the phase downtime. If `executor`
+        is given, that query is submitted to it instead of blocking, and
+        `downtime`/`fight_dps_time` are left unset until the returned future's
+        result is passed to `_set_downtime`.
+
+        All-phases tables also set `phase_windows`, the start and end time of each
+        phase reached, which is empty for other tables.
+
+        Args:
+            headers (dict[str, str]): FFLogs API headers.
+            fight_info_response (dict): `reportData.report` portion of the
+                `FightInformation` response.
+            executor (Executor | None, optional): Executor for the phase downtime
+                query.
+
+        Returns:
+            Future | None: Pending phase downtime, if submitted to `executor`.
+        """
         self.report_start_time = self._get_report_start_time(fight_info_response)
         self.fight_name = self._get_fight_name(fight_info_response)
         self.encounter_id = self._get_encounter_id(fight_info_response)
@@ -275,10 +498,17 @@ class ActionTable(BuffQuery):
             self.fight_end_time,
             self.phase_start_time,
             self.phase_end_time,
-            self.downtime,
-            self.fight_dps_time,
-        ) = self._process_fight_data(headers, fight_info_response)
-        pass
+        ) = self._process_fight_data(fight_info_response)
+        self.phase_windows = self._phase_windows(fight_info_response)
+
+        if self.phase == 0:
+            self._set_downtime(self._get_downtime(fight_info_response))
+            return None
+
+        if executor is not None:
+            return submit_in_context(executor, self._query_phase_downtime, headers)
+        self._set_downtime(self._query_phase_downtime(headers))
+        return None
 
     @staticmethod
     def _get_report_start_time(fight_info_response) -> str:
@@ -397,21 +627,21 @@ class ActionTable(BuffQuery):
             # No bonus for incorrect potion type
             return 0
 
-    def _process_fight_data(self, headers: dict[str, str], fight_info_response) -> None:
+    def _process_fight_data(self, fight_info_response: dict) -> tuple:
         """
-        Parses the fight data from the FFLogs API response, setting core attributes.
+        Parses the fight data from the FFLogs API response, getting start/end times.
 
-        such as encounter details, start/end times, and handling phase timings.
-        Updates the class state to reflect whether the fight was a kill,
-        whether echo was active, and any relevant phase/downtime offsets.
+        If a specific phase was requested, the phase start/end times (relative to the
+        report start) are found from the phase transitions.
 
         Args:
-            response (dict):
+            fight_info_response (dict):
                 The parsed JSON response from the FFLogs API containing report
                 and fight data.
-            headers (dict[str, str]):
-                HTTP headers used for further GraphQL queries, if needed
-                for phase/downtime details.
+
+        Returns:
+            tuple: (fight_start_time, fight_end_time, phase_start_time,
+                phase_end_time). Phase times are None for whole fight analyses.
         """
         fight = fight_info_response["fights"][0]
 
@@ -423,32 +653,57 @@ class ActionTable(BuffQuery):
             phase_start_time, phase_end_time = self._fetch_phase_start_end_time(
                 fight["endTime"]
             )
-            phase_response = self._fetch_phase_downtime(
-                headers, phase_start_time, phase_end_time
-            )
-            downtime = self._get_downtime(phase_response)
-
             fight_start_time += phase_start_time
             fight_end_time += phase_end_time
         else:
-            downtime = self._get_downtime(fight_info_response)
             phase_start_time = None
             phase_end_time = None
             fight_start_time += fight["startTime"]
             fight_end_time += fight["endTime"]
 
-        fight_dps_time = (fight_end_time - fight_start_time - downtime) / 1000
-
         return (
             fight_start_time,
             fight_end_time,
             phase_start_time,
             phase_end_time,
-            downtime,
-            fight_dps_time,
         )
 
-    def _fetch_phase_start_end_time(self, fight_end_time: int):
+    def _phase_windows(self, fight_info_response: dict) -> dict[int, tuple[int, int]]:
+        """Start and end times (ms, relative to the report start) of each phase reached.
+
+        Only all-phases tables of encounters with phases have phase windows.
+        """
+        if (
+            not self.all_phases
+            or self.encounter_id not in self.encounter_phases
+            or not self.phase_information
+        ):
+            return {}
+
+        fight_end_time = fight_info_response["fights"][0]["endTime"]
+        return {
+            p["id"]: self._fetch_phase_start_end_time(fight_end_time, p["id"])
+            for p in self.phase_information
+            if p["id"] in self.encounter_phases[self.encounter_id]
+        }
+
+    def _query_phase_downtime(self, headers: dict[str, str]) -> int:
+        """Query the downtime (ms) of the requested phase."""
+        phase_response = self._fetch_phase_downtime(
+            headers, self.phase_start_time, self.phase_end_time
+        )
+        return self._get_downtime(phase_response)
+
+    def _set_downtime(self, downtime: int) -> None:
+        """Set downtime (ms) and the resulting time spent dealing damage (s)."""
+        self.downtime = downtime
+        self.fight_dps_time = (
+            self.fight_end_time - self.fight_start_time - downtime
+        ) / 1000
+
+    def _fetch_phase_start_end_time(
+        self, fight_end_time: int, phase: int | None = None
+    ):
         """
         Determines the start and end timestamps (in milliseconds) for the requested phase.
 
@@ -457,27 +712,30 @@ class ActionTable(BuffQuery):
 
         Args:
             fight_end_time (int): The timestamp (ms) identifying the fight end.
+            phase (int | None, optional): Phase to find the times of, defaults to
+                `self.phase`.
 
         Returns:
             tuple[int, int]: (phase_start_time, phase_end_time), both in milliseconds.
             phase_start_time is extracted from self.phase_information where id == self.phase.
             phase_end_time is either the next phase start or fight_end_time.
         """
+        if phase is None:
+            phase = self.phase
+
         phase_start_time = next(
-            p["startTime"] for p in self.phase_information if p["id"] == self.phase
+            p["startTime"] for p in self.phase_information if p["id"] == phase
         )
 
         # Phase end = fight end if either:
         # - Final phase of the fight.
         # - Final phase of a pull with a wipe.
         if (
-            self.phase < max(self.encounter_phases[self.encounter_id].keys())
-            and len(self.phase_information) > self.phase
+            phase < max(self.encounter_phases[self.encounter_id].keys())
+            and len(self.phase_information) > phase
         ):
             phase_end_time = next(
-                p["startTime"]
-                for p in self.phase_information
-                if p["id"] == self.phase + 1
+                p["startTime"] for p in self.phase_information if p["id"] == phase + 1
             )
         else:
             phase_end_time = fight_end_time
@@ -498,13 +756,40 @@ class ActionTable(BuffQuery):
             headers, self._fight_phase_downtime_query(), variables, "PhaseTime"
         )["data"]["reportData"]["report"]
 
+    def _query_phase_downtimes(self, headers: dict[str, str]) -> dict[int, int]:
+        """Query the downtime (ms) of every phase in `phase_windows` at once."""
+        response = self._fetch_all_phase_downtimes(headers, self.phase_windows)
+        return {
+            p: self._get_downtime({"table": response[f"phase{p}"]})
+            for p in self.phase_windows
+        }
+
+    def _fetch_all_phase_downtimes(
+        self, headers: dict[str, str], phase_windows: dict[int, tuple[int, int]]
+    ) -> dict:
+        """Retrieves the timing data of several phases in one query."""
+        variables = {"code": self.report_id, "id": [self.fight_id]}
+        for p, (start, end) in phase_windows.items():
+            variables[f"start{p}"] = start
+            variables[f"end{p}"] = end
+        return self.gql_query(
+            headers,
+            self._all_phase_downtime_query(list(phase_windows)),
+            variables,
+            "PhaseTimes",
+        )["data"]["reportData"]["report"]
+
     def _get_downtime(self, response: dict) -> int:
         """Extracts downtime from the response, returning 0 if not present."""
         data = response.get("table", {}).get("data", {})
         # Some FFLogs responses use `damageDowntime` instead of `downtime`.
         return data.get("downtime", data.get("damageDowntime", 0))
 
-    def _query_damage_events(self, headers: dict[str, str]) -> None:
+    def _query_damage_events(
+        self,
+        headers: dict[str, str],
+        party_events: PartyDamageEvents | None = None,
+    ) -> DamageEventColumns:
         """
         Query FFLogs API for damage events from a specific fight.
 
@@ -512,9 +797,14 @@ class ActionTable(BuffQuery):
 
         Makes a GraphQL query to fetch damage events with:
         - Source filtering by job/player
-        - Pagination support (10000 events per page)
+        - Pagination support (10000 events per page), following
+          `nextPageTimestamp` until all pages are fetched
         - Combat-only events
 
+        Each page is decoded into columns as it arrives, while the next page is
+        in flight. Page counts and bytes received are recorded in
+        `self.damage_event_page_stats`.
+
         The query returns raw damage events containing:
         - Timestamp of action
         - Action ID and name
@@ -527,33 +817,48 @@ class ActionTable(BuffQuery):
             headers (dict[str, str]): FFLogs API headers containing:
                 - Content-Type: application/json
                 - Authorization: Bearer token
+            party_events (PartyDamageEvents | None, optional): Party-wide damage
+                event store. If provided, the player's events are taken from it
+                instead of being queried individually.
 
-        Sets:
-            self.actions (List[Dict]): List of raw damage events from the API
-                Each event is a dict with fields like timestamp, type,
-                sourceID, targetID, amount, etc.
+        Returns:
+            DamageEventColumns: Decoded damage events, with fields like
+                timestamp, type, sourceID, targetID, amount, etc.
         """
+        # Need to switch back to relative timestamp
+        # Time filtering is needed to ensure the correct phase
+        start_time = self.fight_start_time - self.report_start_time
+        end_time = self.fight_end_time - self.report_start_time
+
+        self.damage_event_page_stats = PageStats()
+        if party_events is not None:
+            return decode_damage_events(
+                party_events.source_events(
+                    headers, self.player_id, self.pet_ids, start_time, end_time
+                )
+            )
+
         # Querying by playerID also includes pets
         # neat...
-        actions = []
-        # source_ids = [self.player_id]
-
-        # for i in source_ids:
         variables = {
             "code": self.report_id,
             "id": [self.fight_id],
             "sourceID": self.player_id,
-            # Need to switch back to relative timestamp
-            # Time filtering is needed to ensure the correct phase
-            "startTime": self.fight_start_time - self.report_start_time,
-            "endTime": self.fight_end_time - self.report_start_time,
+            "startTime": start_time,
+            "endTime": end_time,
         }
 
-        response = self.gql_query(
-            headers, self._damage_events_query(), variables, "DpsActions"
-        )
-        actions.extend(response["data"]["reportData"]["report"]["events"]["data"])
-        return actions
+        # Long fights (e.g., full FRU pulls with pets and DoTs) span multiple pages.
+        decoder = DamageEventDecoder()
+        for report in self.paginate(
+            headers,
+            self._damage_events_query(),
+            variables,
+            "DpsActions",
+            self.damage_event_page_stats,
+        ):
+            decoder.add(report["events"]["data"])
+        return decoder.finish()
 
     @staticmethod
     def _get_100_potency_d2_value(
@@ -565,6 +870,8 @@ class ActionTable(BuffQuery):
         medication_amount: int = 0,
         tenacity: int | None = None,
     ) -> int:
+        from ffxiv_stats.jobs import Healer, MagicalRanged, Melee, PhysicalRanged, Tank
+
         from crit_app.job_data.roles import role_mapping
 
         role = role_mapping[job]
@@ -659,27 +966,18 @@ class ActionTable(BuffQuery):
         guaranteed_buff_table: pd.DataFrame,
         guaranteed_action_table: pd.DataFrame,
     ) -> None:
-        """Filter buff tables to the relevant patch."""
+        """Filter buff tables to the relevant patch.
+
+        Tables loaded by `fflogs_rotation.job_data.data` are indexed by patch once
+        per process, so this is a lookup rather than a filter.
+        """
         # Here damage_buffs is left as a DataFrame while the others are converted into dicts
-        self.damage_buffs = damage_buff_table[
-            (damage_buff_table["valid_start"] <= self.patch_number)
-            & (self.patch_number < damage_buff_table["valid_end"])
-        ]
-        self.critical_hit_rate_buffs = (
-            crit_rate_table[
-                (crit_rate_table["valid_start"] <= self.patch_number)
-                & (self.patch_number < crit_rate_table["valid_end"])
-            ]
-            .set_index("buff_id")["rate_buff"]
-            .to_dict()
+        self.damage_buffs = patch_index(damage_buff_table).lookup(self.patch_number)
+        self.critical_hit_rate_buffs = patch_index(crit_rate_table).mapping(
+            self.patch_number, "buff_id", "rate_buff"
         )
-        self.direct_hit_rate_buffs = (
-            dh_rate_table[
-                (dh_rate_table["valid_start"] <= self.patch_number)
-                & (self.patch_number < dh_rate_table["valid_end"])
-            ]
-            .set_index("buff_id")["rate_buff"]
-            .to_dict()
+        self.direct_hit_rate_buffs = patch_index(dh_rate_table).mapping(
+            self.patch_number, "buff_id", "rate_buff"
         )
         self.guaranteed_hit_type_via_buff = guaranteed_buff_table
         self.guaranteed_hit_type_via_action = guaranteed_action_table.set_index(
@@ -776,7 +1074,7 @@ class ActionTable(BuffQuery):
     ) -> pd.DataFrame:
         """Compute the multiplier table for ground effects based on actions_df and damage_buffs."""
         df = actions_df.copy()
-        df["str_buffs"] = df["buffs"].astype(str)
+        df["str_buffs"] = map_buff_sets(df["buffs"], lambda b: str(list(b)))
 
         unique_buff_sets = df.drop_duplicates(
             subset=["str_buffs", "multiplier"]
@@ -814,7 +1112,7 @@ class ActionTable(BuffQuery):
     ) -> pd.DataFrame:
         """Merge multiplier values for ground effect actions and return an updated actions_df."""
         df = actions_df.copy()
-        df["str_buffs"] = df["buffs"].astype(str)
+        df["str_buffs"] = map_buff_sets(df["buffs"], lambda b: str(list(b)))
 
         ground_ticks_actions = df[df["abilityGameID"] == ground_effect_id].copy()
         ground_ticks_actions = ground_ticks_actions.merge(
@@ -908,38 +1206,107 @@ class ActionTable(BuffQuery):
             print(f"Hit Type: {hit}, Multiplier: {mult}")
             ```
         """
+        key = (ability_id, frozenset(buff_ids), ch_rate_buff, dh_rate_buff)
+        if key not in self._guaranteed_hit_type_cache:
+            self._guaranteed_hit_type_cache[key] = self._guaranteed_hit_type(*key)
+
+        hit_type_multiplier, hit_type = self._guaranteed_hit_type_cache[key]
+        # Multiplier for guaranteed hit type
+        if hit_type_multiplier is not None:
+            multiplier *= hit_type_multiplier
+
+        return multiplier, hit_type
+
+    def _guaranteed_hit_type(
+        self,
+        ability_id: str,
+        buff_ids: frozenset[str],
+        ch_rate_buff: float,
+        dh_rate_buff: float,
+    ) -> tuple[float | None, int]:
+        """Uncached guaranteed hit type lookup for `guaranteed_hit_type_damage_buff`.
+
+        Returns:
+            tuple: (hit_type_multiplier: float | None, hit_type: int)
+                - hit_type_multiplier: Damage multiplier from the guaranteed hit
+                  type, None if the action has no guaranteed hit type.
+                - hit_type: Hit type code (0-3)
+        """
         hit_type = 0
-        r = Rate(self.critical_hit_stat, self.direct_hit_stat, level=self.level)
+        valid_action = False
 
         # Check if a guaranteed hit type giving buff is present
         # and if if affects the current action
-
-        valid_buff_and_action = self.guaranteed_hit_type_via_buff[
-            self.guaranteed_hit_type_via_buff["buff_id"].isin(buff_ids)
-            & (self.guaranteed_hit_type_via_buff["affected_action_id"] == ability_id)
-        ]
-        # And if it is affecting a relevant action
-        if len(valid_buff_and_action) > 0:
-            hit_type = valid_buff_and_action["hit_type"].iloc[0]
-            valid_action = True
-        else:
-            valid_action = False
+        for buff_id, buff_hit_type in self._guaranteed_hit_type_via_buff_index.get(
+            ability_id, {}
+        ).items():
+            if buff_id in buff_ids:
+                hit_type = buff_hit_type
+                valid_action = True
+                break
 
         # Now check if the ability has a guaranteed hit type regardless of buff
         if ability_id in self.guaranteed_hit_type_via_action.keys():
             valid_action = True
             hit_type = self.guaranteed_hit_type_via_action[ability_id]
 
-        # Multiplier for guaranteed hit type
-        if valid_action:
-            multiplier *= r.get_hit_type_damage_buff(
+        if not valid_action:
+            return None, hit_type
+
+        return (
+            self._rate.get_hit_type_damage_buff(
                 hit_type,
                 buff_crit_rate=ch_rate_buff,
                 buff_dh_rate=dh_rate_buff,
                 determination=self.determination,
-            )
+            ),
+            hit_type,
+        )
 
-        return multiplier, hit_type
+    # Caches derived from the player's stats and hit type tables, which aren't
+    # pickled so an unpickled table never reuses results from stale tables.
+    _CACHED_PROPERTIES = (
+        "_rate",
+        "_guaranteed_hit_type_via_buff_index",
+        "_guaranteed_hit_type_cache",
+    )
+
+    def __getstate__(self) -> dict:
+        """Pickle the table without its `_CACHED_PROPERTIES` caches."""
+        state = self.__dict__.copy()
+        for name in self._CACHED_PROPERTIES:
+            state.pop(name, None)
+        return state
+
+    @cached_property
+    def _rate(self) -> "Rate":
+        """Hit type rates of the player's critical hit and direct hit stats."""
+        from ffxiv_stats import Rate
+
+        return Rate(self.critical_hit_stat, self.direct_hit_stat, level=self.level)
+
+    @cached_property
+    def _guaranteed_hit_type_via_buff_index(self) -> dict[str, dict[str, int]]:
+        """Guaranteed hit types granted by buffs, keyed by action ID then buff ID.
+
+        Buffs are kept in `guaranteed_hit_type_via_buff` order, so the first buff
+        present for an action takes precedence.
+        """
+        index = {}
+        for action_id, buff_id, hit_type in zip(
+            self.guaranteed_hit_type_via_buff["affected_action_id"],
+            self.guaranteed_hit_type_via_buff["buff_id"],
+            self.guaranteed_hit_type_via_buff["hit_type"],
+        ):
+            index.setdefault(action_id, {}).setdefault(buff_id, hit_type)
+        return index
+
+    @cached_property
+    def _guaranteed_hit_type_cache(
+        self,
+    ) -> dict[tuple[str, frozenset[str], float, float], tuple[float | None, int]]:
+        """Memoized `_guaranteed_hit_type` results."""
+        return {}
 
     def apply_the_echo(self) -> None:
         """
@@ -993,6 +1360,82 @@ class ActionTable(BuffQuery):
         )
         self.actions_df["action_name"] += f"_{echo_buff}"
         self.actions_df["buffs"].apply(lambda x: x.append(echo_buff))
+        update_buff_set_ids(self.actions_df, None, self.buff_vocabulary)
+
+    def _buff_adjustments(
+        self,
+        buffs: tuple[str, ...],
+        ability_id: int,
+        radiant_finale_strength: str | None,
+        medication_id: str = "1000049",
+        radiant_finale_id: str = "1002964",
+    ) -> tuple[list[str], bool, int, float, np.ndarray]:
+        """Hit type and main stat adjustments of an action under a set of buffs.
+
+        Args:
+            buffs (tuple[str, ...]): Buff IDs active for the action, as listed by
+                FFLogs.
+            ability_id (int): FFLogs ability ID of the action.
+            radiant_finale_strength (str | None): Standardized Radiant Finale buff ID
+                if Radiant Finale is active, from `estimate_radiant_finale_strength`.
+            medication_id (str, optional): FFLogs ability ID for medication.
+            radiant_finale_id (str, optional): FFLogs ability ID for Radiant Finale.
+
+        Returns:
+            tuple[list[str], bool, int, float, np.ndarray]:
+                - Buff IDs with Radiant Finale and pre-7.0 AST cards standardized.
+                - Whether medication is active.
+                - Main stat added by medication.
+                - Damage multiplier for guaranteed hit types under hit type buffs.
+                - Probability of each hit type.
+        """
+        buff_ids = list(buffs)
+        crit_hit_rate_mod = 0
+        direct_hit_rate_mod = 0
+        medicated = False
+        main_stat_adjust = 0
+
+        # Loop through buffs and do various things depending on the buff
+        for b_idx, s in enumerate(set(buffs)):
+            # Adjust critical/direct hit rate according to hit-type buffs
+            if s in self.critical_hit_rate_buffs.keys():
+                crit_hit_rate_mod += self.critical_hit_rate_buffs[s]
+            if s in self.direct_hit_rate_buffs.keys():
+                direct_hit_rate_mod += self.direct_hit_rate_buffs[s]
+
+            if s == medication_id:
+                medicated = True
+                main_stat_adjust += self.medication_amt
+
+            # Different Radiant Finale strengths will lead to different
+            # 1-hit damage distributions.
+            if s == radiant_finale_id:
+                buff_ids[b_idx] = radiant_finale_strength
+
+            # All AST cards are lumped as either 6% buff or 3% buff.
+            # only do for pre-Dawntrail.
+            if (self.patch_number < 7.0) & (s in self.ranged_cards + self.melee_cards):
+                buff_ids[b_idx] = self.ast_card_buff(s)[0]
+
+        # Check if action has a guaranteed hit type, potentially under a hit type buff.
+        # Get the hit type and new damage multiplier if hit type buffs were present.
+        multiplier, hit_type = self.guaranteed_hit_type_damage_buff(
+            ability_id,
+            buff_ids,
+            1.0,
+            crit_hit_rate_mod,
+            direct_hit_rate_mod,
+        )
+
+        # Probability of each hit type, accounting for hit type buffs or
+        # guaranteed hit types.
+        # Hit type ignores hit type buff additions if they are present
+        p = self._rate.get_p(
+            round(crit_hit_rate_mod, 2),
+            round(direct_hit_rate_mod, 2),
+            guaranteed_hit_type=hit_type,
+        )
+        return buff_ids, medicated, main_stat_adjust, multiplier, p
 
     def create_action_df(
         self,
@@ -1025,194 +1468,196 @@ class ActionTable(BuffQuery):
                 - p_n/p_c/p_d/p_cd: Hit type probabilities
                 - main_stat_add: Main stat increases
                 - buffs: List of active buff IDs
+                - buff_set_id: ID of the sorted buffs in `self.buff_vocabulary`
         """
 
-        # These columns are almost always here, there can be some additional columns
-        # which are checked for, depending if certain actions are used
-        action_df_columns = [
-            "timestamp",
-            "elapsed_time",
-            "type",
-            "sourceID",
-            "targetID",
-            "packetID",
-            "targetInstance",
-            "abilityGameID",
-            "ability_name",
-            "buffs",
-            "amount",
-            "tick",
-            "multiplier",
-            "bonusPercent",
-            "hitType",
-            "directHit",
-        ]
-
         # Unpaired actions have a cast begin but the damage does not go out
         # These will be filtered out later, but are included because unpaired
         # actions can still grant job gauge like Darkside
-        actions_df = pd.DataFrame(self.actions)
+        # Only the "prepares action" events and dot ticks are decoded, as pages
+        # arrive. Raw event lists, like those of test fixtures, are decoded here.
+        events = self.actions
+        if not isinstance(events, DamageEventColumns):
+            events = decode_damage_events(events)
+        columns = events.columns
 
-        actions_df["ability_name"] = actions_df["ability"].apply(
-            lambda x: x.get("name") if isinstance(x, dict) else None
-        )
-        actions_df["abilityGameID"] = actions_df["ability"].apply(
-            lambda x: x.get("guid") if isinstance(x, dict) else None
+        # Time in seconds relative to the first second
+        elapsed_time = (columns["timestamp"] - columns["timestamp"][0]) / 1000
+        # Create proper
+        timestamp = columns["timestamp"] + self.report_start_time
+        self.fight_start_time = timestamp[0]
+
+        # Add (tick) to a dot tick so the base ability name for
+        # application and ticks are distinct - e.g., Dia and Dia (tick)
+        # Suffixes are added once per ability name and picked for each action.
+        ability_name = columns["ability_name"]
+        categories = np.asarray(ability_name.categories, dtype=object)
+        suffixed_names = np.empty((4, len(categories) + 1), dtype=object)
+        for i, suffix in enumerate(("", " (tick)", " (Pet)", " (tick) (Pet)")):
+            suffixed_names[i, :-1] = categories + suffix
+        # Actions without an ability name (code -1) stay NaN
+        suffixed_names[:, -1] = np.nan
+        suffix_variant = (columns["tick"] == True).astype(np.int64) + 2 * (
+            columns["sourceID"] != self.player_id
         )
-        actions_df.drop(columns="ability", inplace=True)
+        ability_name = suffixed_names[suffix_variant, ability_name.codes]
 
-        if "unpaired" in actions_df.columns:
-            action_df_columns.append("unpaired")
+        # Start to handle hit type buffs + medication
+        # Radiant Finale has the same ID regardless of strength, which is instead
+        # estimated from the time it was applied.
+        buff_set_ids = events.buff_set_ids.tolist()
+        has_radiant_finale = [radiant_finale_id in b for b in events.buff_sets]
+        radiant_finale = [
+            (
+                self.estimate_radiant_finale_strength(t)
+                if has_radiant_finale[b]
+                else None
+            )
+            for b, t in zip(buff_set_ids, elapsed_time.tolist())
+        ]
 
-        if "directHit" not in actions_df.columns:
-            actions_df["directHit"] = False
-        # Only include player ID and any of their associated pet IDs
+        # Adjustments only depend on the buffs, ability and Radiant Finale strength,
+        # so they are computed once per unique combination and broadcast back to
+        # each action.
+        unique_adjustments = {}
+        group = [
+            unique_adjustments.setdefault(k, len(unique_adjustments))
+            for k in zip(
+                buff_set_ids, columns["abilityGameID"].tolist(), radiant_finale
+            )
+        ]
+        buff_id, medicated, main_stat_adjust, hit_type_multiplier, p = zip(
+            *(
+                self._buff_adjustments(
+                    events.buff_sets[buff_set_id],
+                    ability_id,
+                    radiant_finale_strength,
+                    medication_id,
+                    radiant_finale_id,
+                )
+                for buff_set_id, ability_id, radiant_finale_strength in (
+                    unique_adjustments
+                )
+            )
+        )
+        buff_id = [sorted(b) for b in buff_id]
+        # Buff set IDs are interned once here, job modules keep them in sync.
+        self.buff_vocabulary = buff_vocabulary(self.patch_number)
+        buff_set_id = np.array(
+            [self.buff_vocabulary.intern(b) for b in buff_id], dtype=np.int64
+        )
 
-        if "tick" not in actions_df.columns:
-            actions_df["tick"] = False
+        # Medication is treated as a 5% damage bonus.
+        # ffxiv_stats directly alters the main stat, so it must be divided out
+        # Ground effects have multipliers of nan, and are unaffected either way.
+        multiplier = [
+            (round(m / medication_multiplier, 6) if medicated[g] else m)
+            * hit_type_multiplier[g]
+            for m, g in zip(columns["multiplier"].tolist(), group)
+        ]
+        # Create a unique action name based on the action + all buffs present
+        name_suffix = np.array(["-" + "_".join(b) for b in buff_id], dtype=object)
+        p = np.array(p)[group]
 
-        if "bonusPercent" not in actions_df.columns:
-            actions_df["bonusPercent"] = pd.NA
-            actions_df["bonusPercent"] = actions_df["bonusPercent"].astype("Int64")
+        # Assemble the action dataframe with updated values
+        # Later we can groupby/count to create a rotation dataframe
+        actions_df = pd.DataFrame(
+            {
+                "timestamp": timestamp,
+                "elapsed_time": elapsed_time,
+                "type": np.asarray(columns["type"], dtype=object),
+                "sourceID": columns["sourceID"],
+                "targetID": columns["targetID"],
+                "packetID": columns["packetID"],
+                "targetInstance": columns["targetInstance"],
+                "abilityGameID": columns["abilityGameID"],
+                "ability_name": ability_name,
+                "buffs": [list(buff_id[g]) for g in group],
+                "amount": columns["amount"],
+                "tick": columns["tick"],
+                "multiplier": multiplier,
+                "bonusPercent": columns["bonusPercent"],
+                "hitType": columns["hitType"],
+                "directHit": columns["directHit"],
+            }
+        )
+        if "unpaired" in columns:
+            actions_df["unpaired"] = columns["unpaired"]
 
-        if "targetInstance" not in actions_df.columns:
-            actions_df["targetInstance"] = 1
+        actions_df["action_name"] = actions_df["ability_name"] + name_suffix[group]
+        actions_df[["p_n", "p_c", "p_d", "p_cd"]] = p
+        actions_df["main_stat_add"] = [main_stat_adjust[g] for g in group]
+        actions_df["l_c"] = self._rate.crit_dmg_multiplier()
+        actions_df["buff_set_id"] = buff_set_id[group]
+        return actions_df
 
-        # Damage over time/ground effect ticks
-        if "tick" in actions_df.columns:
-            dots_present = True
-            damage_condition = (actions_df["type"] == "calculateddamage") | (
-                (actions_df["type"] == "damage") & (actions_df["tick"] == True)
-            )
-        else:
-            action_df_columns.remove("tick")
-            dots_present = False
-            damage_condition = actions_df["type"] == "calculateddamage"
+    def _create_job_specifics(
+        self, headers: dict[str, str], fight_info_response: dict | None = None
+    ):
+        """Create the job-specific helper, running its FFLogs queries.
 
-        # Only keep the "prepares action" or dot ticks
-        actions_df = actions_df[damage_condition]
+        Job helpers only need fight information, so this runs alongside the
+        damage events query. Black Mage is created in `_apply_job_specifics`
+        because it needs the actions DataFrame.
 
-        # Buffs column won't show up if no buffs are present, so make one with nans
-        # Only really happens in a striking dummy scenario
-        if "buffs" not in pd.DataFrame(self.actions).columns:
-            actions_df["buffs"] = pd.NA
-            actions_df["buffs"] = actions_df["buffs"].astype("object")
+        Args:
+            headers (dict[str, str]): FFLogs API headers.
+            fight_info_response (dict | None, optional): `FightInformation` report
+                response, which already contains the job's aura tables.
 
-        # Time in seconds relative to the first second
-        actions_df["elapsed_time"] = (
-            actions_df["timestamp"] - actions_df["timestamp"].iloc[0]
-        ) / 1000
-        # Create proper
-        actions_df["timestamp"] = actions_df["timestamp"] + self.report_start_time
-        self.fight_start_time = actions_df["timestamp"].iloc[0]
-        # Filter/rename columns
-        actions_df = actions_df[action_df_columns]
+        Returns:
+            The job-specific helper, or None if the job doesn't have one.
+        """
+        if self.job == "DarkKnight":
+            return JOB_CLASSES["DarkKnight"]()
 
-        # Add (tick) to a dot tick so the base ability name for
-        # application and ticks are distinct - e.g., Dia and Dia (tick)
-        if dots_present:
-            actions_df.loc[actions_df["tick"] == True, "ability_name"] = (
-                actions_df["ability_name"] + " (tick)"
+        elif self.job == "Paladin":
+            return JOB_CLASSES["Paladin"](
+                headers,
+                self.report_id,
+                self.fight_id,
+                self.player_id,
+                aura_report=fight_info_response,
             )
 
-        actions_df.loc[actions_df["sourceID"] != self.player_id, "ability_name"] += (
-            " (Pet)"
-        )
-
-        actions_df["buffs"] = actions_df["buffs"].apply(
-            lambda x: x[:-1].split(".") if not pd.isna(x) else []
-        )
-        actions_df = actions_df.reset_index(drop=True)
-
-        # Start to handle hit type buffs + medication
-        r = Rate(self.critical_hit_stat, self.direct_hit_stat, level=self.level)
-
-        multiplier = actions_df["multiplier"].tolist()
-        name = actions_df["ability_name"].tolist()
-
-        buff_id = actions_df["buffs"].tolist()
-
-        main_stat_adjust = [0] * len(actions_df)
-        crit_hit_rate_mod = [0] * len(actions_df)
-        direct_hit_rate_mod = [0] * len(actions_df)
-        p = [0] * len(actions_df)
-
-        # Loop actions to create adjustments to hit type rates rates/main stat
-        # There are enough conditionals/looping over array columns that vectorization isn't feasible.
-        for idx, row in actions_df.iterrows():
-            b = row["buffs"]
-
-            # Loop through buffs and do various things depending on the buff
-            for b_idx, s in enumerate(set(b)):
-                # Adjust critical/direct hit rate according to hit-type buffs
-                if s in self.critical_hit_rate_buffs.keys():
-                    crit_hit_rate_mod[idx] += self.critical_hit_rate_buffs[s]
-                if s in self.direct_hit_rate_buffs.keys():
-                    direct_hit_rate_mod[idx] += self.direct_hit_rate_buffs[s]
-
-                # Medication is treated as a 5% damage bonus.
-                # ffxiv_stats directly alters the main stat, so it must be divided out
-                # Ground effects have multipliers of nan, and are unaffected either way.
-                if s == medication_id:
-                    main_stat_adjust[idx] += self.medication_amt
-                    multiplier[idx] = round(multiplier[idx] / medication_multiplier, 6)
-
-                # Radiant Finale has the same ID regardless of strength
-                # A new ID is created for each buff strength.
-                # Different Radiant Finale strengths will lead to different
-                # 1-hit damage distributions.
-                if s == radiant_finale_id:
-                    buff_id[idx][b_idx] = self.estimate_radiant_finale_strength(
-                        actions_df.iloc[idx]["elapsed_time"]
-                    )
-
-                # All AST cards are lumped as either 6% buff or 3% buff.
-                # only do for pre-Dawntrail.
-                if (self.patch_number < 7.0) & (
-                    s in self.ranged_cards + self.melee_cards
-                ):
-                    buff_id[idx][b_idx] = self.ast_card_buff(s)[0]
-
-            # Check if action has a guaranteed hit type, potentially under a hit type buff.
-            # Get the hit type and new damage multiplier if hit type buffs were present.
-            multiplier[idx], hit_type = self.guaranteed_hit_type_damage_buff(
-                row["abilityGameID"],
-                b,
-                multiplier[idx],
-                crit_hit_rate_mod[idx],
-                direct_hit_rate_mod[idx],
+        elif self.job in ("Monk", "Ninja", "Dragoon"):
+            return JOB_AURA_CLASSES[self.job](
+                headers,
+                self.report_id,
+                self.fight_id,
+                self.player_id,
+                self.patch_number,
+                aura_report=fight_info_response,
             )
-            # Create a unique action name based on the action + all buffs present
-            if b != "":
-                name[idx] = name[idx] + "-" + "_".join(sorted(buff_id[idx]))
-
-            # Probability of each hit type, accounting for hit type buffs or
-            # guaranteed hit types.
-            # Hit type ignores hit type buff additions if they are present
-            p[idx] = r.get_p(
-                round(crit_hit_rate_mod[idx], 2),
-                round(direct_hit_rate_mod[idx], 2),
-                guaranteed_hit_type=hit_type,
+
+        elif self.job in ("Reaper", "Viper", "Samurai", "Machinist"):
+            return JOB_AURA_CLASSES[self.job](
+                headers,
+                self.report_id,
+                self.fight_id,
+                self.player_id,
+                aura_report=fight_info_response,
             )
 
-        # Assemble the action dataframe with updated values
-        # Later we can groupby/count to create a rotation dataframe
-        actions_df["multiplier"] = multiplier
-        actions_df["action_name"] = name
-        actions_df[["p_n", "p_c", "p_d", "p_cd"]] = pd.DataFrame(np.array(p))
-        actions_df["main_stat_add"] = main_stat_adjust
-        actions_df["l_c"] = r.crit_dmg_multiplier()
-        actions_df["buffs"] = (
-            actions_df["buffs"].sort_values().apply(lambda x: sorted(x))
-        )
-        return actions_df.reset_index(drop=True)
+        elif self.job == "Bard":
+            return JOB_CLASSES["Bard"](self.d2_100, self.patch_number)
+
+        return None
 
     def _apply_job_specifics(self, headers: dict[str, str]) -> None:
-        """Delegates job-specific transformations."""
-        self.job_specifics = None
+        """Delegates job-specific transformations.
+
+        Uses the job-specific helper from `_create_job_specifics`, already set
+        as `self.job_specifics`. Helpers add buffs with this table's buff
+        vocabulary, keeping `buff_set_id` in sync.
+
+        Args:
+            headers (dict[str, str]): FFLogs API headers.
+        """
+        if self.job_specifics is not None:
+            self.job_specifics.buff_vocabulary = self.buff_vocabulary
 
         if self.job == "DarkKnight":
-            self.job_specifics = DarkKnightActions()
             self.estimate_ground_effect_multiplier(
                 self.job_specifics.salted_earth_id,
             )
@@ -1223,15 +1668,12 @@ class ActionTable(BuffQuery):
             )
 
         elif self.job == "Paladin":
-            self.job_specifics = PaladinActions(
-                headers, self.report_id, self.fight_id, self.player_id
-            )
             self.actions_df = self.job_specifics.apply_pld_buffs(self.actions_df)
             pass
 
         # FIXME:
         elif self.job == "BlackMage":
-            self.job_specifics = BlackMageActions(
+            self.job_specifics = JOB_CLASSES["BlackMage"](
                 self.actions_df,
                 headers,
                 self.report_id,
@@ -1242,6 +1684,7 @@ class ActionTable(BuffQuery):
                 self.patch_number,
                 self.phase,
             )
+            self.job_specifics.buff_vocabulary = self.buff_vocabulary
             self.actions_df = self.job_specifics.apply_blm_buffs(self.actions_df)
             self.actions_df = self.actions_df[
                 self.actions_df["ability_name"] != "Attack"
@@ -1254,14 +1697,6 @@ class ActionTable(BuffQuery):
 
         # FIXME: I think arm of the destroyer won't get updated but surely no one would use that in savage.
         elif self.job == "Monk":
-            self.job_specifics = MonkActions(
-                headers,
-                self.report_id,
-                self.fight_id,
-                self.player_id,
-                self.patch_number,
-            )
-
             if self.patch_number < 7.0:
                 self.actions_df = self.job_specifics.apply_endwalker_mnk_buffs(
                     self.actions_df
@@ -1285,24 +1720,10 @@ class ActionTable(BuffQuery):
             pass
 
         elif self.job == "Ninja":
-            self.job_specifics = NinjaActions(
-                headers,
-                self.report_id,
-                self.fight_id,
-                self.player_id,
-                self.patch_number,
-            )
             self.actions_df = self.job_specifics.apply_ninja_buff(self.actions_df)
             pass
 
         elif self.job == "Dragoon":
-            self.job_specifics = DragoonActions(
-                headers,
-                self.report_id,
-                self.fight_id,
-                self.player_id,
-                self.patch_number,
-            )
             # if self.patch_number >= 7.0:
             #     self.actions_df = self.job_specifics.apply_dawntrail_life_of_the_dragon_buffs(
             #         self.actions_df
@@ -1320,22 +1741,13 @@ class ActionTable(BuffQuery):
                 )
 
         elif self.job == "Reaper":
-            self.job_specifics = ReaperActions(
-                headers, self.report_id, self.fight_id, self.player_id
-            )
             self.actions_df = self.job_specifics.apply_enhanced_buffs(self.actions_df)
             pass
 
         elif self.job == "Viper":
-            self.job_specifics = ViperActions(
-                headers, self.report_id, self.fight_id, self.player_id
-            )
             self.actions_df = self.job_specifics.apply_viper_buffs(self.actions_df)
 
         elif self.job == "Samurai":
-            self.job_specifics = SamuraiActions(
-                headers, self.report_id, self.fight_id, self.player_id
-            )
             self.actions_df = self.job_specifics.apply_enhanced_enpi(self.actions_df)
 
         elif self.job == "Machinist":
@@ -1349,13 +1761,9 @@ class ActionTable(BuffQuery):
                 1000861,
             )
             self.actions_df = self.actions_df.reset_index(drop=True)
-            self.job_specifics = MachinistActions(
-                headers, self.report_id, self.fight_id, self.player_id
-            )
             self.actions_df = self.job_specifics.apply_mch_potencies(self.actions_df)
 
         elif self.job == "Bard":
-            self.job_specifics = BardActions(self.d2_100, self.patch_number)
             self.actions_df = self.job_specifics.estimate_pitch_perfect_potency(
                 self.actions_df
             )
@@ -1384,20 +1792,52 @@ class ActionTable(BuffQuery):
             ]
         self.actions_df = self.actions_df.reset_index(drop=True)
 
-    def _apply_encounter_specifics(self, headers: dict[str, str]) -> None:
+    def _query_encounter_specifics(self, headers: dict[str, str]) -> dict:
+        """Run encounter-specific FFLogs queries.
+
+        These only need fight information, so they run alongside the damage events
+        query. The responses are used by `_apply_encounter_specifics`.
+
+        Args:
+            headers (dict[str, str]): FFLogs API headers.
+
+        Returns:
+            dict: Responses keyed by name, empty if the encounter needs none.
+        """
+        encounter_responses = {}
+        if (self.encounter_id == 1079) & (self.phase in (0, 2)):
+            encounter_responses["fru_vuln_down"] = (
+                EncounterSpecifics().query_fru_vuln_down(
+                    headers, self.report_id, self.fight_id
+                )
+            )
+        return encounter_responses
+
+    def _apply_encounter_specifics(
+        self, headers: dict[str, str], encounter_responses: dict | None = None
+    ) -> None:
+        if encounter_responses is None:
+            encounter_responses = {}
+        encounter_specifics = EncounterSpecifics()
+        encounter_specifics.buff_vocabulary = self.buff_vocabulary
+
         # Apply Groove buff, 3%
         if self.encounter_id == 97:
             pass
 
         if (self.encounter_id == 99) & (self.difficulty == 101):
-            self.actions_df = EncounterSpecifics().m7s_exclude_final_blooming(
+            self.actions_df = encounter_specifics.m7s_exclude_final_blooming(
                 self.actions_df, self.excluded_enemy_ids[0]
             )
 
         # FRU ice crystals, only for p2 or whole fight analysis.
         if (self.encounter_id == 1079) & (self.phase in (0, 2)):
-            self.actions_df = EncounterSpecifics().fru_apply_vuln_p2(
-                headers, self.report_id, self.fight_id, self.actions_df
+            self.actions_df = encounter_specifics.fru_apply_vuln_p2(
+                headers,
+                self.report_id,
+                self.fight_id,
+                self.actions_df,
+                vuln_response=encounter_responses.get("fru_vuln_down"),
             )
 
 
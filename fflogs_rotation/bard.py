@@ -1,6 +1,7 @@
 import pandas as pd
 
 from fflogs_rotation.base import BuffQuery
+from fflogs_rotation.buff_sets import update_buff_set_ids
 
 
 class BardActions(BuffQuery):
@@ -162,6 +163,9 @@ class BardActions(BuffQuery):
         actions_df.loc[~actions_df["pp_buff"].isna()].apply(
             lambda x: x["buffs"].append(x["pp_buff"]), axis=1
         )
+        update_buff_set_ids(
+            actions_df, ~actions_df["pp_buff"].isna(), self.buff_vocabulary
+        )
 
         return actions_df[original_columns]
 
@@ -210,6 +214,9 @@ class BardActions(BuffQuery):
         actions_df.loc[~actions_df["gauge"].isna()].apply(
             lambda x: x["buffs"].append(x["gauge"]), axis=1
         )
+        update_buff_set_ids(
+            actions_df, ~actions_df["gauge"].isna(), self.buff_vocabulary
+        )
         return actions_df[original_columns]
 
     def estimate_radiant_encore_potency(
@@ -227,13 +234,13 @@ class BardActions(BuffQuery):
         Returns:
             pd.DataFrame: Updated DataFrame with estimated Radiant Encore potencies.
         """
-        actions_df.loc[
-            (actions_df["abilityGameID"] == self.radiant_encore_id)
-            & (actions_df["elapsed_time"] < 40)
-        ].apply(lambda x: x["buffs"].append("c1"), axis=1)
-
-        actions_df.loc[
-            (actions_df["abilityGameID"] == self.radiant_encore_id)
-            & (actions_df["elapsed_time"] >= 40)
-        ].apply(lambda x: x["buffs"].append("c3"), axis=1)
+        one_coda = (actions_df["abilityGameID"] == self.radiant_encore_id) & (
+            actions_df["elapsed_time"] < 40
+        )
+        three_coda = (actions_df["abilityGameID"] == self.radiant_encore_id) & (
+            actions_df["elapsed_time"] >= 40
+        )
+        actions_df.loc[one_coda].apply(lambda x: x["buffs"].append("c1"), axis=1)
+        actions_df.loc[three_coda].apply(lambda x: x["buffs"].append("c3"), axis=1)
+        update_buff_set_ids(actions_df, one_coda | three_coda, self.buff_vocabulary)
         return actions_df
@@ -1,8 +1,26 @@
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from functools import reduce
+from typing import NamedTuple
 
 import numpy as np
 import pandas as pd
-import requests
+
+from fflogs_rotation.buff_sets import (
+    BuffVocabulary,
+    join_buffs,
+    map_buff_sets,
+    update_buff_set_ids,
+)
+from fflogs_rotation.cache import get_response_cache
+from fflogs_rotation.http_session import get_session
+from fflogs_rotation.rate_limit import (
+    estimate_query_cost,
+    get_rate_limiter,
+    submit_in_context,
+)
+from fflogs_rotation.single_flight import get_single_flight
 
 # from fflogs_rotation.rotation import FFLogsClient
 
@@ -18,23 +36,261 @@ def disjunction(*conditions):
     return reduce(np.logical_or, conditions)
 
 
+class IntervalSet:
+    """Sorted, merged set of time windows, like aura bands.
+
+    Checking which timestamps fall in any window is a single `searchsorted` over the
+    merged window starts, instead of a `Series.between` mask per window combined
+    with `disjunction`. Each window is a sequence whose first two elements are its
+    start and end; extra elements (e.g., stack counts) are ignored.
+
+    Example:
+        ```python
+        condition = IntervalSet(self.meisui_times, inclusive="right").contains(
+            actions_df["timestamp"]
+        )
+        ```
+    """
+
+    def __init__(self, windows: Iterable, inclusive: str = "both") -> None:
+        """Merge the windows.
+
+        Args:
+            windows (Iterable): Windows, with start and end as the first two elements.
+            inclusive (str, optional): Included window bounds, as in
+                `Series.between`: "both", "neither", "left" or "right".
+        """
+        if inclusive not in ("both", "neither", "left", "right"):
+            raise ValueError(
+                "inclusive must be one of 'both', 'neither', 'left' or 'right'"
+            )
+        self.inclusive = inclusive
+
+        bounds = np.array([(w[0], w[1]) for w in windows], dtype=float).reshape(-1, 2)
+        starts, ends = bounds[:, 0], bounds[:, 1]
+        # Drop windows which can't contain anything, including NaN bounds.
+        if inclusive == "both":
+            non_empty = starts <= ends
+        else:
+            non_empty = starts < ends
+        starts, ends = starts[non_empty], ends[non_empty]
+
+        order = np.argsort(starts, kind="stable")
+        starts, ends = starts[order], ends[order]
+
+        # A window starts a new merged window unless it overlaps the previous
+        # ones. Touching open bounds leave the shared point out of both.
+        previous_end = np.maximum.accumulate(ends)[:-1]
+        if inclusive == "neither":
+            new_window = np.r_[True, starts[1:] >= previous_end]
+        else:
+            new_window = np.r_[True, starts[1:] > previous_end]
+        new_window = new_window[: len(starts)]
+
+        self.starts = starts[new_window]
+        self.ends = (
+            np.maximum.reduceat(ends, np.flatnonzero(new_window))
+            if len(ends) > 0
+            else ends
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def contains(self, values: pd.Series) -> pd.Series:
+        """Boolean mask of values inside any window.
+
+        Identical to `disjunction` of `values.between(start, end, inclusive)` over
+        every window, but False everywhere if there are no windows.
+
+        Args:
+            values (pd.Series): Values to check, e.g., action timestamps.
+
+        Returns:
+            pd.Series: Boolean mask with the index and name of `values`.
+        """
+        x = values.to_numpy(dtype=float)
+        # Last window starting at or before (or strictly before) each value.
+        side = "right" if self.inclusive in ("both", "left") else "left"
+        idx = np.searchsorted(self.starts, x, side=side) - 1
+
+        mask = idx >= 0
+        window_end = self.ends[np.maximum(idx, 0)] if len(self) > 0 else x
+        if self.inclusive in ("both", "right"):
+            mask &= x <= window_end
+        else:
+            mask &= x < window_end
+        return pd.Series(mask, index=values.index, name=values.name)
+
+
+class AuraRequirement(NamedTuple):
+    """An aura table (or aura event list) a job module needs for its player.
+
+    Job modules declare these so the tables can be merged into another query,
+    e.g., `FightInformation`, instead of costing their own round trip.
+    """
+
+    alias: str
+    ability_id: int
+    # Query aura events instead of the aura table (bands)
+    events: bool = False
+
+
+def aura_fields(
+    requirements: Iterable[AuraRequirement], source_variable: str = "$playerID"
+) -> str:
+    """GraphQL `report` fields, aliased, for a collection of aura requirements.
+
+    Args:
+        requirements (Iterable[AuraRequirement]): Aura tables to query.
+        source_variable (str, optional): Query variable holding the player ID.
+
+    Returns:
+        str: Aliased `table`/`events` fields.
+    """
+    fields = []
+    for r in requirements:
+        arguments = (
+            f"fightIDs: $id dataType: Buffs sourceID: {source_variable} "
+            f"abilityID: {r.ability_id}"
+        )
+        if r.events:
+            fields.append(
+                f"{r.alias}: events({arguments}) {{ data nextPageTimestamp }}"
+            )
+        else:
+            fields.append(f"{r.alias}: table({arguments})")
+    return "\n".join(fields)
+
+
+def aura_query(operation_name: str, requirements: Iterable[AuraRequirement]) -> str:
+    """Standalone query for a collection of aura requirements."""
+    return f"""
+    query {operation_name}($code: String!, $id: [Int]!, $playerID: Int!) {{
+        reportData {{
+            report(code: $code) {{
+                startTime
+                {aura_fields(requirements)}
+            }}
+        }}
+    }}
+    """
+
+
+@dataclass
+class PageStats:
+    """Instrumentation for a paginated query."""
+
+    pages: int = 0
+    # Response bytes received over the network, cached pages count as 0.
+    bytes: int = 0
+    cached_pages: int = 0
+
+
 class FFLogsClient:
-    """Responsible for FFLogs API calls."""
+    """Responsible for FFLogs API calls.
+
+    Queries read through the process-wide response cache, see
+    `fflogs_rotation.cache.set_response_cache`, wait for the process-wide rate
+    limiter, see `fflogs_rotation.rate_limit`, and are sent over the shared
+    pooled session from `fflogs_rotation.http_session`. Identical requests in
+    flight at the same time are coalesced, see `fflogs_rotation.single_flight`.
+    """
 
     def __init__(self, api_url: str = "https://www.fflogs.com/api/v2/client"):
         self.api_url = api_url
 
+    def _gql_request(
+        self, headers: dict[str, str], query: str, variables: dict, operation_name: str
+    ) -> tuple[dict, int]:
+        """Run a GraphQL query, returning the response and bytes received.
+
+        Cached responses, and responses received by a coalesced identical request,
+        report 0 bytes received.
+        """
+        response_cache = get_response_cache()
+        cached_response = response_cache.get(operation_name, query, variables)
+        if cached_response is not None:
+            return cached_response, 0
+
+        n_bytes = 0
+
+        def fetch() -> dict:
+            nonlocal n_bytes
+            get_rate_limiter().acquire(headers, cost=estimate_query_cost(query))
+            json_payload = {
+                "query": query,
+                "variables": variables,
+                "operationName": operation_name,
+            }
+            response = get_session().post(
+                headers=headers, url=self.api_url, json=json_payload
+            )
+            response.raise_for_status()
+            n_bytes = len(response.content)
+            return response.json()
+
+        response_json = get_single_flight().run(operation_name, query, variables, fetch)
+        response_cache.set(operation_name, query, variables, response_json)
+        return response_json, n_bytes
+
     def gql_query(
         self, headers: dict[str, str], query: str, variables: dict, operation_name: str
     ) -> dict:
-        json_payload = {
-            "query": query,
-            "variables": variables,
-            "operationName": operation_name,
-        }
-        response = requests.post(headers=headers, url=self.api_url, json=json_payload)
-        response.raise_for_status()
-        return response.json()
+        return self._gql_request(headers, query, variables, operation_name)[0]
+
+    def paginate(
+        self,
+        headers: dict[str, str],
+        query: str,
+        variables: dict,
+        operation_name: str,
+        stats: PageStats | None = None,
+    ) -> Iterator[dict]:
+        """Stream every page of a paginated events query.
+
+        The query must page through `reportData.report.events` with a
+        `$startTime` variable and request `nextPageTimestamp`. The request for
+        the next page is sent as soon as the current page arrives, so it is in
+        flight while the caller processes the current page.
+
+        Args:
+            headers (dict[str, str]): FFLogs API headers.
+            query (str): GraphQL query string.
+            variables (dict): Query variables for the first page.
+            operation_name (str): GraphQL operation name.
+            stats (PageStats | None, optional): Updated with page counts and bytes.
+
+        Yields:
+            dict: The `reportData.report` portion of each page's response.
+        """
+        if stats is None:
+            stats = PageStats()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_page = submit_in_context(
+                executor, self._gql_request, headers, query, variables, operation_name
+            )
+            while next_page is not None:
+                response, n_bytes = next_page.result()
+                stats.pages += 1
+                stats.bytes += n_bytes
+                stats.cached_pages += int(n_bytes == 0)
+
+                report = response["data"]["reportData"]["report"]
+                next_page_timestamp = report["events"]["nextPageTimestamp"]
+                if next_page_timestamp is None:
+                    next_page = None
+                else:
+                    next_page = submit_in_context(
+                        executor,
+                        self._gql_request,
+                        headers,
+                        query,
+                        {**variables, "startTime": next_page_timestamp},
+                        operation_name,
+                    )
+                yield report
 
 
 class BuffQuery(FFLogsClient):
@@ -44,10 +300,79 @@ class BuffQuery(FFLogsClient):
     Provides base functionality for job-specific buff tracking classes.
     """
 
+    # Vocabulary of the actions' `buff_set_id`s, set by the `ActionTable` whose
+    # actions are being updated. Job modules used on their own leave IDs alone.
+    buff_vocabulary: BuffVocabulary | None = None
+
     def __init__(self, api_url: str = "https://www.fflogs.com/api/v2/client") -> None:
         super().__init__()
         self.api_url = api_url
 
+    def instance_aura_requirements(
+        self,
+        ability_ids: dict[str, int],
+        requirements: Iterable[AuraRequirement] | None = None,
+    ) -> tuple[AuraRequirement, ...]:
+        """The class' aura requirements, with the buff IDs of this instance.
+
+        Args:
+            ability_ids (dict[str, int]): Buff ID of each alias this instance may
+                override, e.g., from constructor arguments.
+            requirements (Iterable[AuraRequirement] | None, optional): Class
+                requirements to use. Defaults to `aura_requirements`.
+
+        Returns:
+            tuple[AuraRequirement, ...]: Aura requirements to query.
+        """
+        if requirements is None:
+            requirements = type(self).aura_requirements
+        return tuple(
+            r._replace(ability_id=ability_ids.get(r.alias, r.ability_id))
+            for r in requirements
+        )
+
+    def query_auras(
+        self,
+        headers: dict[str, str],
+        requirements: Iterable[AuraRequirement],
+        operation_name: str,
+        aura_report: dict | None = None,
+    ) -> dict:
+        """Get a response containing the requested aura tables.
+
+        If `aura_report` already contains every requested table, e.g., because
+        they were merged into `ActionTable`'s `FightInformation` query, it is
+        reused instead of querying FFLogs again. Only the class' default
+        `aura_requirements` are merged, so requirements with other buff IDs are
+        always queried.
+
+        Args:
+            headers (dict[str, str]): FFLogs API headers.
+            requirements (Iterable[AuraRequirement]): Aura tables needed.
+            operation_name (str): Operation name for the standalone query.
+            aura_report (dict | None, optional): `reportData.report` portion of a
+                response which may already contain the aura tables.
+
+        Returns:
+            dict: GraphQL response with the aura tables and report `startTime`.
+        """
+        requirements = tuple(requirements)
+        # Only the class' default requirements were merged into other queries.
+        merged = set(getattr(type(self), "aura_requirements", ()))
+        if (aura_report is not None) and all(
+            (r in merged) and (r.alias in aura_report) for r in requirements
+        ):
+            return {"data": {"reportData": {"report": aura_report}}}
+
+        variables = {
+            "code": self.report_id,
+            "id": [self.fight_id],
+            "playerID": self.player_id,
+        }
+        return self.gql_query(
+            headers, aura_query(operation_name, requirements), variables, operation_name
+        )
+
     def _get_buff_times(
         self,
         buff_response: dict,
@@ -83,7 +408,7 @@ class BuffQuery(FFLogsClient):
         """
         Apply a buff to an actions DataFrame.
 
-        Appends the buff ID to `buffs` column.
+        Appends the buff ID to `buffs` column, updating `buff_set_id`.
         Updates the `action_name` column to include the new buff ID.
 
         Args:
@@ -97,11 +422,12 @@ class BuffQuery(FFLogsClient):
         actions_df.loc[condition, "buffs"] = actions_df.loc[condition, "buffs"].apply(
             lambda x: x + [str(buff_id)]
         )
+        update_buff_set_ids(actions_df, condition, self.buff_vocabulary, str(buff_id))
 
         actions_df["action_name"] = (
             actions_df["action_name"].str.split("-").str[0]
             + "-"
-            + actions_df["buffs"].sort_values().str.join("_")
+            + map_buff_sets(actions_df["buffs"], lambda b: join_buffs(b, "_"))
         )
         return actions_df
 
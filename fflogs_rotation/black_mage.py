@@ -3,7 +3,8 @@ import warnings
 import numpy as np
 import pandas as pd
 
-from fflogs_rotation.base import BuffQuery, disjunction
+from fflogs_rotation.base import BuffQuery, IntervalSet
+from fflogs_rotation.buff_sets import join_buffs, map_buff_sets, update_buff_set_ids
 
 # Filter all DataFrame concatenation deprecation warnings
 warnings.filterwarnings(
@@ -1054,16 +1055,13 @@ class BlackMageActions(BuffQuery):
 
         # Apply Astral Fire
         for elemental_level, time_bounds in self.elemental_state_times.items():
-            elemental_betweens = list(
-                actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-                for b in time_bounds
-            )
+            elemental_windows = IntervalSet(time_bounds, inclusive="right")
 
             # Loop over all fire actions and apply
             for elemental_id in fire_ice_actions.keys():
-                elemental_condition = disjunction(*elemental_betweens) & (
-                    actions_df["abilityGameID"] == elemental_id
-                )
+                elemental_condition = elemental_windows.contains(
+                    actions_df["timestamp"]
+                ) & (actions_df["abilityGameID"] == elemental_id)
 
                 actions_df = self._apply_buffs(
                     actions_df, elemental_condition, elemental_level
@@ -1093,6 +1091,12 @@ class BlackMageActions(BuffQuery):
                 actions_df.loc[enochian_bounds & no_tick, "buffs"] = actions_df[
                     "buffs"
                 ].apply(lambda x: x + ["enochian"])
+                update_buff_set_ids(
+                    actions_df,
+                    enochian_bounds & no_tick,
+                    self.buff_vocabulary,
+                    "enochian",
+                )
                 # Enochian indicator
                 actions_df.loc[enochian_bounds & no_tick, "enochian_multiplier"] *= (
                     self.enochian_buff
@@ -1108,12 +1112,17 @@ class BlackMageActions(BuffQuery):
                 .groupby("packetID")[["buffs", "enochian_multiplier"]]
                 .transform("first")
             )
+            update_buff_set_ids(
+                actions_df,
+                actions_df["abilityGameID"].isin(thunder_tick_ids),
+                self.buff_vocabulary,
+            )
 
         # Update all the action names
         actions_df["action_name"] = (
             actions_df["action_name"].str.split("-").str[0]
             + "-"
-            + actions_df["buffs"].sort_values().str.join("_")
+            + map_buff_sets(actions_df["buffs"], lambda b: join_buffs(b, "_"))
         )
 
         # Apply buff multipliers to everything
@@ -0,0 +1,211 @@
+"""Interned buff sets for the `buffs` column of actions DataFrames.
+
+Each action keeps its buffs as a list of buff IDs, which job modules append to.
+Thousands of actions share a few dozen distinct buff lists, so derived forms like
+action name suffixes or group-by keys are built once per distinct buff list and
+broadcast back to the actions, instead of sorting and joining every row.
+
+Actions also carry an integer `buff_set_id` from the `BuffVocabulary` of their
+patch. It's interned once when the actions DataFrame is created and kept in sync
+by `update_buff_set_ids` wherever buffs are added, so rotations are counted by
+the ID without looking at the buff lists again.
+"""
+
+import functools
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def factorize_buff_sets(
+    buffs: Iterable[list[str]],
+) -> tuple[np.ndarray, list[tuple[str, ...]]]:
+    """Intern buff lists as integer buff set IDs.
+
+    Buff lists with the same buffs in the same order share an ID.
+
+    Args:
+        buffs (Iterable[list[str]]): Buff list of each action.
+
+    Returns:
+        tuple[np.ndarray, list[tuple[str, ...]]]: Buff set ID of each action and
+            the buff set of each ID.
+    """
+    ids: dict[tuple[str, ...], int] = {}
+    buff_set_ids = np.fromiter(
+        (ids.setdefault(tuple(b), len(ids)) for b in buffs), dtype=np.int64
+    )
+    return buff_set_ids, list(ids)
+
+
+class BuffVocabulary:
+    """Integer IDs of sorted buff sets, shared by the actions tables of a patch.
+
+    IDs are assigned in the order buff sets are first seen and never change, so
+    an ID is only meaningful with the vocabulary which assigned it. Pickling a
+    vocabulary keeps its IDs.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ids: dict[tuple[str, ...], int] = {}
+        # Sorted buffs of each ID.
+        self.buff_sets: list[tuple[str, ...]] = []
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.buff_sets)
+
+    def intern(self, buffs: Iterable[str]) -> int:
+        """ID of a buff set, regardless of buff order.
+
+        Args:
+            buffs (Iterable[str]): Buff IDs.
+
+        Returns:
+            int: Buff set ID.
+        """
+        # Non-string buffs, e.g., NaN, are sorted by their string form.
+        buff_set = tuple(sorted(buffs, key=str))
+        buff_set_id = self._ids.get(buff_set)
+        if buff_set_id is None:
+            with self._lock:
+                buff_set_id = self._ids.get(buff_set)
+                if buff_set_id is None:
+                    buff_set_id = len(self.buff_sets)
+                    self.buff_sets.append(buff_set)
+                    self._ids[buff_set] = buff_set_id
+        return buff_set_id
+
+    def intern_all(self, buffs: Iterable[list[str]]) -> np.ndarray:
+        """IDs of each action's buffs, sorting each distinct buff list once.
+
+        Args:
+            buffs (Iterable[list[str]]): Buff list of each action.
+
+        Returns:
+            np.ndarray: Buff set ID of each action.
+        """
+        buff_list_ids, buff_lists = factorize_buff_sets(buffs)
+        buff_set_ids = np.array([self.intern(b) for b in buff_lists], dtype=np.int64)
+        return buff_set_ids[buff_list_ids]
+
+    def add(self, buff_set_ids: Iterable[int], buff: str) -> np.ndarray:
+        """IDs of buff sets with a buff added, once per distinct buff set.
+
+        Args:
+            buff_set_ids (Iterable[int]): Buff set IDs.
+            buff (str): Buff ID to add.
+
+        Returns:
+            np.ndarray: Buff set ID of each buff set with `buff` added.
+        """
+        unique_ids, inverse = np.unique(
+            np.asarray(buff_set_ids, dtype=np.int64), return_inverse=True
+        )
+        added = np.array(
+            [self.intern(self.buff_sets[i] + (buff,)) for i in unique_ids],
+            dtype=np.int64,
+        )
+        return added[inverse]
+
+    def is_valid(self, buff_set_ids: Iterable[int]) -> np.ndarray:
+        """Whether each buff set only contains buff IDs, and can be counted.
+
+        Args:
+            buff_set_ids (Iterable[int]): Buff set IDs.
+
+        Returns:
+            np.ndarray: Boolean array, one per ID.
+        """
+        unique_ids, inverse = np.unique(
+            np.asarray(buff_set_ids, dtype=np.int64), return_inverse=True
+        )
+        is_valid = np.array(
+            [all(isinstance(b, str) for b in self.buff_sets[i]) for i in unique_ids],
+            dtype=bool,
+        )
+        return is_valid[inverse]
+
+
+@functools.cache
+def buff_vocabulary(patch_number: float) -> BuffVocabulary:
+    """The buff vocabulary shared by every actions table of a patch.
+
+    Args:
+        patch_number (float): Game patch, e.g., 7.2.
+
+    Returns:
+        BuffVocabulary: Vocabulary of the patch.
+    """
+    return BuffVocabulary()
+
+
+def update_buff_set_ids(
+    actions_df: pd.DataFrame,
+    condition: pd.Series | None,
+    vocabulary: BuffVocabulary | None,
+    buff: str | None = None,
+) -> None:
+    """Update the buff set IDs of actions whose buffs were changed, in place.
+
+    Does nothing if the DataFrame has no `buff_set_id` column or there is no
+    vocabulary, e.g., for job modules used on their own.
+
+    Args:
+        actions_df (pd.DataFrame): Actions DataFrame with `buffs` and
+            `buff_set_id` columns.
+        condition (pd.Series | None): Boolean mask of the changed actions, None
+            if all of them changed.
+        vocabulary (BuffVocabulary | None): Vocabulary of the `buff_set_id`s.
+        buff (str | None, optional): Buff ID which was added to each changed
+            action. If None, the changed buff lists are interned instead.
+    """
+    if vocabulary is None or "buff_set_id" not in actions_df.columns:
+        return
+    if condition is None:
+        condition = slice(None)
+    elif not condition.any():
+        return
+    if buff is None:
+        buff_set_ids = vocabulary.intern_all(actions_df.loc[condition, "buffs"])
+    else:
+        buff_set_ids = vocabulary.add(actions_df.loc[condition, "buff_set_id"], buff)
+    actions_df.loc[condition, "buff_set_id"] = buff_set_ids
+
+
+def map_buff_sets(
+    buffs: pd.Series, func: Callable[[tuple[str, ...]], Any]
+) -> pd.Series:
+    """Apply a function once per distinct buff set and broadcast the result.
+
+    Args:
+        buffs (pd.Series): `buffs` column of an actions DataFrame.
+        func (Callable[[tuple[str, ...]], Any]): Function of a buff set.
+
+    Returns:
+        pd.Series: Result for each action, with the index of `buffs`.
+    """
+    buff_set_ids, buff_sets = factorize_buff_sets(buffs)
+    values = np.empty(len(buff_sets), dtype=object)
+    values[:] = [func(b) for b in buff_sets]
+    return pd.Series(values[buff_set_ids], index=buffs.index, dtype=object)
+
+
+def join_buffs(buff_set: Iterable[str], sep: str) -> str | float:
+    """Join buff IDs like `Series.str.join`, NaN if any buff isn't a string."""
+    buff_set = list(buff_set)
+    if not all(isinstance(b, str) for b in buff_set):
+        return np.nan
+    return sep.join(buff_set)
@@ -0,0 +1,175 @@
+"""Response caching for FFLogs GraphQL queries.
+
+A finished report's fights, events and aura tables never change, so responses are
+cached keyed by (operation name, normalized query, variables). Reports which may
+still be live-logged are only cached for a short time.
+
+The cache used by `FFLogsClient.gql_query` is process-wide and set with
+`set_response_cache`. The default cache is a no-op, so nothing is cached unless
+the app opts in.
+"""
+
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+
+import diskcache
+
+
+def normalize_query(query: str) -> str:
+    """Strip comments and collapse whitespace so formatting doesn't change the key.
+
+    Args:
+        query (str): GraphQL query string.
+
+    Returns:
+        str: Normalized query string.
+    """
+    query = re.sub(r"#[^\n]*", "", query)
+    return " ".join(query.split())
+
+
+def response_cache_key(operation_name: str, query: str, variables: dict) -> str:
+    """Create a stable cache key for a GraphQL request.
+
+    Args:
+        operation_name (str): GraphQL operation name.
+        query (str): GraphQL query string.
+        variables (dict): Query variables.
+
+    Returns:
+        str: Hex digest identifying the request.
+    """
+    payload = json.dumps(
+        {
+            "operationName": operation_name,
+            "query": normalize_query(query),
+            "variables": variables,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """No-op response cache, every lookup is a miss."""
+
+    def get(self, operation_name: str, query: str, variables: dict) -> dict | None:
+        return None
+
+    def set(
+        self, operation_name: str, query: str, variables: dict, response: dict
+    ) -> None:
+        pass
+
+
+class DiskResponseCache(ResponseCache):
+    """Size-bounded, least-recently-used disk cache of FFLogs responses.
+
+    Responses are cached for `ttl` seconds, unless the report started within the
+    last `live_window` seconds and could still be live-logged, in which case they
+    are cached for `live_ttl` seconds. The report start time is read from any
+    response which queries `startTime` and remembered per report code, so queries
+    without it (e.g., damage events) still get the correct TTL. If the report start
+    time is unknown, the report is treated as live.
+
+    Responses containing errors are never cached.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        size_limit: int = 2**30,
+        ttl: float = 30 * 24 * 3600,
+        live_ttl: float = 300,
+        live_window: float = 12 * 3600,
+    ) -> None:
+        """Open (or create) the disk cache.
+
+        Args:
+            directory (str | Path): Cache directory.
+            size_limit (int, optional): Maximum cache size in bytes. Defaults to 1 GiB.
+            ttl (float, optional): Seconds to cache finished reports. Defaults to 30 days.
+            live_ttl (float, optional): Seconds to cache reports which could still be
+                live-logged. Defaults to 5 minutes.
+            live_window (float, optional): Seconds after the report start time that
+                a report is considered potentially live. Defaults to 12 hours.
+        """
+        self.cache = diskcache.Cache(
+            str(directory),
+            size_limit=size_limit,
+            eviction_policy="least-recently-used",
+        )
+        self.ttl = ttl
+        self.live_ttl = live_ttl
+        self.live_window = live_window
+
+    @staticmethod
+    def _report_start_key(report_code: str) -> str:
+        return f"report-start-{report_code}"
+
+    def _report_start_time(self, variables: dict, response: dict) -> int | None:
+        """Get the report start time (ms) from the response or a prior response."""
+        report_code = variables.get("code")
+        try:
+            start_time = response["data"]["reportData"]["report"]["startTime"]
+        except (KeyError, TypeError):
+            start_time = None
+
+        if report_code is None:
+            return start_time
+
+        if start_time is not None:
+            self.cache.set(self._report_start_key(report_code), start_time)
+            return start_time
+        return self.cache.get(self._report_start_key(report_code))
+
+    def response_ttl(self, variables: dict, response: dict) -> float:
+        """Seconds a response should be cached for.
+
+        Args:
+            variables (dict): Query variables, `code` is the report code.
+            response (dict): GraphQL response.
+
+        Returns:
+            float: Time to live in seconds.
+        """
+        report_start_time = self._report_start_time(variables, response)
+        if report_start_time is None:
+            return self.live_ttl
+
+        report_age = time.time() - report_start_time / 1000
+        if report_age > self.live_window:
+            return self.ttl
+        return self.live_ttl
+
+    def get(self, operation_name: str, query: str, variables: dict) -> dict | None:
+        return self.cache.get(response_cache_key(operation_name, query, variables))
+
+    def set(
+        self, operation_name: str, query: str, variables: dict, response: dict
+    ) -> None:
+        if ("errors" in response) or ("data" not in response):
+            return
+        self.cache.set(
+            response_cache_key(operation_name, query, variables),
+            response,
+            expire=self.response_ttl(variables, response),
+        )
+
+
+_response_cache: ResponseCache = ResponseCache()
+
+
+def set_response_cache(response_cache: ResponseCache | None) -> None:
+    """Set the process-wide response cache, `None` disables caching."""
+    global _response_cache
+    _response_cache = ResponseCache() if response_cache is None else response_cache
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache."""
+    return _response_cache
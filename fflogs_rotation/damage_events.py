@@ -0,0 +1,240 @@
+"""Columnar decoding of FFLogs damage events.
+
+`pd.DataFrame(events)` on a list of event dicts infers every column through
+object arrays, and the nested `ability` dict and dotted `buffs` string then need
+a per-row `.apply` each. Instead, the events are walked once, keeping only the
+damage events an actions table is built from, into typed NumPy arrays. Ability
+names are categorical and buff strings are interned as buff set IDs, so each
+distinct name or buff string is only decoded once. Paginated queries decode each
+page with `DamageEventDecoder` as it arrives.
+
+Column dtypes and defaults follow `pd.DataFrame` on the whole event list, so
+fields are tracked on every event, including the ones which aren't kept.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Event types of the actions table: "prepares action" events and DoT ticks.
+DAMAGE_EVENT_TYPES = ("calculateddamage", "damage")
+
+# Numeric event fields. Integer fields become float64 with NaN if any event lacks
+# them, as `pd.DataFrame` would infer.
+INT_FIELDS = (
+    "timestamp",
+    "sourceID",
+    "targetID",
+    "packetID",
+    "targetInstance",
+    "amount",
+    "bonusPercent",
+    "hitType",
+)
+FLOAT_FIELDS = ("multiplier",)
+# Flags are only present on events where they are true, so they are True/NaN
+# object columns, or all False if no event has them.
+BOOL_FIELDS = ("tick", "directHit", "unpaired")
+TRACKED_FIELDS = frozenset(INT_FIELDS + BOOL_FIELDS)
+
+
+@dataclass
+class DamageEventColumns:
+    """Typed columns of damage events, one row per kept event."""
+
+    # Event field -> column. `ability_name` and `type` are categorical.
+    columns: dict[str, np.ndarray | pd.Categorical]
+    # Buff set ID of each event, indexing `buff_sets`.
+    buff_set_ids: np.ndarray
+    buff_sets: list[tuple[str, ...]]
+
+    def __len__(self) -> int:
+        return len(self.buff_set_ids)
+
+
+def _int_column(values: list, missing: bool = False) -> np.ndarray:
+    """Integer column, or float64 with NaN if any value is missing.
+
+    Args:
+        values (list): Column values, None where the field is missing.
+        missing (bool, optional): Whether the field is missing from any event,
+            including events which weren't kept.
+    """
+    if missing or any(v is None for v in values):
+        return np.array(values, dtype=np.float64)
+    return np.array(values, dtype=np.int64)
+
+
+def _flag_column(values: list, present: bool, missing: bool) -> np.ndarray:
+    """Flag column as `pd.DataFrame` infers it from the whole event list.
+
+    Args:
+        values (list): Raw flag values, None where the flag is missing.
+        present (bool): Whether any event has the flag.
+        missing (bool): Whether any event lacks the flag.
+    """
+    if not present:
+        return np.zeros(len(values), dtype=bool)
+    if not missing:
+        return np.array(values)
+    return np.array([np.nan if v is None else v for v in values], dtype=object)
+
+
+class DamageEventDecoder:
+    """Incrementally decode pages of damage events into typed columns.
+
+    Each page is walked into row buffers as soon as it's added, e.g., while the
+    next page is still being fetched. The typed columns are only built once, by
+    `finish`, so they're the same as decoding all events at once.
+    """
+
+    def __init__(self) -> None:
+        self.rows: list[tuple] = []
+        self.flags: list[tuple] = []
+        # Fields present on any event and missing from any event, kept or not.
+        self.present_fields: set[str] = set()
+        self.missing_fields: set[str] = set()
+        self.ability_id_missing = False
+        self.type_codes: list[int] = []
+        # (name, guid) of each distinct ability, and the raw string of each buff set.
+        self.abilities: dict[tuple, int] = {}
+        self.ability_codes: list[int] = []
+        self.buff_strings: dict[str | None, int] = {}
+        self.buff_set_ids: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, events: list[dict]) -> None:
+        """Decode a page of raw FFLogs damage events into the row buffers.
+
+        Only "calculateddamage" events and "damage" events which are DoT ticks are
+        kept.
+
+        Args:
+            events (list[dict]): Raw FFLogs damage events.
+        """
+        numeric_fields = INT_FIELDS + FLOAT_FIELDS
+        for event in events:
+            fields = TRACKED_FIELDS.intersection(event)
+            self.present_fields |= fields
+            if len(fields) < len(TRACKED_FIELDS):
+                self.missing_fields |= TRACKED_FIELDS - fields
+            ability = event.get("ability")
+            if not isinstance(ability, dict) or ability.get("guid") is None:
+                self.ability_id_missing = True
+
+            event_type = event.get("type")
+            is_tick = event.get("tick", False) == True
+            if event_type == "calculateddamage":
+                self.type_codes.append(0)
+            elif event_type == "damage" and is_tick:
+                self.type_codes.append(1)
+            else:
+                continue
+
+            self.rows.append(tuple(map(event.get, numeric_fields)))
+            self.flags.append(tuple(map(event.get, BOOL_FIELDS)))
+
+            key = (
+                (ability.get("name"), ability.get("guid"))
+                if isinstance(ability, dict)
+                else (None, None)
+            )
+            self.ability_codes.append(
+                self.abilities.setdefault(key, len(self.abilities))
+            )
+
+            buffs = event.get("buffs")
+            self.buff_set_ids.append(
+                self.buff_strings.setdefault(buffs, len(self.buff_strings))
+            )
+
+    def finish(self) -> DamageEventColumns:
+        """Build the typed columns of every event added so far.
+
+        Missing flags are NaN, or False if no event has the flag, and missing
+        `buffs` decode to an empty buff set. `unpaired` is only a column if some
+        event has it.
+
+        Returns:
+            DamageEventColumns: Columns of the kept events.
+        """
+        numeric_fields = INT_FIELDS + FLOAT_FIELDS
+        n = len(self.rows)
+        columns: dict[str, np.ndarray | pd.Categorical] = {}
+        numeric = list(zip(*self.rows)) if n else [()] * len(numeric_fields)
+        for name, values in zip(numeric_fields, numeric):
+            values = list(values)
+            if name in FLOAT_FIELDS:
+                columns[name] = np.array(values, dtype=np.float64)
+            else:
+                columns[name] = _int_column(values, name in self.missing_fields)
+
+        flags = list(zip(*self.flags)) if n else [()] * len(BOOL_FIELDS)
+        for name, values in zip(BOOL_FIELDS, flags):
+            if name == "unpaired" and name not in self.present_fields:
+                continue
+            columns[name] = _flag_column(
+                list(values),
+                name in self.present_fields,
+                name in self.missing_fields,
+            )
+
+        # Fields no event had get the defaults `create_action_df` has always used.
+        if "targetInstance" not in self.present_fields:
+            columns["targetInstance"] = np.ones(n, dtype=np.int64)
+        if "bonusPercent" not in self.present_fields:
+            columns["bonusPercent"] = pd.array([pd.NA] * n, dtype="Int64")
+
+        columns["type"] = pd.Categorical.from_codes(
+            np.array(self.type_codes, dtype=np.int8),
+            categories=list(DAMAGE_EVENT_TYPES),
+        )
+
+        # Ability names and IDs are decoded once per distinct ability.
+        name_codes: dict[str, int] = {}
+        ability_name_code = np.array(
+            [
+                -1 if name is None else name_codes.setdefault(name, len(name_codes))
+                for name, _ in self.abilities
+            ],
+            dtype=np.int64,
+        )
+        ability_codes = np.array(self.ability_codes, dtype=np.int64)
+        columns["ability_name"] = pd.Categorical.from_codes(
+            ability_name_code[ability_codes], categories=list(name_codes)
+        )
+        columns["abilityGameID"] = _int_column(
+            [guid for _, guid in self.abilities], self.ability_id_missing
+        )[ability_codes]
+
+        # Buffs are listed like "1000049.1001221.", or missing if there are none.
+        buff_sets = [
+            tuple(s[:-1].split(".")) if isinstance(s, str) else ()
+            for s in self.buff_strings
+        ]
+        return DamageEventColumns(
+            columns=columns,
+            buff_set_ids=np.array(self.buff_set_ids, dtype=np.int64),
+            buff_sets=buff_sets,
+        )
+
+
+def decode_damage_events(events: list[dict]) -> DamageEventColumns:
+    """Decode damage events into typed columns in a single pass.
+
+    Only "calculateddamage" events and "damage" events which are DoT ticks are
+    kept. Missing flags are NaN, or False if no event has the flag, and missing
+    `buffs` decode to an empty buff set.
+
+    Args:
+        events (list[dict]): Raw FFLogs damage events.
+
+    Returns:
+        DamageEventColumns: Columns of the kept events.
+    """
+    decoder = DamageEventDecoder()
+    decoder.add(events)
+    return decoder.finish()
@@ -1,7 +1,8 @@
 import numpy as np
 import pandas as pd
 
-from fflogs_rotation.base import disjunction
+from fflogs_rotation.base import IntervalSet
+from fflogs_rotation.buff_sets import BuffVocabulary, update_buff_set_ids
 
 
 class DarkKnightActions:
@@ -16,6 +17,9 @@ class DarkKnightActions:
         >>> actions = drk.apply_drk_things(df, player_id=123, pet_id=456)
     """
 
+    # Vocabulary of the actions' `buff_set_id`s, like `BuffQuery.buff_vocabulary`.
+    buff_vocabulary: BuffVocabulary | None = None
+
     def __init__(self, salted_earth_id: int = 1000749) -> None:
         """Initialize Dark Knight actions handler.
 
@@ -113,16 +117,13 @@ class DarkKnightActions:
             DataFrame with Darkside buffs applied to valid actions
         """
 
-        no_darkside_conditions = (
-            action_df["elapsed_time"].between(b[0], b[1])
-            for b in self.no_darkside_time_intervals
-        )
+        no_darkside_windows = IntervalSet(self.no_darkside_time_intervals)
         action_df["darkside_buff"] = 1.0
         # Add 10% Darkside buff except
         # For living shadow
         # For salted earth (this gets snapshotted)
         action_df.loc[
-            ~disjunction(*no_darkside_conditions)
+            ~no_darkside_windows.contains(action_df["elapsed_time"])
             & (action_df["sourceID"] != pet_id)
             & (action_df["ability_name"] != "Salted Earth (tick)"),
             "darkside_buff",
@@ -153,12 +154,8 @@ class DarkKnightActions:
         ].cumsum()
 
         # Check if salted earth snapshotted Darkside
-        no_darkside_conditions_se = (
-            salted_earth["elapsed_time"].between(b[0], b[1])
-            for b in self.no_darkside_time_intervals
-        )
         salted_earth.loc[
-            ~disjunction(*no_darkside_conditions_se)
+            ~no_darkside_windows.contains(salted_earth["elapsed_time"])
             & (salted_earth["salted_earth_application"] == 1),
             "darkside_buff",
         ] = 1.1
@@ -181,6 +178,9 @@ class DarkKnightActions:
         action_df.loc[action_df["darkside_buff"] == 1.1, "buffs"].apply(
             lambda x: x.append("Darkside")
         )
+        update_buff_set_ids(
+            action_df, action_df["darkside_buff"] == 1.1, self.buff_vocabulary
+        )
         # And add to unique name
         action_df.loc[action_df["darkside_buff"] == 1.1, "action_name"] + "_Darkside"
         return action_df.drop(columns=["darkside_buff"])
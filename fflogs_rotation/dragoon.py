@@ -1,12 +1,21 @@
 import pandas as pd
 from numpy.typing import NDArray
 
-from fflogs_rotation.base import BuffQuery, disjunction
+from fflogs_rotation.base import AuraRequirement, BuffQuery, IntervalSet
 
 # FIXME: add enhanced ranged attack buff
 
 
 class DragoonActions(BuffQuery):
+    # Aura tables needed for the player, see `BuffQuery.query_auras`.
+    # Combo finishers are only needed before 7.0, enhanced piercing talon from 7.2.
+    combo_finisher_requirements = (
+        AuraRequirement("fangBared", 1000802, events=True),
+        AuraRequirement("wheelMotion", 1000803, events=True),
+    )
+    enhanced_talon_requirements = (AuraRequirement("enhancedTalon", 1001870),)
+    aura_requirements = combo_finisher_requirements + enhanced_talon_requirements
+
     def __init__(
         self,
         headers: dict[str, str],
@@ -20,6 +29,7 @@ class DragoonActions(BuffQuery):
         wheel_in_motion_id: int = 1000803,
         life_of_the_dragon_id: int = 1003177,
         piercing_talon_id: int = 90,
+        aura_report: dict | None = None,
     ) -> None:
         super().__init__()
         self.report_id = report_id
@@ -36,66 +46,38 @@ class DragoonActions(BuffQuery):
         self.life_of_the_dragon_id = life_of_the_dragon_id
         self.piercing_talon_id = piercing_talon_id
 
+        self.combo_finisher_requirements = self.instance_aura_requirements(
+            {"fangBared": fang_and_claw_bared_id, "wheelMotion": wheel_in_motion_id},
+            DragoonActions.combo_finisher_requirements,
+        )
+        self.aura_requirements = (
+            self.combo_finisher_requirements + self.enhanced_talon_requirements
+        )
+
         if patch_number < 7.0:
-            self._set_combo_finisher_timings(headers)
+            self._set_combo_finisher_timings(headers, aura_report)
 
         # Enhanced piercing talon
         if patch_number >= 7.2:
             self.enhanced_piercing_times = self._get_enhanced_piercing_talon_times(
-                headers
+                headers, aura_report
             )
 
-    def _set_combo_finisher_timings(self, headers: dict[str, str]) -> None:
+    def _set_combo_finisher_timings(
+        self, headers: dict[str, str], aura_report: dict | None = None
+    ) -> None:
         """
         Set the timings for combo finishers based on the provided headers.
 
         Parameters:
             headers (Dict[str, str]): Headers for the GraphQL query.
+            aura_report (dict | None): Report response already containing the
+                buff events.
         """
-        query = """
-        query dragoonFinishers(
-            $code: String!
-            $id: [Int]!
-            $playerID: Int!
-            $fangBaredID: Float!
-            $wheelMotionID: Float!
-        ) {
-            reportData {
-                report(code: $code) {
-                    startTime
-                    fangBared: events(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $fangBaredID
-                    ) {
-                        data
-                        nextPageTimestamp
-                    }
-
-                    wheelMotion: events(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $wheelMotionID
-                    ) {
-                        data
-                        nextPageTimestamp
-                    }
-                }
-            }
-        }
-        """
-
-        variables = {
-            "code": self.report_id,
-            "id": [self.fight_id],
-            "playerID": self.player_id,
-            "fangBaredID": self.fang_and_claw_bared_id,
-            "wheelMotionID": self.wheel_in_motion_id,
-        }
-
-        self._perform_graph_ql_query(headers, query, variables, "dragoonFinishers")
+        self.request_response = self.query_auras(
+            headers, self.combo_finisher_requirements, "dragoonFinishers", aura_report
+        )
+        self.report_start = self._get_report_start_time(self.request_response)
 
         #### Fang and Claw ####
         # Fang and claw timings with applying ability ID
@@ -146,35 +128,16 @@ class DragoonActions(BuffQuery):
             int
         ).to_numpy()
 
-    def _get_enhanced_piercing_talon_times(self, headers: dict[str, str]) -> NDArray:
+    def _get_enhanced_piercing_talon_times(
+        self, headers: dict[str, str], aura_report: dict | None = None
+    ) -> NDArray:
         """Get timing bands when Enhanced Piercing Talon buff was up."""
-        query = """
-        query dragoonEnhancedTalon(
-            $code: String!
-            $id: [Int]!
-            $playerID: Int!
-        ) {
-            reportData {
-                report(code: $code) {
-                    startTime
-                    enhancedTalon: table(
-                            fightIDs: $id
-                            dataType: Buffs
-                            sourceID: $playerID
-                            abilityID: 1001870
-                    )
-                }
-            }
-        }
-        """
-
-        variables = {
-            "code": self.report_id,
-            "id": [self.fight_id],
-            "playerID": self.player_id,
-        }
-
-        response = self.gql_query(headers, query, variables, "dragoonEnhancedTalon")
+        response = self.query_auras(
+            headers,
+            self.enhanced_talon_requirements,
+            "dragoonEnhancedTalon",
+            aura_report,
+        )
         enhancing_piercing_timings = self._get_buff_times(
             response, "enhancedTalon", add_report_start=True
         )
@@ -204,46 +167,42 @@ class DragoonActions(BuffQuery):
             )
 
         #### Wheeling Thrust ####
-        wheel_no_finisher_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-            for b in self.life_of_the_dragon_times
-            if b[2] == 25772
+        wheel_no_finisher_windows = IntervalSet(
+            (b for b in self.life_of_the_dragon_times if b[2] == 25772),
+            inclusive="right",
         )
 
-        wheel_no_finisher_conditions = disjunction(*wheel_no_finisher_betweens) & (
-            actions_df["abilityGameID"] == self.wheeling_thrust_id
-        )
+        wheel_no_finisher_conditions = wheel_no_finisher_windows.contains(
+            actions_df["timestamp"]
+        ) & (actions_df["abilityGameID"] == self.wheeling_thrust_id)
 
-        wheel_finisher_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-            for b in self.life_of_the_dragon_times
-            if b[2] == 3554
+        wheel_finisher_windows = IntervalSet(
+            (b for b in self.life_of_the_dragon_times if b[2] == 3554),
+            inclusive="right",
         )
 
-        wheel_finisher_conditions = disjunction(*wheel_finisher_betweens) & (
-            actions_df["abilityGameID"] == self.wheeling_thrust_id
-        )
+        wheel_finisher_conditions = wheel_finisher_windows.contains(
+            actions_df["timestamp"]
+        ) & (actions_df["abilityGameID"] == self.wheeling_thrust_id)
 
         #### Fang and Claw ####
-        fang_no_finisher_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-            for b in self.fang_and_claw_bared_times
-            if b[2] == 25771
+        fang_no_finisher_windows = IntervalSet(
+            (b for b in self.fang_and_claw_bared_times if b[2] == 25771),
+            inclusive="right",
         )
 
-        fang_no_finisher_conditions = disjunction(*fang_no_finisher_betweens) & (
-            actions_df["abilityGameID"] == self.fang_and_claw_id
-        )
+        fang_no_finisher_conditions = fang_no_finisher_windows.contains(
+            actions_df["timestamp"]
+        ) & (actions_df["abilityGameID"] == self.fang_and_claw_id)
 
-        fang_finisher_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-            for b in self.fang_and_claw_bared_times
-            if b[2] == 3556
+        fang_finisher_windows = IntervalSet(
+            (b for b in self.fang_and_claw_bared_times if b[2] == 3556),
+            inclusive="right",
         )
 
-        fang_finisher_conditions = disjunction(*fang_finisher_betweens) & (
-            actions_df["abilityGameID"] == self.fang_and_claw_id
-        )
+        fang_finisher_conditions = fang_finisher_windows.contains(
+            actions_df["timestamp"]
+        ) & (actions_df["abilityGameID"] == self.fang_and_claw_id)
 
         actions_df = self._apply_buffs(
             actions_df, wheel_no_finisher_conditions, "no_finisher"
@@ -269,12 +228,9 @@ class DragoonActions(BuffQuery):
         Returns:
             pd.DataFrame: DataFrame of actions with enhanced added as a buff to Piercing Talon.
         """
-        talon_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-            for b in self.enhanced_piercing_times
-        )
+        talon_windows = IntervalSet(self.enhanced_piercing_times, inclusive="right")
 
-        talon_condition = disjunction(*talon_betweens) & (
+        talon_condition = talon_windows.contains(actions_df["timestamp"]) & (
             actions_df["abilityGameID"] == self.piercing_talon_id
         )
 
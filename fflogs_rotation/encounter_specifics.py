@@ -1,6 +1,6 @@
 import pandas as pd
 
-from fflogs_rotation.base import BuffQuery
+from fflogs_rotation.base import BuffQuery, IntervalSet
 
 
 class EncounterSpecifics(BuffQuery):
@@ -8,26 +8,18 @@ class EncounterSpecifics(BuffQuery):
         super().__init__()
         pass
 
-    def fru_apply_vuln_p2(
-        self,
-        headers: dict[str, str],
-        report_id: str,
-        fight_id: int,
-        actions_df: pd.DataFrame,
-    ) -> pd.DataFrame:
-        """Apply vulnerability down debuff to ice veil from FRU.
-
-        Queries FFLogs for the vulnerability down debuff (ID: 1002198) and applies a
-        50% damage reduction to actions that occurred while the debuff was active.
+    def query_fru_vuln_down(
+        self, headers: dict[str, str], report_id: str, fight_id: int
+    ) -> dict:
+        """Query the vulnerability down debuff (ID: 1002198) applied to enemies in FRU.
 
         Args:
             headers (dict[str, str]): Headers for the FFLogs API request
             report_id (str): The FFLogs report ID
             fight_id (int): The specific fight ID within the report
-            actions_df (pd.DataFrame): DataFrame containing combat actions
 
         Returns:
-            pd.DataFrame: Modified DataFrame with vulnerability down multipliers applied
+            dict: GraphQL response with the `vulnDown` aura table.
         """
         query = """
         query vulnDown(
@@ -48,7 +40,35 @@ class EncounterSpecifics(BuffQuery):
         }
         """
         variables = {"code": report_id, "id": [fight_id]}
-        response = self.gql_query(headers, query, variables, "vulnDown")
+        return self.gql_query(headers, query, variables, "vulnDown")
+
+    def fru_apply_vuln_p2(
+        self,
+        headers: dict[str, str],
+        report_id: str,
+        fight_id: int,
+        actions_df: pd.DataFrame,
+        vuln_response: dict | None = None,
+    ) -> pd.DataFrame:
+        """Apply vulnerability down debuff to ice veil from FRU.
+
+        Queries FFLogs for the vulnerability down debuff (ID: 1002198) and applies a
+        50% damage reduction to actions that occurred while the debuff was active.
+
+        Args:
+            headers (dict[str, str]): Headers for the FFLogs API request
+            report_id (str): The FFLogs report ID
+            fight_id (int): The specific fight ID within the report
+            actions_df (pd.DataFrame): DataFrame containing combat actions
+            vuln_response (dict | None, optional): Response from
+                `query_fru_vuln_down`, if already queried.
+
+        Returns:
+            pd.DataFrame: Modified DataFrame with vulnerability down multipliers applied
+        """
+        response = vuln_response
+        if response is None:
+            response = self.query_fru_vuln_down(headers, report_id, fight_id)
 
         vuln_times = self._get_buff_times(response, "vulnDown", add_report_start=True)
 
@@ -119,13 +139,9 @@ class EncounterSpecifics(BuffQuery):
             player_buff_times = (
                 pd.DataFrame(player_buff_times).to_numpy() + self.report_start_time
             )
-            groove_betweens = list(
-                actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-                for b in player_buff_times
-            )
-            groove_condition = (
-                actions_df["sourceID"] == self.player_id
-            ) & self.disjunction(*groove_betweens)
+            groove_condition = (actions_df["sourceID"] == self.player_id) & IntervalSet(
+                player_buff_times, inclusive="right"
+            ).contains(actions_df["timestamp"])
 
             # Update buff list and action name
             actions_df = self._apply_buffs(actions_df, groove_condition, "groove")
@@ -141,13 +157,9 @@ class EncounterSpecifics(BuffQuery):
                 pet_buff_times_dict[pet_id] = (
                     pd.DataFrame(row["bands"]).to_numpy() + self.report_start_time
                 )
-                groove_betweens = list(
-                    actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-                    for b in pet_buff_times_dict[pet_id]
-                )
-                groove_condition = (
-                    actions_df["sourceID"] == pet_id
-                ) & self.disjunction(*groove_betweens)
+                groove_condition = (actions_df["sourceID"] == pet_id) & IntervalSet(
+                    pet_buff_times_dict[pet_id], inclusive="right"
+                ).contains(actions_df["timestamp"])
 
                 # Update buff list and action name
                 actions_df = self._apply_buffs(actions_df, groove_condition, "groove")
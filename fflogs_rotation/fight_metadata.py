@@ -0,0 +1,146 @@
+"""Fight-level metadata shared by the encounter lookup and `ActionTable`.
+
+Submitting an FFLogs URL already queries the fight's timings, phases, rankings and
+damage table. Parsing that response into a `FightMetadata` record, persisted per
+report/fight, lets every later player analysis of the fight skip those fields and
+only query its per-player auras.
+"""
+
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class FightMetadata:
+    """Metadata of one fight in a report.
+
+    Times are in milliseconds, relative to the report start unless stated.
+    """
+
+    report_id: str
+    fight_id: int
+    # Absolute time (ms) the report started
+    report_start_time: int
+    fight_name: str
+    encounter_id: int
+    difficulty: int | None
+    kill: bool
+    has_echo: bool
+    region: str
+    fight_start_time: int
+    fight_end_time: int
+    phase_transitions: list[dict] | None
+    ranking_duration: int | None
+    downtime: int
+
+    @classmethod
+    def from_report(
+        cls, report_id: str, fight_id: int, report: dict
+    ) -> "FightMetadata":
+        """Parse the `reportData.report` portion of a fight information response.
+
+        The response must contain `startTime`, `region`, `fights`, `rankings` and a
+        `DamageDone` `table`, like `EncounterInfo` or `FightInformation`.
+
+        Args:
+            report_id (str): FFLogs report ID.
+            fight_id (int): Fight ID within the report.
+            report (dict): `reportData.report` portion of the response.
+
+        Returns:
+            FightMetadata: Parsed metadata.
+        """
+        fight = report["fights"][0]
+        rankings = report.get("rankings", {}).get("data", [])
+        table_data = report.get("table", {}).get("data", {})
+        return cls(
+            report_id=report_id,
+            fight_id=fight_id,
+            report_start_time=report["startTime"],
+            fight_name=fight["name"],
+            encounter_id=fight["encounterID"],
+            difficulty=fight.get("difficulty"),
+            kill=fight["kill"],
+            has_echo=fight["hasEcho"],
+            region=report["region"]["compactName"],
+            fight_start_time=fight["startTime"],
+            fight_end_time=fight["endTime"],
+            phase_transitions=fight.get("phaseTransitions"),
+            ranking_duration=rankings[0]["duration"] if len(rankings) > 0 else None,
+            # Some FFLogs responses use `damageDowntime` instead of `downtime`.
+            downtime=table_data.get("downtime", table_data.get("damageDowntime", 0)),
+        )
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether the record can be reused by later analyses.
+
+        FFLogs only ranks a kill some time after the log is uploaded, until then
+        the ranking duration is missing and the fight duration would be wrong.
+        """
+        return (not self.kill) or (self.ranking_duration is not None)
+
+    def as_report(self) -> dict:
+        """Fight-level fields in the shape of a `FightInformation` response."""
+        return {
+            "startTime": self.report_start_time,
+            "region": {"compactName": self.region},
+            "fights": [
+                {
+                    "encounterID": self.encounter_id,
+                    "kill": self.kill,
+                    "startTime": self.fight_start_time,
+                    "endTime": self.fight_end_time,
+                    "name": self.fight_name,
+                    "hasEcho": self.has_echo,
+                    "difficulty": self.difficulty,
+                    "phaseTransitions": self.phase_transitions,
+                }
+            ],
+            "rankings": {
+                "data": (
+                    []
+                    if self.ranking_duration is None
+                    else [{"duration": self.ranking_duration}]
+                )
+            },
+            "table": {"data": {"downtime": self.downtime}},
+        }
+
+
+def fight_metadata_path(directory: str | Path, report_id: str, fight_id: int) -> Path:
+    return Path(directory) / f"fight-metadata-{report_id}-{fight_id}.pkl"
+
+
+def save_fight_metadata(directory: str | Path, fight_metadata: FightMetadata) -> None:
+    """Persist a fight's metadata, replacing any previous record.
+
+    Incomplete records, see `FightMetadata.is_complete`, aren't saved, so the fight
+    information is queried again until FFLogs has ranked the kill.
+    """
+    if not fight_metadata.is_complete:
+        return
+    path = fight_metadata_path(
+        directory, fight_metadata.report_id, fight_metadata.fight_id
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so concurrent workers never read a partial file.
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        pickle.dump(fight_metadata, f)
+    os.replace(tmp_path, path)
+
+
+def load_fight_metadata(
+    directory: str | Path, report_id: str, fight_id: int
+) -> FightMetadata | None:
+    """Load a fight's persisted metadata, None if it was never saved or is incomplete."""
+    path = fight_metadata_path(directory, report_id, fight_id)
+    if not path.exists():
+        return None
+    with open(path, "rb") as f:
+        fight_metadata = pickle.load(f)
+    return fight_metadata if fight_metadata.is_complete else None
@@ -0,0 +1,101 @@
+"""Process-wide pooled HTTP session shared by FFLogs, Etro and xivgear requests.
+
+Reusing one `requests.Session` keeps TCP/TLS connections alive between requests
+instead of opening a new connection per GraphQL query. Requests are retried with
+exponential backoff on 429/5xx responses, honoring `Retry-After`.
+
+The session is created lazily per process, so gunicorn workers never share
+connections opened before forking.
+"""
+
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds
+DEFAULT_TIMEOUT = (5, 60)
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_POOL_MAXSIZE = 16
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class PooledSession(requests.Session):
+    """Session with connection pooling, retries and a default timeout."""
+
+    def __init__(
+        self,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    ) -> None:
+        """Create a pooled session.
+
+        Args:
+            timeout (float | tuple[float, float], optional): Default (connect, read)
+                timeout in seconds, used when a request doesn't pass one.
+            retries (int, optional): Maximum number of retries per request.
+            backoff_factor (float, optional): Exponential backoff factor between retries.
+            pool_maxsize (int, optional): Connections kept alive per host.
+        """
+        super().__init__()
+        self.timeout = timeout
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            # GraphQL queries are POSTs but only read data, so they are safe to retry.
+            allowed_methods=None,
+            respect_retry_after_header=True,
+            # Return the final response so callers can raise_for_status() as before.
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=retry
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+_session: PooledSession | None = None
+_session_pid: int | None = None
+_session_class: type[PooledSession] = PooledSession
+_session_kwargs: dict = {}
+
+
+def configure_session(
+    session_class: type[PooledSession] = PooledSession, **session_kwargs
+) -> None:
+    """Set the timeout/retry/pool settings for the shared session.
+
+    Takes the same keyword arguments as `session_class`. The current session is
+    closed and recreated with the new settings on next use.
+
+    Args:
+        session_class (type[PooledSession], optional): Session class to use, e.g.,
+            `fflogs_rotation.recording.RecordReplaySession`.
+        **session_kwargs: Passed to `session_class`.
+    """
+    global _session, _session_class, _session_kwargs
+    _session_class = session_class
+    _session_kwargs = session_kwargs
+    if _session is not None:
+        _session.close()
+    _session = None
+
+
+def get_session() -> PooledSession:
+    """Get the shared session for this process, creating it if needed."""
+    global _session, _session_pid
+    if (_session is None) or (_session_pid != os.getpid()):
+        _session = _session_class(**_session_kwargs)
+        _session_pid = os.getpid()
+    return _session
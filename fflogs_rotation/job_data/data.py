@@ -4,6 +4,13 @@ from pathlib import Path
 
 import pandas as pd
 
+from fflogs_rotation.job_data.snapshot import (
+    POTENCY_KEYS,
+    PatchIndex,
+    load_potency_table,
+    register_index,
+)
+
 base_path = Path("fflogs_rotation/job_data")
 
 critical_hit_rate_table = pd.read_csv(
@@ -21,4 +28,13 @@ guaranteed_hits_by_buff_table = pd.read_csv(
     base_path / "guaranteed_hits_by_buff.csv", dtype={"buff_id": str}
 )
 
-potency_table = pd.read_csv(base_path / "potencies.csv", dtype={"buff_id": str})
+# Compiled by `potencies/create_potencies.py`, with `potency_falloff` parsed.
+potency_table = load_potency_table(
+    base_path / "potencies.csv", base_path / "potencies.arrow"
+)
+
+# Per-patch lookups of the tables above are built once per process.
+register_index(PatchIndex(critical_hit_rate_table))
+register_index(PatchIndex(direct_hit_rate_table))
+register_index(PatchIndex(damage_buff_table))
+register_index(PatchIndex(potency_table, POTENCY_KEYS))
@@ -2,7 +2,10 @@
 Create a main potency CSV from all job potency CSVs.
 
 Individual potencies are split by
-job and by patch, to account for potency changes over time
+job and by patch, to account for potency changes over time.
+
+Also compiles the CSV into `potencies.arrow`, the snapshot loaded by
+`fflogs_rotation.job_data.data`.
 """
 
 import shutil
@@ -13,6 +16,7 @@ import pandas as pd
 
 # from ..game_data import patch_times
 from fflogs_rotation.job_data.game_data import balance_patches
+from fflogs_rotation.job_data.snapshot import write_potency_snapshot
 
 if __name__ == "__main__":
     job_csv_path = Path("fflogs_rotation/job_data/potencies")
@@ -61,3 +65,6 @@ if __name__ == "__main__":
         )
 
     pd.concat(potency_df_list).to_csv(potency_path / "potencies.csv", index=False)
+    write_potency_snapshot(
+        potency_path / "potencies.csv", potency_path / "potencies.arrow"
+    )
@@ -0,0 +1,246 @@
+"""Compiled, patch-indexed snapshots of game data tables.
+
+`create_potencies.py` compiles `potencies.csv` into `potencies.arrow`, an Arrow
+IPC file which loads with `potency_falloff` already parsed into float arrays. The
+snapshot records a hash of the CSV it was built from, and is only used while that
+CSV is unchanged.
+
+Game data tables are wrapped in a `PatchIndex`, which splits the rows valid in each
+patch once and keys them (e.g., by job and level), so each analysis looks up
+ready-made tables for its patch instead of filtering and re-parsing the whole table.
+"""
+
+import hashlib
+import json
+from bisect import bisect_right
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+POTENCY_KEYS = ("job", "level")
+# Snapshot schema metadata keys, for the SHA-256 of the source CSV and the
+# distinct falloffs.
+SNAPSHOT_SOURCE_KEY = b"source_sha256"
+SNAPSHOT_FALLOFF_KEY = b"potency_falloffs"
+# Missing falloff means the action has no falloff.
+NO_FALLOFF = np.array([1.0])
+
+
+def parse_potency_falloff(falloff: pd.Series) -> pd.Series:
+    """Parse semicolon-separated falloff strings into float arrays.
+
+    Each distinct string is parsed once. Already parsed values are kept, and
+    missing values become `[1.0]`.
+
+    Args:
+        falloff (pd.Series): `potency_falloff` column, like "1;0.75;0.5".
+
+    Returns:
+        pd.Series: Falloff of each action as a float array.
+    """
+    parsed = {}
+
+    def parse(f):
+        if isinstance(f, str):
+            if f not in parsed:
+                parsed[f] = np.array(f.split(";"), dtype=float)
+            return parsed[f]
+        if isinstance(f, (list, np.ndarray)):
+            return np.asarray(f, dtype=float)
+        return NO_FALLOFF
+
+    return falloff.map(parse)
+
+
+def source_digest(csv_path: Path) -> bytes:
+    """SHA-256 hex digest of a snapshot's source CSV."""
+    return hashlib.sha256(Path(csv_path).read_bytes()).hexdigest().encode()
+
+
+def read_potency_csv(csv_path: Path) -> pd.DataFrame:
+    """Read the potency CSV, with falloff still as strings."""
+    return pd.read_csv(csv_path, dtype={"buff_id": str})
+
+
+def write_potency_snapshot(csv_path: Path, snapshot_path: Path) -> None:
+    """Compile the potency CSV into an Arrow snapshot.
+
+    Falloff is stored as a code per action into the few distinct falloffs, which
+    are kept in the schema metadata.
+
+    Args:
+        csv_path (Path): Path to `potencies.csv`.
+        snapshot_path (Path): Path of the Arrow snapshot to write.
+    """
+    potency_table = read_potency_csv(csv_path)
+    codes, falloffs = pd.factorize(
+        potency_table["potency_falloff"].fillna("1."), sort=True
+    )
+    potency_table = potency_table.drop(columns="potency_falloff")
+    potency_table["potency_falloff_code"] = codes.astype(np.int32)
+
+    table = pa.Table.from_pandas(potency_table, preserve_index=False)
+    metadata = {
+        **(table.schema.metadata or {}),
+        SNAPSHOT_SOURCE_KEY: source_digest(csv_path),
+        SNAPSHOT_FALLOFF_KEY: json.dumps(
+            [[float(x) for x in f.split(";")] for f in falloffs]
+        ).encode(),
+    }
+    feather.write_feather(
+        table.replace_schema_metadata(metadata), snapshot_path, compression="lz4"
+    )
+
+
+def load_potency_table(csv_path: Path, snapshot_path: Path) -> pd.DataFrame:
+    """Load the potency table, with falloff parsed into float arrays.
+
+    The Arrow snapshot is used if it was compiled from the current CSV,
+    otherwise the CSV is parsed.
+
+    Args:
+        csv_path (Path): Path to `potencies.csv`.
+        snapshot_path (Path): Path to the Arrow snapshot.
+
+    Returns:
+        pd.DataFrame: Potency table.
+    """
+    if snapshot_path.exists():
+        table = feather.read_table(snapshot_path)
+        metadata = table.schema.metadata or {}
+        if metadata.get(SNAPSHOT_SOURCE_KEY) == source_digest(csv_path):
+            potency_table = table.to_pandas()
+            # Arrow reads missing strings as None, the CSV as NaN.
+            potency_table["buff_id"] = potency_table["buff_id"].fillna(np.nan)
+
+            # Actions with the same falloff share one array.
+            distinct_falloffs = json.loads(metadata[SNAPSHOT_FALLOFF_KEY])
+            falloffs = np.empty(len(distinct_falloffs), dtype=object)
+            falloffs[:] = [np.array(f, dtype=float) for f in distinct_falloffs]
+            codes = potency_table.pop("potency_falloff_code").to_numpy()
+            potency_table["potency_falloff"] = falloffs[codes]
+            return potency_table
+
+    potency_table = read_potency_csv(csv_path)
+    potency_table["potency_falloff"] = parse_potency_falloff(
+        potency_table["potency_falloff"]
+    )
+    return potency_table
+
+
+class PatchIndex:
+    """Rows of a game data table valid in each patch, keyed by other columns.
+
+    A row is valid for `valid_start <= patch < valid_end`. The validity window
+    bounds of all rows split patch numbers into intervals where the same rows are
+    valid, so a lookup is a bisect over the bounds and a dict lookup. Each interval's
+    rows are grouped by key the first time the interval is looked up.
+
+    Looked up tables are shared between callers and must not be modified.
+
+    Example:
+        ```python
+        index = PatchIndex(potency_table, keys=("job", "level"))
+        index.lookup(7.2, "Samurai", 100)
+        ```
+    """
+
+    def __init__(self, table: pd.DataFrame, keys: Iterable[str] = ()) -> None:
+        """Index a table with `valid_start` and `valid_end` columns.
+
+        Args:
+            table (pd.DataFrame): Game data table.
+            keys (Iterable[str], optional): Columns to key the rows of a patch by.
+        """
+        self.table = table
+        self.keys = tuple(keys)
+        self._bounds = sorted(set(table["valid_start"]) | set(table["valid_end"]))
+        self._empty = table.iloc[:0]
+        # Interval -> key -> rows
+        self._groups: dict[int, dict[tuple, pd.DataFrame]] = {}
+        self._mappings: dict[tuple, dict] = {}
+
+    def _interval(self, patch_number: float) -> int:
+        return bisect_right(self._bounds, patch_number)
+
+    def _interval_groups(self, patch_number: float) -> dict[tuple, pd.DataFrame]:
+        interval = self._interval(patch_number)
+        groups = self._groups.get(interval)
+        if groups is None:
+            # Every patch in the interval has the same valid rows.
+            rows = self.table[
+                (self.table["valid_start"] <= patch_number)
+                & (patch_number < self.table["valid_end"])
+            ]
+            if self.keys:
+                groups = {k: g for k, g in rows.groupby(list(self.keys), sort=False)}
+            else:
+                groups = {(): rows}
+            self._groups[interval] = groups
+        return groups
+
+    def lookup(self, patch_number: float, *key) -> pd.DataFrame:
+        """Rows valid in a patch for a key.
+
+        Args:
+            patch_number (float): Patch number, e.g. 7.05.
+            *key: Values of the key columns, in order.
+
+        Returns:
+            pd.DataFrame: Matching rows, empty if there are none.
+        """
+        return self._interval_groups(patch_number).get(key, self._empty)
+
+    def mapping(self, patch_number: float, key_column: str, value_column: str) -> dict:
+        """`{key_column: value_column}` of the rows valid in a patch."""
+        cache_key = (self._interval(patch_number), key_column, value_column)
+        mapping = self._mappings.get(cache_key)
+        if mapping is None:
+            mapping = (
+                self.lookup(patch_number).set_index(key_column)[value_column].to_dict()
+            )
+            self._mappings[cache_key] = mapping
+        return dict(mapping)
+
+
+# id(table) -> index, for tables loaded at import by `job_data.data`
+_indexes: dict[int, PatchIndex] = {}
+
+
+def register_index(index: PatchIndex) -> PatchIndex:
+    """Register a prebuilt index, so lookups on its table reuse it."""
+    _indexes[id(index.table)] = index
+    return index
+
+
+def patch_index(table: pd.DataFrame, keys: Iterable[str] = ()) -> PatchIndex:
+    """Prebuilt index of a registered table, or a new index of any other table.
+
+    Args:
+        table (pd.DataFrame): Game data table.
+        keys (Iterable[str], optional): Columns to key the rows of a patch by.
+
+    Returns:
+        PatchIndex: Index of the table.
+    """
+    index = _indexes.get(id(table))
+    if index is not None and index.table is table and index.keys == tuple(keys):
+        return index
+    return PatchIndex(table, keys)
+
+
+def potency_index(potency_table: pd.DataFrame) -> PatchIndex:
+    """Index of a potency table by job and level, with falloff parsed."""
+    index = _indexes.get(id(potency_table))
+    if index is not None and index.table is potency_table:
+        return index
+    return PatchIndex(
+        potency_table.assign(
+            potency_falloff=parse_potency_falloff(potency_table["potency_falloff"])
+        ),
+        POTENCY_KEYS,
+    )
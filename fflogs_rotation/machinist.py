@@ -3,13 +3,17 @@ import warnings
 import numpy as np
 import pandas as pd
 
-from fflogs_rotation.base import BuffQuery, disjunction
+from fflogs_rotation.base import AuraRequirement, BuffQuery, IntervalSet
+from fflogs_rotation.buff_sets import update_buff_set_ids
 
 # Filter the pandas FutureWarning about concat
 warnings.filterwarnings("ignore", category=FutureWarning, module="pandas.core.concat")
 
 
 class MachinistActions(BuffQuery):
+    # Aura tables needed for the player, see `BuffQuery.query_auras`.
+    aura_requirements = (AuraRequirement("wildfire", 1001946),)
+
     def __init__(
         self,
         headers: dict[str, str],
@@ -40,6 +44,7 @@ class MachinistActions(BuffQuery):
         },
         wildfire_id: int = 1001946,
         queen_automaton_id: int = 16501,
+        aura_report: dict | None = None,
     ) -> None:
         """
         Initialize the MachinistActions class.
@@ -53,6 +58,7 @@ class MachinistActions(BuffQuery):
         battery_gauge_amount (dict[int, int]): dictionary mapping ability IDs to battery gauge amounts.
         wildfire_id (int): Wildfire ability ID.
         queen_automaton_id (int): Queen Automaton ability ID.
+        aura_report (dict | None): Report response already containing `aura_requirements`.
         """
         super().__init__()
 
@@ -62,6 +68,9 @@ class MachinistActions(BuffQuery):
         self.weaponskill_ids = weaponskill_ids
         self.battery_gauge_amount = battery_gauge_amount
         self.wildfire_id = wildfire_id
+        self.aura_requirements = self.instance_aura_requirements(
+            {"wildfire": wildfire_id}
+        )
         self.queen_automaton_id = queen_automaton_id
         self.pet_ability_ids = {16503, 16504, 17206, 25787}
 
@@ -73,7 +82,7 @@ class MachinistActions(BuffQuery):
             16501: "Automaton Queen",
         }
 
-        self.wildfire_times = self.get_wildfire_timings(headers)
+        self.wildfire_times = self.get_wildfire_timings(headers, aura_report)
         self.battery_gauge_actions = self._set_battery_gauge_actions(headers)
 
         self.queen_battery_levels = self._compute_battery_gauge_amounts(
@@ -83,41 +92,20 @@ class MachinistActions(BuffQuery):
             self.queen_battery_levels
         )
 
-    def get_wildfire_timings(self, headers: dict[str, str]) -> None:
+    def get_wildfire_timings(
+        self, headers: dict[str, str], aura_report: dict | None = None
+    ) -> None:
         """
         Set the timings for Wildfire and Queen Automaton based on the provided headers.
 
         Parameters:
             headers (dict[str, str]): Headers for the GraphQL query.
+            aura_report (dict | None): Report response already containing the
+                buff table.
         """
-        query = """
-                query machinistBuffs(
-                    $code: String!
-                    $id: [Int]!
-                    $playerID: Int!
-                    $wildfireID: Float!
-                ) {
-                    reportData {
-                        report(code: $code) {
-                            startTime
-                            wildfire: table(
-                                fightIDs: $id
-                                dataType: Buffs
-                                sourceID: $playerID
-                                abilityID: $wildfireID
-                            )
-                        }
-                    }
-                }
-        """
-        variables = {
-            "code": self.report_id,
-            "id": [self.fight_id],
-            "playerID": self.player_id,
-            "wildfireID": self.wildfire_id,
-        }
-
-        wildfire_response = self.gql_query(headers, query, variables, "machinistBuffs")
+        wildfire_response = self.query_auras(
+            headers, self.aura_requirements, "machinistBuffs", aura_report
+        )
         return self._get_buff_times(
             wildfire_response, "wildfire", add_report_start=True
         )
@@ -345,12 +333,9 @@ class MachinistActions(BuffQuery):
             pd.DataFrame: DataFrame of actions, with a buff indicating the wildfire potency.
         """
         # Find weaponskills which occurred during wildfire
-        wildfire_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="both")
-            for b in self.wildfire_times
-        )
+        wildfire_windows = IntervalSet(self.wildfire_times, inclusive="both")
         n_wildfire_gcds = actions_df[
-            disjunction(*wildfire_betweens)
+            wildfire_windows.contains(actions_df["timestamp"])
             & actions_df["abilityGameID"].isin(self.weaponskill_ids)
         ][["elapsed_time"]]
 
@@ -397,6 +382,9 @@ class MachinistActions(BuffQuery):
         actions_df[~actions_df["wildfire_buff_name"].isna()].apply(
             lambda x: x["buffs"].append(x["wildfire_buff_name"]), axis=1
         )
+        update_buff_set_ids(
+            actions_df, ~actions_df["wildfire_buff_name"].isna(), self.buff_vocabulary
+        )
         (
             actions_df[~actions_df["wildfire_buff_name"].isna()]["action_name"]
             + "_"
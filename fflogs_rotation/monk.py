@@ -1,10 +1,18 @@
 import pandas as pd
-from ffxiv_stats import Rate
 
-from fflogs_rotation.base import BuffQuery, disjunction
+from fflogs_rotation.base import AuraRequirement, BuffQuery, IntervalSet
+from fflogs_rotation.buff_sets import update_buff_set_ids
 
 
 class MonkActions(BuffQuery):
+    # Aura tables needed for the player, see `BuffQuery.query_auras`.
+    aura_requirements = (
+        AuraRequirement("opoOpo", 1000107),
+        AuraRequirement("formlessFist", 1002513),
+        AuraRequirement("perfectBalance", 1000110),
+        AuraRequirement("leadenFist", 1001861),
+    )
+
     def __init__(
         self,
         headers: dict,
@@ -23,6 +31,7 @@ class MonkActions(BuffQuery):
         rising_raptor_id: int = 36946,
         pouncing_coeurl_id: int = 36947,
         six_sided_star_id: int = 16476,
+        aura_report: dict | None = None,
     ) -> None:
         """
         Initialize the MonkActions class.
@@ -43,6 +52,8 @@ class MonkActions(BuffQuery):
             leaping_opo_id (int): Leaping Opo ability ID.
             rising_raptor_id (int): Rising Raptor ability ID.
             pouncing_coeurl_id (int): Pouncing Coeurl ability ID.
+            aura_report (dict | None): Report response already containing
+                `aura_requirements`.
         """
         super().__init__()
 
@@ -54,6 +65,13 @@ class MonkActions(BuffQuery):
         self.opo_opo_id = opo_opo_id
         self.formless_fist_id = formless_fist_id
         self.leaden_fist_id = leaden_fist_id
+        self.aura_requirements = self.instance_aura_requirements(
+            {
+                "opoOpo": opo_opo_id,
+                "formlessFist": formless_fist_id,
+                "leadenFist": leaden_fist_id,
+            }
+        )
         self.bootshine_id = bootshine_id
 
         self.dragon_kick_id = dragon_kick_id
@@ -72,7 +90,7 @@ class MonkActions(BuffQuery):
             self.formless_fist_times,
             self.leaden_fist_times,
             self.perfect_balance_times,
-        ) = self._set_mnk_buff_times(headers)
+        ) = self._set_mnk_buff_times(headers, aura_report)
 
     def _get_six_sided_star_potencies(self):
         """Potency of Six-sided star based on chakra count.
@@ -97,7 +115,9 @@ class MonkActions(BuffQuery):
         )
         return sss_potency_df
 
-    def _set_mnk_buff_times(self, headers: dict) -> None:
+    def _set_mnk_buff_times(
+        self, headers: dict, aura_report: dict | None = None
+    ) -> None:
         """
         Perform an API call to get buff intervals for Requiescat and Divine Might.
 
@@ -106,57 +126,12 @@ class MonkActions(BuffQuery):
 
         Parameters:
             headers (dict): FFLogs API header.
+            aura_report (dict | None): Report response already containing the
+                buff tables.
         """
-        query = """
-        query MonkOpoOpo(
-            $code: String!
-            $id: [Int]!
-            $playerID: Int!
-            $opoOpoID: Float!
-            $formlessFistID: Float!
-            $leadenFistID: Float!
-        ) {
-            reportData {
-                report(code: $code) {
-                    startTime
-                    opoOpo: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $opoOpoID
-                    )
-                    formlessFist: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $formlessFistID
-                    )
-                    perfectBalance: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: 1000110
-                    )
-                    leadenFist: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $leadenFistID
-                    )
-                }
-            }
-        }
-        """
-        variables = {
-            "code": self.report_id,
-            "id": [self.fight_id],
-            "playerID": self.player_id,
-            "opoOpoID": self.opo_opo_id,
-            "formlessFistID": self.formless_fist_id,
-            "leadenFistID": self.leaden_fist_id,
-        }
-
-        response = self.gql_query(headers, query, variables, "MonkOpoOpo")
+        response = self.query_auras(
+            headers, self.aura_requirements, "MonkOpoOpo", aura_report
+        )
 
         opo_opo_times = self._get_buff_times(response, "opoOpo", add_report_start=True)
         formless_fist_times = self._get_buff_times(
@@ -190,21 +165,14 @@ class MonkActions(BuffQuery):
             pd.DataFrame: Updated DataFrame with applied buffs.
         """
         # Opo opo
-        opo_opo_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1]) for b in self.opo_opo_times
-        )
-
-        opo_opo_condition = disjunction(*opo_opo_betweens) & (
-            actions_df["abilityGameID"] == self.bootshine_id
-        )
+        opo_opo_condition = IntervalSet(self.opo_opo_times).contains(
+            actions_df["timestamp"]
+        ) & (actions_df["abilityGameID"] == self.bootshine_id)
 
         # Leaden fist
-        leaden_fist_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-            for b in self.leaden_fist_times
-        )
-
-        leaden_fist_condition = disjunction(*leaden_fist_betweens) & (
+        leaden_fist_condition = IntervalSet(
+            self.leaden_fist_times, inclusive="right"
+        ).contains(actions_df["timestamp"]) & (
             actions_df["abilityGameID"] == self.bootshine_id
         )
 
@@ -382,6 +350,9 @@ class MonkActions(BuffQuery):
         actions_df.loc[~actions_df["gauge"].isna()].apply(
             lambda x: x["buffs"].append(x["gauge"]), axis=1
         )
+        update_buff_set_ids(
+            actions_df, ~actions_df["gauge"].isna(), self.buff_vocabulary
+        )
         return actions_df[original_columns]
 
     def apply_bootshine_autocrit(
@@ -405,6 +376,8 @@ class MonkActions(BuffQuery):
         Returns:
             pd.DataFrame: Updated DataFrame with applied autocrit calculations.
         """
+        from ffxiv_stats import Rate
+
         r = Rate(critical_hit_stat, direct_hit_rate_stat, level)
 
         def critical_hit_rate_increase(buffs, multiplier):
@@ -425,26 +398,18 @@ class MonkActions(BuffQuery):
             return multiplier, p[0], p[1], p[2], p[3]
 
         # Autocrit is with opo-opo, perfect balance, or formless fist buff.
-        opo_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1]) for b in self.opo_opo_times
-        )
-        perfect_balance_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1])
-            for b in self.perfect_balance_times
-        )
-        formless_fist_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1])
-            for b in self.formless_fist_times
+        autocrit_windows = IntervalSet(
+            [
+                *self.opo_opo_times,
+                *self.perfect_balance_times,
+                *self.formless_fist_times,
+            ]
         )
 
         actions_df["bootshine_autocrit_indicator"] = 0
         actions_df.loc[
             (actions_df["abilityGameID"].isin([self.bootshine_id, self.leaping_opo_id]))
-            & (
-                self.disjunction(*opo_betweens)
-                | self.disjunction(*perfect_balance_betweens)
-                | self.disjunction(*formless_fist_betweens)
-            ),
+            & autocrit_windows.contains(actions_df["timestamp"]),
             "bootshine_autocrit_indicator",
         ] = 1
 
@@ -1,9 +1,15 @@
 import pandas as pd
 
-from fflogs_rotation.base import BuffQuery, disjunction
+from fflogs_rotation.base import AuraRequirement, BuffQuery, IntervalSet
 
 
 class NinjaActions(BuffQuery):
+    # Aura tables needed for the player, see `BuffQuery.query_auras`.
+    aura_requirements = (
+        AuraRequirement("meisui", 1002689),
+        AuraRequirement("kassatsu", 1000497),
+    )
+
     def __init__(
         self,
         headers: dict[str, str],
@@ -33,6 +39,7 @@ class NinjaActions(BuffQuery):
         kassatsu_id: int = 1000497,
         aeolian_edge_id: int = 2255,
         armor_crush_id: int = 3563,
+        aura_report: dict | None = None,
     ) -> None:
         """
         Initialize the NinjaActions class.
@@ -50,6 +57,8 @@ class NinjaActions(BuffQuery):
             kassatsu_id (int): Kassatsu ability ID.
             aeolian_edge_id (int): Aeolian Edge ability ID.
             armor_crush_id (int): Armor Crush ability ID.
+            aura_report (dict | None): Report response already containing
+                `aura_requirements`.
         """
         super().__init__()
 
@@ -64,11 +73,18 @@ class NinjaActions(BuffQuery):
         self.ninjutsu_id = ninjutsu_ids
         self.meisui_id = meisui_id
         self.kassatsu_id = kassatsu_id
+        self.aura_requirements = self.instance_aura_requirements(
+            {"meisui": meisui_id, "kassatsu": kassatsu_id}
+        )
         self.aeolian_edge_id = aeolian_edge_id
         self.armor_crush_id = armor_crush_id
-        self.meisui_times, self.kassatsu_times = self.set_nin_buff_times(headers)
+        self.meisui_times, self.kassatsu_times = self.set_nin_buff_times(
+            headers, aura_report
+        )
 
-    def set_nin_buff_times(self, headers: dict[str, str]) -> None:
+    def set_nin_buff_times(
+        self, headers: dict[str, str], aura_report: dict | None = None
+    ) -> None:
         """
         Perform an API call to get buff intervals for Meisui and Kassatsu.
 
@@ -77,43 +93,12 @@ class NinjaActions(BuffQuery):
 
         Parameters:
             headers (dict[str, str]): FFLogs API header.
+            aura_report (dict | None): Report response already containing the
+                buff tables.
         """
-        query = """
-        query ninjaMeisui(
-            $code: String!
-            $id: [Int]!
-            $playerID: Int!
-            $meisuiID: Float!
-            $kassatsuID: Float!
-        ) {
-            reportData {
-                report(code: $code) {
-                    startTime
-                    meisui: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $meisuiID
-                    )
-                    kassatsu: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $kassatsuID
-                    )
-                }
-            }
-        }
-        """
-        variables = {
-            "code": self.report_id,
-            "id": [self.fight_id],
-            "playerID": self.player_id,
-            "meisuiID": self.meisui_id,
-            "kassatsuID": self.kassatsu_id,
-        }
-
-        nin_buff_response = self.gql_query(headers, query, variables, "ninjaMeisui")
+        nin_buff_response = self.query_auras(
+            headers, self.aura_requirements, "ninjaMeisui", aura_report
+        )
         meisui_times = self._get_buff_times(
             nin_buff_response, "meisui", add_report_start=True
         )
@@ -169,23 +154,17 @@ class NinjaActions(BuffQuery):
         Returns:
             pd.DataFrame: Updated DataFrame with applied buffs.
         """
-        meisui_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-            for b in self.meisui_times
-        )
-
-        meisui_condition = disjunction(*meisui_betweens) & (
+        meisui_condition = IntervalSet(self.meisui_times, inclusive="right").contains(
+            actions_df["timestamp"]
+        ) & (
             actions_df["abilityGameID"].isin([self.zesho_meppo_id, self.bhavacakra_id])
         )
 
-        kassatsu_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-            for b in self.kassatsu_times
+        kassatsu_conditions = IntervalSet(
+            self.kassatsu_times, inclusive="right"
+        ).contains(actions_df["timestamp"]) * actions_df["abilityGameID"].isin(
+            self.ninjutsu_id
         )
-
-        kassatsu_conditions = disjunction(*kassatsu_betweens) * actions_df[
-            "abilityGameID"
-        ].isin(self.ninjutsu_id)
         actions_df = self._apply_buffs(actions_df, meisui_condition, self.meisui_id)
         actions_df = self._apply_buffs(
             actions_df, kassatsu_conditions, self.kassatsu_id
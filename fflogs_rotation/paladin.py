@@ -1,6 +1,6 @@
 import pandas as pd
 
-from fflogs_rotation.base import BuffQuery, disjunction
+from fflogs_rotation.base import AuraRequirement, BuffQuery, IntervalSet
 
 
 class PaladinActions(BuffQuery):
@@ -15,6 +15,12 @@ class PaladinActions(BuffQuery):
         >>> actions = pld.apply_pld_buffs(df)
     """
 
+    # Aura tables needed for the player, see `BuffQuery.query_auras`.
+    aura_requirements = (
+        AuraRequirement("requiescat", 1001368),
+        AuraRequirement("divineMight", 1002673),
+    )
+
     def __init__(
         self,
         headers: dict[str, str],
@@ -25,6 +31,7 @@ class PaladinActions(BuffQuery):
         divine_might_id: int = 1002673,
         holy_ids: list[int] = [7384, 16458],
         blade_ids: list[int] = [16459, 25748, 25749, 25750],
+        aura_report: dict | None = None,
     ) -> None:
         """Initialize Paladin actions handler.
 
@@ -37,6 +44,7 @@ class PaladinActions(BuffQuery):
             divine_might_id: Buff ID for Divine Might
             holy_ids: Ability IDs for Holy Spirit/Circle
             blade_ids: Ability IDs for blade combo
+            aura_report: Report response already containing `aura_requirements`
         """
 
         super().__init__()
@@ -46,16 +54,21 @@ class PaladinActions(BuffQuery):
         self.player_id = player_id
         self.requiescat_id = requiescat_id
         self.divine_might_id = divine_might_id
+        self.aura_requirements = self.instance_aura_requirements(
+            {"requiescat": requiescat_id, "divineMight": divine_might_id}
+        )
         self.holy_ids = holy_ids
         self.blade_ids = blade_ids
 
         self.divine_might_times, self.requiescat_times = self.set_pld_buff_times(
-            headers
+            headers, aura_report
         )
 
         pass
 
-    def set_pld_buff_times(self, headers: dict[str, str]) -> dict:
+    def set_pld_buff_times(
+        self, headers: dict[str, str], aura_report: dict | None = None
+    ) -> dict:
         """Query and set buff timing windows.
 
         Gets start/end times for Requiescat and Divine Might buffs
@@ -63,44 +76,11 @@ class PaladinActions(BuffQuery):
 
         Args:
             headers: FFLogs API headers with auth token
+            aura_report: Report response already containing the buff tables
         """
-        query = """
-        query PaladinBuffs(
-            $code: String!
-            $id: [Int]!
-            $playerID: Int!
-            $requiescatID: Float!
-            $divineMightID: Float!
-        ) {
-            reportData {
-                report(code: $code) {
-                    startTime
-                    requiescat: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $requiescatID
-                    )
-                    divineMight: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $divineMightID
-                    )
-                }
-            }
-        }
-        """
-
-        variables = {
-            "code": self.report_id,
-            "id": [self.fight_id],
-            "playerID": self.player_id,
-            "requiescatID": self.requiescat_id,
-            "divineMightID": self.divine_might_id,
-        }
-
-        pld_response = self.gql_query(headers, query, variables, "PaladinBuffs")
+        pld_response = self.query_auras(
+            headers, self.aura_requirements, "PaladinBuffs", aura_report
+        )
         divine_might_times = self._get_buff_times(
             pld_response, "divineMight", add_report_start=True
         )
@@ -123,12 +103,12 @@ class PaladinActions(BuffQuery):
             DataFrame with Paladin buffs applied
         """
         # Check if the timestamp is between any divine might window.
-        divine_might_condition = list(
-            actions_df["timestamp"].between(b[0], b[1]) for b in self.divine_might_times
+        divine_might_condition = IntervalSet(self.divine_might_times).contains(
+            actions_df["timestamp"]
         )
         # Check if timestamp is between any requiescat window.
-        requiescat_condition = list(
-            actions_df["timestamp"].between(b[0], b[1]) for b in self.requiescat_times
+        requiescat_condition = IntervalSet(self.requiescat_times).contains(
+            actions_df["timestamp"]
         )
 
         # Holy spirit/circle with Divine might:
@@ -136,10 +116,7 @@ class PaladinActions(BuffQuery):
         #    - Requiescat irrelevant
         actions_df = self._apply_buffs(
             actions_df,
-            (
-                disjunction(*divine_might_condition)
-                & actions_df["abilityGameID"].isin(self.holy_ids)
-            ),
+            (divine_might_condition & actions_df["abilityGameID"].isin(self.holy_ids)),
             self.divine_might_id,
         )
 
@@ -148,9 +125,9 @@ class PaladinActions(BuffQuery):
         actions_df = self._apply_buffs(
             actions_df,
             (
-                ~disjunction(*divine_might_condition)
+                ~divine_might_condition
                 & actions_df["abilityGameID"].isin(self.holy_ids)
-                & disjunction(*requiescat_condition)
+                & requiescat_condition
             ),
             self.requiescat_id,
         )
@@ -159,10 +136,7 @@ class PaladinActions(BuffQuery):
         # Requiescat up
         actions_df = self._apply_buffs(
             actions_df,
-            (
-                disjunction(*requiescat_condition)
-                & actions_df["abilityGameID"].isin(self.blade_ids)
-            ),
+            (requiescat_condition & actions_df["abilityGameID"].isin(self.blade_ids)),
             self.requiescat_id,
         )
 
@@ -0,0 +1,144 @@
+from fflogs_rotation.base import FFLogsClient, PageStats
+
+
+class PartyDamageEvents(FFLogsClient):
+    """Report-level store of every party member's damage events for one fight.
+
+    Fetching damage events per player repeats the same paginated query once per
+    party member. Instead, all friendly `DamageDone` events in a time window are
+    fetched once and filtered in memory by source. Pet events are assigned to their
+    owner using the report's pet actors, plus any pet IDs passed in.
+
+    Events are fetched lazily the first time a time window is requested, so one
+    store can be handed to every `ActionTable` of a party analysis. The store
+    is not kept on the `ActionTable` and is never pickled with it.
+    """
+
+    def __init__(
+        self,
+        report_id: str,
+        fight_id: int,
+        api_url: str = "https://www.fflogs.com/api/v2/client",
+    ) -> None:
+        """Create an (empty) party damage event store.
+
+        Args:
+            report_id (str): FFLogs report ID.
+            fight_id (int): Fight ID within the report.
+            api_url (str, optional): FFLogs API URL.
+        """
+        super().__init__(api_url=api_url)
+        self.report_id = report_id
+        self.fight_id = fight_id
+        # (start_time, end_time) -> party damage events
+        self._events_by_window: dict[tuple[float, float], list[dict]] = {}
+        self.pet_owners: dict[int, int] = {}
+        self.page_stats = PageStats()
+
+    @staticmethod
+    def _party_damage_events_query() -> str:
+        """Query for all friendly damage events, one page at a time."""
+        return """
+        query PartyDamageEvents(
+            $code: String!
+            $id: [Int]!
+            $startTime: Float!
+            $endTime: Float!
+        ) {
+            reportData {
+                report(code: $code) {
+                    masterData {
+                        actors(type: "Pet") {
+                            id
+                            petOwner
+                        }
+                    }
+                    events(
+                        fightIDs: $id
+                        startTime: $startTime
+                        endTime: $endTime
+                        dataType: DamageDone
+                        useAbilityIDs: false
+                        limit: 10000
+                    ) {
+                        data
+                        nextPageTimestamp
+                    }
+                }
+            }
+        }
+        """
+
+    def _fetch_events(
+        self, headers: dict[str, str], start_time: float, end_time: float
+    ) -> list[dict]:
+        """Fetch every page of party damage events in a time window.
+
+        Args:
+            headers (dict[str, str]): FFLogs API headers.
+            start_time (float): Window start, relative to the report start (ms).
+            end_time (float): Window end, relative to the report start (ms).
+
+        Returns:
+            list[dict]: Damage events of all friendly sources, in timestamp order.
+        """
+        variables = {
+            "code": self.report_id,
+            "id": [self.fight_id],
+            "startTime": start_time,
+            "endTime": end_time,
+        }
+        events = []
+        for report in self.paginate(
+            headers,
+            self._party_damage_events_query(),
+            variables,
+            "PartyDamageEvents",
+            self.page_stats,
+        ):
+            for actor in report["masterData"]["actors"]:
+                if actor.get("petOwner") is not None:
+                    self.pet_owners[actor["id"]] = actor["petOwner"]
+
+            events.extend(report["events"]["data"])
+        return events
+
+    def source_events(
+        self,
+        headers: dict[str, str],
+        player_id: int,
+        pet_ids: list[int] | None,
+        start_time: float,
+        end_time: float,
+    ) -> list[dict]:
+        """Get a player's damage events, including their pets.
+
+        Equivalent to querying damage events with `sourceID=player_id`.
+
+        Args:
+            headers (dict[str, str]): FFLogs API headers.
+            player_id (int): Player actor ID.
+            pet_ids (list[int] | None): Pet actor IDs owned by the player, if known.
+            start_time (float): Window start, relative to the report start (ms).
+            end_time (float): Window end, relative to the report start (ms).
+
+        Returns:
+            list[dict]: The player's and their pets' damage events, in timestamp order.
+        """
+        window = (start_time, end_time)
+        if window not in self._events_by_window:
+            self._events_by_window[window] = self._fetch_events(
+                headers, start_time, end_time
+            )
+
+        source_ids = {player_id}
+        source_ids.update(pet_ids or [])
+        source_ids.update(
+            pet_id for pet_id, owner in self.pet_owners.items() if owner == player_id
+        )
+
+        return [
+            event
+            for event in self._events_by_window[window]
+            if event.get("sourceID") in source_ids
+        ]
@@ -0,0 +1,180 @@
+"""Build every phase of a multi-phase fight at once.
+
+Analyzing phase 1, then phase 2, then the whole fight of the same pull would query
+FFLogs and build an actions DataFrame each time. Instead, the whole fight is built
+once with `RotationTable(..., all_phases=True)` and each phase is sliced out of it
+with `RotationTable.phase_tables`. The tables of every phase are cached, so other
+phases of the same pull are served without querying or rebuilding anything.
+
+Slicing only happens when every phase is built at once, i.e., when the cache is
+enabled or `build_phase_table` is asked to, so job gauges and buffs from earlier
+phases carry over the same way within those tables. Otherwise each phase is built
+by itself from its own query. The cache used by `phase_rotation_table` is process-wide and
+set with `set_phase_rotation_cache`. The default cache is a no-op.
+
+Callers which know the last phase reached pass it as `last_phase`, so unreached
+phases are built by themselves without building the whole fight first.
+"""
+
+import hashlib
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import diskcache
+
+from fflogs_rotation.rotation import RotationTable
+
+
+def phase_rotation_key(*fields) -> str:
+    """Create a stable cache key for the phase rotation tables of a pull.
+
+    Args:
+        *fields: Everything the rotation tables depend on, like the report code,
+            fight ID, player ID, job and stats.
+
+    Returns:
+        str: Hex digest identifying the tables.
+    """
+    payload = json.dumps(list(fields), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class PhaseRotationCache:
+    """No-op phase rotation cache, every lookup is a miss."""
+
+    enabled = False
+
+    def get(self, key: str) -> dict[int, RotationTable] | None:
+        return None
+
+    def set(self, key: str, tables: dict[int, RotationTable]) -> None:
+        pass
+
+
+class DiskPhaseRotationCache(PhaseRotationCache):
+    """Size-bounded, least-recently-used disk cache of phase rotation tables.
+
+    Tables are shared by all workers and kept for `ttl` seconds, long enough for
+    someone to go through the phases of a pull.
+    """
+
+    enabled = True
+
+    def __init__(
+        self, directory: str | Path, size_limit: int = 2**30, ttl: float = 3600
+    ) -> None:
+        """Open (or create) the disk cache.
+
+        Args:
+            directory (str | Path): Cache directory.
+            size_limit (int, optional): Maximum cache size in bytes. Defaults to 1 GiB.
+            ttl (float, optional): Seconds to cache the tables of a pull. Defaults to
+                1 hour.
+        """
+        self.cache = diskcache.Cache(
+            str(directory),
+            size_limit=size_limit,
+            eviction_policy="least-recently-used",
+        )
+        self.ttl = ttl
+
+    def get(self, key: str) -> dict[int, RotationTable] | None:
+        return self.cache.get(key)
+
+    def set(self, key: str, tables: dict[int, RotationTable]) -> None:
+        self.cache.set(key, tables, expire=self.ttl)
+
+
+_phase_rotation_cache: PhaseRotationCache = PhaseRotationCache()
+
+
+def set_phase_rotation_cache(cache: PhaseRotationCache | None) -> None:
+    """Set the process-wide phase rotation cache, `None` disables caching."""
+    global _phase_rotation_cache
+    _phase_rotation_cache = PhaseRotationCache() if cache is None else cache
+
+
+def get_phase_rotation_cache() -> PhaseRotationCache:
+    """Get the process-wide phase rotation cache."""
+    return _phase_rotation_cache
+
+
+def _is_reached(phase: int, last_phase: int | None) -> bool:
+    """Whether a phase may have been reached, `None` if the last phase is unknown."""
+    return last_phase is None or phase <= last_phase
+
+
+def build_phase_table(
+    phase: int,
+    build: Callable[..., RotationTable],
+    last_phase: int | None = None,
+    all_phases: bool = False,
+) -> RotationTable:
+    """Rotation table of a phase, built by itself or sliced out of the whole fight.
+
+    Phases are only sliced out of a build of the whole fight if `all_phases` is set.
+    Phases which weren't reached are built by themselves, so they fail like any
+    other phase analysis would.
+
+    Args:
+        phase (int): Phase number, 0 for the whole fight.
+        build (Callable[..., RotationTable]): Builds a `RotationTable` of the pull,
+            given `phase` and optionally `all_phases` as keyword arguments.
+        last_phase (int | None, optional): Last phase reached in the pull, if known.
+        all_phases (bool, optional): Slice the phase out of the whole fight.
+            Defaults to False.
+
+    Returns:
+        RotationTable: Rotation table of the phase.
+    """
+    if phase == 0 or not all_phases or not _is_reached(phase, last_phase):
+        return build(phase=phase)
+    fight = build(phase=0, all_phases=True)
+    if phase not in fight.phase_windows:
+        return build(phase=phase)
+    return fight.phase_table(phase)
+
+
+def phase_rotation_table(
+    key: str,
+    phase: int,
+    build: Callable[..., RotationTable],
+    last_phase: int | None = None,
+) -> RotationTable:
+    """Rotation table of a phase, from the cached tables of every phase of the pull.
+
+    On a cache miss, the whole fight is built and the tables of every phase are
+    cached. Without a cache, only the requested phase is built. Phases which
+    weren't reached are built by themselves, so they fail like any other phase
+    analysis would.
+
+    Args:
+        key (str): Key of the pull's tables, from `phase_rotation_key`.
+        phase (int): Phase number, 0 for the whole fight.
+        build (Callable[..., RotationTable]): Builds a `RotationTable` of the pull,
+            given `phase` and optionally `all_phases` as keyword arguments.
+        last_phase (int | None, optional): Last phase reached in the pull, if known.
+
+    Returns:
+        RotationTable: Rotation table of the phase.
+
+    Example:
+        ```python
+        build = partial(RotationTable, headers=headers, report_id=report_id, ...)
+        key = phase_rotation_key(report_id, fight_id, player_id, job, ...)
+        p2 = phase_rotation_table(key, 2, build, last_phase=3)
+        ```
+    """
+    cache = get_phase_rotation_cache()
+    if not cache.enabled or not _is_reached(phase, last_phase):
+        return build(phase=phase)
+
+    tables = cache.get(key)
+    if tables is None:
+        tables = build(phase=0, all_phases=True).phase_tables()
+        cache.set(key, tables)
+
+    if phase not in tables:
+        return build(phase=phase)
+    return tables[phase]
@@ -0,0 +1,203 @@
+"""Opt-in per-stage timings and profiles of analyses.
+
+Stages of an analysis (FFLogs queries, building the actions DataFrame, job and
+encounter specifics, the rotation DataFrame, the damage distributions, blob
+writes) are timed with `stage`, which does nothing unless the analysis runs under
+`record_stages`:
+
+    with record_stages():
+        rotation = RotationTable(...)
+        ...
+        set_analysis_id(analysis_id)
+
+When `record_stages` exits, the timings are written with the analysis ID to the
+process-wide sink set by `set_stage_timing_sink`. The default sink is a no-op, so
+nothing is recorded unless the app opts in. `record_stages` can also capture a
+cProfile of the whole analysis.
+"""
+
+import cProfile
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StageTiming:
+    """Wall time of one stage of an analysis."""
+
+    stage: str
+    seconds: float = 0.0
+    # Rows produced by the stage, if it produces a table
+    rows: int | None = None
+    job: str | None = None
+
+
+@dataclass
+class StageTimings:
+    """Stages timed during one analysis."""
+
+    analysis_id: str | None = None
+    records: list[StageTiming] = field(default_factory=list)
+
+
+class StageTimingSink:
+    """Destination of stage timings. The base class discards them."""
+
+    enabled = False
+
+    def write(self, analysis_id: str, records: list[StageTiming]) -> None:
+        pass
+
+
+class LoggingStageTimingSink(StageTimingSink):
+    """Log each stage as a JSON line."""
+
+    enabled = True
+
+    def __init__(self, level: int = logging.INFO) -> None:
+        self.level = level
+
+    def write(self, analysis_id: str, records: list[StageTiming]) -> None:
+        for record in records:
+            logger.log(
+                self.level, json.dumps({"analysis_id": analysis_id, **asdict(record)})
+            )
+
+
+class SQLiteStageTimingSink(StageTimingSink):
+    """Insert stage timings into a `stage_timing` table.
+
+    Example:
+        ```sql
+        select stage, avg(seconds), max(seconds)
+        from stage_timing
+        group by stage
+        order by avg(seconds) desc
+        ```
+    """
+
+    enabled = True
+
+    def __init__(self, db_path: str | Path) -> None:
+        self.db_path = Path(db_path)
+        with sqlite3.connect(self.db_path) as con:
+            con.execute(
+                """
+                create table if not exists stage_timing (
+                    analysis_id text,
+                    stage text,
+                    job text,
+                    seconds real,
+                    rows integer,
+                    recorded_at text
+                )
+                """
+            )
+        con.close()
+
+    def write(self, analysis_id: str, records: list[StageTiming]) -> None:
+        recorded_at = datetime.now().isoformat()
+        with sqlite3.connect(self.db_path) as con:
+            con.executemany(
+                "insert into stage_timing values (?, ?, ?, ?, ?, ?)",
+                [
+                    (analysis_id, r.stage, r.job, r.seconds, r.rows, recorded_at)
+                    for r in records
+                ],
+            )
+        con.close()
+
+
+_sink: StageTimingSink = StageTimingSink()
+_current: ContextVar[StageTimings | None] = ContextVar("stage_timings", default=None)
+
+
+def set_stage_timing_sink(sink: StageTimingSink | None) -> None:
+    """Set the process-wide stage timing sink, or disable timings with None."""
+    global _sink
+    _sink = sink if sink is not None else StageTimingSink()
+
+
+def get_stage_timing_sink() -> StageTimingSink:
+    return _sink
+
+
+@contextmanager
+def stage(name: str, job: str | None = None) -> Iterator[StageTiming]:
+    """Time a stage of the current analysis.
+
+    Set `rows` on the yielded record to also record how many rows it produced.
+    Outside of `record_stages`, nothing is timed.
+
+    Args:
+        name (str): Stage name, like "action_table.create_action_df".
+        job (str | None, optional): Job the stage is for.
+    """
+    record = StageTiming(name, job=job)
+    timings = _current.get()
+    if timings is None:
+        yield record
+        return
+
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.seconds = time.perf_counter() - start
+        # Stages can run in query threads, list.append is atomic.
+        timings.records.append(record)
+
+
+def set_analysis_id(analysis_id: str) -> None:
+    """Name the current analysis, once its ID is known."""
+    timings = _current.get()
+    if timings is not None:
+        timings.analysis_id = analysis_id
+
+
+@contextmanager
+def record_stages(profile_directory: Path | None = None) -> Iterator[StageTimings]:
+    """Record the stages of an analysis, writing them to the sink on exit.
+
+    Timings are only written if the analysis was named with `set_analysis_id`, so
+    analyses which fail or are answered from a prior analysis aren't recorded.
+
+    Args:
+        profile_directory (Path | None, optional): Also profile the analysis with
+            cProfile, saving the stats to `<directory>/<analysis ID>.prof`. Only
+            the calling thread is profiled, executor threads aren't.
+    """
+    sink = get_stage_timing_sink()
+    if not sink.enabled and profile_directory is None:
+        yield StageTimings()
+        return
+
+    timings = StageTimings()
+    token = _current.set(timings)
+    profiler = cProfile.Profile() if profile_directory is not None else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield timings
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        _current.reset(token)
+
+    if timings.analysis_id is None:
+        return
+    if sink.enabled:
+        sink.write(timings.analysis_id, timings.records)
+    if profiler is not None:
+        profile_directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(profile_directory / f"{timings.analysis_id}.prof")
@@ -0,0 +1,383 @@
+"""Prioritized scheduling of FFLogs API requests under the hourly point limit.
+
+FFLogs meters API points per hour. Instead of letting interactive analyses, party
+analyses and background recomputes compete blindly until FFLogs answers with
+429s, every request takes a token from a process-wide token bucket first. Work
+which can't proceed is queued, highest priority first, rather than failing.
+
+Separate gunicorn workers and long callback processes spend the same points, so
+the bucket can be kept in a diskcache directory shared by all of them, where it is
+read, refilled and spent in one transaction. It is also periodically synced with
+FFLogs' `rateLimitData`, which covers every process using the same API client.
+Priority ordering of waiting requests stays per process.
+
+The priority of requests is set per context with `request_priority`:
+
+    with request_priority(Priority.BACKGROUND):
+        RotationTable(...)
+
+Requests are charged the points `estimate_query_cost` expects them to cost, from
+the report fields they request, since event pages and tables cost FFLogs far more
+than fight metadata. The periodic `rateLimitData` sync corrects the estimates.
+
+Use `submit_in_context` to keep the priority in executor threads. The default
+rate limiter doesn't limit anything, the app opts in with `set_rate_limiter`.
+"""
+
+import contextvars
+import heapq
+import itertools
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from enum import IntEnum
+from pathlib import Path
+
+import diskcache
+import requests
+
+from fflogs_rotation.http_session import get_session
+
+FFLOGS_API_URL = "https://www.fflogs.com/api/v2/client"
+
+RATE_LIMIT_QUERY = """
+query RateLimitData {
+    rateLimitData {
+        limitPerHour
+        pointsSpentThisHour
+        pointsResetIn
+    }
+}
+"""
+
+# Key of the shared bucket state, (capacity, tokens, updated at).
+_BUCKET_KEY = "bucket"
+_REFRESHED_KEY = "refreshed"
+
+
+# Estimated API points of each report field which FFLogs computes per request, on
+# top of 1 point for the request itself. Rough, `rateLimitData` corrects them.
+QUERY_FIELD_COSTS = {
+    "events": 5.0,
+    "table": 5.0,
+    "graph": 5.0,
+    "rankings": 2.0,
+}
+_QUERY_FIELD_PATTERN = re.compile(r"\b(" + "|".join(QUERY_FIELD_COSTS) + r")\s*\(")
+
+
+def estimate_query_cost(query: str) -> float:
+    """Estimate the API points a GraphQL query costs.
+
+    Args:
+        query (str): GraphQL query string.
+
+    Returns:
+        float: 1 point, plus the cost of every costly report field requested, e.g.,
+            each phase's `table(...)` of a query with one table per phase.
+    """
+    return 1.0 + sum(
+        QUERY_FIELD_COSTS[field] for field in _QUERY_FIELD_PATTERN.findall(query)
+    )
+
+
+class Priority(IntEnum):
+    """Request priority classes, lower values are served first."""
+
+    INTERACTIVE = 0
+    PARTY = 1
+    BACKGROUND = 2
+
+
+_request_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "fflogs_request_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Set the priority of FFLogs requests made within the context."""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """Priority of FFLogs requests made in the current context."""
+    return _request_priority.get()
+
+
+def submit_in_context(executor: Executor, fn: Callable, *args, **kwargs) -> Future:
+    """Submit to an executor, keeping the current request priority.
+
+    Executor threads don't inherit context variables, so `fn` is run in a copy of
+    the submitting context.
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class RateLimiter:
+    """No-op rate limiter, requests are never delayed."""
+
+    def acquire(
+        self,
+        headers: dict[str, str] | None = None,
+        priority: Priority | None = None,
+        cost: float = 1.0,
+        timeout: float | None = None,
+    ) -> bool:
+        return True
+
+    def queue_depth(self, priority: Priority | None = None) -> int:
+        return 0
+
+    @property
+    def points_remaining(self) -> float | None:
+        return None
+
+
+class RateLimitScheduler(RateLimiter):
+    """Token bucket of FFLogs API points with prioritized waiting.
+
+    Tokens refill continuously at `points_per_hour` / 3600 per second. A request
+    may only spend points while at least its priority's reserve fraction of the
+    hourly limit would remain, so party and background work leave headroom for
+    interactive analyses. Waiting requests are served strictly by priority, then
+    in arrival order.
+
+    Every `refresh_interval` seconds, the next request first queries
+    `rateLimitData` and resets the bucket to the points FFLogs reports remaining.
+
+    With a `directory`, the bucket and the last refresh time are shared by every
+    scheduler using it. Requests waiting on points spent by another process
+    re-check the bucket at least every `poll_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        points_per_hour: float = 3600,
+        reserve_fractions: dict[Priority, float] | None = None,
+        refresh_interval: float | None = 60,
+        api_url: str = FFLOGS_API_URL,
+        directory: str | Path | None = None,
+        poll_interval: float = 1.0,
+    ) -> None:
+        """Create a rate limit scheduler.
+
+        Args:
+            points_per_hour (float, optional): Hourly point limit, until the actual
+                limit is read from `rateLimitData`.
+            reserve_fractions (dict[Priority, float] | None, optional): Fraction of
+                the hourly limit each priority must leave unspent. Defaults to 10%
+                for party and 30% for background work.
+            refresh_interval (float | None, optional): Seconds between `rateLimitData`
+                queries, None never queries it.
+            api_url (str, optional): FFLogs API URL.
+            directory (str | Path | None, optional): diskcache directory holding the
+                bucket shared by all workers, None keeps it in this process.
+            poll_interval (float, optional): Maximum seconds between checks of a
+                shared bucket while waiting.
+        """
+        self.capacity = float(points_per_hour)
+        self.refill_rate = self.capacity / 3600
+        self.tokens = self.capacity
+        self.reserve_fractions = {
+            Priority.INTERACTIVE: 0.0,
+            Priority.PARTY: 0.1,
+            Priority.BACKGROUND: 0.3,
+        }
+        if reserve_fractions is not None:
+            self.reserve_fractions.update(reserve_fractions)
+        self.refresh_interval = refresh_interval
+        self.api_url = api_url
+        self.poll_interval = poll_interval
+        self._store = None if directory is None else diskcache.Cache(str(directory))
+
+        # Wall clock time, comparable between processes sharing the bucket.
+        self._updated_at = time.time()
+        self._refreshed_at: float | None = None
+        self._condition = threading.Condition()
+        # Heap of (priority, arrival order) of waiting requests
+        self._waiting: list[tuple[Priority, int]] = []
+        self._arrivals = itertools.count()
+
+    @contextmanager
+    def _bucket(self) -> Iterator[None]:
+        """Load the shared bucket state, and save it back when done.
+
+        The state is held in a diskcache transaction, so other processes can't
+        spend the same points in between. Without a shared store, this does nothing.
+        """
+        if self._store is None:
+            yield
+            return
+        with self._store.transact():
+            state = self._store.get(_BUCKET_KEY)
+            if state is not None:
+                self.capacity, self.tokens, self._updated_at = state
+                self.refill_rate = self.capacity / 3600
+            yield
+            self._store.set(_BUCKET_KEY, (self.capacity, self.tokens, self._updated_at))
+
+    def _refill(self) -> None:
+        now = time.time()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated_at) * self.refill_rate
+        )
+        self._updated_at = now
+
+    def _shortfall(self, priority: Priority, cost: float) -> float:
+        """Points missing before a request of this priority may proceed."""
+        reserve = self.reserve_fractions[priority] * self.capacity
+        return cost + reserve - self.tokens
+
+    def update(
+        self, limit_per_hour: float, points_spent: float, reset_in: float | None = None
+    ) -> None:
+        """Sync the bucket with FFLogs' reported rate limit data.
+
+        Args:
+            limit_per_hour (float): Hourly point limit.
+            points_spent (float): Points spent this hour.
+            reset_in (float | None, optional): Seconds until points reset. Unused,
+                points are treated as refilling continuously.
+        """
+        with self._condition, self._bucket():
+            self.capacity = float(limit_per_hour)
+            self.refill_rate = self.capacity / 3600
+            self.tokens = max(self.capacity - points_spent, 0.0)
+            self._updated_at = time.time()
+            self._condition.notify_all()
+
+    def _refresh_due(self) -> bool:
+        if self.refresh_interval is None:
+            return False
+        if self._store is not None:
+            # Only the first worker to add the key refreshes this interval.
+            return self._store.add(_REFRESHED_KEY, True, expire=self.refresh_interval)
+        with self._condition:
+            now = time.monotonic()
+            if (self._refreshed_at is not None) and (
+                now - self._refreshed_at < self.refresh_interval
+            ):
+                return False
+            # Only one request refreshes, others keep using the current estimate.
+            self._refreshed_at = now
+            return True
+
+    def refresh(self, headers: dict[str, str]) -> None:
+        """Query `rateLimitData` and sync the bucket with it.
+
+        Failures are ignored, the current estimate is kept.
+        """
+        try:
+            response = get_session().post(
+                url=self.api_url,
+                json={"query": RATE_LIMIT_QUERY, "operationName": "RateLimitData"},
+                headers=headers,
+            )
+            response.raise_for_status()
+            rate_limit_data = response.json()["data"]["rateLimitData"]
+        except (requests.RequestException, ValueError, KeyError, TypeError):
+            return
+
+        self.update(
+            rate_limit_data["limitPerHour"],
+            rate_limit_data["pointsSpentThisHour"],
+            rate_limit_data["pointsResetIn"],
+        )
+
+    def acquire(
+        self,
+        headers: dict[str, str] | None = None,
+        priority: Priority | None = None,
+        cost: float = 1.0,
+        timeout: float | None = None,
+    ) -> bool:
+        """Wait until a request may be sent, then spend its points.
+
+        Args:
+            headers (dict[str, str] | None, optional): FFLogs API headers, used to
+                refresh `rateLimitData` when due.
+            priority (Priority | None, optional): Request priority, defaults to the
+                context's priority from `request_priority`.
+            cost (float, optional): Points the request is expected to cost.
+            timeout (float | None, optional): Maximum seconds to wait, None waits
+                until points are available.
+
+        Returns:
+            bool: True if points were spent, False if `timeout` was reached first.
+        """
+        if priority is None:
+            priority = current_priority()
+        if (headers is not None) and self._refresh_due():
+            self.refresh(headers)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            entry = (priority, next(self._arrivals))
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    with self._bucket():
+                        self._refill()
+                        shortfall = self._shortfall(priority, cost)
+                        if (self._waiting[0] == entry) and (shortfall <= 0):
+                            self.tokens -= cost
+                            return True
+
+                    # Wake up when enough points should have refilled, or when
+                    # the queue changes.
+                    wait = None
+                    if (shortfall > 0) and (self.refill_rate > 0):
+                        wait = shortfall / self.refill_rate
+                    if self._store is not None:
+                        # Other processes may spend or reset points meanwhile.
+                        wait = (
+                            self.poll_interval
+                            if wait is None
+                            else min(wait, self.poll_interval)
+                        )
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._condition.wait(wait)
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+    def queue_depth(self, priority: Priority | None = None) -> int:
+        """Number of requests waiting, optionally only of one priority."""
+        with self._condition:
+            if priority is None:
+                return len(self._waiting)
+            return sum(1 for p, _ in self._waiting if p == priority)
+
+    @property
+    def points_remaining(self) -> float:
+        """Estimated API points remaining."""
+        with self._condition, self._bucket():
+            self._refill()
+            return self.tokens
+
+
+_rate_limiter: RateLimiter = RateLimiter()
+
+
+def set_rate_limiter(rate_limiter: RateLimiter | None) -> None:
+    """Set the process-wide rate limiter, `None` disables rate limiting."""
+    global _rate_limiter
+    _rate_limiter = RateLimiter() if rate_limiter is None else rate_limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter."""
+    return _rate_limiter
@@ -3,10 +3,19 @@ from typing import Dict
 import numpy as np
 import pandas as pd
 
-from fflogs_rotation.base import BuffQuery, disjunction
+from fflogs_rotation.base import AuraRequirement, BuffQuery, IntervalSet
 
 
 class ReaperActions(BuffQuery):
+    # Aura tables needed for the player, see `BuffQuery.query_auras`.
+    aura_requirements = (
+        AuraRequirement("enhancedCrossReaping", 1002591),
+        AuraRequirement("enhancedGallows", 1002589),
+        AuraRequirement("enhancedGibbet", 1002588),
+        AuraRequirement("enhancedVoidReaping", 1002590),
+        AuraRequirement("immortalSacrifice", 1002592, events=True),
+    )
+
     def __init__(
         self,
         headers: dict,
@@ -25,6 +34,7 @@ class ReaperActions(BuffQuery):
         enhanced_gibbet_id: int = 1002588,
         enhanced_void_reaping_id: int = 1002590,
         immortal_sacrifice_id: int = 1002592,
+        aura_report: dict | None = None,
     ) -> None:
         super().__init__()
 
@@ -46,6 +56,15 @@ class ReaperActions(BuffQuery):
         self.enhanced_gibbet_id = enhanced_gibbet_id
         self.enhanced_void_reaping_id = enhanced_void_reaping_id
         self.immortal_sacrifice_id = immortal_sacrifice_id
+        self.aura_requirements = self.instance_aura_requirements(
+            {
+                "enhancedCrossReaping": enhanced_cross_reaping_id,
+                "enhancedGallows": enhanced_gallows_id,
+                "enhancedGibbet": enhanced_gibbet_id,
+                "enhancedVoidReaping": enhanced_void_reaping_id,
+                "immortalSacrifice": immortal_sacrifice_id,
+            }
+        )
 
         (
             self.enhanced_cross_reaping_times,
@@ -53,10 +72,12 @@ class ReaperActions(BuffQuery):
             self.enhanced_gibbet_times,
             self.enhanced_void_reaping_times,
             self.immortal_sacrifice_times,
-        ) = self.set_enhanced_times(headers)
+        ) = self.set_enhanced_times(headers, aura_report)
         pass
 
-    def set_enhanced_times(self, headers: Dict[str, str]) -> None:
+    def set_enhanced_times(
+        self, headers: Dict[str, str], aura_report: dict | None = None
+    ) -> None:
         """
         Perform an API call to get buff intervals for enhanced abilities and immortal sacrifice stacks.
 
@@ -65,71 +86,12 @@ class ReaperActions(BuffQuery):
 
         Parameters:
             headers (Dict[str, str]): FFLogs API header.
+            aura_report (dict | None): Report response already containing the
+                buff tables.
         """
-        query = """
-        query reaperEnhanced(
-            $code: String!
-            $id: [Int]!
-            $playerID: Int!
-            $enhancedCrossReapingID: Float!
-            $enhancedGallowsID: Float!
-            $enhancedGibbetID: Float!
-            $enhancedVoidReapingID: Float!
-            $immortalSacrificeID: Float!
-        ) {
-            reportData {
-                report(code: $code) {
-                    startTime
-                    enhancedCrossReaping: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $enhancedCrossReapingID
-                    )
-                    enhancedGallows: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $enhancedGallowsID
-                    )
-                    enhancedGibbet: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $enhancedGibbetID
-                    )
-                    enhancedVoidReaping: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $enhancedVoidReapingID
-                    )
-                    immortalSacrifice: events(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $immortalSacrificeID
-                    ) {
-                        data
-                        nextPageTimestamp
-                    }
-                }
-            }
-        }
-        """
-        variables = {
-            "code": self.report_id,
-            "id": [self.fight_id],
-            "playerID": self.player_id,
-            "enhancedCrossReapingID": self.enhanced_cross_reaping_id,
-            "enhancedGallowsID": self.enhanced_gallows_id,
-            "enhancedGibbetID": self.enhanced_gibbet_id,
-            "enhancedVoidReapingID": self.enhanced_void_reaping_id,
-            "immortalSacrificeID": self.immortal_sacrifice_id,
-        }
-
-        rpr_buff_response = self.gql_query(headers, query, variables, "reaperEnhanced")
-        # self._perform_graph_ql_query(headers, query, variables, "reaperEnhanced")
+        rpr_buff_response = self.query_auras(
+            headers, self.aura_requirements, "reaperEnhanced", aura_report
+        )
         enhanced_cross_reaping_times = self._get_buff_times(
             rpr_buff_response, "enhancedCrossReaping", add_report_start=True
         )
@@ -199,57 +161,37 @@ class ReaperActions(BuffQuery):
             pd.DataFrame: Updated DataFrame with applied buffs.
         """
         # Enhanced cross reaping
-        enhanced_cross_reaping_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-            for b in self.enhanced_cross_reaping_times
-        )
-
-        enhanced_cross_reaping_condition = disjunction(
-            *enhanced_cross_reaping_betweens
-        ) & (actions_df["abilityGameID"] == self.cross_reaping_id)
+        timestamp = actions_df["timestamp"]
+        enhanced_cross_reaping_condition = IntervalSet(
+            self.enhanced_cross_reaping_times, inclusive="right"
+        ).contains(timestamp) & (actions_df["abilityGameID"] == self.cross_reaping_id)
 
         # Enhanced gallows
-        enhanced_gallows_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-            for b in self.enhanced_gallows_times
-        )
-
-        enhanced_gallows_condition = disjunction(*enhanced_gallows_betweens) & (
-            actions_df["abilityGameID"] == self.gallows_id
-        )
+        enhanced_gallows_condition = IntervalSet(
+            self.enhanced_gallows_times, inclusive="right"
+        ).contains(timestamp) & (actions_df["abilityGameID"] == self.gallows_id)
 
         # Enhanced gibbet
-        enhanced_gibbet_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-            for b in self.enhanced_gibbet_times
-        )
-
-        enhanced_gibbet_condition = disjunction(*enhanced_gibbet_betweens) & (
-            actions_df["abilityGameID"] == self.gibbet_id
-        )
+        enhanced_gibbet_condition = IntervalSet(
+            self.enhanced_gibbet_times, inclusive="right"
+        ).contains(timestamp) & (actions_df["abilityGameID"] == self.gibbet_id)
 
         # Enhanced harpe
-        enhanced_void_reaping_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-            for b in self.enhanced_void_reaping_times
-        )
-
-        enhanced_void_reaping_condition = disjunction(
-            *enhanced_void_reaping_betweens
-        ) & (actions_df["abilityGameID"] == self.void_reaping_id)
+        enhanced_void_reaping_condition = IntervalSet(
+            self.enhanced_void_reaping_times, inclusive="right"
+        ).contains(timestamp) & (actions_df["abilityGameID"] == self.void_reaping_id)
 
         # Immortal sacrifice stacks, which affect plentiful harvest potency.
         # Dancer is dumb because they dont always trigger a stack.
         for s in range(6, 9):
-            plentiful_harvest_betweens = list(
-                actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-                for b in self.immortal_sacrifice_times
-                if b[2] == s
+            plentiful_harvest_windows = IntervalSet(
+                (b for b in self.immortal_sacrifice_times if b[2] == s),
+                inclusive="right",
             )
 
-            if len(plentiful_harvest_betweens) > 0:
-                plentiful_harvest_condition = disjunction(
-                    *plentiful_harvest_betweens
+            if len(plentiful_harvest_windows) > 0:
+                plentiful_harvest_condition = plentiful_harvest_windows.contains(
+                    timestamp
                 ) & (actions_df["abilityGameID"] == self.plentiful_harvest_id)
 
                 actions_df = self._apply_buffs(
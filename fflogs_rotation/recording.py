@@ -0,0 +1,167 @@
+"""Record and replay FFLogs GraphQL responses.
+
+Recorded responses are stored as one JSON file per request, keyed by operation
+name, variables and query text, so the app and the party pipeline can run offline against
+real payloads. Recording happens at the HTTP session, which covers both
+`FFLogsClient` queries and the `crit_app.util.api.fflogs` helpers:
+
+    configure_session(RecordReplaySession, directory="recordings", mode="record")
+
+The same recordings can be served over HTTP with injected latency by
+`fflogs_rotation.stand_in_server`.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import requests
+
+from fflogs_rotation.http_session import PooledSession
+
+RECORDING_MODES = ("record", "replay")
+
+
+def recording_key(operation_name: str, variables: dict, query: str) -> str:
+    """Stable key for a recorded request.
+
+    The query text is part of the key, so a query whose shape changed isn't
+    served a stale recording. Whitespace is normalized, so reformatting a query
+    keeps its recordings.
+
+    Args:
+        operation_name (str): GraphQL operation name.
+        variables (dict): Query variables.
+        query (str): GraphQL query string.
+
+    Returns:
+        str: Hex digest identifying the request.
+    """
+    payload = json.dumps(
+        {
+            "operationName": operation_name,
+            "variables": variables,
+            "query": " ".join(query.split()),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class RecordingStore:
+    """Directory of recorded GraphQL responses.
+
+    Each response is saved as `<directory>/<operation name>/<key>.json`, alongside
+    its operation name, variables and query.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+
+    def path(self, operation_name: str, variables: dict, query: str) -> Path:
+        return (
+            self.directory
+            / operation_name
+            / f"{recording_key(operation_name, variables, query)}.json"
+        )
+
+    def get(self, operation_name: str, variables: dict, query: str) -> dict | None:
+        """Get a recorded response, None if the request wasn't recorded."""
+        path = self.path(operation_name, variables, query)
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)["response"]
+
+    def put(
+        self, operation_name: str, variables: dict, query: str, response: dict
+    ) -> None:
+        """Record a response, replacing any previous recording."""
+        path = self.path(operation_name, variables, query)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        recording = {
+            "operationName": operation_name,
+            "variables": variables,
+            "query": query,
+            "response": response,
+        }
+        # Write then rename, so concurrent workers never read a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(recording, f)
+        os.replace(tmp_path, path)
+
+
+def graphql_operation(payload: dict | None) -> tuple[str, dict, str] | None:
+    """Operation name, variables and query of a GraphQL request payload, if any."""
+    if not isinstance(payload, dict) or ("operationName" not in payload):
+        return None
+    return (
+        payload["operationName"],
+        payload.get("variables") or {},
+        payload.get("query") or "",
+    )
+
+
+def recorded_response(url: str, response: dict | None) -> requests.Response:
+    """Build an HTTP response for a recorded GraphQL response.
+
+    Requests without a recording get a 404 with a GraphQL-style error, so callers
+    fail the same way they would for a bad request.
+    """
+    http_response = requests.Response()
+    http_response.url = url
+    http_response.headers["Content-Type"] = "application/json"
+    if response is None:
+        http_response.status_code = 404
+        http_response.reason = "Not Found"
+        response = {"errors": [{"message": "No recorded response for this request."}]}
+    else:
+        http_response.status_code = 200
+        http_response.reason = "OK"
+    http_response._content = json.dumps(response).encode()
+    return http_response
+
+
+class RecordReplaySession(PooledSession):
+    """Pooled session which records or replays GraphQL responses.
+
+    Only requests with a GraphQL JSON payload are recorded/replayed, other requests
+    (e.g., Etro or xivgear) are sent as usual.
+    """
+
+    def __init__(
+        self, directory: str | Path, mode: str = "replay", **session_kwargs
+    ) -> None:
+        """Create a record/replay session.
+
+        Args:
+            directory (str | Path): Directory of recorded responses.
+            mode (str, optional): "record" sends requests and saves successful
+                responses, "replay" only serves saved responses. Defaults to
+                "replay".
+            **session_kwargs: Passed to `PooledSession`.
+        """
+        if mode not in RECORDING_MODES:
+            raise ValueError(f"mode must be one of {RECORDING_MODES}, not {mode}.")
+        super().__init__(**session_kwargs)
+        self.store = RecordingStore(directory)
+        self.mode = mode
+
+    def request(self, method, url, **kwargs) -> requests.Response:
+        operation = graphql_operation(kwargs.get("json"))
+        if operation is None:
+            return super().request(method, url, **kwargs)
+
+        if self.mode == "replay":
+            return recorded_response(url, self.store.get(*operation))
+
+        response = super().request(method, url, **kwargs)
+        if response.ok:
+            response_json = response.json()
+            if "errors" not in response_json:
+                self.store.put(*operation, response_json)
+        return response
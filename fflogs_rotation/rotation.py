@@ -1,9 +1,34 @@
+import copy
+from collections.abc import Sequence
+
+import numpy as np
 import pandas as pd
 
 from fflogs_rotation.actions import ActionTable
+from fflogs_rotation.fight_metadata import FightMetadata
+from fflogs_rotation.job_data.snapshot import potency_index
+from fflogs_rotation.party_events import PartyDamageEvents
+from fflogs_rotation.profiling import stage
 
 url = "https://www.fflogs.com/api/v2/client"
 
+# Columns which make actions sample a different 1-hit damage distribution, so
+# actions are counted by them.
+COUNT_COLUMNS = [
+    "action_name",
+    "abilityGameID",
+    "bonusPercent",
+    "buff_set_id",
+    "p_n",
+    "p_c",
+    "p_d",
+    "p_cd",
+    "multiplier",
+    "l_c",
+    "main_stat_add",
+    "matched_falloff",
+]
+
 
 class RotationTable(ActionTable):
     """
@@ -47,6 +72,9 @@ class RotationTable(ActionTable):
         excluded_enemy_ids: list[int] | None = None,
         tenacity: int | None = None,
         debug: bool = False,
+        party_events: PartyDamageEvents | None = None,
+        fight_metadata: FightMetadata | None = None,
+        all_phases: bool = False,
     ) -> None:
         """
         Initialize RotationTable for damage distribution analysis.
@@ -72,6 +100,13 @@ class RotationTable(ActionTable):
             pet_ids: Optional list of pet actor IDs
             excluded_enemy_ids: Target IDs of enemies to exclude from rotation_df.
             debug: Enable debug logging
+            party_events: Optional party-wide damage event store shared between
+                party members, so events are fetched once per party.
+            fight_metadata: Optional persisted fight metadata from the encounter
+                lookup, so only the player's auras are queried.
+            all_phases: Build the whole fight (phase must be 0) so every phase
+                can be sliced out with `phase_table`, instead of querying and
+                building each phase separately.
 
         Example:
             ```python
@@ -121,18 +156,18 @@ class RotationTable(ActionTable):
             excluded_enemy_ids,
             tenacity,
             debug,
+            party_events,
+            fight_metadata,
+            all_phases,
         )
 
         self._setup_potency_table(potency_table)
-        self.rotation_df = self.make_rotation_df(self.actions_df)
+        with stage("rotation_table.make_rotation_df", job) as rotation_stage:
+            self.rotation_df = self.make_rotation_df(self.actions_df)
+            rotation_stage.rows = len(self.rotation_df)
 
         #
-        if excluded_enemy_ids is None:
-            self.filtered_actions_df = self.actions_df.copy()
-        else:
-            self.filtered_actions_df = self.actions_df.copy()[
-                ~self.actions_df["targetID"].isin(self.excluded_enemy_ids)
-            ]
+        self.filtered_actions_df = self._filter_excluded_enemies(self.actions_df)
 
         mismatched_actions = set(self.rotation_df.base_action) - set(
             self.actions_df.ability_name
@@ -143,41 +178,181 @@ class RotationTable(ActionTable):
             )
         pass
 
-    def _setup_potency_table(self, potency_table: pd.DataFrame) -> None:
+    def _filter_excluded_enemies(self, actions_df: pd.DataFrame) -> pd.DataFrame:
+        if self.excluded_enemy_ids is None:
+            return actions_df.copy()
+        return actions_df.copy()[~actions_df["targetID"].isin(self.excluded_enemy_ids)]
+
+    def phase_table(self, phase: int) -> "RotationTable":
+        """
+        Rotation table of one phase, sliced out of an all-phases table.
+
+        The phase's actions are the whole fight's actions from the phase start up
+        to the next phase start, so nothing is queried or rebuilt except the
+        rotation DataFrame. Job gauges and buffs carry over from earlier phases,
+        like they do in game.
+
+        Args:
+            phase: Phase number, 0 for the whole fight.
+
+        Returns:
+            RotationTable sharing this table's fight-level attributes, with phase
+            times, downtime, and copies of the actions and rotation of the phase.
+
+        Example:
+            ```python
+            fight = RotationTable(..., phase=0, ..., all_phases=True)
+            p2 = fight.phase_table(2)
+            print(p2.fight_dps_time, p2.rotation_df.head())
+            ```
+        """
+        if phase == self.phase:
+            return self
+        if not self.all_phases:
+            raise ValueError("Phases can only be sliced out of an all-phases table.")
+        if phase not in self.phase_windows:
+            raise ValueError(f"Phase {phase} wasn't reached.")
+
+        table = copy.copy(self)
+        # Hit type caches are rebuilt for the phase instead of shared.
+        for name in self._CACHED_PROPERTIES:
+            table.__dict__.pop(name, None)
+        # A phase can't be sliced into other phases.
+        table.all_phases = False
+        table.phase_windows = {}
+        table.phase_downtimes = {}
+        table.phase = phase
+        table.phase_start_time, table.phase_end_time = self.phase_windows[phase]
+        table.fight_start_time = self.report_start_time + table.phase_start_time
+        table.fight_end_time = self.report_start_time + table.phase_end_time
+        table._set_downtime(self.phase_downtimes[phase])
+
+        # Phases end where the next starts, the last phase ends with the fight.
+        in_phase = self.actions_df["timestamp"].between(
+            table.fight_start_time,
+            table.fight_end_time,
+            inclusive="both" if table.fight_end_time >= self.fight_end_time else "left",
+        )
+        # The phase's frames and buff lists are copies, so the whole fight is
+        # never modified through them.
+        table.actions_df = self.actions_df[in_phase].reset_index(drop=True).copy()
+        table.actions_df["buffs"] = table.actions_df["buffs"].map(list)
+        if len(table.actions_df) > 0:
+            # Like `create_action_df`, times are relative to the first action.
+            table.fight_start_time = table.actions_df["timestamp"].iloc[0]
+            table.actions_df["elapsed_time"] -= table.actions_df["elapsed_time"].iloc[0]
+
+        with stage("rotation_table.make_rotation_df", self.job) as rotation_stage:
+            table.rotation_df = table.make_rotation_df(table.actions_df)
+            rotation_stage.rows = (
+                0 if table.rotation_df is None else len(table.rotation_df)
+            )
+        table.filtered_actions_df = table._filter_excluded_enemies(table.actions_df)
+        return table
+
+    def phase_tables(self) -> dict[int, "RotationTable"]:
+        """Rotation tables of the whole fight (0) and every phase reached.
+
+        See `phase_table`.
+        """
+        return {0: self} | {p: self.phase_table(p) for p in self.phase_windows}
+
+    def rotation_df_for_stats(self, crit_stat: int, dh_stat: int) -> pd.DataFrame:
+        """
+        Rotation DataFrame of the same actions, for other critical/direct hit stats.
+
+        Only the hit type probabilities and the critical hit multiplier depend on
+        the critical and direct hit stats, so action counts, buffs and potencies
+        are shared with `rotation_df`. Each action's hit type buffs are recovered
+        from its critical/direct hit rates, by removing this table's base rates,
+        and added to the new base rates. Guaranteed and impossible hit types are
+        kept. The damage bonus of guaranteed hit types under hit type buffs, which
+        is part of `buffs`, is recomputed from the hit type buffs in the action
+        name. Buff IDs which aren't in the action name, like one replaced by a
+        Radiant Finale strength, are missed.
+
+        Args:
+            crit_stat: Critical hit stat value
+            dh_stat: Direct hit stat value
+
+        Returns:
+            Copy of `rotation_df` with the hit type probabilities, `l_c` and
+            guaranteed hit type bonuses of the other stats.
+
+        Example:
+            ```python
+            rotation = RotationTable(..., crit_stat=3000, dh_stat=1000, ...)
+            other_build_df = rotation.rotation_df_for_stats(2400, 1600)
+            ```
         """
-        Filters the provided potency table based on job, level, and valid time range,.
+        from ffxiv_stats import Rate
 
-        then converts the `potency_falloff` column into a list of numeric values.
+        rate = Rate(crit_stat, dh_stat, level=self.level)
+        rotation_df = self.rotation_df.copy()
 
-        The method filters the table to retain only rows that:
-        - Have a `valid_start` less than or equal to `self.patch_number`
-        - Have a `valid_end` greater than or equal to `self.patch_number`
-        - Match the current job and level
+        p_crit = (rotation_df["p_c"] + rotation_df["p_cd"]).round(10).to_numpy()
+        p_dh = (rotation_df["p_d"] + rotation_df["p_cd"]).round(10).to_numpy()
+        hit_type = (p_crit == 1.0) * 1 + (p_dh == 1.0) * 2
 
-        Any missing `potency_falloff` entries are filled with `"1."` before splitting
-        the string on semicolons to create lists of values.
+        # Guaranteed hit types hide their hit type buffs from the rates, but the
+        # buff IDs are part of the action name, "<ability>-<id>_<id>_<falloff>".
+        buffs = rotation_df["buffs"].to_numpy(dtype=float, copy=True)
+        for idx in np.flatnonzero(hit_type):
+            buff_ids = set(
+                rotation_df["action_name"].iat[idx].rsplit("-", 1)[-1].split("_")
+            )
+            ch_rate_buff = sum(self.critical_hit_rate_buffs.get(b, 0) for b in buff_ids)
+            dh_rate_buff = sum(self.direct_hit_rate_buffs.get(b, 0) for b in buff_ids)
+            buffs[idx] *= rate.get_hit_type_damage_buff(
+                hit_type[idx], ch_rate_buff, dh_rate_buff, self.determination
+            ) / self._rate.get_hit_type_damage_buff(
+                hit_type[idx], ch_rate_buff, dh_rate_buff, self.determination
+            )
+
+        # Same as `Rate.get_p`, for every action at once.
+        p_crit = np.where(
+            (p_crit == 0.0) | (p_crit == 1.0),
+            p_crit,
+            (rate.crit_prob() + (p_crit - self._rate.crit_prob()).round(2)).round(10),
+        )
+        p_dh = np.where(
+            (p_dh == 0.0) | (p_dh == 1.0),
+            p_dh,
+            (
+                rate.direct_hit_prob() + (p_dh - self._rate.direct_hit_prob()).round(2)
+            ).round(10),
+        )
+        p_cd = (p_crit * p_dh).round(10)
+
+        rotation_df["p_n"] = (1.0 - p_crit - p_dh + p_cd).round(10)
+        rotation_df["p_c"] = (p_crit - p_cd).round(10)
+        rotation_df["p_d"] = (p_dh - p_cd).round(10)
+        rotation_df["p_cd"] = p_cd
+        rotation_df["buffs"] = buffs
+        rotation_df["l_c"] = rate.crit_dmg_multiplier()
+        return rotation_df
+
+    def _setup_potency_table(self, potency_table: pd.DataFrame) -> None:
+        """
+        Look up the potencies of the job and level valid in the fight's patch.
+
+        Rows are valid for `valid_start <= self.patch_number < valid_end`.
+        The shipped potency table is indexed once per process by
+        `fflogs_rotation.job_data.data`, with `potency_falloff` already parsed into
+        float arrays. Any other table is indexed here, missing `potency_falloff`
+        entries becoming `[1.0]`.
 
         Args:
             potency_table (pd.DataFrame):
                 Original DataFrame containing columns:
-                - `valid_start`/`valid_end`: timestamps indicating when the row is valid
+                - `valid_start`/`valid_end`: patches indicating when the row is valid
                 - `job`: job name
                 - `level`: required job level
-                - `potency_falloff`: string of semicolon-separated falloff values
+                - `potency_falloff`: semicolon-separated falloff values
         """
-        self.potency_table = potency_table[
-            (self.patch_number >= potency_table["valid_start"])
-            & (self.patch_number < potency_table["valid_end"])
-            & (potency_table["job"] == self.job)
-            & (potency_table["level"] == self.level)
-        ]
-
-        self.potency_table.loc[
-            self.potency_table["potency_falloff"].isna(), "potency_falloff"
-        ] = "1."
-        self.potency_table.loc[:, "potency_falloff"] = self.potency_table[
-            "potency_falloff"
-        ].apply(lambda x: x.split(";"))
+        self.potency_table = potency_index(potency_table).lookup(
+            self.patch_number, self.job, self.level
+        )
 
     def _filter_actions_by_timestamp(
         self,
@@ -295,6 +470,9 @@ class RotationTable(ActionTable):
         Finding max base damage per packet ID identifies the primary target
         for calculating damage falloff on secondary targets.
 
+        Hits are sorted by packet ID, so the max of each packet is a single
+        `np.fmax.reduceat` over contiguous runs.
+
         Args:
             actions_df: DataFrame containing:
                 - packetID: FFLogs packet identifier
@@ -308,18 +486,21 @@ class RotationTable(ActionTable):
         Notes:
             - DoT ticks and ground effects are excluded since their AoE versions
             have no damage falloff
-            - Copy is returned to avoid modifying original DataFrame
         """
         # Filter out ticks because application damage + tick have same packet ID
         # Only an issue for Dia, where application pot = tick pot.
         # Caused fractional potency falloff condition to fail later.
-        return (
-            actions_df[actions_df["tick"] != True]
-            .groupby("packetID")
-            .max("base_damage")
-            .reset_index()
-            .rename(columns={"base_damage": "max_base"})[["packetID", "max_base"]]
-        ).copy()
+        hits = actions_df[(actions_df["tick"] != True) & actions_df["packetID"].notna()]
+        order = np.argsort(hits["packetID"].to_numpy(), kind="stable")
+        packet_id = hits["packetID"].to_numpy()[order]
+        base_damage = hits["base_damage"].to_numpy(dtype=float)[order]
+
+        packet_start = np.ones(len(packet_id), dtype=bool)
+        packet_start[1:] = packet_id[1:] != packet_id[:-1]
+        starts = np.flatnonzero(packet_start)
+        # fmax skips missing damage, like a groupby max.
+        max_base = np.fmax.reduceat(base_damage, starts) if len(starts) else base_damage
+        return pd.DataFrame({"packetID": packet_id[starts], "max_base": max_base})
 
     def _potency_falloff_fraction(
         self, actions_df: pd.DataFrame, max_multi_hit: pd.DataFrame
@@ -341,7 +522,8 @@ class RotationTable(ActionTable):
                 - max_base: Maximum base damage for that packet
 
         Returns:
-            DataFrame with additional column:
+            DataFrame with additional columns:
+                - max_base: Maximum base damage for the hit's packet
                 - fractional_potency: Ratio of hit damage to max damage [0.0-1.0]
 
         Example:
@@ -351,8 +533,9 @@ class RotationTable(ActionTable):
             print(df["fractional_potency"])  # [1.0, 0.75, 0.5, ...]
             ```
         """
-
-        actions_df = actions_df.merge(max_multi_hit, how="left", on="packetID")
+        packet = pd.Index(max_multi_hit["packetID"]).get_indexer(actions_df["packetID"])
+        max_base = np.append(max_multi_hit["max_base"].to_numpy(dtype=float), np.nan)
+        actions_df["max_base"] = max_base[packet]
 
         # Calculate falloff fractions
         actions_df["fractional_potency"] = (
@@ -370,9 +553,12 @@ class RotationTable(ActionTable):
         """
         Match actual potency falloff values to expected values from potency table.
 
-        Due to FFXIV's ±5% damage variance, matches falloff values within 0.1
-        of expected values from potency table. No abilities have falloff values
-        within 10% of each other, preventing overlap.
+        Each hit is matched to the nearest falloff of its ability, if it is within
+        0.1 of it, to allow for FFXIV's ±5% damage variance. Hits of abilities not
+        in the potency table, or not near any of their falloffs, are dropped.
+
+        Falloffs are sorted by ability and value into one array, so the nearest
+        falloff is a single `np.searchsorted` for all hits.
 
         Args:
             actions_df: DataFrame containing:
@@ -394,28 +580,49 @@ class RotationTable(ActionTable):
             print(df["matched_falloff"])  # [1.0, 0.75, 0.5]
             ```
         """
-        exploded_potencies = self.potency_table.explode("potency_falloff")[
-            ["ability_id", "potency_falloff"]
-        ]
-        exploded_potencies["potency_falloff"] = exploded_potencies[
-            "potency_falloff"
-        ].astype(float)
-
-        actions_df = actions_df.merge(
-            exploded_potencies,
-            left_on="abilityGameID",
-            right_on="ability_id",
-            how="left",
+        falloffs = (
+            self.potency_table.explode("potency_falloff")[
+                ["ability_id", "potency_falloff"]
+            ]
+            .astype({"potency_falloff": float})
+            .drop_duplicates()
+            .sort_values(["ability_id", "potency_falloff"])
         )
+        falloff_ability = falloffs["ability_id"].to_numpy()
+        falloff = falloffs["potency_falloff"].to_numpy()
+        abilities, falloff_code = np.unique(falloff_ability, return_inverse=True)
+        codes = np.arange(len(abilities))
+        segment_start = np.searchsorted(falloff_code, codes)
+        segment_end = np.searchsorted(falloff_code, codes, side="right")
+
+        # Offset each ability's falloffs so they sort after the previous ability's,
+        # with room for fractions beyond the smallest and largest falloff.
+        low = falloff.min(initial=0.0) - 1
+        high = falloff.max(initial=1.0) + 1
+        width = high - low + 1
+        keys = falloff_code * width + (falloff - low)
+
+        code = pd.Index(abilities).get_indexer(actions_df["abilityGameID"])
+        in_table = np.flatnonzero(code >= 0)
+        code = code[in_table]
+        fraction = actions_df["fractional_potency"].to_numpy(dtype=float)[in_table]
+
+        position = np.searchsorted(
+            keys, code * width + (np.clip(fraction, low, high) - low)
+        )
+        # Nearest of the falloffs either side of the fraction, within the ability
+        below = np.maximum(position - 1, segment_start[code])
+        above = np.minimum(position, segment_end[code] - 1)
+        nearest = np.where(
+            np.abs(fraction - falloff[above]) < np.abs(fraction - falloff[below]),
+            above,
+            below,
+        )
+        matched = np.abs(fraction - falloff[nearest]) < 0.1
 
-        actions_df["potency_falloff_diff"] = (
-            actions_df["fractional_potency"] - actions_df["potency_falloff"]
-        ).abs()
-
-        # Filter down to matches
-        actions_df = actions_df[actions_df["potency_falloff_diff"] < 0.1]
-        actions_df = actions_df.drop(columns="potency_falloff_diff").rename(
-            columns={"potency_falloff": "matched_falloff"}
+        nearest = nearest[matched]
+        actions_df = actions_df.iloc[in_table[matched]].assign(
+            ability_id=falloff_ability[nearest], matched_falloff=falloff[nearest]
         )
         return actions_df.drop_duplicates(
             subset=["elapsed_time", "packetID", "amount", "matched_falloff"]
@@ -428,13 +635,14 @@ class RotationTable(ActionTable):
         unique action occurs, then merges the result with the potency table.
 
         Steps:
-        1. Creates a string representation of buffs in `buff_str` (including matched falloff).
+        1. Drops actions whose `buff_set_id` has buffs which aren't buff IDs.
         2. Excludes specified enemy IDs (`excluded_enemy_ids`).
         3. Filters out actions with zero damage.
         4. Fills NaN values in `bonusPercent` with -1.
         5. Groups by multiple columns that affect action uniqueness and counts occurrences.
         6. Merges grouped DataFrame with the potency table to retrieve potency info.
-        7. Restores buffs to a list in `buff_list`.
+        7. Adds the buffs of each counted action in `buff_set`, and as a string
+           with the matched falloff in `buff_str`.
 
         Args:
             actions_df (pd.DataFrame):
@@ -451,12 +659,26 @@ class RotationTable(ActionTable):
                 falloff, combo state, etc.), including a count of how many times
                 the action occurred, tied to its potency data.
         """
-        # Lists are unhashable, so make as an ordered string.
-        actions_df["buff_str"] = (
-            actions_df["buffs"].sort_values().apply(lambda x: sorted(x)).str.join(".")
+        actions_df = self._countable_actions(actions_df)
+
+        # Count actions to make a rotation DF
+        # Also merge to the potency table to get the potency
+        # and is later used to determine combo/positional
+        return self._merge_potencies(
+            actions_df[COUNT_COLUMNS].value_counts().reset_index()
         )
-        # Need to add potency falloff so counting is correctly done later.
-        actions_df["buff_str"] += "." + actions_df["matched_falloff"].astype(str)
+
+    def _countable_actions(self, actions_df: pd.DataFrame) -> pd.DataFrame:
+        """Drop actions which aren't counted.
+
+        See `_count_actions`.
+        """
+        # Lists are unhashable, so actions are counted by the integer ID of their
+        # sorted buffs, interned by `create_action_df`. Potency falloff is counted
+        # separately. Buffs which aren't buff IDs can't be counted.
+        actions_df = actions_df[
+            self.buff_vocabulary.is_valid(actions_df["buff_set_id"])
+        ]
 
         # Exclude any enemies in excluded_enemy_ids
         # ex: crystals of darkness in FRU
@@ -473,42 +695,36 @@ class RotationTable(ActionTable):
 
         # And you cant value count nans
         actions_df["bonusPercent"] = actions_df["bonusPercent"].fillna(-1)
+        return actions_df
 
-        # Count actions grouping by all columns which change the underlying distribution
-        group_by_columns = [
-            "action_name",
-            "abilityGameID",
-            "bonusPercent",
-            "buff_str",
-            "p_n",
-            "p_c",
-            "p_d",
-            "p_cd",
-            "multiplier",
-            "l_c",
-            "main_stat_add",
-            "matched_falloff",
-        ]
+    def _merge_potencies(self, counted_actions: pd.DataFrame) -> pd.DataFrame:
+        """Merge counted actions with their potencies from the potency table.
 
-        # Count actions to make a rotation DF
-        # Also merge to the potency table to get the potency
-        # and is later used to determine combo/positional
-        rotation_df = (
-            actions_df[group_by_columns]
-            .value_counts()
-            .reset_index()
-            .merge(self.potency_table, left_on="abilityGameID", right_on="ability_id")
-            .rename(
-                columns={
-                    "count": "n",
-                    "multiplier": "buffs",
-                    "ability_name": "base_action",
-                }
-            )
+        The buffs of each counted action are looked up from its `buff_set_id`, only
+        to match potencies and to order the rotation.
+        """
+        buff_sets = self.buff_vocabulary.buff_sets
+        counted_buff_sets = [buff_sets[i] for i in counted_actions["buff_set_id"]]
+        counted_actions = counted_actions.assign(
+            buff_set=pd.Series(
+                counted_buff_sets, index=counted_actions.index, dtype=object
+            ),
+            buff_str=[
+                ".".join(buff_set) + "." + str(falloff)
+                for buff_set, falloff in zip(
+                    counted_buff_sets, counted_actions["matched_falloff"]
+                )
+            ],
+        )
+        rotation_df = counted_actions.merge(
+            self.potency_table, left_on="abilityGameID", right_on="ability_id"
+        ).rename(
+            columns={
+                "count": "n",
+                "multiplier": "buffs",
+                "ability_name": "base_action",
+            }
         )
-
-        # Buffs go back to a list
-        rotation_df["buff_list"] = rotation_df["buff_str"].str.split(".")
         return rotation_df
 
     def _apply_potency_priority(self, rotation_df: pd.DataFrame) -> pd.DataFrame:
@@ -519,10 +735,11 @@ class RotationTable(ActionTable):
         in the potency table, each with a different `buff_id`. The correct potency must
         be selected based on which buffs actually occurred.
 
-        The following priority is used to match `buff_id` against `buff_list`:
-        - Highest priority (2): `buff_id` is in `buff_list`
+        The following priority is used to match `buff_id` against the buffs in
+        `buff_set`:
+        - Highest priority (2): `buff_id` is one of the buffs
         - Medium priority (1): `buff_id` is `NaN` (no buff)
-        - Lowest priority (0): `buff_id` is not `NaN` but is absent from `buff_list`
+        - Lowest priority (0): `buff_id` is not `NaN` but is absent from the buffs
 
         For example, a Paladin's Holy Spirit can be un-buffed, buffed by Requiescat,
         or buffed by Divine Might, each having different potencies.
@@ -531,17 +748,20 @@ class RotationTable(ActionTable):
             pd.DataFrame: The input DataFrame with a new `potency_priority` column.
             The original DataFrame is also mutated in-place.
         """
+        # Membership of `buff_id` is looked up as (buff set ID, buff) pairs, with
+        # each distinct buff set exploded once.
+        buffs = (
+            rotation_df.drop_duplicates("buff_set_id")
+            .set_index("buff_set_id")["buff_set"]
+            .explode()
+            .dropna()
+        )
+        has_buff = pd.MultiIndex.from_arrays(
+            [rotation_df["buff_set_id"].to_numpy(), rotation_df["buff_id"].to_numpy()]
+        ).isin(pd.MultiIndex.from_arrays([buffs.index, buffs.to_numpy()]))
 
-        def buff_id_match(buff_id, buff_list):
-            if buff_id in buff_list:
-                return 2
-            elif pd.isna(buff_id):
-                return 1
-            else:
-                return 0
-
-        rotation_df["potency_priority"] = rotation_df.apply(
-            lambda x: buff_id_match(x["buff_id"], x["buff_list"]), axis=1
+        rotation_df["potency_priority"] = np.where(
+            has_buff, 2, np.where(rotation_df["buff_id"].isna(), 1, 0)
         )
         return rotation_df
 
@@ -599,9 +819,9 @@ class RotationTable(ActionTable):
         """
         Selects the highest priority potency value from a set of actions.
 
-        This method sorts the actions by a predefined list of columns and then groups
-        them by a subset of these columns. It takes the first row in each group, which
-        corresponds to the highest priority potency value.
+        This method groups the actions by a predefined list of columns and takes the
+        first row with the highest potency priority in each group. The kept rows are
+        sorted by the group columns and potency priority, descending.
 
         Args:
             rotation_df (pd.DataFrame): DataFrame containing action data, including
@@ -626,17 +846,27 @@ class RotationTable(ActionTable):
             "potency_priority",
         ]
 
-        group_by_list = sort_list[:-1] + ["bonusPercent"]
+        # `buff_str` only orders the rows, the same actions share a buff set ID and
+        # falloff.
+        group_by_list = [c for c in sort_list[:-1] if c != "buff_str"] + [
+            "buff_set_id",
+            "matched_falloff",
+            "bonusPercent",
+        ]
 
-        # Sort by these columns to get everything in the correct order
-        # Do a groupby-head operation to get the first column in the group
+        # Argmax of the priority per group (first row on ties), the same rows as
+        # sorting the whole table and taking the head of each group.
         # Note it include bonus percent now
-        rotation_df = (
-            rotation_df.sort_values(sort_list, ascending=False)
-            .groupby(group_by_list)
-            .head(1)
+        group = rotation_df.groupby(group_by_list, sort=False).ngroup().to_numpy()
+        priority = rotation_df["potency_priority"].to_numpy()
+        order = np.lexsort((np.arange(len(group)), -priority, group))
+        is_first = np.ones(len(order), dtype=bool)
+        is_first[1:] = group[order][1:] != group[order][:-1]
+        highest = order[is_first & (group[order] >= 0)]
+
+        return rotation_df.iloc[np.sort(highest)].sort_values(
+            sort_list, ascending=False
         )
-        return rotation_df
 
     def make_rotation_df(
         self,
@@ -698,6 +928,115 @@ class RotationTable(ActionTable):
         if len(actions_df) == 0:
             return None
 
+        actions_df = self._assign_potency_falloff(actions_df)
+
+        # Count actions to determine the rotation
+        # Actions are different if they sample a unique 1-hit distribution
+        # Many factors influence this including:
+        # - buffs (damage and hit type)
+        # - combo bonus
+        # - positionals
+        # - potency falloff
+        # - potions
+        # - job-specific mechanics like gauge
+        rotation_df = self._count_actions(actions_df)
+
+        rotation_df = self._candidate_potencies(rotation_df)
+        return self._select_potencies(rotation_df)
+
+    def make_clipped_rotation_dfs(
+        self, actions_df: pd.DataFrame, t_end_clips: Sequence[float]
+    ) -> list[pd.DataFrame | None]:
+        """
+        Create rotation DataFrames of the end of the fight, for several clip times.
+
+        Gives the same rotations as calling
+        `make_rotation_df(actions_df, t_end_clip=t, return_clipped=True)` for each
+        `t`, but potency falloff, buff strings and potencies are only resolved
+        once, for the longest clip. Each shorter clip is a subset of the longer
+        ones, so its action counts are accumulated from the time-sorted actions.
+
+        A multi-target hit's falloff depends on which of its targets' hits are in
+        the window, so any clip starting partway through a multi-target hit falls
+        back to `make_rotation_df`.
+
+        Args:
+            actions_df: DataFrame of raw combat actions
+            t_end_clips: Seconds clipped from the fight end, one rotation each.
+
+        Returns:
+            Rotation DataFrame of the last `t` seconds of the fight for each clip
+            time, in order. None for clips with no actions.
+        """
+        if len(t_end_clips) == 0:
+            return []
+
+        clip_starts = self.fight_end_time - 1000 * np.asarray(t_end_clips, dtype=float)
+        rotations = [None] * len(t_end_clips)
+        tail_df = self._filter_actions_by_timestamp(
+            actions_df.copy(), t_end_clip=max(t_end_clips), return_clipped=True
+        )
+        if len(tail_df) == 0:
+            return rotations
+
+        # Clips starting partway through a multi-target hit
+        hit_times = (
+            tail_df[tail_df["tick"] != True]
+            .groupby("packetID")["timestamp"]
+            .agg(["min", "max"])
+        )
+        hit_times = hit_times[hit_times["min"] < hit_times["max"]]
+        splits_hit = [
+            bool(((hit_times["min"] <= s) & (s < hit_times["max"])).any())
+            for s in clip_starts
+        ]
+        # Latest actions first, so each clip's actions are a prefix.
+        tail_times = -np.sort(-tail_df["timestamp"].to_numpy())
+
+        counted_df = self._countable_actions(self._assign_potency_falloff(tail_df))
+        # Actions counted together share a code, in `value_counts` order.
+        groups = counted_df.groupby(COUNT_COLUMNS, sort=True, dropna=True)
+        codes = groups.ngroup().to_numpy()
+        count_keys = groups.size().reset_index()[COUNT_COLUMNS]
+        # Potency table rows matched to each count code
+        candidate_codes = np.zeros(0, dtype=np.int64)
+        if len(count_keys) > 0:
+            candidates = self._candidate_potencies(
+                self._merge_potencies(
+                    count_keys.assign(count_code=np.arange(len(count_keys)), count=0)
+                )
+            )
+            candidate_codes = candidates["count_code"].to_numpy()
+
+        order = np.argsort(-counted_df["timestamp"].to_numpy(), kind="stable")
+        codes = codes[order]
+        timestamps = counted_df["timestamp"].to_numpy()[order]
+        counts = np.zeros(len(count_keys), dtype=np.int64)
+        counted_to = 0
+        for idx in np.argsort(-clip_starts, kind="stable"):
+            if np.searchsorted(-tail_times, -clip_starts[idx], "left") == 0:
+                continue
+
+            n_counted = int(np.searchsorted(-timestamps, -clip_starts[idx], "left"))
+            window = codes[counted_to:n_counted]
+            counts += np.bincount(window[window >= 0], minlength=len(counts))
+            counted_to = n_counted
+
+            n = counts[candidate_codes]
+            if splits_hit[idx] or not n.any():
+                rotations[idx] = self.make_rotation_df(
+                    actions_df, t_end_clip=t_end_clips[idx], return_clipped=True
+                )
+                continue
+
+            # Same row order as `value_counts`, most frequent first.
+            rotation_df = candidates[n > 0].assign(n=n[n > 0])
+            rotation_df = rotation_df.sort_values("n", ascending=False, kind="stable")
+            rotations[idx] = self._select_potencies(rotation_df)
+        return rotations
+
+    def _assign_potency_falloff(self, actions_df: pd.DataFrame) -> pd.DataFrame:
+        """Match each hit to its potency falloff, suffixing it to `action_name`."""
         # Now check for multi-target actions and identify any associated potency falloffs
         # Limitations:
         # - Multi target where one target is castlocked and doesn't take damage.
@@ -710,18 +1049,13 @@ class RotationTable(ActionTable):
         actions_df = self._potency_falloff_fraction(actions_df, max_multi_hit)
         actions_df = self._match_potency_falloff(actions_df)
         actions_df["action_name"] += "_" + actions_df["matched_falloff"].astype(str)
+        return actions_df
 
-        # Count actions to determine the rotation
-        # Actions are different if they sample a unique 1-hit distribution
-        # Many factors influence this including:
-        # - buffs (damage and hit type)
-        # - combo bonus
-        # - positionals
-        # - potency falloff
-        # - potions
-        # - job-specific mechanics like gauge
-        rotation_df = self._count_actions(actions_df)
+    def _candidate_potencies(self, rotation_df: pd.DataFrame) -> pd.DataFrame:
+        """Potency of each potency table row matched to a counted action.
 
+        Doesn't depend on how many times actions were performed.
+        """
         # Now determine potencies
         # Determine potency priority
         rotation_df = self._apply_potency_priority(rotation_df)
@@ -738,7 +1072,10 @@ class RotationTable(ActionTable):
 
         # Combo bonus and positional bonus
         rotation_df = self._apply_bonus_potency(rotation_df, "combo_positional")
+        return rotation_df
 
+    def _select_potencies(self, rotation_df: pd.DataFrame) -> pd.DataFrame:
+        """Keep the highest priority potency of each action, as the final rotation."""
         rotation_df = self._take_highest_priority_potency(rotation_df)
         # Now that all correct potencies have been assigned,
         # Multiply by damage falloff
@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
 
-from fflogs_rotation.base import BuffQuery, disjunction
+from fflogs_rotation.base import AuraRequirement, BuffQuery, IntervalSet
 
 
 class SamuraiActions(BuffQuery):
@@ -12,6 +12,9 @@ class SamuraiActions(BuffQuery):
     Inherits from BuffQuery for FFLogs API interactions.
     """
 
+    # Aura tables needed for the player, see `BuffQuery.query_auras`.
+    aura_requirements = (AuraRequirement("enhancedEnpi", 1001236),)
+
     def __init__(
         self,
         headers: dict[str, str],
@@ -20,6 +23,7 @@ class SamuraiActions(BuffQuery):
         player_id: int,
         enpi_id: int = 7486,
         enhanced_enpi_id: int = 1001236,
+        aura_report: dict | None = None,
     ) -> None:
         """Initialize Samurai actions handler.
 
@@ -30,6 +34,7 @@ class SamuraiActions(BuffQuery):
             player_id: FFLogs player actor ID
             enpi_id: Ability ID for Enpi
             enhanced_enpi_id: Buff ID for Enhanced Enpi
+            aura_report: Report response already containing `aura_requirements`
         """
 
         super().__init__()
@@ -40,48 +45,28 @@ class SamuraiActions(BuffQuery):
 
         self.enpi_id = enpi_id
         self.enhanced_enpi_id = enhanced_enpi_id
+        self.aura_requirements = self.instance_aura_requirements(
+            {"enhancedEnpi": enhanced_enpi_id}
+        )
 
-        self.enhanced_enpi_times = self.get_enhanced_enpi_times(headers)
+        self.enhanced_enpi_times = self.get_enhanced_enpi_times(headers, aura_report)
         pass
 
-    def get_enhanced_enpi_times(self, headers: dict[str, str]) -> np.ndarray:
+    def get_enhanced_enpi_times(
+        self, headers: dict[str, str], aura_report: dict | None = None
+    ) -> np.ndarray:
         """Query FFLogs API to get enhanced Enpi bands.
 
         Args:
             headers (dict[str, str]): Authorization headers
+            aura_report (dict | None): Report response already containing the buff table
 
         Returns:
             np.ndarray: n x 2 numpy array of buff times, (buff start, buff end]
         """
-        query = """
-        query samuraiEnpi(
-            $code: String!
-            $id: [Int]!
-            $playerID: Int!
-            $enhancedEnpiID: Float!
-        ) {
-            reportData {
-                report(code: $code) {
-                    startTime
-                    enhancedEnpi: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $enhancedEnpiID
-                    )
-                }
-            }
-        }
-        """
-
-        variables = {
-            "code": self.report_id,
-            "id": [self.fight_id],
-            "playerID": self.player_id,
-            "enhancedEnpiID": self.enhanced_enpi_id,
-        }
-
-        response = self.gql_query(headers, query, variables, "samuraiEnpi")
+        response = self.query_auras(
+            headers, self.aura_requirements, "samuraiEnpi", aura_report
+        )
         return self._get_buff_times(response, "enhancedEnpi", add_report_start=True)
 
     def apply_enhanced_enpi(self, actions_df: pd.DataFrame) -> pd.DataFrame:
@@ -94,14 +79,11 @@ class SamuraiActions(BuffQuery):
             pd.DataFrame: Actions DataFrame with enhanced Enpi buff applied.
         """
 
-        enhanced_enpi_betweens = list(
-            actions_df["timestamp"].between(b[0], b[1], inclusive="right")
-            for b in self.enhanced_enpi_times
-        )
+        enhanced_enpi_windows = IntervalSet(self.enhanced_enpi_times, inclusive="right")
 
-        enhanced_enpi_condition = disjunction(*enhanced_enpi_betweens) & (
-            actions_df["abilityGameID"] == self.enpi_id
-        )
+        enhanced_enpi_condition = enhanced_enpi_windows.contains(
+            actions_df["timestamp"]
+        ) & (actions_df["abilityGameID"] == self.enpi_id)
 
         return self._apply_buffs(
             actions_df, enhanced_enpi_condition, self.enhanced_enpi_id
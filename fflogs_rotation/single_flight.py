@@ -0,0 +1,131 @@
+"""Coalesce identical in-flight FFLogs requests across threads and processes.
+
+When several people analyze the same fight at once, every gunicorn worker would
+send the same `FightInformation`, `EncounterInfo` and `LimitBreakDamage`
+queries. With single-flight, the first request for a key takes a lock and the
+others wait for its result instead of querying FFLogs again.
+
+The lock and result slot live in a diskcache directory, so coalescing works across
+processes on the same machine. The default is a no-op, the app opts in with
+`set_single_flight`.
+"""
+
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+
+import diskcache
+
+from fflogs_rotation.cache import response_cache_key
+
+
+class SingleFlight:
+    """No-op single-flight, every request is sent."""
+
+    def run(
+        self,
+        operation_name: str,
+        query: str,
+        variables: dict,
+        fetch: Callable[[], dict],
+    ) -> dict:
+        return fetch()
+
+
+class DiskSingleFlight(SingleFlight):
+    """Single-flight using a lock and result slot in a shared diskcache.
+
+    The first caller for a request adds a lock key and runs `fetch`. Concurrent
+    callers mark that they are waiting and poll for its result, which is kept for
+    `result_ttl` seconds. Results nobody waited for aren't written, so large
+    responses only go to disk when they are shared. If the first caller fails, or
+    holds the lock for longer than `lock_timeout` seconds, the next waiting caller
+    runs `fetch` itself.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        lock_timeout: float = 120,
+        result_ttl: float = 10,
+        poll_interval: float = 0.05,
+    ) -> None:
+        """Open (or create) the single-flight store.
+
+        Args:
+            directory (str | Path): diskcache directory shared by all workers.
+            lock_timeout (float, optional): Seconds before a held lock expires, e.g.,
+                if its worker died.
+            result_ttl (float, optional): Seconds a result stays available to
+                waiting callers.
+            poll_interval (float, optional): Seconds between checks for a result.
+        """
+        self.cache = diskcache.Cache(str(directory))
+        self.lock_timeout = lock_timeout
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+
+    def run(
+        self,
+        operation_name: str,
+        query: str,
+        variables: dict,
+        fetch: Callable[[], dict],
+    ) -> dict:
+        """Run `fetch`, unless an identical request is in flight or just finished.
+
+        Args:
+            operation_name (str): GraphQL operation name.
+            query (str): GraphQL query string.
+            variables (dict): Query variables.
+            fetch (Callable[[], dict]): Sends the request, returning the response.
+
+        Returns:
+            dict: Response from this caller's `fetch` or a concurrent caller's.
+        """
+        key = response_cache_key(operation_name, query, variables)
+        lock_key = f"lock-{key}"
+        result_key = f"result-{key}"
+        waiting_key = f"waiting-{key}"
+        token = uuid.uuid4().hex
+
+        while True:
+            result = self.cache.get(result_key)
+            if result is not None:
+                return result
+            if self.cache.add(lock_key, token, expire=self.lock_timeout):
+                break
+            self.cache.set(waiting_key, True, expire=self.lock_timeout)
+            time.sleep(self.poll_interval)
+
+        try:
+            # The previous holder may have stored its result just before releasing
+            # the lock.
+            result = self.cache.get(result_key)
+            if result is not None:
+                return result
+            result = fetch()
+            # A caller which starts waiting after this check fetches once the lock
+            # is released.
+            if self.cache.pop(waiting_key) is not None:
+                self.cache.set(result_key, result, expire=self.result_ttl)
+            return result
+        finally:
+            # Don't release a lock which expired and was taken by another caller.
+            if self.cache.get(lock_key) == token:
+                self.cache.delete(lock_key)
+
+
+_single_flight: SingleFlight = SingleFlight()
+
+
+def set_single_flight(single_flight: SingleFlight | None) -> None:
+    """Set the process-wide single-flight, `None` disables coalescing."""
+    global _single_flight
+    _single_flight = SingleFlight() if single_flight is None else single_flight
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight."""
+    return _single_flight
@@ -0,0 +1,164 @@
+"""Local stand-in for the FFLogs GraphQL API, serving recorded responses.
+
+Serves responses recorded by `fflogs_rotation.recording.RecordReplaySession`,
+keyed by operation name and variables, with configurable injected latency. Point
+the app at it with `StandInSession` to load test or profile the Dash app and
+party pipeline offline with realistic payload sizes:
+
+    python -m fflogs_rotation.stand_in_server recordings --port 8080 --latency 0.2
+
+Requests without a recording get a 404.
+"""
+
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+from fflogs_rotation.http_session import PooledSession
+from fflogs_rotation.recording import RecordingStore, graphql_operation
+
+FFLOGS_API_URL = "https://www.fflogs.com/api/v2/client"
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """Answer GraphQL POSTs with recorded responses."""
+
+    # Set by `make_server`
+    store: RecordingStore
+    latency: float = 0.0
+    jitter: float = 0.0
+    verbose: bool = False
+
+    def do_POST(self) -> None:
+        content_length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(content_length))
+        except ValueError:
+            payload = None
+
+        operation = graphql_operation(payload)
+        response = None
+        if operation is not None:
+            response = self.store.get(*operation)
+
+        # Simulated network and FFLogs processing time
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if response is None:
+            status = 404
+            response = {
+                "errors": [{"message": "No recorded response for this request."}]
+            }
+        else:
+            status = 200
+
+        body = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(
+    directory: str | Path,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    verbose: bool = False,
+) -> ThreadingHTTPServer:
+    """Create (but don't start) a stand-in server.
+
+    Args:
+        directory (str | Path): Directory of recorded responses.
+        host (str, optional): Host to bind to.
+        port (int, optional): Port to bind to, 0 picks a free port.
+        latency (float, optional): Seconds added to every response.
+        jitter (float, optional): Up to this many extra seconds, chosen uniformly at
+            random, added to every response.
+        verbose (bool, optional): Log every request.
+
+    Returns:
+        ThreadingHTTPServer: Server handling each request in its own thread.
+    """
+    handler = type(
+        "ConfiguredStandInRequestHandler",
+        (StandInRequestHandler,),
+        {
+            "store": RecordingStore(directory),
+            "latency": latency,
+            "jitter": jitter,
+            "verbose": verbose,
+        },
+    )
+    return ThreadingHTTPServer((host, port), handler)
+
+
+class StandInSession(PooledSession):
+    """Pooled session which sends FFLogs API requests to a stand-in server."""
+
+    def __init__(
+        self,
+        stand_in_url: str,
+        api_url: str = FFLOGS_API_URL,
+        **session_kwargs,
+    ) -> None:
+        """Create a session redirecting FFLogs API requests.
+
+        Args:
+            stand_in_url (str): URL of the stand-in server, e.g.,
+                "http://127.0.0.1:8080".
+            api_url (str, optional): FFLogs API URL to redirect.
+            **session_kwargs: Passed to `PooledSession`.
+        """
+        super().__init__(**session_kwargs)
+        self.stand_in_url = stand_in_url
+        self.api_url = api_url
+
+    def request(self, method, url, **kwargs) -> requests.Response:
+        if url == self.api_url:
+            url = self.stand_in_url
+        return super().request(method, url, **kwargs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve recorded FFLogs GraphQL responses."
+    )
+    parser.add_argument("directory", help="Directory of recorded responses.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every response."
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.0,
+        help="Up to this many random extra seconds added to every response.",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    args = parser.parse_args()
+
+    server = make_server(
+        args.directory, args.host, args.port, args.latency, args.jitter, args.verbose
+    )
+    print(f"Serving {args.directory} on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
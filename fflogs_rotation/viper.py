@@ -2,7 +2,7 @@ from typing import Dict
 
 import pandas as pd
 
-from fflogs_rotation.base import BuffQuery, disjunction
+from fflogs_rotation.base import AuraRequirement, BuffQuery, IntervalSet, disjunction
 
 
 class ViperActions(BuffQuery):
@@ -12,6 +12,20 @@ class ViperActions(BuffQuery):
     Manages buffs and potency increases for Viper abilities and combos.
     """
 
+    # Aura tables needed for the player, see `BuffQuery.query_auras`.
+    aura_requirements = (
+        AuraRequirement("hunters", 1003657),
+        AuraRequirement("swiftskins", 1003658),
+        AuraRequirement("poisedTwinfang", 1003665),
+        AuraRequirement("poisedTwinblood", 1003666),
+        AuraRequirement("fellskins", 1003660),
+        AuraRequirement("fellhunters", 1003659),
+        AuraRequirement("grimhunters", 1003649),
+        AuraRequirement("grimskins", 1003650),
+        AuraRequirement("honedReavers", 1003772),
+        AuraRequirement("honedSteel", 1003672),
+    )
+
     def __init__(
         self,
         headers: dict,
@@ -28,6 +42,7 @@ class ViperActions(BuffQuery):
         poised_twinblood_id: int = 1003666,
         honed_reavers_id: int = 1003772,
         honed_steel_id: int = 1003672,
+        aura_report: dict | None = None,
     ) -> None:
         """
         Initialize ViperActions with report details and buff IDs.
@@ -47,6 +62,8 @@ class ViperActions(BuffQuery):
             poised_twinblood_id (int): Buff ID for Poised Twinblood
             honed_reavers_id (int): Buff ID for Honed Reavers
             honed_steel_id (int): Buff ID for Honed Steel
+            aura_report (dict | None): Report response already containing
+                `aura_requirements`
         """
         super().__init__()
 
@@ -71,6 +88,16 @@ class ViperActions(BuffQuery):
         self.fellhunters_venom_id = 1003659
         self.grimhunters_venom_id = 1003649
         self.grimskins_venom_id = 1003650
+        self.aura_requirements = self.instance_aura_requirements(
+            {
+                "hunters": hunters_venom_id,
+                "swiftskins": swiftskins_venom_id,
+                "poisedTwinfang": poised_twinfang_id,
+                "poisedTwinblood": poised_twinblood_id,
+                "honedReavers": honed_reavers_id,
+                "honedSteel": honed_steel_id,
+            }
+        )
 
         self.buff_action_map = {
             self.flankstung_venom_id: 34610,
@@ -131,10 +158,12 @@ class ViperActions(BuffQuery):
             34630: 34629,
         }
 
-        self.set_viper_buff_times(headers)
+        self.set_viper_buff_times(headers, aura_report)
         pass
 
-    def set_viper_buff_times(self, headers: Dict[str, str]) -> None:
+    def set_viper_buff_times(
+        self, headers: Dict[str, str], aura_report: dict | None = None
+    ) -> None:
         """Set buffs so corresponding actions have their potency increased.
 
         By Buff -> Action potency increase:
@@ -148,108 +177,9 @@ class ViperActions(BuffQuery):
         - Poised for Twinblood -> Uncoiled Twinblood
         """
 
-        # TODO: Can remove flanks/hinds buffs.
-        query = """
-        query ViperBuffs(
-            $code: String!
-            $id: [Int]!
-            $playerID: Int!
-            $huntersID: Float!
-            $swiftskinsID: Float!
-            $poisedTwinfangID: Float!
-            $poisedTwinbloodID: Float!
-            $fellskinsID: Float!
-            $fellhuntersID: Float!
-            $grimhuntersID: Float!
-            $grimskinsID: Float!
-            $honedReaversID: Float!
-            $honedSteelID: Float!
-        ) {
-            reportData {
-                report(code: $code) {
-                    startTime
-                    hunters: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $huntersID
-                    )
-                    swiftskins: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $swiftskinsID
-                    )
-                    poisedTwinfang: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $poisedTwinfangID
-                    )
-                    poisedTwinblood: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $poisedTwinbloodID
-                    )
-                    fellskins: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $fellskinsID
-                    )
-                    fellhunters: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $fellhuntersID
-                    )
-                    grimhunters: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $grimhuntersID
-                    )
-                    grimskins: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $grimskinsID
-                    )
-                    honedReavers: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $honedReaversID
-                    )
-                    honedSteel: table(
-                        fightIDs: $id
-                        dataType: Buffs
-                        sourceID: $playerID
-                        abilityID: $honedSteelID
-                    )
-                }
-            }
-        }
-        """
-
-        variables = {
-            "code": self.report_id,
-            "id": [self.fight_id],
-            "playerID": self.player_id,
-            "huntersID": self.hunters_venom_id,
-            "swiftskinsID": self.swiftskins_venom_id,
-            "poisedTwinfangID": self.poised_twinfang_id,
-            "poisedTwinbloodID": self.poised_twinblood_id,
-            "fellskinsID": self.fellskins_venom_id,
-            "fellhuntersID": self.fellhunters_venom_id,
-            "grimhuntersID": self.grimhunters_venom_id,
-            "grimskinsID": self.grimskins_venom_id,
-            "honedReaversID": self.honed_reavers_id,
-            "honedSteelID": self.honed_steel_id,
-        }
-
-        vpr_response = self.gql_query(headers, query, variables, "ViperBuffs")
+        vpr_response = self.query_auras(
+            headers, self.aura_requirements, "ViperBuffs", aura_report
+        )
 
         self.honed_reavers_times = self._get_buff_times(
             vpr_response, "honedReavers", add_report_start=True
@@ -300,10 +230,14 @@ class ViperActions(BuffQuery):
         Returns:
             pd.DataFrame: Updated DataFrame with applied buffs for generation combos.
         """
+        # Buff set IDs are updated and copied back along with the buffs.
+        buff_columns = ["action_name", "buffs"] + [
+            c for c in ["buff_set_id"] if c in actions_df.columns
+        ]
         # Filter to just weaponskills
         weaponskill_df = actions_df[
             actions_df["abilityGameID"].isin(self.viper_weaponskills)
-        ][["abilityGameID", "action_name", "buffs"]].copy()
+        ][["abilityGameID", *buff_columns]].copy()
 
         weaponskill_df["priorWeaponskillID"] = weaponskill_df["abilityGameID"].shift(1)
 
@@ -326,14 +260,14 @@ class ViperActions(BuffQuery):
             weaponskill_df["abilityGameID"].isin(
                 self.generation_combo_prior_combo_ids.keys()
             )
-        ][["action_name", "buffs"]]
+        ][buff_columns]
 
         # Update original values in the actions DF
         actions_df.loc[
             actions_df["abilityGameID"].isin(
                 self.generation_combo_prior_combo_ids.keys()
             ),
-            ["action_name", "buffs"],
+            buff_columns,
         ] = weaponskill_df
 
         return actions_df
@@ -363,14 +297,9 @@ class ViperActions(BuffQuery):
             self.honed_steel_id: self.honed_steel_times,
             self.honed_reavers_id: self.honed_reavers_times,
         }.items():
-            betweens = list(
-                actions_df["timestamp"].between(b[0], b[1], inclusive="both")
-                for b in times
-            )
-
-            condition = disjunction(*betweens) & (
-                actions_df["abilityGameID"] == self.buff_action_map[k]
-            )
+            condition = IntervalSet(times, inclusive="both").contains(
+                actions_df["timestamp"]
+            ) & (actions_df["abilityGameID"] == self.buff_action_map[k])
 
             actions_df = self._apply_buffs(actions_df, condition, k)
 
@@ -0,0 +1,180 @@
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from crit_app.util.action_distribution_cache import (
+    CACHED_ARRAYS,
+    TieredActionDistributionCache,
+    action_distribution_key,
+    set_action_distribution_cache,
+)
+
+
+@pytest.fixture
+def rotation_df():
+    return pd.DataFrame(
+        {
+            "action_name": ["Hard Slash-_1.0", "Hard Slash-1000049_1.0", "Attack-_1.0"],
+            "base_action": ["Hard Slash", "Hard Slash", "Attack"],
+            "n": [20, 10, 40],
+            "p_n": [0.6, 0.5, 0.6],
+            "p_c": [0.2, 0.25, 0.2],
+            "p_d": [0.15, 0.15, 0.15],
+            "p_cd": [0.05, 0.1, 0.05],
+            "buffs": [1.0, 1.1, 1.0],
+            "l_c": [1600.0, 1600.0, 1600.0],
+            "main_stat_add": [0, 0, 0],
+            "potency": [300, 300, 90],
+            "damage_type": ["direct", "direct", "auto"],
+        }
+    )
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    # ffxiv_stats still uses `np.trapz`, which was renamed in NumPy 2.
+    monkeypatch.setattr(np, "trapz", np.trapezoid, raising=False)
+    cache = TieredActionDistributionCache(tmp_path / "action_cache")
+    yield cache
+    set_action_distribution_cache(None)
+    cache.cache.close()
+
+
+def analyze(rotation_df: pd.DataFrame, t: float):
+    from ffxiv_stats.jobs import Tank
+
+    tank = Tank(
+        strength=4900,
+        det=2000,
+        skill_speed=420,
+        tenacity=868,
+        crit_stat=3000,
+        dh_stat=1500,
+        weapon_damage=146,
+        delay=2.8,
+        job="DarkKnight",
+        pet_attack_power=4700,
+        level=100,
+    )
+    tank.attach_rotation(rotation_df.copy(), t, compute_mgf=False)
+    return tank
+
+
+def assert_same_analysis(cached, computed) -> None:
+    assert cached.rotation_mean == pytest.approx(computed.rotation_mean)
+    assert cached.rotation_std == pytest.approx(computed.rotation_std)
+    np.testing.assert_allclose(cached.rotation_dps_distribution, computed.rotation_dps_distribution)
+    for name, distribution in computed.unique_actions_distribution.items():
+        np.testing.assert_allclose(
+            cached.unique_actions_distribution[name]["dps_distribution"],
+            distribution["dps_distribution"],
+        )
+
+
+def test_action_distribution_key():
+    row = pd.Series(
+        {"n": 20, "p_n": 0.6, "p_c": 0.2, "p_d": 0.15, "p_cd": 0.05}
+        | {"d2": 12000, "l_c": 1600, "buffs": 1.1, "is_dot": 0, "action_name": "a"}
+    )
+    key = action_distribution_key(row, 10, False)
+
+    # Names and numpy scalar types don't matter.
+    assert action_distribution_key(row.copy().replace("a", "b"), 10, False) == key
+    numpy_row = row.copy()
+    numpy_row["n"] = np.int64(20)
+    assert action_distribution_key(numpy_row, 10, False) == key
+
+    assert action_distribution_key(row, 20, False) != key
+    assert action_distribution_key(row.replace(12000, 12001), 10, False) != key
+
+
+def test_cached_actions_match_computed(cache, rotation_df, monkeypatch):
+    from ffxiv_stats.moments import ActionMoments
+
+    convolved = []
+    compute_dps_distribution = ActionMoments.compute_dps_distribution
+
+    def count_convolutions(self):
+        convolved.append(self.n)
+        return compute_dps_distribution(self)
+
+    monkeypatch.setattr(ActionMoments, "compute_dps_distribution", count_convolutions)
+
+    set_action_distribution_cache(None)
+    computed = analyze(rotation_df, 100.0)
+    computed_half = analyze(rotation_df, 50.0)
+
+    set_action_distribution_cache(cache)
+    convolved.clear()
+    assert_same_analysis(analyze(rotation_df, 100.0), computed)
+    assert len(cache.memory) == 3
+    assert convolved == [20, 10, 40]
+
+    # Warm memory tier, even for another elapsed time.
+    assert_same_analysis(analyze(rotation_df, 100.0), computed)
+    assert_same_analysis(analyze(rotation_df, 50.0), computed_half)
+    assert len(cache.memory) == 3
+    assert convolved == [20, 10, 40]
+
+    # Only novel actions are convolved.
+    analyze(rotation_df.assign(n=[20, 10, 41]), 100.0)
+    assert convolved == [20, 10, 40, 41]
+
+    # Disk tier, like another worker.
+    cache.memory.clear()
+    cache.memory_size = 0
+    assert_same_analysis(analyze(rotation_df, 50.0), computed_half)
+    assert len(cache.memory) == 3
+    assert convolved == [20, 10, 40, 41]
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = TieredActionDistributionCache(memory_limit=400)
+    cache.set("a", {"x": np.zeros(5)})
+    cache.set("b", {"x": np.zeros(5)})
+    cache.get("a")
+    cache.set("c", {"x": np.zeros(5)})
+
+    assert list(cache.memory) == ["a", "c"]
+    assert cache.memory_size <= 400
+    assert cache.get("b") is None
+
+
+def test_cached_action_is_rebuilt_from_its_own_row(cache, rotation_df):
+    """Only the damage distribution is cached, the rest comes from the new row."""
+    from ffxiv_stats import moments
+
+    original = moments.ActionMoments
+    set_action_distribution_cache(cache)
+    row = analyze(rotation_df, 100.0).rotation_df.iloc[0]
+    state = cache.get(action_distribution_key(row, 10, False))
+    assert set(state) == set(CACHED_ARRAYS)
+
+    action = moments.ActionMoments(row.drop("action_name"), 50.0, compute_mgf=False)
+    computed = original(row.drop("action_name"), 50.0, compute_mgf=False)
+
+    assert type(action) is original
+    assert vars(action).keys() == vars(computed).keys()
+    assert action.t == 50.0
+    np.testing.assert_allclose(action.dps_distribution, computed.dps_distribution)
+    assert action.mean == pytest.approx(computed.mean)
+
+
+def test_disabling_restores_action_moments(cache):
+    from ffxiv_stats import moments
+
+    original = moments.ActionMoments
+    set_action_distribution_cache(cache)
+    assert moments.ActionMoments is not original
+
+    set_action_distribution_cache(None)
+    assert moments.ActionMoments is original
+
+
+def test_import_is_lazy():
+    """Importing the cache module doesn't import ffxiv_stats."""
+    program = "import sys, crit_app.util.action_distribution_cache; print('ffxiv_stats' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", program], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+from crit_app.shared_elements import rotation_analysis
+from crit_app.util.analysis_cache import (
+    DiskJobAnalysisStore,
+    rotation_fingerprint,
+    set_job_analysis_store,
+)
+
+STATS = {
+    "t": 100.0,
+    "main_stat": 4900,
+    "secondary_stat": 868,
+    "determination": 2000,
+    "speed_stat": 420,
+    "ch": 3000,
+    "dh": 1500,
+    "wd": 146,
+    "delay": 2.8,
+    "main_stat_pre_bonus": 4700,
+}
+
+
+@pytest.fixture
+def rotation_df():
+    return pd.DataFrame(
+        {
+            "action_name": ["Hard Slash-_1.0", "Hard Slash-1000049_1.0", "Attack-_1.0"],
+            "base_action": ["Hard Slash", "Hard Slash", "Attack"],
+            "n": [20, 10, 40],
+            "p_n": [0.6, 0.5, 0.6],
+            "p_c": [0.2, 0.25, 0.2],
+            "p_d": [0.15, 0.15, 0.15],
+            "p_cd": [0.05, 0.1, 0.05],
+            "buffs": [1.0, 1.1, 1.0],
+            "l_c": [1600.0, 1600.0, 1600.0],
+            "main_stat_add": [0, 0, 0],
+            "potency": [300, 300, 90],
+            "damage_type": ["direct", "direct", "auto"],
+        }
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DiskJobAnalysisStore(tmp_path / "job_analysis_cache")
+    set_job_analysis_store(store)
+    yield store
+    set_job_analysis_store(None)
+    store.cache.close()
+
+
+def test_rotation_fingerprint(rotation_df):
+    fingerprint = rotation_fingerprint(rotation_df, **STATS)
+
+    # Row order, extra columns and input order don't matter.
+    reordered = rotation_df.iloc[::-1].assign(d2=1)
+    stats = dict(reversed(STATS.items()))
+    assert rotation_fingerprint(reordered, **stats) == fingerprint
+
+    changed = rotation_df.assign(n=[20, 10, 41])
+    assert rotation_fingerprint(changed, **STATS) != fingerprint
+    assert rotation_fingerprint(rotation_df, **{**STATS, "ch": 3001}) != fingerprint
+
+
+def test_rotation_analysis_reuses_job_analysis(store, rotation_df, monkeypatch):
+    from ffxiv_stats.jobs import Tank
+
+    analyzed = []
+
+    def attach_rotation(self, rotation_df, t, **kwargs):
+        analyzed.append(t)
+        self.rotation_mean = float((rotation_df["n"] * rotation_df["potency"]).sum())
+        self.unique_actions_distribution = {}
+
+    monkeypatch.setattr(Tank, "attach_rotation", attach_rotation)
+
+    job_analysis = rotation_analysis("Tank", "DarkKnight", rotation_df, **STATS)
+    reused = rotation_analysis("Tank", "DarkKnight", rotation_df.iloc[::-1], **STATS)
+    assert analyzed == [100.0]
+    assert reused is not job_analysis
+    assert reused.rotation_mean == job_analysis.rotation_mean
+
+    # Other inputs are analyzed.
+    rotation_analysis("Tank", "DarkKnight", rotation_df, **{**STATS, "t": 50.0})
+    assert analyzed == [100.0, 50.0]
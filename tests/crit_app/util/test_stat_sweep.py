@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+from crit_app.shared_elements import job_object
+from crit_app.util.stat_sweep import SWEEP_PERCENTILES, rotation_moments, stat_sweep
+
+STATS = {
+    "main_stat": 4900,
+    "secondary_stat": 868,
+    "determination": 2000,
+    "speed_stat": 420,
+    "ch": 3000,
+    "dh": 1500,
+    "wd": 146,
+    "delay": 2.8,
+    "main_stat_pre_bonus": 4700,
+}
+
+
+@pytest.fixture
+def rotation_df():
+    return pd.DataFrame(
+        {
+            "action_name": [
+                "Hard Slash-_1.0",
+                "Hard Slash-1000049_1.0",
+                "Attack-_1.0",
+                "Salted Earth-_1.0",
+            ],
+            "base_action": ["Hard Slash", "Hard Slash", "Attack", "Salted Earth"],
+            "n": [20, 10, 40, 15],
+            "p_n": [0.6, 0.5, 0.6, 0.6],
+            "p_c": [0.2, 0.25, 0.2, 0.2],
+            "p_d": [0.15, 0.15, 0.15, 0.15],
+            "p_cd": [0.05, 0.1, 0.05, 0.05],
+            "buffs": [1.0, 1.1, 1.0, 1.05],
+            "l_c": [1600.0, 1600.0, 1600.0, 1600.0],
+            "main_stat_add": [0, 0, 0, 0],
+            "potency": [300, 300, 90, 50],
+            "damage_type": ["direct", "direct", "auto", "physical-dot"],
+        }
+    )
+
+
+class FakeRotation:
+    """Stands in for a `RotationTable`, whose rotation doesn't depend on stats."""
+
+    def __init__(self, rotation_df: pd.DataFrame) -> None:
+        self.rotation_df = rotation_df
+
+    def rotation_df_for_stats(self, crit_stat: int, dh_stat: int) -> pd.DataFrame:
+        return self.rotation_df.copy()
+
+
+def test_rotation_moments_match_ffxiv_stats(trapz, rotation_df):
+    tank = job_object("Tank", "DarkKnight", *STATS.values())
+    tank.attach_rotation(rotation_df.copy(), 100.0, compute_mgf=True, purge_action_moments=False)
+
+    # Exact raw moments of the damage of each action landing all its hits.
+    raw = np.array([[a._first_moment, a._second_moment, a._third_moment] for a in tank.action_moments])
+    variances = raw[:, 1] - raw[:, 0] ** 2
+    thirds = raw[:, 2] - 3 * raw[:, 0] * raw[:, 1] + 2 * raw[:, 0] ** 3
+
+    mean, variance, skewness = rotation_moments(job_object("Tank", "DarkKnight", *STATS.values()), rotation_df, 100.0)
+    assert mean == pytest.approx(raw[:, 0].sum() / 100)
+    assert variance == pytest.approx(variances.sum() / 100**2)
+    assert skewness == pytest.approx(thirds.sum() / variances.sum() ** 1.5)
+
+
+@pytest.fixture
+def trapz(monkeypatch):
+    # ffxiv_stats still uses `np.trapz`, which was renamed in NumPy 2.
+    monkeypatch.setattr(np, "trapz", np.trapezoid, raising=False)
+
+
+def percentiles(support: np.ndarray, distribution: np.ndarray) -> np.ndarray:
+    F = np.cumsum(distribution) * (support[1] - support[0])
+    return np.array([support[np.abs(F - q / 100).argmin()] for q in SWEEP_PERCENTILES])
+
+
+@pytest.mark.parametrize("t", [100.0, 10.0])
+def test_stat_sweep_matches_rotation_analysis(trapz, rotation_df, t):
+    """The analyzed gearset's distribution is the one `ffxiv_stats` convolves."""
+    tank = job_object("Tank", "DarkKnight", *STATS.values())
+    tank.attach_rotation(rotation_df.copy(), t, action_delta=9, compute_mgf=False)
+
+    sweep = stat_sweep("Tank", "DarkKnight", FakeRotation(rotation_df), t, [STATS], action_delta=9)
+
+    assert not sweep.fast_estimate
+    assert sweep.summary.loc[0, "mean"] == pytest.approx(tank.rotation_mean, rel=1e-3)
+    assert sweep.summary.loc[0, "std"] == pytest.approx(tank.rotation_std, rel=1e-2)
+    np.testing.assert_allclose(
+        sweep.summary[[f"p{p}" for p in SWEEP_PERCENTILES]].to_numpy()[0],
+        percentiles(tank.rotation_dps_support, tank.rotation_dps_distribution),
+        rtol=1e-3,
+    )
+
+
+def test_gearsets_are_convolved_together_like_alone(rotation_df):
+    gearsets = [STATS, {**STATS, "main_stat": 4800, "ch": 2800}]
+    together = stat_sweep("Tank", "DarkKnight", FakeRotation(rotation_df), 100.0, gearsets)
+    alone = stat_sweep("Tank", "DarkKnight", FakeRotation(rotation_df), 100.0, gearsets[1:])
+
+    columns = ["mean", "std"] + [f"p{p}" for p in SWEEP_PERCENTILES]
+    np.testing.assert_allclose(
+        together.summary.loc[1, columns].astype(float), alone.summary.loc[0, columns].astype(float), rtol=1e-4
+    )
+
+
+def test_fast_estimate(rotation_df):
+    convolved = stat_sweep("Tank", "DarkKnight", FakeRotation(rotation_df), 100.0, [STATS])
+    fast = stat_sweep("Tank", "DarkKnight", FakeRotation(rotation_df), 100.0, [STATS], fast_estimate=True)
+
+    assert fast.fast_estimate
+    assert fast.summary.loc[0, "mean"] == pytest.approx(
+        rotation_moments(job_object("Tank", "DarkKnight", *STATS.values()), rotation_df, 100.0)[0]
+    )
+    columns = [f"p{p}" for p in SWEEP_PERCENTILES]
+    np.testing.assert_allclose(fast.summary[columns], convolved.summary[columns], rtol=1e-2)
+
+
+@pytest.mark.parametrize("fast_estimate", [False, True])
+def test_stat_sweep(rotation_df, fast_estimate):
+    gearsets = [
+        {"name": "BiS", **STATS},
+        {**STATS, "main_stat": 4800},
+    ]
+    sweep = stat_sweep("Tank", "DarkKnight", FakeRotation(rotation_df), 100.0, gearsets, fast_estimate=fast_estimate)
+
+    summary = sweep.summary
+    assert summary["name"].tolist() == ["BiS", "Gearset 2"]
+    assert summary.loc[0, "mean"] > summary.loc[1, "mean"]
+
+    percentiles = summary[[f"p{p}" for p in SWEEP_PERCENTILES]].to_numpy()
+    assert (np.diff(percentiles, axis=1) > 0).all()
+    assert summary["p50"].to_numpy() == pytest.approx(summary["mean"], rel=0.01)
+
+    assert sweep.dps_distributions.shape == (2, sweep.dps_support.size)
+    np.testing.assert_allclose(np.trapezoid(sweep.dps_distributions, sweep.dps_support), 1, rtol=1e-3)
@@ -61,6 +61,11 @@ def mock_action_table_api_via_file(monkeypatch, request):
 
     monkeypatch.setattr(EncounterSpecifics, "fru_apply_vuln_p2", mock_fru_p2_specific)
 
+    def mock_fru_vuln_down(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(EncounterSpecifics, "query_fru_vuln_down", mock_fru_vuln_down)
+
 
 @pytest.fixture
 def mock_gql_query_integration(monkeypatch, request):
@@ -167,6 +167,8 @@ def test_melee_end_to_end(mock_action_table_api_via_file, mock_gql_query_integra
         pet_ids=pet_ids,
         excluded_enemy_ids=excluded_enemy_ids,
     )
+    # Job modules kept the buff set IDs in sync with the buffs they added
+    assert rt.actions_df["buff_set_id"].tolist() == rt.buff_vocabulary.intern_all(rt.actions_df["buffs"]).tolist()
     # Assert expected behavior based on the mock JSON response
 
     actual_counts = (
@@ -184,3 +186,58 @@ def test_melee_end_to_end(mock_action_table_api_via_file, mock_gql_query_integra
     )
 
     assert_frame_equal(actual_counts, expected_output)
+
+
+@pytest.mark.parametrize(
+    "mock_action_table_api_via_file, mock_gql_query_integration, params",
+    [
+        (
+            data_path / "sam_7_05_st.json",
+            data_path / "sam_7_05_st.json",
+            {"phase": 0, "player_id": 3, "excluded_enemy_ids": None, "job": "Samurai"},
+        ),
+        (
+            data_path / "mnk_7_1_mt_phase.json",
+            data_path / "mnk_7_1_mt_phase.json",
+            {"phase": 4, "player_id": 23, "excluded_enemy_ids": [52], "job": "Monk"},
+        ),
+    ],
+    indirect=["mock_action_table_api_via_file", "mock_gql_query_integration"],
+)
+def test_clipped_rotations(mock_action_table_api_via_file, mock_gql_query_integration, params):
+    """Building all clippings at once matches clipping one at a time."""
+    rt = RotationTable(
+        headers={},
+        report_id="",
+        fight_id="",
+        job=params["job"],
+        player_id=params["player_id"],
+        crit_stat=3000,
+        dh_stat=2000,
+        determination=2000,
+        main_stat=4900,
+        weapon_damage=146,
+        level=100,
+        phase=params["phase"],
+        damage_buff_table=damage_buff_table,
+        critical_hit_rate_buff_table=critical_hit_rate_table,
+        direct_hit_rate_buff_table=direct_hit_rate_table,
+        guaranteed_hits_by_action_table=guaranteed_hits_by_action_table,
+        guaranteed_hits_by_buff_table=guaranteed_hits_by_buff_table,
+        potency_table=potency_table,
+        encounter_phases=encounter_phases,
+        excluded_enemy_ids=params["excluded_enemy_ids"],
+    )
+    # Out of order, and including an empty clipping
+    t_clips = [30.0, 0.0, 2.5, 60.0, 10.0]
+    clipped_rotations = rt.make_clipped_rotation_dfs(rt.actions_df, t_clips)
+
+    for t, clipped in zip(t_clips, clipped_rotations):
+        expected = rt.make_rotation_df(rt.actions_df, t_end_clip=t, return_clipped=True)
+        if expected is None:
+            assert clipped is None
+            continue
+        assert_frame_equal(
+            clipped.sort_values(list(clipped.columns)).reset_index(drop=True),
+            expected.sort_values(list(expected.columns)).reset_index(drop=True),
+        )
@@ -139,6 +139,8 @@ def test_physical_ranged_end_to_end(mock_action_table_api_via_file, mock_gql_que
         pet_ids=pet_ids,
         excluded_enemy_ids=excluded_enemy_ids,
     )
+    # Job modules kept the buff set IDs in sync with the buffs they added
+    assert rt.actions_df["buff_set_id"].tolist() == rt.buff_vocabulary.intern_all(rt.actions_df["buffs"]).tolist()
     # Assert expected behavior based on the mock JSON response
 
     actual_counts = (
@@ -13,7 +13,7 @@ from fflogs_rotation.job_data.data import (
     guaranteed_hits_by_buff_table,
     potency_table,
 )
-from fflogs_rotation.rotation import RotationTable
+from fflogs_rotation.rotation import ActionTable, RotationTable
 
 data_path = Path("tests/fflogs_rotation/integration/dawntrail/tank_data/")
 
@@ -154,6 +154,8 @@ def test_tank_end_to_end(mock_action_table_api_via_file, mock_gql_query_integrat
         excluded_enemy_ids=excluded_enemy_ids,
         tenacity=868,
     )
+    # Job modules kept the buff set IDs in sync with the buffs they added
+    assert rt.actions_df["buff_set_id"].tolist() == rt.buff_vocabulary.intern_all(rt.actions_df["buffs"]).tolist()
     # Assert expected behavior based on the mock JSON response
 
     actual_counts = (
@@ -171,3 +173,133 @@ def test_tank_end_to_end(mock_action_table_api_via_file, mock_gql_query_integrat
     )
 
     assert_frame_equal(actual_counts, expected_output)
+
+
+@pytest.mark.parametrize(
+    "mock_action_table_api_via_file, mock_gql_query_integration, params",
+    [
+        (
+            data_path / "drk_7_1_phase_mt.json",
+            data_path / "drk_7_1_phase_mt.json",
+            {"player_id": 26, "pet_ids": [32], "excluded_enemy_ids": [52], "job": "DarkKnight"},
+        ),
+        (
+            data_path / "pld_7_1_mt_phase.json",
+            data_path / "pld_7_1_mt_phase.json",
+            {"player_id": 2, "pet_ids": None, "excluded_enemy_ids": [29], "job": "Paladin"},
+        ),
+    ],
+    indirect=["mock_action_table_api_via_file", "mock_gql_query_integration"],
+)
+def test_phase_table_matches_phase_analysis(
+    mock_action_table_api_via_file, mock_gql_query_integration, monkeypatch, params
+):
+    """A phase sliced out of the whole fight matches analyzing only the phase."""
+
+    def mock_all_phase_downtimes(self, headers, phase_windows):
+        downtime = ActionTable._fetch_phase_downtime(self, headers, 0, 0)
+        return {f"phase{p}": downtime["table"] for p in phase_windows}
+
+    monkeypatch.setattr(ActionTable, "_fetch_all_phase_downtimes", mock_all_phase_downtimes)
+
+    def rotation_table(**kwargs):
+        return RotationTable(
+            headers={},
+            report_id="",
+            fight_id="",
+            job=params["job"],
+            player_id=params["player_id"],
+            crit_stat=3000,
+            dh_stat=1000,
+            determination=1000,
+            main_stat=4900,
+            weapon_damage=146,
+            level=100,
+            damage_buff_table=damage_buff_table,
+            critical_hit_rate_buff_table=critical_hit_rate_table,
+            direct_hit_rate_buff_table=direct_hit_rate_table,
+            guaranteed_hits_by_action_table=guaranteed_hits_by_action_table,
+            guaranteed_hits_by_buff_table=guaranteed_hits_by_buff_table,
+            potency_table=potency_table,
+            encounter_phases=encounter_phases,
+            pet_ids=params["pet_ids"],
+            excluded_enemy_ids=params["excluded_enemy_ids"],
+            tenacity=868,
+            **kwargs,
+        )
+
+    fight = rotation_table(phase=0, all_phases=True)
+    phase_tables = fight.phase_tables()
+    assert list(phase_tables) == [0, 1, 2, 3, 4, 5]
+
+    expected = rotation_table(phase=4)
+    actual = phase_tables[4]
+    assert actual.fight_start_time == expected.fight_start_time
+    assert actual.fight_end_time == expected.fight_end_time
+    assert actual.fight_dps_time == expected.fight_dps_time
+    # The fixture only has phase 4 damage events
+    assert_frame_equal(actual.actions_df, expected.actions_df, check_like=True)
+    assert_frame_equal(actual.rotation_df, expected.rotation_df)
+    assert phase_tables[5].rotation_df is None
+
+
+@pytest.mark.parametrize(
+    "mock_action_table_api_via_file, mock_gql_query_integration, params",
+    [
+        (
+            data_path / "war_7_05_st.json",
+            data_path / "war_7_05_st.json",
+            {"phase": 0, "player_id": 5, "pet_ids": None, "excluded_enemy_ids": None, "job": "Warrior"},
+        ),
+        (
+            data_path / "gnb_7_05_st.json",
+            data_path / "gnb_7_05_st.json",
+            {"phase": 0, "player_id": 9, "pet_ids": None, "excluded_enemy_ids": None, "job": "Gunbreaker"},
+        ),
+        (
+            data_path / "drk_7_05_st.json",
+            data_path / "drk_7_05_st.json",
+            {"phase": 0, "player_id": 2, "pet_ids": [13], "excluded_enemy_ids": None, "job": "DarkKnight"},
+        ),
+    ],
+    indirect=["mock_action_table_api_via_file", "mock_gql_query_integration"],
+)
+def test_rotation_df_for_stats(mock_action_table_api_via_file, mock_gql_query_integration, params):
+    """Hit type probabilities for other stats match building the table with them."""
+
+    def rotation_table(crit_stat, dh_stat):
+        return RotationTable(
+            headers={},
+            report_id="",
+            fight_id="",
+            job=params["job"],
+            player_id=params["player_id"],
+            crit_stat=crit_stat,
+            dh_stat=dh_stat,
+            determination=1000,
+            main_stat=4900,
+            weapon_damage=146,
+            level=100,
+            phase=params["phase"],
+            damage_buff_table=damage_buff_table,
+            critical_hit_rate_buff_table=critical_hit_rate_table,
+            direct_hit_rate_buff_table=direct_hit_rate_table,
+            guaranteed_hits_by_action_table=guaranteed_hits_by_action_table,
+            guaranteed_hits_by_buff_table=guaranteed_hits_by_buff_table,
+            potency_table=potency_table,
+            encounter_phases=encounter_phases,
+            pet_ids=params["pet_ids"],
+            excluded_enemy_ids=params["excluded_enemy_ids"],
+            tenacity=868,
+        )
+
+    rt = rotation_table(3000, 1000)
+    assert_frame_equal(rt.rotation_df_for_stats(3000, 1000), rt.rotation_df)
+
+    expected = rotation_table(2400, 1600).rotation_df
+    actual = rt.rotation_df_for_stats(2400, 1600)
+    sort_columns = ["action_name", "n", "potency"]
+    assert_frame_equal(
+        actual.sort_values(sort_columns).reset_index(drop=True),
+        expected.sort_values(sort_columns).reset_index(drop=True),
+    )
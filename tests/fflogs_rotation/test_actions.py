@@ -1,8 +1,10 @@
 import math
+import pickle
 
+import numpy as np
+import pandas as pd
 import pytest
-
-from fflogs_rotation.actions import ActionTable
+from fflogs_rotation.actions import JOB_AURA_CLASSES, ActionTable
 
 
 @pytest.fixture
@@ -207,3 +209,252 @@ def test_estimate_medication_multiplier(job, main_stat, determination, med_amoun
     assert math.isclose(
         multiplier, expected, abs_tol=0.003
     ), f"Job {job} with {med_amount} medication should have multiplier close to {expected}, got {multiplier}"
+
+
+@pytest.mark.parametrize("job", list(JOB_AURA_CLASSES))
+def test_fight_information_query_includes_job_auras(job):
+    action_table = ActionTable.__new__(ActionTable)
+    action_table.job = job
+    query = action_table._fight_information_query()
+    for requirement in JOB_AURA_CLASSES[job].aura_requirements:
+        assert f"{requirement.alias}: " in query
+
+
+def test_fight_information_query_without_job_auras():
+    action_table = ActionTable.__new__(ActionTable)
+    action_table.job = "Bard"
+    assert "Buffs sourceID: $sourceID abilityID" not in action_table._fight_information_query()
+
+
+@pytest.fixture
+def buffed_action_table():
+    action_table = ActionTable.__new__(ActionTable)
+    action_table.report_start_time = 0
+    action_table.player_id = 1
+    action_table.critical_hit_stat = 3000
+    action_table.direct_hit_stat = 1500
+    action_table.determination = 2000
+    action_table.level = 100
+    action_table.phase = 0
+    action_table.patch_number = 7.2
+    action_table.medication_amt = 392
+    action_table.critical_hit_rate_buffs = {"1001221": 0.1}
+    action_table.direct_hit_rate_buffs = {}
+    action_table.ranged_cards = []
+    action_table.melee_cards = []
+    action_table.guaranteed_hit_type_via_buff = pd.DataFrame(columns=["buff_id", "affected_action_id", "hit_type"])
+    action_table.guaranteed_hit_type_via_action = {}
+
+    def event(timestamp, buffs):
+        return {
+            "timestamp": timestamp,
+            "type": "calculateddamage",
+            "sourceID": 1,
+            "targetID": 2,
+            "packetID": timestamp,
+            "ability": {"name": "Fire IV", "guid": 25796},
+            "buffs": buffs,
+            "amount": 1000,
+            "multiplier": 1.155,
+            "hitType": 1,
+        }
+
+    action_table.actions = [
+        event(0, "1000049.1001221."),
+        event(1000, "1000049.1001221."),
+        event(2000, "1002964."),
+        event(150000, "1002964."),
+        event(151000, "1001221."),
+    ]
+    return action_table
+
+
+def test_create_action_df_buff_adjustments(buffed_action_table):
+    actions_df = buffed_action_table.create_action_df()
+
+    # Medication is divided out of the multiplier and added as main stat
+    assert actions_df["multiplier"].tolist() == [1.1, 1.1, 1.155, 1.155, 1.155]
+    assert actions_df["main_stat_add"].tolist() == [392, 392, 0, 0, 0]
+    # Radiant Finale strength depends on when it was applied
+    assert actions_df["action_name"].tolist() == [
+        "Fire IV-1000049_1001221",
+        "Fire IV-1000049_1001221",
+        "Fire IV-RadiantFinale1",
+        "Fire IV-RadiantFinale3",
+        "Fire IV-1001221",
+    ]
+    assert actions_df["buffs"].tolist()[3] == ["RadiantFinale3"]
+    # Actions under the same hit type buffs share hit type probabilities
+    p = actions_df[["p_n", "p_c", "p_d", "p_cd"]].to_numpy()
+    assert (p[0] == p[1]).all() and (p[0] == p[4]).all() and (p[2] == p[3]).all()
+    assert actions_df["p_c"].iloc[0] > actions_df["p_c"].iloc[2]
+    # Each action gets its own buff list
+    assert actions_df["buffs"].iloc[0] is not actions_df["buffs"].iloc[1]
+
+
+def baseline_create_action_df(action_table, medication_id="1000049", medication_multiplier=1.05):
+    """`create_action_df` as it was before decoding events into typed columns.
+
+    Kept verbatim, apart from the dead no-tick branch, as the golden output the
+    columnar implementation must reproduce.
+    """
+    from ffxiv_stats import Rate
+
+    radiant_finale_id = "1002964"
+    action_df_columns = [
+        "timestamp",
+        "elapsed_time",
+        "type",
+        "sourceID",
+        "targetID",
+        "packetID",
+        "targetInstance",
+        "abilityGameID",
+        "ability_name",
+        "buffs",
+        "amount",
+        "tick",
+        "multiplier",
+        "bonusPercent",
+        "hitType",
+        "directHit",
+    ]
+    actions_df = pd.DataFrame(action_table.actions)
+    actions_df["ability_name"] = actions_df["ability"].apply(lambda x: x.get("name") if isinstance(x, dict) else None)
+    actions_df["abilityGameID"] = actions_df["ability"].apply(lambda x: x.get("guid") if isinstance(x, dict) else None)
+    actions_df.drop(columns="ability", inplace=True)
+
+    if "unpaired" in actions_df.columns:
+        action_df_columns.append("unpaired")
+    if "directHit" not in actions_df.columns:
+        actions_df["directHit"] = False
+    if "tick" not in actions_df.columns:
+        actions_df["tick"] = False
+    if "bonusPercent" not in actions_df.columns:
+        actions_df["bonusPercent"] = pd.NA
+        actions_df["bonusPercent"] = actions_df["bonusPercent"].astype("Int64")
+    if "targetInstance" not in actions_df.columns:
+        actions_df["targetInstance"] = 1
+
+    damage_condition = (actions_df["type"] == "calculateddamage") | (
+        (actions_df["type"] == "damage") & (actions_df["tick"] == True)
+    )
+    actions_df = actions_df[damage_condition]
+
+    if "buffs" not in pd.DataFrame(action_table.actions).columns:
+        actions_df["buffs"] = pd.NA
+        actions_df["buffs"] = actions_df["buffs"].astype("object")
+
+    actions_df["elapsed_time"] = (actions_df["timestamp"] - actions_df["timestamp"].iloc[0]) / 1000
+    actions_df["timestamp"] = actions_df["timestamp"] + action_table.report_start_time
+    actions_df = actions_df[action_df_columns]
+
+    actions_df.loc[actions_df["tick"] == True, "ability_name"] = actions_df["ability_name"] + " (tick)"
+    actions_df.loc[actions_df["sourceID"] != action_table.player_id, "ability_name"] += " (Pet)"
+    actions_df["buffs"] = actions_df["buffs"].apply(lambda x: x[:-1].split(".") if not pd.isna(x) else [])
+    actions_df = actions_df.reset_index(drop=True)
+
+    r = Rate(action_table.critical_hit_stat, action_table.direct_hit_stat, level=action_table.level)
+    multiplier = actions_df["multiplier"].tolist()
+    name = actions_df["ability_name"].tolist()
+    buff_id = actions_df["buffs"].tolist()
+    main_stat_adjust = [0] * len(actions_df)
+    crit_hit_rate_mod = [0] * len(actions_df)
+    direct_hit_rate_mod = [0] * len(actions_df)
+    p = [0] * len(actions_df)
+
+    for idx, row in actions_df.iterrows():
+        b = row["buffs"]
+        for b_idx, s in enumerate(set(b)):
+            if s in action_table.critical_hit_rate_buffs:
+                crit_hit_rate_mod[idx] += action_table.critical_hit_rate_buffs[s]
+            if s in action_table.direct_hit_rate_buffs:
+                direct_hit_rate_mod[idx] += action_table.direct_hit_rate_buffs[s]
+            if s == medication_id:
+                main_stat_adjust[idx] += action_table.medication_amt
+                multiplier[idx] = round(multiplier[idx] / medication_multiplier, 6)
+            if s == radiant_finale_id:
+                buff_id[idx][b_idx] = action_table.estimate_radiant_finale_strength(
+                    actions_df.iloc[idx]["elapsed_time"]
+                )
+        multiplier[idx], hit_type = action_table.guaranteed_hit_type_damage_buff(
+            row["abilityGameID"], b, multiplier[idx], crit_hit_rate_mod[idx], direct_hit_rate_mod[idx]
+        )
+        name[idx] = name[idx] + "-" + "_".join(sorted(buff_id[idx]))
+        p[idx] = r.get_p(
+            round(crit_hit_rate_mod[idx], 2), round(direct_hit_rate_mod[idx], 2), guaranteed_hit_type=hit_type
+        )
+
+    actions_df["multiplier"] = multiplier
+    actions_df["action_name"] = name
+    actions_df[["p_n", "p_c", "p_d", "p_cd"]] = pd.DataFrame(np.array(p))
+    actions_df["main_stat_add"] = main_stat_adjust
+    actions_df["l_c"] = r.crit_dmg_multiplier()
+    actions_df["buffs"] = actions_df["buffs"].sort_values().apply(lambda x: sorted(x))
+    return actions_df.reset_index(drop=True)
+
+
+def golden_event(timestamp, event_type="calculateddamage", **fields):
+    return {
+        "timestamp": timestamp,
+        "type": event_type,
+        "sourceID": 1,
+        "targetID": 2,
+        "ability": {"name": "Fire IV", "guid": 25796},
+        "amount": 1000,
+        "multiplier": 1.155,
+        "hitType": 1,
+        **fields,
+    }
+
+
+@pytest.mark.parametrize(
+    "events",
+    [
+        # Buffs, pets, DoT ticks, direct hits and unpaired actions, with dropped
+        # damage events lacking fields the kept events have
+        [
+            golden_event(0, packetID=1, buffs="1000049.1001221.", targetInstance=1),
+            golden_event(500, "damage", packetID=1),
+            golden_event(1000, packetID=2, directHit=True, bonusPercent=20, targetInstance=2),
+            golden_event(2000, "damage", tick=True, ability={"name": "Thunder III", "guid": 1000163}),
+            golden_event(3000, sourceID=5, packetID=3, buffs="1002964."),
+            golden_event(150000, packetID=4, buffs="1002964.", unpaired=True),
+            golden_event(151000, "damage", sourceID=5, tick=True, buffs="1001221."),
+            golden_event(152000, packetID=5, ability={"name": "Xenoglossy", "guid": 16507}),
+        ],
+        # Only dropped events have a target instance and bonus percent, or lack
+        # packet IDs and hit types
+        [
+            golden_event(0, packetID=1),
+            {"timestamp": 400, "type": "damage", "targetInstance": 3, "bonusPercent": 10},
+            golden_event(1000, packetID=2),
+            {"timestamp": 1200, "type": "cast", "sourceID": 1, "targetID": 2, "ability": {"name": "Fire IV"}},
+        ],
+        # Striking dummy: no buffs, flags, ticks, bonus percent or target instances
+        [golden_event(t, packetID=t) for t in (0, 2500, 5000)],
+    ],
+)
+def test_create_action_df_matches_baseline(buffed_action_table, events):
+    buffed_action_table.actions = events
+    buffed_action_table.guaranteed_hit_type_via_action = {16507: 3}
+
+    expected = baseline_create_action_df(buffed_action_table)
+    actions_df = buffed_action_table.create_action_df()
+
+    # `buff_set_id` is the only new column, interning the sorted buffs
+    buff_sets = buffed_action_table.buff_vocabulary.buff_sets
+    assert [buff_sets[i] for i in actions_df["buff_set_id"]] == [tuple(b) for b in expected["buffs"]]
+    pd.testing.assert_frame_equal(actions_df.drop(columns="buff_set_id"), expected, check_dtype=True)
+
+
+def test_pickle_drops_cached_properties(buffed_action_table):
+    actions_df = buffed_action_table.create_action_df()
+    assert all(name in vars(buffed_action_table) for name in ActionTable._CACHED_PROPERTIES)
+
+    unpickled = pickle.loads(pickle.dumps(buffed_action_table))
+
+    assert not any(name in vars(unpickled) for name in ActionTable._CACHED_PROPERTIES)
+    # The hit type rates are rebuilt from the unpickled stats
+    unpickled.critical_hit_stat = 2000
+    assert (unpickled.create_action_df()["p_c"] < actions_df["p_c"]).all()
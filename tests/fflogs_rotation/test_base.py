@@ -1,7 +1,18 @@
+import time
+
+import numpy as np
 import pandas as pd
 import pytest
 
-from fflogs_rotation.base import BuffQuery
+from fflogs_rotation.base import (
+    AuraRequirement,
+    BuffQuery,
+    FFLogsClient,
+    IntervalSet,
+    PageStats,
+    aura_fields,
+    disjunction,
+)
 
 
 @pytest.fixture
@@ -49,3 +60,146 @@ def test_normalize_damage(
 
     result = BuffQuery.normalize_damage(actions_df, potion_multiplier)
     assert int(result["normalized_damage"].iloc[0]) == expected
+
+
+def events_page(events: list[int], next_page_timestamp: int | None) -> dict:
+    return {
+        "data": {
+            "reportData": {
+                "report": {
+                    "events": {
+                        "data": events,
+                        "nextPageTimestamp": next_page_timestamp,
+                    }
+                }
+            }
+        }
+    }
+
+
+@pytest.fixture
+def paged_client(monkeypatch):
+    """Client serving three pages of events, the last page from cache."""
+    pages = {
+        0: (events_page([1, 2], 10), 200),
+        10: (events_page([3, 4], 20), 300),
+        20: (events_page([5], None), 0),
+    }
+    client = FFLogsClient()
+    client.requested = []
+
+    def mock_gql_request(headers, query, variables, operation_name):
+        client.requested.append(variables["startTime"])
+        return pages[variables["startTime"]]
+
+    monkeypatch.setattr(client, "_gql_request", mock_gql_request)
+    return client
+
+
+def test_paginate_follows_next_page_timestamp(paged_client):
+    stats = PageStats()
+    events = [
+        e
+        for report in paged_client.paginate({}, "", {"startTime": 0, "endTime": 100}, "DpsActions", stats)
+        for e in report["events"]["data"]
+    ]
+    assert events == [1, 2, 3, 4, 5]
+    assert stats == PageStats(pages=3, bytes=500, cached_pages=1)
+
+
+def test_paginate_requests_next_page_before_current_is_processed(paged_client):
+    pager = paged_client.paginate({}, "", {"startTime": 0}, "DpsActions")
+    next(pager)
+    # Page 2 is requested in the background while page 1 is being processed.
+    deadline = time.monotonic() + 5
+    while (10 not in paged_client.requested) and (time.monotonic() < deadline):
+        time.sleep(0.01)
+    assert paged_client.requested == [0, 10]
+    pager.close()
+
+
+REQUIREMENTS = (AuraRequirement("requiescat", 1001368), AuraRequirement("immortalSacrifice", 1002592, events=True))
+
+
+def test_aura_fields():
+    fields = aura_fields(REQUIREMENTS, "$sourceID")
+    assert "requiescat: table(fightIDs: $id dataType: Buffs sourceID: $sourceID abilityID: 1001368)" in fields
+    assert "immortalSacrifice: events(" in fields
+    assert "{ data nextPageTimestamp }" in fields
+
+
+class AuraQueryClient(BuffQuery):
+    aura_requirements = REQUIREMENTS
+
+
+@pytest.fixture
+def aura_query_client(monkeypatch):
+    client = AuraQueryClient()
+    client.report_id, client.fight_id, client.player_id = "abc", 1, 2
+    client.queries = []
+
+    def mock_gql_query(headers, query, variables, operation_name):
+        client.queries.append((query, variables, operation_name))
+        return {"data": {"reportData": {"report": {"startTime": 0}}}}
+
+    monkeypatch.setattr(client, "gql_query", mock_gql_query)
+    return client
+
+
+def test_query_auras_reuses_merged_report(aura_query_client):
+    report = {"startTime": 0, "requiescat": {}, "immortalSacrifice": {}}
+    response = aura_query_client.query_auras({}, REQUIREMENTS, "PaladinBuffs", report)
+    assert response["data"]["reportData"]["report"] is report
+    assert aura_query_client.queries == []
+
+
+def test_query_auras_queries_instance_buff_ids(aura_query_client):
+    report = {"startTime": 0, "requiescat": {}, "immortalSacrifice": {}}
+    requirements = aura_query_client.instance_aura_requirements({"requiescat": 1001369})
+    assert requirements[0] == AuraRequirement("requiescat", 1001369)
+    assert requirements[1] == REQUIREMENTS[1]
+
+    # The merged report has the default buff ID's table, not this one.
+    aura_query_client.query_auras({}, requirements, "PaladinBuffs", report)
+    query, _, _ = aura_query_client.queries[0]
+    assert "abilityID: 1001369" in query
+
+
+@pytest.mark.parametrize("aura_report", [None, {"startTime": 0, "requiescat": {}}])
+def test_query_auras_queries_missing_tables(aura_query_client, aura_report):
+    aura_query_client.query_auras({}, REQUIREMENTS, "PaladinBuffs", aura_report)
+    query, variables, operation_name = aura_query_client.queries[0]
+    assert operation_name == "PaladinBuffs"
+    assert "query PaladinBuffs(" in query
+    assert variables == {"code": "abc", "id": [1], "playerID": 2}
+
+
+@pytest.mark.parametrize("inclusive", ["both", "neither", "left", "right"])
+@pytest.mark.parametrize(
+    "windows",
+    [
+        [(10, 20)],
+        # Overlapping, touching and unsorted windows.
+        [(30, 40), (10, 20), (15, 25), (20, 30)],
+        # Nested and zero-length windows.
+        [(10, 40), (15, 20), (45, 45)],
+        # Extra columns, like stack counts, and missing bounds.
+        [(10, 20, 3), (25, np.nan, 1), (35, 50, 2)],
+    ],
+)
+def test_interval_set_matches_disjunction_of_betweens(windows, inclusive):
+    timestamps = pd.Series(np.arange(0, 60, 2.5), index=np.arange(24)[::-1], name="timestamp")
+    expected = disjunction(*[timestamps.between(w[0], w[1], inclusive=inclusive) for w in windows])
+
+    pd.testing.assert_series_equal(IntervalSet(windows, inclusive=inclusive).contains(timestamps), expected)
+
+
+def test_interval_set_merges_windows():
+    interval_set = IntervalSet(np.array([[30, 40], [10, 20], [15, 25]]))
+    assert interval_set.starts.tolist() == [10, 30]
+    assert interval_set.ends.tolist() == [25, 40]
+
+
+def test_interval_set_without_windows():
+    timestamps = pd.Series([1, 2, 3])
+    assert not IntervalSet([]).contains(timestamps).any()
@@ -0,0 +1,99 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+from fflogs_rotation.buff_sets import (
+    BuffVocabulary,
+    buff_vocabulary,
+    factorize_buff_sets,
+    join_buffs,
+    map_buff_sets,
+    update_buff_set_ids,
+)
+
+
+def test_factorize_buff_sets():
+    buff_set_ids, buff_sets = factorize_buff_sets([["a", "b"], [], ["a", "b"], ["b", "a"]])
+    assert buff_set_ids.tolist() == [0, 1, 0, 2]
+    assert buff_sets == [("a", "b"), (), ("b", "a")]
+
+
+def test_buff_vocabulary_intern_all():
+    vocabulary = BuffVocabulary()
+    buff_set_ids = vocabulary.intern_all([["b", "a"], [], ["a", "b"], ["c"]])
+    assert buff_set_ids.tolist() == [0, 1, 0, 2]
+    assert vocabulary.buff_sets == [("a", "b"), (), ("c",)]
+    # IDs are kept across tables
+    assert vocabulary.intern(["c"]) == 2
+
+
+def test_buff_vocabulary_add():
+    vocabulary = BuffVocabulary()
+    buff_set_ids = vocabulary.intern_all([["b"], [], ["b"]])
+    added = vocabulary.add(buff_set_ids, "a")
+    assert [vocabulary.buff_sets[i] for i in added] == [("a", "b"), ("a",), ("a", "b")]
+
+
+def test_buff_vocabulary_is_valid():
+    vocabulary = BuffVocabulary()
+    buff_set_ids = vocabulary.intern_all([["a"], ["a", np.nan], ["a"]])
+    assert vocabulary.is_valid(buff_set_ids).tolist() == [True, False, True]
+
+
+def test_buff_vocabulary_pickle_keeps_ids():
+    vocabulary = BuffVocabulary()
+    vocabulary.intern_all([["a"], ["b"]])
+    unpickled = pickle.loads(pickle.dumps(vocabulary))
+    assert unpickled.buff_sets == vocabulary.buff_sets
+    assert unpickled.intern(["b"]) == 1
+    assert unpickled.intern(["c"]) == 2
+
+
+def test_buff_vocabulary_is_shared_per_patch():
+    assert buff_vocabulary(7.2) is buff_vocabulary(7.2)
+    assert buff_vocabulary(7.2) is not buff_vocabulary(7.1)
+
+
+def test_update_buff_set_ids():
+    vocabulary = BuffVocabulary()
+    actions_df = pd.DataFrame({"buffs": [["a"], ["b"], ["a"]]})
+    actions_df["buff_set_id"] = vocabulary.intern_all(actions_df["buffs"])
+    condition = pd.Series([True, False, True])
+
+    actions_df.loc[condition, "buffs"].apply(lambda x: x.append("c"))
+    update_buff_set_ids(actions_df, condition, vocabulary)
+    np.testing.assert_array_equal(actions_df["buff_set_id"], vocabulary.intern_all(actions_df["buffs"]))
+
+    actions_df["buffs"] = actions_df["buffs"].apply(lambda x: x + ["d"])
+    update_buff_set_ids(actions_df, None, vocabulary, "d")
+    np.testing.assert_array_equal(actions_df["buff_set_id"], vocabulary.intern_all(actions_df["buffs"]))
+
+
+def test_update_buff_set_ids_without_vocabulary():
+    actions_df = pd.DataFrame({"buffs": [["a"]], "buff_set_id": [5]})
+    update_buff_set_ids(actions_df, None, None)
+    assert actions_df["buff_set_id"].tolist() == [5]
+
+
+def test_map_buff_sets_calls_once_per_buff_set():
+    calls = []
+
+    def suffix(buff_set):
+        calls.append(buff_set)
+        return "_".join(sorted(buff_set))
+
+    buffs = pd.Series([["b", "a"], ["c"], ["b", "a"], []], index=[3, 5, 7, 9])
+    result = map_buff_sets(buffs, suffix)
+
+    assert result.tolist() == ["a_b", "c", "a_b", ""]
+    assert result.index.tolist() == [3, 5, 7, 9]
+    assert len(calls) == 3
+
+
+def test_map_buff_sets_matches_str_join():
+    buffs = pd.Series([["1000049", "RadiantFinale1"], [], ["card6"]])
+    pd.testing.assert_series_equal(map_buff_sets(buffs, lambda b: join_buffs(b, "_")), buffs.str.join("_"))
+
+
+def test_join_buffs_non_string():
+    assert np.isnan(join_buffs(["a", 1], "_"))
@@ -0,0 +1,141 @@
+import time
+
+import pytest
+from fflogs_rotation.base import FFLogsClient
+from fflogs_rotation.cache import (
+    DiskResponseCache,
+    ResponseCache,
+    get_response_cache,
+    response_cache_key,
+    set_response_cache,
+)
+
+QUERY = """
+query FightInformation($code: String!, $id: [Int]!) {
+    reportData {
+        report(code: $code) {
+            startTime
+            # masterData { abilities { name gameID } }
+            fights(fightIDs: $id) { startTime endTime }
+        }
+    }
+}
+"""
+
+FINISHED_START_TIME = 1722322800000
+
+
+def report_response(start_time: int) -> dict:
+    return {
+        "data": {
+            "reportData": {
+                "report": {
+                    "startTime": start_time,
+                    "fights": [{"startTime": 10, "endTime": 20}],
+                }
+            }
+        }
+    }
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    response_cache = DiskResponseCache(tmp_path / "fflogs_cache")
+    yield response_cache
+    response_cache.cache.close()
+
+
+@pytest.fixture
+def counted_post(monkeypatch):
+    """Replace the session post with a counter returning a finished report."""
+    calls = []
+
+    class MockResponse:
+        content = b"{}"
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return report_response(FINISHED_START_TIME)
+
+    def mock_post(*args, **kwargs):
+        calls.append(kwargs["json"])
+        return MockResponse()
+
+    class MockSession:
+        post = staticmethod(mock_post)
+
+    monkeypatch.setattr("fflogs_rotation.base.get_session", lambda: MockSession())
+    return calls
+
+
+def test_cache_key_ignores_formatting_and_variable_order():
+    compact_query = " ".join(line.strip() for line in QUERY.splitlines() if "#" not in line)
+    assert response_cache_key("FightInformation", QUERY, {"code": "abc", "id": [1]}) == response_cache_key(
+        "FightInformation", compact_query, {"id": [1], "code": "abc"}
+    )
+
+
+@pytest.mark.parametrize(
+    "operation_name, variables",
+    [
+        ("FightInformation", {"code": "abc", "id": [2]}),
+        ("OtherOperation", {"code": "abc", "id": [1]}),
+    ],
+)
+def test_cache_key_distinguishes_requests(operation_name, variables):
+    assert response_cache_key("FightInformation", QUERY, {"code": "abc", "id": [1]}) != response_cache_key(
+        operation_name, QUERY, variables
+    )
+
+
+def test_finished_report_uses_long_ttl(disk_cache):
+    response = report_response(FINISHED_START_TIME)
+    assert disk_cache.response_ttl({"code": "abc"}, response) == disk_cache.ttl
+
+
+def test_live_report_uses_short_ttl(disk_cache):
+    response = report_response(int(time.time() * 1000))
+    assert disk_cache.response_ttl({"code": "abc"}, response) == disk_cache.live_ttl
+
+
+def test_report_start_time_remembered_across_queries(disk_cache):
+    disk_cache.set(
+        "FightInformation",
+        QUERY,
+        {"code": "abc", "id": [1]},
+        report_response(FINISHED_START_TIME),
+    )
+    # Damage events don't query startTime
+    events_response = {"data": {"reportData": {"report": {"events": {"data": []}}}}}
+    assert disk_cache.response_ttl({"code": "abc"}, events_response) == disk_cache.ttl
+    assert disk_cache.response_ttl({"code": "other"}, events_response) == disk_cache.live_ttl
+
+
+def test_error_responses_not_cached(disk_cache):
+    variables = {"code": "abc", "id": [1]}
+    disk_cache.set("FightInformation", QUERY, variables, {"errors": [{"message": "private"}]})
+    assert disk_cache.get("FightInformation", QUERY, variables) is None
+
+
+def test_gql_query_reads_through_cache(disk_cache, counted_post):
+    set_response_cache(disk_cache)
+    try:
+        client = FFLogsClient()
+        variables = {"code": "abc", "id": [1]}
+        first = client.gql_query({}, QUERY, variables, "FightInformation")
+        second = client.gql_query({}, QUERY, variables, "FightInformation")
+    finally:
+        set_response_cache(None)
+
+    assert first == second
+    assert len(counted_post) == 1
+
+
+def test_default_cache_is_noop(counted_post):
+    assert type(get_response_cache()) is ResponseCache
+    client = FFLogsClient()
+    client.gql_query({}, QUERY, {"code": "abc", "id": [1]}, "FightInformation")
+    client.gql_query({}, QUERY, {"code": "abc", "id": [1]}, "FightInformation")
+    assert len(counted_post) == 2
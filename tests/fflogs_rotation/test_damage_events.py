@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+from fflogs_rotation.damage_events import DamageEventDecoder, decode_damage_events
+
+
+def event(timestamp, event_type="calculateddamage", **fields):
+    return {
+        "timestamp": timestamp,
+        "type": event_type,
+        "sourceID": 1,
+        "targetID": 2,
+        "ability": {"name": "Dia", "guid": 16532},
+        "hitType": 1,
+        "multiplier": 1.0,
+        **fields,
+    }
+
+
+def test_decode_damage_events_keeps_damage_and_ticks():
+    events = decode_damage_events(
+        [
+            event(0, packetID=1, buffs="1000049.1001221."),
+            event(10, "damage", packetID=1, amount=100),
+            event(20, "damage", tick=True, amount=50, buffs="1000049.1001221."),
+            event(30, "cast"),
+        ]
+    )
+    columns = events.columns
+
+    assert len(events) == 2
+    assert columns["timestamp"].tolist() == [0, 20]
+    assert columns["timestamp"].dtype == np.int64
+    # Flags are NaN where FFLogs omits them, like `pd.DataFrame` would infer
+    assert columns["tick"].dtype == object
+    assert pd.isna(columns["tick"][0]) and columns["tick"][1] is True
+    assert columns["type"].tolist() == ["calculateddamage", "damage"]
+    # DoT ticks have no packet ID, like `pd.DataFrame` would infer
+    assert np.isnan(columns["packetID"][1])
+    # Both events share one interned buff set
+    assert events.buff_set_ids.tolist() == [0, 0]
+    assert events.buff_sets == [("1000049", "1001221")]
+
+
+def test_decode_damage_events_abilities():
+    events = decode_damage_events(
+        [
+            event(0),
+            event(10, ability={"name": "Glare III", "guid": 25859}),
+            event(20),
+            event(30, ability=None),
+        ]
+    )
+    ability_name = events.columns["ability_name"]
+
+    assert isinstance(ability_name, pd.Categorical)
+    assert ability_name.categories.tolist() == ["Dia", "Glare III"]
+    assert ability_name.codes.tolist() == [0, 1, 0, -1]
+    np.testing.assert_array_equal(events.columns["abilityGameID"], [16532, 25859, 16532, np.nan])
+
+
+def test_decode_damage_events_missing_fields():
+    events = decode_damage_events([event(0), event(10)])
+    columns = events.columns
+
+    assert events.buff_sets == [()]
+    assert columns["targetInstance"].tolist() == [1, 1]
+    assert columns["bonusPercent"].dtype == "Int64"
+    assert columns["bonusPercent"].isna().all()
+    # Flags no event has are all False, except `unpaired` which is left out
+    assert columns["directHit"].dtype == bool
+    assert not columns["directHit"].any()
+    assert "unpaired" not in columns
+
+
+def test_decode_damage_events_dtypes_follow_all_events():
+    events = decode_damage_events(
+        [
+            event(0, packetID=1, targetInstance=1, bonusPercent=10),
+            # Not kept, but lacks fields the kept events have
+            event(10, "damage", amount=100),
+            event(20, packetID=2, targetInstance=1, bonusPercent=10, unpaired=True),
+        ]
+    )
+    columns = events.columns
+
+    assert columns["packetID"].dtype == np.float64
+    assert columns["targetInstance"].dtype == np.float64
+    assert columns["bonusPercent"].dtype == np.float64
+    assert columns["unpaired"].dtype == object
+    assert pd.isna(columns["unpaired"][0]) and columns["unpaired"][1] is True
+
+
+def test_decoding_pages_matches_decoding_all_events():
+    events = [
+        event(0, packetID=1, buffs="1000049."),
+        event(10, ability={"name": "Glare III", "guid": 25859}, packetID=2),
+        event(20, "damage", tick=True, amount=50),
+        event(30, buffs="1000049.", targetInstance=2),
+        event(40, ability=None, packetID=3),
+    ]
+    decoder = DamageEventDecoder()
+    for page in (events[:2], events[2:3], [], events[3:]):
+        decoder.add(page)
+    paged = decoder.finish()
+    expected = decode_damage_events(events)
+
+    assert paged.buff_sets == expected.buff_sets
+    np.testing.assert_array_equal(paged.buff_set_ids, expected.buff_set_ids)
+    assert paged.columns.keys() == expected.columns.keys()
+    for name, column in expected.columns.items():
+        assert pd.Series(paged.columns[name]).equals(pd.Series(column)), name
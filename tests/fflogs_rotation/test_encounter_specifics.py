@@ -58,3 +58,37 @@ def test_m7s_exclude_final_blooming(
         f"Row {test_id}: {ability_name} at {elapsed_time}s with initial targetID={initial_target_id} "
         f"should have targetID={expected_target_id} after processing"
     )
+
+
+def test_fru_apply_vuln_p2_uses_prefetched_response(monkeypatch):
+    """A response from `query_fru_vuln_down` is applied without querying again."""
+
+    def fail_query(*args, **kwargs):
+        raise AssertionError("vulnDown should not be queried")
+
+    monkeypatch.setattr(EncounterSpecifics, "gql_query", fail_query)
+
+    vuln_response = {
+        "data": {
+            "reportData": {
+                "report": {
+                    "startTime": 1000,
+                    "vulnDown": {"data": {"auras": [{"id": 7, "bands": [{"startTime": 100, "endTime": 200}]}]}},
+                }
+            }
+        }
+    }
+    actions_df = pd.DataFrame(
+        {
+            "timestamp": [1050, 1150, 1150],
+            "targetID": [7, 7, 8],
+            "buffs": [[], [], []],
+            "action_name": ["a-", "a-", "a-"],
+            "multiplier": [1.0, 1.0, 1.0],
+        }
+    )
+
+    result_df = EncounterSpecifics().fru_apply_vuln_p2({}, "abc", 1, actions_df, vuln_response=vuln_response)
+
+    assert result_df["multiplier"].tolist() == [1.0, 0.5, 1.0]
+    assert result_df["buffs"].tolist() == [[], ["vuln_down"], []]
@@ -0,0 +1,106 @@
+import pytest
+from fflogs_rotation.actions import JOB_AURA_CLASSES, ActionTable
+from fflogs_rotation.fight_metadata import FightMetadata, load_fight_metadata, save_fight_metadata
+
+REPORT = {
+    "startTime": 1000,
+    "region": {"compactName": "NA"},
+    "table": {"data": {"downtime": 100}},
+    "fights": [
+        {
+            "encounterID": 1079,
+            "kill": True,
+            "startTime": 100,
+            "endTime": 15000,
+            "name": "Futures Rewritten",
+            "hasEcho": False,
+            "difficulty": 101,
+            "phaseTransitions": [{"id": 1, "startTime": 100}, {"id": 2, "startTime": 5000}],
+        }
+    ],
+    "rankings": {"data": [{"duration": 14900}]},
+}
+
+
+@pytest.fixture
+def fight_metadata():
+    return FightMetadata.from_report("abc", 3, REPORT)
+
+
+def test_from_report(fight_metadata):
+    assert fight_metadata.encounter_id == 1079
+    assert fight_metadata.region == "NA"
+    assert fight_metadata.ranking_duration == 14900
+    assert fight_metadata.downtime == 100
+    assert len(fight_metadata.phase_transitions) == 2
+
+
+def test_as_report_round_trip(fight_metadata):
+    assert FightMetadata.from_report("abc", 3, fight_metadata.as_report()) == fight_metadata
+
+
+def test_from_report_damage_downtime():
+    report = {**REPORT, "table": {"data": {"damageDowntime": 250}}, "rankings": {"data": []}}
+    fight_metadata = FightMetadata.from_report("abc", 3, report)
+    assert fight_metadata.downtime == 250
+    assert fight_metadata.ranking_duration is None
+
+
+def test_save_and_load(tmp_path, fight_metadata):
+    assert load_fight_metadata(tmp_path, "abc", 3) is None
+    save_fight_metadata(tmp_path / "fight-metadata", fight_metadata)
+    assert load_fight_metadata(tmp_path / "fight-metadata", "abc", 3) == fight_metadata
+    # Saving again replaces the record without leaving temporary files behind.
+    save_fight_metadata(tmp_path / "fight-metadata", fight_metadata)
+    assert not list((tmp_path / "fight-metadata").rglob("*.tmp"))
+
+
+def test_unranked_kill_is_not_persisted(tmp_path, fight_metadata):
+    """Kills FFLogs hasn't ranked yet are queried again later."""
+    unranked = FightMetadata.from_report("abc", 3, {**REPORT, "rankings": {"data": []}})
+    assert not unranked.is_complete
+    save_fight_metadata(tmp_path, unranked)
+    assert load_fight_metadata(tmp_path, "abc", 3) is None
+
+    # Wipes are never ranked.
+    wipe = FightMetadata.from_report(
+        "abc", 3, {**REPORT, "fights": [{**REPORT["fights"][0], "kill": False}], "rankings": {"data": []}}
+    )
+    save_fight_metadata(tmp_path, wipe)
+    assert load_fight_metadata(tmp_path, "abc", 3) == wipe
+
+
+@pytest.mark.parametrize("job", list(JOB_AURA_CLASSES))
+def test_player_fight_information_query_is_slim(job):
+    action_table = ActionTable.__new__(ActionTable)
+    action_table.job = job
+    query = action_table._player_fight_information_query()
+
+    assert "potionType: table(" in query
+    for requirement in JOB_AURA_CLASSES[job].aura_requirements:
+        assert f"{requirement.alias}: " in query
+    assert "rankings" not in query
+    assert "dataType: DamageDone" not in query
+
+
+def test_query_fight_information_with_metadata(fight_metadata):
+    queried = []
+    player_report = {"startTime": 1000, "potionType": {"data": {"auras": []}}}
+
+    def gql_query(headers, query, variables, operation_name):
+        queried.append(operation_name)
+        return {"data": {"reportData": {"report": player_report}}}
+
+    action_table = ActionTable.__new__(ActionTable)
+    action_table.job = "Bard"
+    action_table.report_id = "abc"
+    action_table.fight_id = 3
+    action_table.player_id = 5
+    action_table.gql_query = gql_query
+
+    report = action_table._query_fight_information({}, fight_metadata)
+
+    assert queried == ["PlayerFightInformation"]
+    assert report["potionType"] == player_report["potionType"]
+    assert report["fights"] == fight_metadata.as_report()["fights"]
+    assert report["rankings"]["data"][0]["duration"] == 14900
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fflogs_rotation.job_data.data import damage_buff_table, potency_table
+from fflogs_rotation.job_data.game_data import patch_times
+from fflogs_rotation.job_data.snapshot import (
+    PatchIndex,
+    load_potency_table,
+    parse_potency_falloff,
+    patch_index,
+    potency_index,
+    write_potency_snapshot,
+)
+
+
+def test_parse_potency_falloff():
+    falloff = parse_potency_falloff(pd.Series(["1;0.75;0.5", np.nan, "1;0.75;0.5"]))
+    np.testing.assert_array_equal(falloff[0], [1.0, 0.75, 0.5])
+    np.testing.assert_array_equal(falloff[1], [1.0])
+    # Each distinct string is parsed once
+    assert falloff[0] is falloff[2]
+
+
+@pytest.mark.parametrize("patch_number", list(patch_times))
+def test_potency_index_matches_filter(patch_number):
+    index = potency_index(potency_table)
+    for (job, level), _ in potency_table.groupby(["job", "level"]):
+        expected = potency_table[
+            (patch_number >= potency_table["valid_start"])
+            & (patch_number < potency_table["valid_end"])
+            & (potency_table["job"] == job)
+            & (potency_table["level"] == level)
+        ]
+        pd.testing.assert_frame_equal(index.lookup(patch_number, job, level), expected)
+
+
+def test_patch_index_overlapping_windows():
+    table = pd.DataFrame(
+        {
+            "buff_id": ["a", "b", "c"],
+            "rate_buff": [0.1, 0.2, 0.3],
+            "valid_start": [6.0, 6.2, 7.0],
+            "valid_end": [10.0, 7.0, 10.0],
+        }
+    )
+    index = PatchIndex(table)
+    assert index.lookup(5.0).empty
+    assert index.lookup(6.1)["buff_id"].tolist() == ["a"]
+    assert index.lookup(6.5)["buff_id"].tolist() == ["a", "b"]
+    assert index.mapping(7.0, "buff_id", "rate_buff") == {"a": 0.1, "c": 0.3}
+    assert index.lookup(10.0).empty
+
+
+def test_patch_index_reuses_registered_index():
+    assert patch_index(damage_buff_table) is patch_index(damage_buff_table)
+    assert potency_index(potency_table) is potency_index(potency_table)
+    other = damage_buff_table.copy()
+    assert patch_index(other) is not patch_index(other)
+
+
+def test_potency_snapshot_round_trip(tmp_path):
+    csv_path = tmp_path / "potencies.csv"
+    snapshot_path = tmp_path / "potencies.arrow"
+    pd.DataFrame(
+        {
+            "job": ["Samurai", "Samurai"],
+            "ability_id": [7477, 7478],
+            "buff_id": [np.nan, "1001229"],
+            "valid_start": [7.2, 7.2],
+            "valid_end": [7.25, 7.25],
+            "potency_falloff": [np.nan, "1;0.5"],
+        }
+    ).to_csv(csv_path, index=False)
+    write_potency_snapshot(csv_path, snapshot_path)
+
+    snapshot = load_potency_table(csv_path, snapshot_path)
+    assert np.isnan(snapshot["buff_id"][0])
+    np.testing.assert_array_equal(snapshot["potency_falloff"][1], [1.0, 0.5])
+
+    # An edited CSV is read instead of the stale snapshot
+    csv_path.write_text(csv_path.read_text().replace("7477", "7480"))
+    assert load_potency_table(csv_path, snapshot_path)["ability_id"][0] == 7480
@@ -0,0 +1,56 @@
+import pytest
+from fflogs_rotation.http_session import (
+    RETRY_STATUS_CODES,
+    PooledSession,
+    configure_session,
+    get_session,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_session():
+    configure_session()
+    yield
+    configure_session()
+
+
+def test_retries_configured_for_https():
+    session = PooledSession(retries=5, backoff_factor=1.0)
+    retry = session.get_adapter("https://www.fflogs.com/api/v2/client").max_retries
+    assert retry.total == 5
+    assert retry.backoff_factor == 1.0
+    assert set(retry.status_forcelist) == set(RETRY_STATUS_CODES)
+    # POST must be retried for GraphQL queries
+    assert retry.is_retry("POST", 429)
+
+
+def test_default_timeout_applied(monkeypatch):
+    seen = {}
+
+    def mock_request(self, method, url, **kwargs):
+        seen.update(kwargs)
+
+    monkeypatch.setattr("requests.Session.request", mock_request)
+    session = PooledSession(timeout=(1, 2))
+    session.post("https://www.fflogs.com/api/v2/client", json={})
+    assert seen["timeout"] == (1, 2)
+
+    session.post("https://www.fflogs.com/api/v2/client", json={}, timeout=10)
+    assert seen["timeout"] == 10
+
+
+def test_session_shared_within_process():
+    assert get_session() is get_session()
+
+
+def test_session_recreated_after_fork(monkeypatch):
+    parent_session = get_session()
+    monkeypatch.setattr("fflogs_rotation.http_session.os.getpid", lambda: -1)
+    assert get_session() is not parent_session
+
+
+def test_configure_session_applies_settings():
+    configure_session(timeout=3, retries=0)
+    session = get_session()
+    assert session.timeout == 3
+    assert session.get_adapter("https://api.xivgear.app").max_retries.total == 0
@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+import pytest
+
+from fflogs_rotation.actions import JOB_CLASS_PATHS, JOB_CLASSES, LazyClasses
+from fflogs_rotation.samurai import SamuraiActions
+
+
+def test_actions_import_is_lazy():
+    """Importing the actions module doesn't import ffxiv_stats or job modules."""
+    program = (
+        "import sys, fflogs_rotation.actions; "
+        "print(' '.join(m for m in ('ffxiv_stats', 'fflogs_rotation.samurai') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", program], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_job_classes():
+    assert JOB_CLASSES["Samurai"] is SamuraiActions
+    assert set(JOB_CLASSES) == set(JOB_CLASS_PATHS)
+    assert len(JOB_CLASSES) == len(JOB_CLASS_PATHS)
+
+
+def test_lazy_classes_unknown_name():
+    with pytest.raises(KeyError):
+        LazyClasses({"Samurai": "fflogs_rotation.samurai:SamuraiActions"})["Viper"]
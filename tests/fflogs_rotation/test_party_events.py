@@ -0,0 +1,75 @@
+import pytest
+
+from fflogs_rotation.party_events import PartyDamageEvents
+
+# Player 1 owns pet 10 (from masterData), player 2 owns pet 20 (only passed in).
+EVENTS = [
+    {"timestamp": 100, "sourceID": 1, "amount": 1},
+    {"timestamp": 100, "sourceID": 10, "amount": 2},
+    {"timestamp": 150, "sourceID": 2, "amount": 3},
+    {"timestamp": 200, "sourceID": 20, "amount": 4},
+    {"timestamp": 250, "sourceID": 10, "amount": 5},
+    {"timestamp": 300, "sourceID": 1, "amount": 6},
+    {"timestamp": 350, "sourceID": 3, "amount": 7},
+]
+
+
+@pytest.fixture
+def party_events(monkeypatch):
+    """Party event store serving EVENTS two events per page."""
+    store = PartyDamageEvents("abc", 1)
+    store.queries = []
+
+    def mock_gql_request(headers, query, variables, operation_name):
+        store.queries.append(variables)
+        page = [e for e in EVENTS if variables["startTime"] <= e["timestamp"] <= variables["endTime"]]
+        next_page = page[2]["timestamp"] if len(page) > 2 else None
+        response = {
+            "data": {
+                "reportData": {
+                    "report": {
+                        "masterData": {"actors": [{"id": 10, "petOwner": 1}, {"id": 30, "petOwner": None}]},
+                        "events": {"data": page[:2], "nextPageTimestamp": next_page},
+                    }
+                }
+            }
+        }
+        return response, 100
+
+    monkeypatch.setattr(store, "_gql_request", mock_gql_request)
+    return store
+
+
+def test_all_pages_fetched(party_events):
+    party_events.source_events({}, 3, None, 0, 1000)
+    assert [q["startTime"] for q in party_events.queries] == [0, 150, 250, 350]
+
+
+def test_player_events_include_pets_in_order(party_events):
+    events = party_events.source_events({}, 1, None, 0, 1000)
+    assert [e["amount"] for e in events] == [1, 2, 5, 6]
+
+
+def test_passed_pet_ids_included(party_events):
+    events = party_events.source_events({}, 2, [20], 0, 1000)
+    assert [e["amount"] for e in events] == [3, 4]
+
+
+def test_page_stats_recorded(party_events):
+    party_events.source_events({}, 1, None, 0, 1000)
+    assert party_events.page_stats.pages == 4
+    assert party_events.page_stats.bytes == 400
+
+
+def test_events_fetched_once_per_window(party_events):
+    for player_id in (1, 2, 3):
+        party_events.source_events({}, player_id, None, 0, 1000)
+    assert len(party_events.queries) == 4
+
+    party_events.source_events({}, 1, None, 100, 200)
+    assert len(party_events.queries) == 6
+
+
+def test_time_window_respected(party_events):
+    events = party_events.source_events({}, 1, None, 100, 200)
+    assert [e["amount"] for e in events] == [1, 2]
@@ -0,0 +1,122 @@
+import pytest
+from fflogs_rotation.phases import (
+    DiskPhaseRotationCache,
+    PhaseRotationCache,
+    build_phase_table,
+    get_phase_rotation_cache,
+    phase_rotation_key,
+    phase_rotation_table,
+    set_phase_rotation_cache,
+)
+
+
+class FakeTable:
+    def __init__(self, phase: int, all_phases: bool = False, gauge: int = 0) -> None:
+        self.phase = phase
+        self.all_phases = all_phases
+        # Job gauge at the start of the phase, only built up in earlier phases when
+        # they are part of the build.
+        self.gauge = gauge
+        self.phase_windows = {1: (0, 100), 2: (100, 200)} if all_phases else {}
+
+    def phase_table(self, phase: int) -> "FakeTable":
+        return FakeTable(phase, gauge=50 * (phase - 1))
+
+    def phase_tables(self) -> dict:
+        return {0: self} | {p: self.phase_table(p) for p in self.phase_windows}
+
+
+@pytest.fixture
+def builds():
+    """Build fake tables, recording the arguments of each build."""
+    calls = []
+
+    def build(**kwargs):
+        calls.append(kwargs)
+        return FakeTable(**kwargs)
+
+    build.calls = calls
+    return build
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    cache = DiskPhaseRotationCache(tmp_path / "phase_cache")
+    set_phase_rotation_cache(cache)
+    yield cache
+    set_phase_rotation_cache(None)
+    cache.cache.close()
+
+
+def test_phase_rotation_key():
+    assert phase_rotation_key("abc", 1, [2, 3]) == phase_rotation_key("abc", 1, [2, 3])
+    assert phase_rotation_key("abc", 1, [2, 3]) != phase_rotation_key("abc", 1, None)
+
+
+def test_default_cache_builds_the_phase_alone(builds):
+    assert not get_phase_rotation_cache().enabled
+
+    table = phase_rotation_table("key", 2, builds)
+
+    assert table.phase == 2
+    assert builds.calls == [{"phase": 2}]
+
+
+def test_default_cache_builds_the_whole_fight_alone(builds):
+    assert phase_rotation_table("key", 0, builds).phase == 0
+    assert builds.calls == [{"phase": 0}]
+
+
+def test_build_phase_table_builds_the_phase_alone_by_default(builds):
+    assert build_phase_table(2, builds).phase == 2
+    assert builds.calls == [{"phase": 2}]
+
+
+def test_sliced_phase_is_the_same_with_or_without_cache(tmp_path, builds):
+    """Earlier phases carry over into a sliced phase whether or not it was cached."""
+    uncached = build_phase_table(2, builds, all_phases=True)
+
+    cache = DiskPhaseRotationCache(tmp_path / "phase_cache")
+    set_phase_rotation_cache(cache)
+    try:
+        cached = phase_rotation_table("key", 2, builds)
+    finally:
+        set_phase_rotation_cache(None)
+        cache.cache.close()
+
+    assert uncached.gauge == cached.gauge == 50
+
+
+def test_unreached_phase_is_built_alone_without_cache(builds):
+    assert build_phase_table(3, builds, all_phases=True).phase == 3
+    assert builds.calls == [{"phase": 0, "all_phases": True}, {"phase": 3}]
+
+
+def test_known_unreached_phase_skips_the_whole_fight(builds):
+    assert build_phase_table(3, builds, last_phase=2, all_phases=True).phase == 3
+    assert builds.calls == [{"phase": 3}]
+
+
+def test_other_phases_are_cached(disk_cache, builds):
+    assert phase_rotation_table("key", 1, builds).phase == 1
+    assert phase_rotation_table("key", 2, builds).phase == 2
+    assert phase_rotation_table("key", 0, builds).phase == 0
+
+    # The whole fight is only built once.
+    assert builds.calls == [{"phase": 0, "all_phases": True}]
+
+
+def test_unreached_phase_is_built_alone(disk_cache, builds):
+    assert phase_rotation_table("key", 3, builds).phase == 3
+    assert builds.calls == [{"phase": 0, "all_phases": True}, {"phase": 3}]
+
+
+def test_known_unreached_phase_is_not_cached(disk_cache, builds):
+    assert phase_rotation_table("key", 3, builds, last_phase=2).phase == 3
+    assert builds.calls == [{"phase": 3}]
+    assert disk_cache.get("key") is None
+
+
+def test_set_phase_rotation_cache_none_disables():
+    set_phase_rotation_cache(None)
+    assert type(get_phase_rotation_cache()) is PhaseRotationCache
@@ -0,0 +1,110 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fflogs_rotation.profiling import (
+    SQLiteStageTimingSink,
+    StageTimingSink,
+    record_stages,
+    set_analysis_id,
+    set_stage_timing_sink,
+    stage,
+)
+from fflogs_rotation.rate_limit import submit_in_context
+
+
+class ListSink(StageTimingSink):
+    enabled = True
+
+    def __init__(self):
+        self.written = []
+
+    def write(self, analysis_id, records):
+        self.written.append((analysis_id, records))
+
+
+@pytest.fixture
+def sink():
+    sink = ListSink()
+    set_stage_timing_sink(sink)
+    yield sink
+    set_stage_timing_sink(None)
+
+
+def test_stage_outside_analysis_is_not_recorded(sink):
+    with stage("create_action_df") as record:
+        record.rows = 10
+    assert sink.written == []
+
+
+def test_disabled_sink_records_nothing():
+    with record_stages() as timings:
+        with stage("create_action_df"):
+            pass
+        set_analysis_id("abc")
+    assert timings.records == []
+
+
+def test_record_stages(sink):
+    with record_stages():
+        with stage("create_action_df", "Samurai") as record:
+            record.rows = 10
+        with stage("make_rotation_df", "Samurai"):
+            pass
+        set_analysis_id("abc")
+
+    [(analysis_id, records)] = sink.written
+    assert analysis_id == "abc"
+    assert [r.stage for r in records] == ["create_action_df", "make_rotation_df"]
+    assert records[0].rows == 10
+    assert records[0].job == "Samurai"
+    assert all(r.seconds >= 0 for r in records)
+
+
+def test_unnamed_analysis_is_not_written(sink):
+    with record_stages(), stage("create_action_df"):
+        pass
+    assert sink.written == []
+
+
+def test_failed_analysis_is_not_written(sink):
+    with pytest.raises(ValueError), record_stages():
+        set_analysis_id("abc")
+        raise ValueError
+    assert sink.written == []
+
+
+def test_stages_in_query_threads(sink):
+    def query():
+        with stage("query"):
+            pass
+
+    with record_stages(), ThreadPoolExecutor(max_workers=2) as executor:
+        for f in [submit_in_context(executor, query) for _ in range(3)]:
+            f.result()
+        set_analysis_id("abc")
+
+    assert [r.stage for r in sink.written[0][1]] == ["query"] * 3
+
+
+def test_sqlite_sink(tmp_path):
+    set_stage_timing_sink(SQLiteStageTimingSink(tmp_path / "timings.db"))
+    try:
+        with record_stages():
+            with stage("create_action_df", "Samurai") as record:
+                record.rows = 10
+            set_analysis_id("abc")
+    finally:
+        set_stage_timing_sink(None)
+
+    with sqlite3.connect(tmp_path / "timings.db") as con:
+        rows = con.execute("select analysis_id, stage, job, rows from stage_timing").fetchall()
+    con.close()
+    assert rows == [("abc", "create_action_df", "Samurai", 10)]
+
+
+def test_profile(tmp_path):
+    with record_stages(profile_directory=tmp_path / "profiles"):
+        sum(range(1000))
+        set_analysis_id("abc")
+    assert (tmp_path / "profiles" / "abc.prof").exists()
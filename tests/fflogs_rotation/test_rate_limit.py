@@ -0,0 +1,163 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fflogs_rotation.base import FFLogsClient
+from fflogs_rotation.rate_limit import (
+    Priority,
+    RateLimiter,
+    RateLimitScheduler,
+    current_priority,
+    estimate_query_cost,
+    get_rate_limiter,
+    request_priority,
+    set_rate_limiter,
+    submit_in_context,
+)
+
+
+@pytest.fixture
+def scheduler():
+    # 3600 points per hour refills 1 point per second
+    return RateLimitScheduler(points_per_hour=3600, refresh_interval=None)
+
+
+@pytest.fixture
+def reset_rate_limiter():
+    yield
+    set_rate_limiter(None)
+
+
+def wait_for_queue(scheduler, depth):
+    deadline = time.monotonic() + 5
+    while scheduler.queue_depth() < depth:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_acquire_spends_points(scheduler):
+    assert scheduler.acquire(cost=100)
+    assert scheduler.points_remaining == pytest.approx(3500, abs=1)
+
+
+def test_reserve_queues_low_priority_work(scheduler):
+    """Background work leaves 30% of the hourly points for interactive work."""
+    scheduler.update(limit_per_hour=3600, points_spent=2600)
+
+    assert not scheduler.acquire(priority=Priority.BACKGROUND, timeout=0.05)
+    assert scheduler.acquire(priority=Priority.PARTY)
+    assert scheduler.acquire(priority=Priority.INTERACTIVE)
+
+
+def test_waiting_work_served_by_priority(scheduler):
+    scheduler.update(limit_per_hour=3600, points_spent=3600)
+    order = []
+
+    def acquire(priority):
+        scheduler.acquire(priority=priority, cost=10)
+        order.append(priority)
+
+    background = threading.Thread(target=acquire, args=(Priority.BACKGROUND,))
+    background.start()
+    wait_for_queue(scheduler, 1)
+    interactive = threading.Thread(target=acquire, args=(Priority.INTERACTIVE,))
+    interactive.start()
+    wait_for_queue(scheduler, 2)
+
+    assert scheduler.queue_depth(Priority.BACKGROUND) == 1
+    assert scheduler.queue_depth(Priority.INTERACTIVE) == 1
+
+    # Points reset
+    scheduler.update(limit_per_hour=3600, points_spent=0)
+    background.join(5)
+    interactive.join(5)
+
+    assert order == [Priority.INTERACTIVE, Priority.BACKGROUND]
+    assert scheduler.queue_depth() == 0
+
+
+def test_shared_bucket_spends_points_of_every_scheduler(tmp_path):
+    """Schedulers of separate workers sharing a directory share one bucket."""
+    first = RateLimitScheduler(points_per_hour=3600, refresh_interval=None, directory=tmp_path)
+    second = RateLimitScheduler(points_per_hour=3600, refresh_interval=None, directory=tmp_path)
+
+    assert first.acquire(cost=1000)
+    assert second.points_remaining == pytest.approx(2600, abs=1)
+
+    second.update(limit_per_hour=3600, points_spent=3600)
+    assert not first.acquire(cost=100, timeout=0.05)
+    assert first.points_remaining == pytest.approx(0, abs=1)
+
+
+def test_refresh_reads_rate_limit_data(monkeypatch):
+    class MockResponse:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {
+                "data": {"rateLimitData": {"limitPerHour": 18000, "pointsSpentThisHour": 500, "pointsResetIn": 1200}}
+            }
+
+    class MockSession:
+        @staticmethod
+        def post(*args, **kwargs):
+            assert kwargs["json"]["operationName"] == "RateLimitData"
+            return MockResponse()
+
+    monkeypatch.setattr("fflogs_rotation.rate_limit.get_session", lambda: MockSession())
+    scheduler = RateLimitScheduler(points_per_hour=3600, refresh_interval=60)
+
+    assert scheduler.acquire(headers={}, cost=0)
+    assert scheduler.capacity == 18000
+    assert scheduler.points_remaining == pytest.approx(17500, abs=5)
+
+
+def test_estimate_query_cost():
+    assert estimate_query_cost("query Q { reportData { report(code: $code) { startTime } } }") == 1
+    events = "query E { reportData { report(code: $code) { events(startTime: $t) { data } } } }"
+    assert estimate_query_cost(events) == 6
+    phases = "query P { reportData { report(code: $code) { p1: table(fightIDs: $id) p2: table (fightIDs: $id) } } }"
+    assert estimate_query_cost(phases) == 11
+
+
+def test_priority_kept_in_executor_threads():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with request_priority(Priority.BACKGROUND):
+            future = submit_in_context(executor, current_priority)
+        assert future.result() == Priority.BACKGROUND
+        assert executor.submit(current_priority).result() == Priority.INTERACTIVE
+
+
+def test_gql_query_waits_for_rate_limiter(monkeypatch, reset_rate_limiter):
+    acquired = []
+
+    class CountingRateLimiter(RateLimiter):
+        def acquire(self, headers=None, priority=None, cost=1.0, timeout=None):
+            acquired.append((current_priority(), cost))
+            return True
+
+    class MockResponse:
+        content = b"{}"
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"data": {}}
+
+    class MockSession:
+        @staticmethod
+        def post(*args, **kwargs):
+            return MockResponse()
+
+    monkeypatch.setattr("fflogs_rotation.base.get_session", lambda: MockSession())
+    set_rate_limiter(CountingRateLimiter())
+    assert isinstance(get_rate_limiter(), CountingRateLimiter)
+
+    with request_priority(Priority.PARTY):
+        FFLogsClient().gql_query({}, "query Q { a }", {}, "Q")
+        FFLogsClient().gql_query({}, "query T { t: table(dataType: DamageDone) }", {}, "T")
+
+    assert acquired == [(Priority.PARTY, 1), (Priority.PARTY, 6)]
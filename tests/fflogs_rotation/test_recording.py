@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+import requests
+from fflogs_rotation.base import FFLogsClient
+from fflogs_rotation.http_session import configure_session
+from fflogs_rotation.recording import RecordingStore, RecordReplaySession, recording_key
+from fflogs_rotation.stand_in_server import FFLOGS_API_URL, StandInSession, make_server
+
+QUERY = "query FightInformation($code: String!) { reportData { report(code: $code) { startTime } } }"
+VARIABLES = {"code": "abc", "id": [1]}
+RESPONSE = {"data": {"reportData": {"report": {"startTime": 1000}}}}
+
+
+def payload(variables=VARIABLES):
+    return {"query": QUERY, "variables": variables, "operationName": "FightInformation"}
+
+
+@pytest.fixture(autouse=True)
+def reset_session():
+    configure_session()
+    yield
+    configure_session()
+
+
+@pytest.fixture
+def recordings(tmp_path):
+    store = RecordingStore(tmp_path / "recordings")
+    store.put("FightInformation", VARIABLES, QUERY, RESPONSE)
+    return store
+
+
+@pytest.fixture
+def stand_in_server(recordings):
+    server = make_server(recordings.directory, port=0, latency=0.05)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_recording_key_ignores_variable_order():
+    assert recording_key("FightInformation", {"code": "abc", "id": [1]}, QUERY) == recording_key(
+        "FightInformation", {"id": [1], "code": "abc"}, QUERY
+    )
+    assert recording_key("FightInformation", VARIABLES, QUERY) != recording_key("Other", VARIABLES, QUERY)
+
+
+def test_recording_key_includes_query_text():
+    key = recording_key("FightInformation", VARIABLES, QUERY)
+    assert recording_key("FightInformation", VARIABLES, f"  {QUERY.replace(' ', chr(10) + '    ')}\n") == key
+    changed = QUERY.replace("startTime", "startTime endTime")
+    assert recording_key("FightInformation", VARIABLES, changed) != key
+
+
+def test_store_round_trip(recordings):
+    assert recordings.get("FightInformation", {"id": [1], "code": "abc"}, QUERY) == RESPONSE
+    assert recordings.get("FightInformation", {"code": "other", "id": [1]}, QUERY) is None
+    # A stale recording of another query shape isn't served.
+    assert recordings.get("FightInformation", VARIABLES, QUERY.replace("startTime", "endTime")) is None
+
+
+def test_replay_serves_recordings_without_network(recordings, monkeypatch):
+    def fail_request(*args, **kwargs):
+        raise AssertionError("Replay should not send requests")
+
+    monkeypatch.setattr("requests.Session.request", fail_request)
+    session = RecordReplaySession(recordings.directory, mode="replay")
+
+    response = session.post(FFLOGS_API_URL, json=payload())
+    assert response.json() == RESPONSE
+
+    missing = session.post(FFLOGS_API_URL, json=payload({"code": "other", "id": [1]}))
+    assert missing.status_code == 404
+    with pytest.raises(requests.HTTPError):
+        missing.raise_for_status()
+
+
+def test_record_then_replay_through_fflogs_client(recordings, stand_in_server, tmp_path):
+    """Record from the stand-in server, then replay the recording offline."""
+    recorded_directory = tmp_path / "recorded"
+    configure_session(RecordReplaySession, directory=recorded_directory, mode="record")
+    client = FFLogsClient(api_url=stand_in_server)
+    assert client.gql_query({}, QUERY, VARIABLES, "FightInformation") == RESPONSE
+    assert RecordingStore(recorded_directory).get("FightInformation", VARIABLES, QUERY) == RESPONSE
+
+    configure_session(RecordReplaySession, directory=recorded_directory, mode="replay")
+    client = FFLogsClient(api_url="http://127.0.0.1:1")
+    assert client.gql_query({}, QUERY, VARIABLES, "FightInformation") == RESPONSE
+
+
+def test_stand_in_session_redirects_fflogs_api(stand_in_server):
+    session = StandInSession(stand_in_server)
+
+    start = time.perf_counter()
+    response = session.post(FFLOGS_API_URL, json=payload())
+    elapsed = time.perf_counter() - start
+
+    assert response.json() == RESPONSE
+    # Injected latency
+    assert elapsed >= 0.05
+
+    assert session.post(FFLOGS_API_URL, json=payload({"code": "other"})).status_code == 404
+
+
+def test_invalid_recording_mode(tmp_path):
+    with pytest.raises(ValueError):
+        RecordReplaySession(tmp_path, mode="rewind")
@@ -1,8 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 import pytest
-
-from fflogs_rotation.rotation import ActionTable
+from fflogs_rotation.rotation import ActionTable, RotationTable
 
 
 class DummyAction(ActionTable):
@@ -17,6 +18,7 @@ class DummyAction(ActionTable):
     ):
         # encounter_phases is not used directly by _process_fight_data.
         self.encounter_phases = {1: {1: "Phase 1", 2: "Phase 2", 3: "Phase 3"}}
+        self.all_phases = False
 
     def _fetch_phase_downtime(self, headers={}, phase_start_time=0, phase_end_time=0):
         # Return a dummy dict structure for downtime extraction.
@@ -121,6 +123,98 @@ def test_fight_times(action_table, phase, kill, expected):
     assert action_table.fight_dps_time == expected[2]
 
 
+@pytest.mark.parametrize("phase, expected_dps_time", [(0, 14.80), (2, 4.9)])
+def test_fight_times_with_executor(action_table, phase, expected_dps_time):
+    """Phase downtime is submitted to the executor and set once joined."""
+    action_table.phase = phase
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        phase_downtime = action_table._set_fight_information({}, create_fight_response(True, phase), executor)
+        if phase_downtime is not None:
+            action_table._set_downtime(phase_downtime.result())
+
+    assert (phase_downtime is None) == (phase == 0)
+    assert action_table.fight_dps_time == expected_dps_time
+
+
+@pytest.mark.parametrize(
+    "kill, expected_windows",
+    [
+        (True, {1: (100, 5000), 2: (5000, 10000), 3: (10000, 15000)}),
+        (False, {1: (100, 5000), 2: (5000, 8000)}),
+    ],
+)
+def test_all_phase_downtimes(action_table, kill, expected_windows):
+    """All-phases tables query the downtime of every phase reached at once."""
+    action_table.phase = 0
+    action_table.all_phases = True
+    action_table.report_id = "abc"
+    action_table.fight_id = 1
+    requests = []
+
+    def gql_query(headers, query, variables, operation_name):
+        requests.append((query, variables, operation_name))
+        report = {f"phase{p}": {"data": {"downtime": 10 * p}} for p in expected_windows}
+        return {"data": {"reportData": {"report": report}}}
+
+    action_table.gql_query = gql_query
+    action_table._set_fight_information({}, create_fight_response(kill, len(expected_windows)))
+
+    assert action_table.phase_windows == expected_windows
+    assert action_table._query_phase_downtimes({}) == {p: 10 * p for p in expected_windows}
+    # Whole fight times are unchanged
+    assert action_table.fight_dps_time == (14.80 if kill else 7.8)
+
+    ((query, variables, operation_name),) = requests
+    assert operation_name == "PhaseTimes"
+    assert variables["start2"] == 5000
+    assert variables["end2"] == expected_windows[2][1]
+    assert "phase2: table(" in query
+
+
+def test_phase_table_keeps_job_specifics_from_earlier_phases(monkeypatch):
+    """A phase's actions come from the whole fight, after job specifics were applied."""
+    fight = RotationTable.__new__(RotationTable)
+    fight.job = "Paladin"
+    fight.phase = 0
+    fight.all_phases = True
+    fight.excluded_enemy_ids = None
+    fight.report_start_time = 0
+    fight.fight_start_time = 1000
+    fight.fight_end_time = 30000
+    fight.phase_windows = {1: (1000, 10000), 2: (10000, 30000)}
+    fight.phase_downtimes = {1: 0, 2: 2000}
+    # Gauge built in phase 1 empowers the phase 2 actions.
+    fight.actions_df = pd.DataFrame(
+        {
+            "timestamp": [1000, 9000, 12000, 20000, 30000],
+            "elapsed_time": [0.0, 8.0, 11.0, 19.0, 29.0],
+            "action_name": ["Fast Blade", "Fast Blade", "Atonement-gauge", "Atonement-gauge", "Fast Blade"],
+            "targetID": [1, 1, 1, 1, 1],
+            "buffs": [[], ["1"], ["1"], [], []],
+        }
+    )
+    fight._rate = "whole fight rate"
+    monkeypatch.setattr(
+        RotationTable,
+        "make_rotation_df",
+        lambda self, actions_df: actions_df["action_name"].value_counts().rename("n").reset_index(),
+    )
+
+    p2 = fight.phase_table(2)
+
+    assert p2.phase == 2 and not p2.all_phases
+    assert p2.actions_df["action_name"].tolist() == ["Atonement-gauge", "Atonement-gauge", "Fast Blade"]
+    assert p2.actions_df["elapsed_time"].tolist() == [0.0, 8.0, 18.0]
+    assert p2.fight_dps_time == 18.0
+    assert dict(zip(p2.rotation_df["action_name"], p2.rotation_df["n"])) == {"Atonement-gauge": 2, "Fast Blade": 1}
+    # The whole fight is untouched, and shares no frames, buff lists or caches.
+    assert len(fight.actions_df) == 5
+    p2.actions_df["buffs"].iloc[0].append("2")
+    assert fight.actions_df["buffs"].iloc[2] == ["1"]
+    assert "_rate" not in vars(p2) and not p2.phase_windows
+
+
 @pytest.mark.parametrize(
     "job, ranged_cards, melee_cards, input_card, expected_result",
     [
@@ -253,9 +347,7 @@ class DummyRate:
 def patch_rate(monkeypatch):
     # Monkeypatch the Rate class in rotation to our DummyRate.
     # FIXME: probably just instantiate a Rate instance in the class idk
-    from fflogs_rotation import actions
-
-    monkeypatch.setattr(actions, "Rate", DummyRate)
+    monkeypatch.setattr("ffxiv_stats.Rate", DummyRate)
 
 
 @pytest.fixture
@@ -362,3 +454,114 @@ def test_zero_rate_buffs_no_multiplier_change(dummy_action_instance):
     # Even though hit type is non-zero, DummyRate returns 1.0 if both rates are zero.
     assert hit_type == 1
     assert np.isclose(new_multiplier, base_multiplier * 1.0)
+
+
+def test_hit_type_via_buff_first_listed_buff_wins(dummy_action_instance):
+    """When several buffs guarantee a hit type, the first one in the table is used."""
+    dummy_action_instance.guaranteed_hit_type_via_buff = pd.DataFrame(
+        {
+            "buff_id": ["B2", "B1", "B1"],
+            "affected_action_id": ["A", "A", "C"],
+            "hit_type": [3, 1, 2],
+        }
+    )
+    _, hit_type = dummy_action_instance.guaranteed_hit_type_damage_buff("A", ["B1", "B2"], 1.0, 0.1, 0.1)
+    assert hit_type == 3
+    _, hit_type = dummy_action_instance.guaranteed_hit_type_damage_buff("A", ["B1"], 1.0, 0.1, 0.1)
+    assert hit_type == 1
+    _, hit_type = dummy_action_instance.guaranteed_hit_type_damage_buff("B", ["B1"], 1.0, 0.1, 0.1)
+    assert hit_type == 0
+
+
+def test_guaranteed_hit_type_memoized(dummy_action_instance):
+    """Repeated lookups reuse the cached result and a single Rate instance."""
+    dummy_action_instance.guaranteed_hit_type_via_action = {"A": 2}
+    first = dummy_action_instance.guaranteed_hit_type_damage_buff("A", ["B1", "B2"], 2.0, 0.1, 0.1)
+    rate = dummy_action_instance._rate
+    second = dummy_action_instance.guaranteed_hit_type_damage_buff("A", ["B2", "B1"], 3.0, 0.1, 0.1)
+
+    assert first == (2.0 * 1.2, 2)
+    assert second == (3.0 * 1.2, 2)
+    assert len(dummy_action_instance._guaranteed_hit_type_cache) == 1
+    assert dummy_action_instance._rate is rate
+
+
+def test_apply_potency_priority():
+    instance = RotationTable.__new__(RotationTable)
+    rotation_df = pd.DataFrame(
+        {
+            "buff_set_id": [0, 0, 1, 2],
+            "buff_set": [
+                ("1000076", "1001177"),
+                ("1000076", "1001177"),
+                ("1000076",),
+                (),
+            ],
+            "buff_id": ["1000076", np.nan, "1001177", np.nan],
+        }
+    )
+    result = instance._apply_potency_priority(rotation_df)
+    assert result["potency_priority"].tolist() == [2, 1, 0, 1]
+
+
+def test_take_highest_priority_potency():
+    instance = RotationTable.__new__(RotationTable)
+    keys = {
+        "base_action": "Holy Spirit",
+        "abilityGameID": 7384,
+        "buff_str": "1001368.1.0",
+        "buff_set_id": 0,
+        "matched_falloff": 1.0,
+        "p_n": 0.5,
+        "p_c": 0.2,
+        "p_d": 0.2,
+        "p_cd": 0.1,
+        "buffs": 1.0,
+        "main_stat_add": 0,
+        "bonusPercent": -1,
+    }
+    rotation_df = pd.DataFrame(
+        [
+            {**keys, "n": 3, "potency": 400, "potency_priority": 1},
+            {**keys, "n": 3, "potency": 500, "potency_priority": 2},
+            {**keys, "n": 3, "potency": 450, "potency_priority": 2},
+            {**keys, "n": 3, "potency": 300, "potency_priority": 0},
+            {**keys, "n": 2, "potency": 400, "potency_priority": 1},
+        ]
+    )
+    result = instance._take_highest_priority_potency(rotation_df)
+    # First of the tied highest priorities, most used first
+    assert result["potency"].tolist() == [500, 400]
+    assert result.index.tolist() == [1, 4]
+
+
+def test_assign_potency_falloff():
+    instance = RotationTable.__new__(RotationTable)
+    instance.potency_table = pd.DataFrame(
+        {
+            "ability_id": [1, 1, 2],
+            "potency_falloff": [
+                np.array([1.0, 0.85]),
+                np.array([1.0, 0.85]),
+                np.array([1.0]),
+            ],
+        }
+    )
+    actions_df = pd.DataFrame(
+        {
+            "action_name": ["A", "A", "A", "B", "B", "C"],
+            "abilityGameID": [1, 1, 1, 2, 2, 3],
+            "packetID": [10, 10, 10, 20, np.nan, 30],
+            "elapsed_time": [1.0, 1.0, 1.0, 2.0, 3.0, 4.0],
+            "amount": [1000, 920, 700, 500, 400, 300],
+            "hitType": 1,
+            "directHit": False,
+            "l_c": 1500,
+            "tick": [False, False, False, False, True, False],
+        }
+    )
+    result = instance._assign_potency_falloff(actions_df)
+    # 0.92 is within 0.1 of both falloffs but nearest 0.85, 0.7 is near neither,
+    # and C has no potencies.
+    assert result["action_name"].tolist() == ["A_1.0", "A_0.85", "B_1.0", "B_1.0"]
+    assert result["matched_falloff"].tolist() == [1.0, 0.85, 1.0, 1.0]
@@ -0,0 +1,143 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fflogs_rotation.base import FFLogsClient
+from fflogs_rotation.single_flight import DiskSingleFlight, SingleFlight, get_single_flight, set_single_flight
+
+QUERY = "query FightInformation($code: String!) { reportData { report(code: $code) { startTime } } }"
+VARIABLES = {"code": "abc", "id": [1]}
+RESPONSE = {"data": {"reportData": {"report": {"startTime": 1000}}}}
+
+
+@pytest.fixture
+def single_flight(tmp_path):
+    single_flight = DiskSingleFlight(tmp_path / "in_flight", poll_interval=0.01)
+    yield single_flight
+    single_flight.cache.close()
+
+
+@pytest.fixture
+def reset_single_flight():
+    yield
+    set_single_flight(None)
+
+
+def slow_fetch(calls, delay=0.2):
+    def fetch():
+        calls.append(threading.get_ident())
+        time.sleep(delay)
+        return RESPONSE
+
+    return fetch
+
+
+def test_default_single_flight_always_fetches():
+    calls = []
+    assert type(get_single_flight()) is SingleFlight
+    for _ in range(2):
+        assert get_single_flight().run("FightInformation", QUERY, VARIABLES, slow_fetch(calls, 0)) == RESPONSE
+    assert len(calls) == 2
+
+
+def test_concurrent_identical_requests_fetch_once(single_flight):
+    calls = []
+    fetch = slow_fetch(calls)
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: single_flight.run("FightInformation", QUERY, VARIABLES, fetch), range(5)))
+
+    assert results == [RESPONSE] * 5
+    assert len(calls) == 1
+
+
+def test_result_not_stored_without_waiters(single_flight):
+    calls = []
+    assert single_flight.run("FightInformation", QUERY, VARIABLES, slow_fetch(calls, 0)) == RESPONSE
+    assert len(single_flight.cache) == 0
+
+
+def test_different_requests_not_coalesced(single_flight):
+    calls = []
+    single_flight.run("FightInformation", QUERY, VARIABLES, slow_fetch(calls, 0))
+    single_flight.run("FightInformation", QUERY, {"code": "other", "id": [1]}, slow_fetch(calls, 0))
+    assert len(calls) == 2
+
+
+def test_waiting_request_fetches_if_first_fails(single_flight):
+    started = threading.Event()
+
+    def failing_fetch():
+        started.set()
+        time.sleep(0.1)
+        raise ConnectionError("FFLogs unavailable")
+
+    calls = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(single_flight.run, "FightInformation", QUERY, VARIABLES, failing_fetch)
+        started.wait(5)
+        second = executor.submit(single_flight.run, "FightInformation", QUERY, VARIABLES, slow_fetch(calls, 0))
+
+        with pytest.raises(ConnectionError):
+            first.result()
+        assert second.result() == RESPONSE
+
+    assert len(calls) == 1
+
+
+def _run_in_process(directory, count_path):
+    def fetch():
+        with open(count_path, "a") as f:
+            f.write("fetch\n")
+        time.sleep(0.5)
+        return RESPONSE
+
+    assert DiskSingleFlight(directory, poll_interval=0.01).run("FightInformation", QUERY, VARIABLES, fetch) == RESPONSE
+
+
+def test_requests_coalesced_across_processes(tmp_path):
+    count_path = tmp_path / "fetches.txt"
+    count_path.touch()
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_run_in_process, args=(tmp_path / "in_flight", count_path)) for _ in range(3)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join(10)
+
+    assert all(p.exitcode == 0 for p in processes)
+    assert count_path.read_text().count("fetch") == 1
+
+
+def test_gql_query_coalesced(single_flight, monkeypatch, reset_single_flight):
+    posts = []
+
+    class MockResponse:
+        content = b"{}"
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return RESPONSE
+
+    class MockSession:
+        @staticmethod
+        def post(*args, **kwargs):
+            posts.append(kwargs["json"])
+            time.sleep(0.2)
+            return MockResponse()
+
+    monkeypatch.setattr("fflogs_rotation.base.get_session", lambda: MockSession())
+    set_single_flight(single_flight)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(
+            executor.map(lambda _: FFLogsClient()._gql_request({}, QUERY, VARIABLES, "FightInformation"), range(3))
+        )
+
+    assert [r[0] for r in results] == [RESPONSE] * 3
+    # Only the request which was actually sent received bytes
+    assert sorted(r[1] for r in results) == [0, 0, 2]
+    assert len(posts) == 1